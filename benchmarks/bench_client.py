@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Compare TaskClient's pooled connections with a new connection per call.
+
+Usage:
+    python benchmarks/bench_client.py [num_tasks] [num_calls]
+"""
+
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_client import TaskClient  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+from task_server import TaskServer  # noqa: E402
+
+
+def per_call_connections(address: tuple, calls: int, path: str) -> None:
+    """GET a path, opening and closing a connection for every call."""
+    for _ in range(calls):
+        conn = http.client.HTTPConnection(*address)
+        conn.request("GET", path)
+        conn.getresponse().read()
+        conn.close()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        TaskManager(path)._save_tasks(make_tasks(n))
+        server = TaskServer(("127.0.0.1", 0), TaskManager(path, snapshot_cache=True))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        address = server.server_address[:2]
+
+        print(f"{n} tasks, {calls} calls")
+        for label, query, kwargs in (
+            ("count", "/count", {}),
+            ("list page", "/tasks?limit=20", {"limit": 20}),
+            ("list all", "/tasks", {}),
+        ):
+            fresh = timed(lambda: per_call_connections(address, calls, query))
+            with TaskClient(server.url) as client:
+                method = (
+                    client.count_tasks
+                    if label == "count"
+                    else lambda: client.list_tasks(**kwargs)
+                )
+                pooled = timed(lambda: [method() for _ in range(calls)])
+            print(
+                f"{label:<10} new connection {fresh / calls * 1000:7.2f} ms/call   "
+                f"TaskClient {pooled / calls * 1000:7.2f} ms/call"
+            )
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
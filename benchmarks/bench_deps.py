@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Compare keeping the ready set incrementally with recomputing it.
+
+Tasks form release checklists: every task depends on up to three earlier
+tasks, giving tens of thousands of edges. Recomputing the ready set checks
+every open task's blockers; the dependency index only decrements the counts
+of the dependents of the task marked done.
+
+Usage:
+    python benchmarks/bench_deps.py [num_tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_index import DependencyIndex  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def recompute_ready(tasks: list) -> set:
+    done = {t["id"] for t in tasks if t["status"] == "done"}
+    ids = {t["id"] for t in tasks}
+    return {
+        t["id"]
+        for t in tasks
+        if t["status"] != "done"
+        and all(b in done or b not in ids for b in t.get("dependsOn", ()))
+    }
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        tasks = make_tasks(n)
+        edges = 0
+        for t in tasks:
+            i = t["id"]
+            blockers = sorted({b for b in (i - 1, i - 7, i - 31) if b > 0 and b % 5})
+            if blockers:
+                t["dependsOn"] = blockers
+                edges += len(blockers)
+        tm = TaskManager(path)
+        tm._save_tasks(tasks)
+        del tasks
+
+        start = time.perf_counter()
+        index = tm._get_index(DependencyIndex.name)
+        print(
+            f"{n} tasks, {edges} edges; "
+            f"index built in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+        tasks = tm.list_tasks()
+        start = time.perf_counter()
+        assert recompute_ready(tasks) == index.ready
+        print(
+            f"recompute ready set        {(time.perf_counter() - start) * 1000:8.2f} ms"
+        )
+
+        target = min(index.ready)
+        old = dict(tm._find_task(tasks, target))
+        new = dict(old, status="done")
+        copy = DependencyIndex.from_data(index.to_data())
+        start = time.perf_counter()
+        copy.remove(old)
+        copy.add(new)
+        print(
+            f"incremental mark_done      {(time.perf_counter() - start) * 1000:8.3f} ms"
+        )
+
+        start = time.perf_counter()
+        tm.mark_done(target)
+        ready = tm.list_tasks(ready=True)
+        print(
+            f"mark_done + list --ready   "
+            f"{(time.perf_counter() - start) * 1000:8.2f} ms ({len(ready)} ready)"
+        )
+        assert {t["id"] for t in ready} == recompute_ready(tm.list_tasks())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Compare one shared task file with named task lists for per-team work.
+
+The same tasks are stored once as a single list and once split over
+several named lists. Adding a task and listing one team's tasks are timed in
+each layout, each with a fresh TaskManager, as a CLI call would do.
+
+Usage:
+    python benchmarks/bench_lists.py [num_tasks] [num_lists]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    lists = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = os.path.join(tmp, "shared.json")
+        tasks = make_tasks(n)
+        for t in tasks:
+            t["tags"] = [f"team-{t['id'] % lists}"]
+        TaskManager(shared)._save_tasks(tasks)
+
+        split = os.path.join(tmp, "split.json")
+        for team in range(lists):
+            own = [dict(t, id=i) for i, t in enumerate(tasks[team::lists], 1)]
+            TaskManager(split, namespace=f"team-{team}")._save_tasks(own)
+        del tasks
+
+        print(f"{n} tasks, {lists} lists")
+        one = timed(lambda: TaskManager(shared).add_task("New task", tags=["team-3"]))
+        named = timed(
+            lambda: TaskManager(split, namespace="team-3").add_task("New task")
+        )
+        print(
+            f"{'add_task':<22} one list {one * 1000:8.1f} ms   "
+            f"named list {named * 1000:7.1f} ms"
+        )
+        one = timed(
+            lambda: TaskManager(shared).list_tasks(tags=["team-3"], status="todo")
+        )
+        named = timed(
+            lambda: TaskManager(split, namespace="team-3").list_tasks(status="todo")
+        )
+        print(
+            f"{'list one team (todo)':<22} one list {one * 1000:8.1f} ms   "
+            f"named list {named * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
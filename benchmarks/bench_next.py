@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Compare picking the next tasks from the priority heap with sorting all tasks.
+
+The sort baseline loads every task and sorts the ones not done by priority
+and due date. next_tasks() pops k entries off the persisted heap and decodes
+only those k tasks. Both are timed in a warm TaskManager and after a change,
+which the heap absorbs incrementally.
+
+Usage:
+    python benchmarks/bench_next.py [num_tasks] [k]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def sort_next(tm: TaskManager, k: int) -> list:
+    tasks = [t for t in tm.list_tasks() if t["status"] != "done"]
+    tasks.sort(key=lambda t: (-t.get("priority", 0), t.get("due") or "~", t["id"]))
+    return tasks[:k]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        tasks = make_tasks(n)
+        for t in tasks:
+            if t["id"] % 4:
+                t["priority"] = t["id"] % 5
+            if t["id"] % 3 == 1:
+                t["due"] = f"2026-{1 + t['id'] % 12:02d}-{1 + t['id'] % 28:02d}"
+        tm = TaskManager(path, snapshot_cache=True)
+        tm._save_tasks(tasks)
+        del tasks
+
+        build = timed(lambda: tm.next_tasks(k))
+        assert [t["id"] for t in tm.next_tasks(k)] == [
+            t["id"] for t in sort_next(tm, k)
+        ]
+        print(f"{n} tasks, top {k}; heap built and persisted in {build * 1000:.1f} ms")
+
+        heap = min(timed(lambda: tm.next_tasks(k)) for _ in range(5))
+        full = min(timed(lambda: sort_next(tm, k)) for _ in range(5))
+        print(f"{'warm':<14} sort {full * 1000:9.2f} ms   heap {heap * 1000:7.2f} ms")
+
+        first = tm.next_tasks(1)[0]["id"]
+        tm.mark_done(first)
+        heap = timed(lambda: tm.next_tasks(k))
+        full = timed(lambda: sort_next(tm, k))
+        print(
+            f"{'after change':<14} sort {full * 1000:9.2f} ms   "
+            f"heap {heap * 1000:7.2f} ms"
+        )
+
+        fresh = timed(lambda: TaskManager(path, snapshot_cache=True).next_tasks(k))
+        print(f"{'new process':<14} heap loaded from disk {fresh * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Compare point changes with and without the task offsets sidecar.
+
+Without "tasks.json.offsets" a change parses every task (descriptions
+included) and writes the whole store; with it only the changed task is
+decoded and spliced into a copy of the file. Each change uses a fresh
+TaskManager, as a CLI call would.
+
+The changes are timed twice: on a bare store, then after every index (text,
+time, next, tag, deps and a saved view) has been built. A change appends to
+each index's journal rather than reading and rewriting the index, so the
+in-place timings should barely move.
+
+Usage:
+    python benchmarks/bench_offsets.py [num_tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def build_indexes(path: str) -> None:
+    tm = TaskManager(path)
+    tm.search("release")
+    tm.list_tasks(created_after="2026-06-01")
+    tm.next_tasks(5)
+    tm.list_tasks(tags=["backend"])
+    tm.list_tasks(ready=True)
+    tm.save_view("release7", "status != done and description ~ 'release 7'")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        tasks = make_tasks(n)
+        for t in tasks:
+            t["description"] *= 8  # longer descriptions, as in real stores
+        TaskManager(path)._save_tasks(tasks)
+        del tasks
+
+        mid = n // 2
+        print(f"{n} tasks, {os.path.getsize(path) / 1024 / 1024:.0f} MiB")
+        for indexes in (False, True):
+            if indexes:
+                build_indexes(path)
+                print("with every index built:")
+            for label, op in (
+                ("mark_done", lambda tm, i: tm.mark_done(i)),
+                ("mark_in_progress", lambda tm, i: tm.mark_in_progress(i)),
+                ("update_task", lambda tm, i: tm.update_task(i, "Renamed task")),
+                ("delete_task", lambda tm, i: tm.delete_task(i)),
+            ):
+                spliced = timed(lambda: op(TaskManager(path), mid + 1))
+                os.remove(path + ".offsets")
+                full = timed(
+                    lambda: op(TaskManager(path), mid)
+                )  # full save also rewrites the offsets
+                mid += 2
+                print(
+                    f"{label:<18} full {full * 1000:9.1f} ms   "
+                    f"in place {spliced * 1000:7.1f} ms"
+                )
+            if indexes:
+                tm = TaskManager(path)
+                assert tm.search("renamed") == tm.list_tasks(
+                    where="description ~ renamed"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compare a single-task lookup and mark_done on the JSON store and the record store.
+
+Each operation runs in a child process, the way a short-lived CLI call
+would, and reports its wall time and peak RSS.
+
+Usage:
+    python benchmarks/bench_records.py [num_tasks]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+from task_records import RecordStore  # noqa: E402
+
+# Peak RSS is read from /proc (Linux): ru_maxrss would include the forking parent.
+CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+from task_manager import TaskManager
+from task_records import RecordStore
+start = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - start
+hwm = next(
+    line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")
+)
+print(elapsed, hwm)
+"""
+
+CASES = [
+    (
+        "json   get",
+        "next(t for t in TaskManager({json!r})._get_tasks() if t['id'] == {id})",
+    ),
+    ("json   mark_done", "TaskManager({json!r}).mark_done({id})"),
+    ("record get", "RecordStore({rec!r}).get_task({id})"),
+    ("record mark_done", "RecordStore({rec!r}).mark_done({id})"),
+]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tasks = make_tasks(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "tasks.json")
+        rec_path = os.path.join(tmp, "tasks.rec")
+        TaskManager(json_path)._save_tasks(tasks)
+        RecordStore.create(rec_path, tasks).close()
+        baseline = subprocess.run(
+            [sys.executable, "-c", CHILD.format(root=str(ROOT), stmt="pass")],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+
+        print(f"{n} tasks, baseline interpreter RSS {int(baseline[1]) / 1024:.0f} MiB")
+        for name, stmt in CASES:
+            stmt = stmt.format(json=json_path, rec=rec_path, id=n // 2)
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD.format(root=str(ROOT), stmt=stmt)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            print(
+                f"{name:<18} {float(out[0]) * 1000:>9.2f} ms  "
+                f"peak RSS {int(out[1]) / 1024:>6.0f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare checking recurring templates through the scheduler heap with a scan.
+
+The scan baseline reads every template and compares its next occurrence
+with now, as a tick without a scheduler would. tick() looks at the top of
+the heap kept between ticks, so an idle tick costs the same however many
+templates there are. A tick with due templates adds all of their tasks in
+one save.
+
+Usage:
+    python benchmarks/bench_recurring.py [num_templates] [num_tasks]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+START = datetime(2026, 10, 1)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def scan_due(tm: TaskManager, now: datetime) -> list:
+    now_iso = now.isoformat(timespec="seconds")
+    return [t["id"] for t in tm.list_templates() if t["next"] <= now_iso]
+
+
+def main() -> None:
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        tm = TaskManager(path)
+        tm._save_tasks(make_tasks(n))
+
+        # Templates due every 1-30 days at staggered minutes, written directly
+        # (adding them one by one would save the file m times).
+        templates = []
+        for i in range(1, m + 1):
+            start = START + timedelta(minutes=i)
+            templates.append(
+                {
+                    "id": i,
+                    "description": f"Recurring {i}",
+                    "every": f"{1 + i % 30}d",
+                    "start": start.isoformat(timespec="seconds"),
+                    "next": start.isoformat(timespec="seconds"),
+                }
+            )
+        with open(tm.recurring_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "nextId": m + 1, "templates": templates}, f)
+        del templates
+
+        idle = START - timedelta(days=1)
+        load = timed(lambda: tm.tick(idle))
+        print(
+            f"{m} templates, {n} tasks; "
+            f"templates loaded and heap built in {load * 1000:.1f} ms"
+        )
+
+        heap = min(timed(lambda: tm.tick(idle)) for _ in range(5))
+        scan = min(timed(lambda: scan_due(tm, idle)) for _ in range(5))
+        print(
+            f"{'idle tick':<16} scan {scan * 1000:9.3f} ms   heap {heap * 1000:9.3f} ms"
+        )
+
+        due_at = START + timedelta(minutes=100)
+        seq = tm.summary()["seq"]
+        added = []
+        elapsed = timed(lambda: added.extend(tm.tick(due_at)))
+        assert len(added) == 100 and tm.summary()["seq"] == seq + 1
+        print(
+            f"{'due tick':<16} {len(added)} tasks added in one save "
+            f"in {elapsed * 1000:.1f} ms"
+        )
+        assert tm.tick(due_at) == []
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare a status/day/cycle-time report over list_tasks() dicts and columns.
+
+Usage:
+    python benchmarks/bench_report.py [num_tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def dict_report(tm: TaskManager) -> None:
+    """The same report computed over the list of task dictionaries."""
+    tasks = tm.list_tasks()
+    Counter(t["status"] for t in tasks)
+    Counter(t["createdAt"][:10] for t in tasks)
+    Counter(t["updatedAt"][:10] for t in tasks if t["status"] == "done")
+    durations = sorted(
+        (
+            datetime.fromisoformat(t["updatedAt"])
+            - datetime.fromisoformat(t["createdAt"])
+        ).total_seconds()
+        for t in tasks
+        if t["status"] == "done"
+    )
+    sum(durations) / max(1, len(durations))
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        TaskManager(path, snapshot_cache=True)._save_tasks(make_tasks(n))
+
+        dicts = timed(lambda: dict_report(TaskManager(path, snapshot_cache=True)))
+        cold = timed(lambda: TaskManager(path, snapshot_cache=True).report(days=30))
+        warm = timed(lambda: TaskManager(path, snapshot_cache=True).report(days=30))
+
+        print(f"{n} tasks")
+        print(f"dicts from list_tasks()      {dicts:.3f}s")
+        print(f"columns, first run (build)   {cold:.3f}s")
+        print(
+            f"columns, persisted           {warm:.3f}s  "
+            f"({os.path.getsize(path + '.columns') / 1024:.0f} KiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
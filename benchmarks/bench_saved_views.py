@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Compare showing a saved view with running its where query each time.
+
+The query baseline is list_tasks(where=...), which plans the query, loads
+the store and filters it. show_view() reads the materialized ids and
+decodes only those tasks. Both are timed in a new process (the CLI case),
+warm, and after a change, which the view absorbs by testing only the
+changed task.
+
+Usage:
+    python benchmarks/bench_saved_views.py [num_tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+# About 0.1% of the tasks: done, release 7, updated in March.
+QUERY = (
+    "status = done and description ~ 'release 7' "
+    "and updatedAt >= 2026-03-01 and updatedAt < 2026-04-01"
+)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        tm = TaskManager(path)
+        tm._save_tasks(make_tasks(n))
+
+        save = timed(lambda: tm.save_view("release7", QUERY))
+        view = tm.show_view("release7")
+        assert view == tm.list_tasks(where=QUERY)
+        print(
+            f"{n} tasks, {len(view)} in the view; "
+            f"saved and materialized in {save * 1000:.1f} ms"
+        )
+
+        query = timed(lambda: TaskManager(path).list_tasks(where=QUERY))
+        shown = timed(lambda: TaskManager(path).show_view("release7"))
+        print(
+            f"{'new process':<14} query {query * 1000:9.2f} ms   "
+            f"view {shown * 1000:7.2f} ms"
+        )
+
+        query = min(timed(lambda: tm.list_tasks(where=QUERY)) for _ in range(5))
+        shown = min(timed(lambda: tm.show_view("release7")) for _ in range(5))
+        print(
+            f"{'warm':<14} query {query * 1000:9.2f} ms   view {shown * 1000:7.2f} ms"
+        )
+
+        target = view[0]["id"]
+        tm.update_task(target, "Renamed task")
+        shown = timed(lambda: tm.show_view("release7"))
+        query = timed(lambda: tm.list_tasks(where=QUERY))
+        assert target not in {t["id"] for t in tm.show_view("release7")}
+        assert tm.show_view("release7") == tm.list_tasks(where=QUERY)
+        print(
+            f"{'after change':<14} query {query * 1000:9.2f} ms   "
+            f"view {shown * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
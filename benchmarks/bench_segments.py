@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare point operations and memory use of the JSON store and the segment store.
+
+Each case runs in a child process and reports wall time and peak RSS; the
+segment store runs a stream of random point operations under a small cache
+budget and reports its cache statistics.
+
+Usage:
+    python benchmarks/bench_segments.py [num_tasks] [num_ops]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+from task_segments import SegmentStore  # noqa: E402
+
+CHILD = """
+import random, sys, time
+sys.path.insert(0, {root!r})
+from task_manager import TaskManager
+from task_segments import SegmentStore
+random.seed(1)
+start = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - start
+hwm = next(
+    line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")
+)
+print(elapsed, hwm)
+"""
+
+CASES = [
+    ("json    1 mark_done", "TaskManager({json!r}).mark_done({id})"),
+    (
+        "segment 1 mark_done",
+        "SegmentStore({seg!r}, cache_bytes=4 << 20).mark_done({id})",
+    ),
+    (
+        "segment {ops} point ops",
+        "s = SegmentStore({seg!r}, cache_bytes=4 << 20)\n"
+        "for i in range({ops}):\n"
+        "    t = random.randint(1, {n})\n"
+        "    s.get_task(t) if i % 4 else s.mark_in_progress(t)\n"
+        "print(s.cache_stats(), file=sys.stderr)",
+    ),
+]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    tasks = make_tasks(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "tasks.json")
+        seg_path = os.path.join(tmp, "tasks.seg")
+        TaskManager(json_path)._save_tasks(tasks)
+        SegmentStore.create(seg_path, tasks).close()
+        del tasks
+
+        print(f"{n} tasks")
+        for name, stmt in CASES:
+            stmt = stmt.format(json=json_path, seg=seg_path, id=n // 2, n=n, ops=ops)
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD.format(root=str(ROOT), stmt=stmt)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            elapsed, hwm = out.stdout.split()
+            print(
+                f"{name.format(ops=ops):<24} {float(elapsed) * 1000:>9.2f} ms  "
+                f"peak RSS {int(hwm) / 1024:>6.0f} MiB"
+            )
+            if out.stderr:
+                print(f"    {out.stderr.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Compare sequential and pipelined writes to the HTTP server, and conditional GETs.
+
+Usage:
+    python benchmarks/bench_server.py [num_tasks] [num_requests]
+"""
+
+import http.client
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+from task_server import TaskServer  # noqa: E402
+
+
+def sequential(address: tuple, n: int) -> None:
+    """Add n tasks one request at a time on a keep-alive connection."""
+    conn = http.client.HTTPConnection(*address)
+    for i in range(n):
+        conn.request(
+            "POST", "/tasks", body=json.dumps({"description": f"Sequential {i}"})
+        )
+        conn.getresponse().read()
+    conn.close()
+
+
+def pipelined(address: tuple, n: int) -> None:
+    """Send n add requests before reading any response."""
+    bodies = [json.dumps({"description": f"Pipelined {i}"}).encode() for i in range(n)]
+    data = b"".join(
+        b"POST /tasks HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n%s"
+        % (len(b), b)
+        for b in bodies
+    )
+    with socket.create_connection(address) as sock:
+        sock.sendall(data)
+        responses = sock.makefile("rb")
+        for _ in range(n):
+            responses.readline()
+            length = 0
+            for line in iter(responses.readline, b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            responses.read(length)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        TaskManager(path)._save_tasks(make_tasks(n))
+        server = TaskServer(("127.0.0.1", 0), TaskManager(path, snapshot_cache=True))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        address = server.server_address[:2]
+
+        seq = timed(lambda: sequential(address, requests))
+        saves = server.metrics["saves"]
+        pipe = timed(lambda: pipelined(address, requests))
+
+        conn = http.client.HTTPConnection(*address)
+        conn.request("GET", "/tasks")
+        response = conn.getresponse()
+        etag = response.getheader("ETag")
+        response.read()
+        full = timed(lambda: (conn.request("GET", "/tasks"), conn.getresponse().read()))
+        cached = timed(
+            lambda: (
+                conn.request("GET", "/tasks", headers={"If-None-Match": etag}),
+                conn.getresponse().read(),
+            )
+        )
+
+        print(f"{n} tasks, {requests} adds")
+        print(f"sequential   {seq:.3f}s  ({requests / seq:.0f} req/s, {saves} saves)")
+        print(
+            f"pipelined    {pipe:.3f}s  ({requests / pipe:.0f} req/s, "
+            f"{server.metrics['saves'] - saves} saves)"
+        )
+        print(
+            f"GET /tasks   {full * 1000:.1f} ms, "
+            f"with matching If-None-Match {cached * 1000:.1f} ms"
+        )
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Compare cold loads of tasks.json with and without the snapshot cache.
+
+Each load runs in a fresh TaskManager, as a short-lived CLI process would.
+
+Usage:
+    python benchmarks/bench_snapshot.py [num_tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def best_of(runs: int, fn) -> float:
+    """Return the fastest of several timed calls to fn."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        TaskManager(path, snapshot_cache=True)._save_tasks(make_tasks(n))
+
+        json_s = best_of(3, lambda: TaskManager(path)._get_tasks())
+        cache_s = best_of(
+            3, lambda: TaskManager(path, snapshot_cache=True)._get_tasks()
+        )
+
+        print(f"{n} tasks")
+        print(
+            f"tasks.json        {os.path.getsize(path) / 1024:>10.0f} KiB  "
+            f"load {json_s:.3f}s"
+        )
+        print(
+            f"tasks.json.cache  {os.path.getsize(path + '.cache') / 1024:>10.0f} KiB  "
+            f"load {cache_s:.3f}s"
+        )
+        print(f"speedup {json_s / cache_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Compare store size and load/save time for plain and compressed formats.
+
+Usage:
+    python benchmarks/bench_storage.py [num_tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from task_manager import TaskManager  # noqa: E402
+
+STATUSES = ["todo", "in-progress", "done"]
+
+FORMATS = [
+    ("tasks.json", None),
+    ("tasks.json.gz", 1),
+    ("tasks.json.gz", 6),
+    ("tasks.json.gz", 9),
+    ("tasks.json.xz", 0),
+    ("tasks.json.xz", 6),
+]
+
+
+def make_tasks(n: int) -> list:
+    """Build n synthetic tasks shaped like the ones TaskManager writes."""
+    return [
+        {
+            "id": i,
+            "description": f"Task number {i} for release {i % 97}",
+            "status": STATUSES[i % 3],
+            "createdAt": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T10:{i % 60:02d}:00",
+            "updatedAt": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T11:{i % 60:02d}:00",
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tasks = make_tasks(n)
+    print(f"{n} tasks")
+    print(f"{'format':<16}{'level':>6}{'size KiB':>12}{'save s':>10}{'load s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, level in FORMATS:
+            path = os.path.join(tmp, name)
+            tm = TaskManager(path, compression_level=level)
+
+            start = time.perf_counter()
+            tm._save_tasks(tasks)
+            save_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            tm._get_tasks()
+            load_s = time.perf_counter() - start
+
+            size_kib = os.path.getsize(path) / 1024
+            shown = "-" if level is None else str(level)
+            print(
+                f"{name:<16}{shown:>6}{size_kib:>12.0f}{save_s:>10.3f}{load_s:>10.3f}"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
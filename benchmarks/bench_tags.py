@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Compare tag filters answered by per-tag id sets with scanning all tags.
+
+Tasks carry a team, a service and a severity tag. The scan baseline checks
+each task's tag list; TagIndex.lookup intersects (or joins) the id set of
+each tag. list_tasks(tags=...) is timed as well, which adds picking the
+matching tasks out of the loaded list.
+
+Usage:
+    python benchmarks/bench_tags.py [num_tasks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_index import TagIndex  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def best(fn, runs: int = 5) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        tasks = make_tasks(n)
+        for t in tasks:
+            i = t["id"]
+            t["tags"] = sorted({f"team-{i % 7}", f"svc-{i % 13}", f"sev{i % 4}"})
+        tm = TaskManager(path)
+        tm._save_tasks(tasks)
+        tasks = tm.list_tasks()
+        index = tm._get_index(TagIndex.name)
+
+        queries = (
+            ("all of 2 tags", ["team-3", "sev1"], []),
+            ("all of 3 tags", ["team-3", "svc-5", "sev1"], []),
+            ("any of 3 tags", [], ["svc-1", "svc-2", "svc-3"]),
+        )
+        print(f"{n} tasks")
+        for label, all_tags, any_tags in queries:
+
+            def scan():
+                return [
+                    t
+                    for t in tasks
+                    if all(tag in t["tags"] for tag in all_tags)
+                    and (not any_tags or any(tag in t["tags"] for tag in any_tags))
+                ]
+
+            matches = len(scan())
+            assert index.lookup(all_tags, any_tags) == [t["id"] for t in scan()]
+            scanned = best(scan)
+            looked_up = best(lambda: index.lookup(all_tags, any_tags))
+            listed = best(lambda: tm.list_tasks(tags=all_tags, any_tags=any_tags))
+            print(
+                f"{label:<15}{matches:>7} matches   scan {scanned * 1000:7.2f} ms   "
+                f"id sets {looked_up * 1000:6.2f} ms   "
+                f"list_tasks {listed * 1000:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compare ISO-string and epoch-millisecond timestamps.
+
+Measures the store size, time sorts and scans, and the migration.
+
+Usage:
+    python benchmarks/bench_timestamps.py [num_tasks]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import STATUSES  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def make_tasks(n: int) -> list:
+    """Build n tasks with distinct timestamps, 37 seconds apart, like a real history."""
+    base = datetime(2026, 1, 1).timestamp()
+    return [
+        {
+            "id": i,
+            "description": f"Task number {i} for release {i % 97}",
+            "status": STATUSES[i % 3],
+            "createdAt": datetime.fromtimestamp(base + i * 37).isoformat(
+                timespec="seconds"
+            ),
+            "updatedAt": datetime.fromtimestamp(
+                base + i * 37 + (i % 5000) * 60
+            ).isoformat(timespec="seconds"),
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+# Runs the migration in a fresh process and reports its time and peak RSS (Linux).
+MIGRATE = """
+import sys, time
+sys.path.insert(0, {root!r})
+from task_manager import TaskManager
+start = time.perf_counter()
+TaskManager({path!r}).migrate_timestamps(epoch_ms=True)
+elapsed = time.perf_counter() - start
+hwm = next(
+    line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")
+)
+print(elapsed, hwm)
+"""
+
+
+def best_of(runs: int, fn) -> float:
+    """Return the fastest of several timed calls to fn."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(tm: TaskManager) -> dict:
+    """Time a full sort by createdAt, a scan of updatedAt and a time index rebuild."""
+    tasks = tm.list_tasks()
+    cutoff = tm._to_timestamp("2026-06-15")
+    index = tm._get_index("time", tasks)
+    return {
+        "size": os.path.getsize(tm.path),
+        "sort": best_of(
+            3, lambda: sorted(tasks, key=lambda t: (t["createdAt"], t["id"]))
+        ),
+        "scan": best_of(3, lambda: [t for t in tasks if t["updatedAt"] < cutoff]),
+        "index": best_of(3, lambda: index.rebuild(tasks)),
+    }
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        tm = TaskManager(path)
+        tm._save_tasks(make_tasks(n))
+        iso = measure(tm)
+
+        root = str(Path(__file__).resolve().parent.parent)
+        out = subprocess.run(
+            [sys.executable, "-c", MIGRATE.format(root=root, path=path)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        epoch = measure(TaskManager(path))
+
+        print(
+            f"{n} tasks; migration to epoch ms: {float(out[0]):.1f}s, "
+            f"peak RSS {int(out[1]) / 1024:.0f} MiB"
+        )
+        print(
+            f"{'':<8}{'Size (KiB)':>12}{'Sort (s)':>10}{'Scan (s)':>10}"
+            f"{'Time index (s)':>16}"
+        )
+        for name, m in (("ISO", iso), ("epoch", epoch)):
+            print(
+                f"{name:<8}{m['size'] / 1024:>12.0f}{m['sort']:>10.3f}"
+                f"{m['scan']:>10.3f}{m['index']:>16.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
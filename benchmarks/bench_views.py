@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Compare reading tasks through snapshot() with list_tasks() and defensive copies.
+
+A long-lived TaskManager (as in the HTTP server) reads the tasks after every
+change; after a save, the next snapshot copies only the task that changed.
+
+Usage:
+    python benchmarks/bench_views.py [num_tasks] [num_changes]
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        TaskManager(path)._save_tasks(make_tasks(n))
+        tm = TaskManager(path, snapshot_cache=True)
+        tm.list_tasks()
+
+        print(f"{n} tasks")
+        print(f"list_tasks()            {timed(tm.list_tasks) * 1000:9.2f} ms")
+        tasks = tm.list_tasks()
+        print(
+            "deepcopy(list_tasks())  "
+            f"{timed(lambda: copy.deepcopy(tasks)) * 1000:9.2f} ms"
+        )
+        print(f"snapshot() first        {timed(tm.snapshot) * 1000:9.2f} ms")
+        print(f"snapshot() unchanged    {timed(tm.snapshot) * 1000:9.4f} ms")
+
+        # The part of a save that keeps the snapshot current (the save itself is
+        # excluded).
+        snap = tm.snapshot()
+
+        def next_snapshots() -> None:
+            for i in range(changes):
+                old = dict(snap[i])
+                snap.with_changes(
+                    [old], [dict(old, status="done")], snap.generation + 1, None
+                )
+
+        print(
+            "next snapshot           "
+            f"{timed(next_snapshots) / changes * 1000:9.2f} ms per change"
+        )
+
+
+if __name__ == "__main__":
+    main()
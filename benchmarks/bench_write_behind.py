@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Compare add_task throughput with synchronous saves and in write-behind mode.
+
+Usage:
+    python benchmarks/bench_write_behind.py [num_tasks] [num_adds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_storage import make_tasks  # noqa: E402
+from task_manager import TaskManager  # noqa: E402
+
+
+def adds_per_second(tm: TaskManager, adds: int) -> float:
+    """Add tasks as fast as possible, including the final save."""
+    start = time.perf_counter()
+    for i in range(adds):
+        tm.add_task(f"Produced task {i}")
+    tm.flush()
+    return adds / (time.perf_counter() - start)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    adds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        TaskManager(path)._save_tasks(make_tasks(n))
+
+        print(f"{n} tasks")
+        sync_rate = adds_per_second(TaskManager(path), adds)
+        print(f"synchronous              {sync_rate:10.1f} adds/s")
+        for interval in (0.5, 2.0):
+            tm = TaskManager(
+                path, write_behind=True, flush_interval=interval, flush_ops=100_000
+            )
+            rate = adds_per_second(tm, adds * 500)
+            tm.close()
+            print(f"write-behind, {interval:.1f}s flush  {rate:10.1f} adds/s")
+
+
+if __name__ == "__main__":
+    main()
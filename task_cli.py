@@ -1,8 +1,67 @@
 #! /usr/bin/env python3
 import argparse
-from task_manager import TaskManager
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
+from task_manager import TaskManager, parse_duration
+from task_output import OUTPUT_FORMATS, parse_fields, silence_broken_pipe, write_tasks
+from task_records import RecordStore
+from task_segments import SegmentStore
+
+tm = TaskManager(snapshot_cache=True)
+
+# Storage engines besides the JSON store (see --engine): their default path and class.
+ENGINES = {
+    "segments": ("tasks.seg", SegmentStore),
+    "records": ("tasks.rec", RecordStore),
+}
+
+# Commands the other engines support, with the options they don't.
+ENGINE_COMMANDS = {
+    "add": ("priority", "due", "tags"),
+    "list": (
+        "sort",
+        "reverse",
+        "limit",
+        "offset",
+        "cursor",
+        "created_after",
+        "created_before",
+        "updated_after",
+        "updated_before",
+        "where",
+        "explain",
+        "tags",
+        "any_tags",
+        "ready",
+    ),
+    "update": ("priority", "due"),
+    "delete": (),
+    "mark-in-progress": (),
+    "mark-done": (),
+    "count": (),
+    "convert": (),
+}
+
+# Fields shown by "next" in text format.
+NEXT_TEXT_FIELDS = ["id", "description", "status", "priority", "due"]
+
+
+def parse_time_arg(value: str) -> Union[str, timedelta]:
+    """Parse a time argument given on the command line.
+
+    Args:
+        value: Either a relative age such as "30m", "12h", "7d" or "2w", or an
+              ISO format date/timestamp such as "2026-10-01".
+
+    Returns:
+        A timedelta for relative ages, otherwise the value unchanged (it is
+        validated by TaskManager).
+    """
+    age = parse_duration(value)
+    return value if age is None else age
 
-tm = TaskManager()
 
 def command_add(args: argparse.Namespace) -> None:
     """Add a new task.
@@ -10,14 +69,22 @@ def command_add(args: argparse.Namespace) -> None:
     Args:
         args: Argument namespace containing:
             - description: The task description to add.
+            - priority: Optional priority (higher is more important).
+            - due: Optional due date (YYYY-MM-DD).
+            - tags: Optional list of tags.
             
     Prints:
         A confirmation message with the task id, description, and status.
-        
-    Raises:
-        ValueError: If task description is empty or file save fails.
+        If an error occurs, prints an error message.
     """
-    t = tm.add_task(args.description)
+    options = {name: getattr(args, name, None) for name in ("priority", "due", "tags")}
+    try:
+        t = tm.add_task(
+            args.description, **{k: v for k, v in options.items() if v is not None}
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
     print(f"Task added: {t['id']} - {t['description']} - {t['status']}")
 
 
@@ -27,44 +94,211 @@ def command_list(args: argparse.Namespace) -> None:
     Args:
         args: Argument namespace containing:
             - status: Optional status filter ("todo", "in-progress", or "done").
+            - format: Optional output format ("text", "json", "ndjson", "csv",
+                     or "tsv"). Defaults to "text".
+            - fields: Optional comma-separated list of fields to output.
+            - no_header: Optional flag to omit the text banner or CSV/TSV header.
+            - sort: Optional sort field ("id", "createdAt", "updatedAt", "description").
+            - reverse: Optional flag to sort in descending order.
+            - limit: Optional maximum number of tasks to show.
+            - offset: Optional number of tasks to skip.
+            - cursor: Optional cursor from a previous page.
+            - created_after, created_before, updated_after, updated_before:
+                    Optional time bounds (timestamps or timedeltas).
+            - where: Optional query, e.g. "status = todo and description ~ 'deploy'".
+            - explain: Optional flag to print the query plan instead of the tasks.
+            - tags: Optional list of tags that tasks must all have.
+            - any_tags: Optional list of tags that tasks must have one of.
+            - ready: Optional flag to list only tasks whose blockers are all done.
             
     Prints:
-        A formatted list of tasks with their id, description, and status.
-        If no tasks are found, prints an appropriate message.
+        The matching tasks in the selected format, written in large chunks.
+        In text format, if no tasks are found, prints an appropriate message,
+        and if the page is full, prints the cursor for the next page.
         
     Raises:
         ValueError: If status is provided but is not a valid status value.
     """
     status = args.status # optional status filter
+    where = getattr(args, "where", None)
+    if getattr(args, "explain", False):
+        explain_where(where)
+        return
+
+    fmt = getattr(args, "format", "text")
+    header = not getattr(args, "no_header", False)
+    sort_by = getattr(args, "sort", None)
+    limit = getattr(args, "limit", None)
 
     try:
-        tasks = tm.list_tasks(status=status)
+        fields = parse_fields(getattr(args, "fields", None))
+        options = dict(
+            sort_by=sort_by,
+            reverse=getattr(args, "reverse", False),
+            limit=limit,
+            offset=getattr(args, "offset", 0) or None,
+            cursor=getattr(args, "cursor", None),
+            created_after=getattr(args, "created_after", None),
+            created_before=getattr(args, "created_before", None),
+            updated_after=getattr(args, "updated_after", None),
+            updated_before=getattr(args, "updated_before", None),
+            where=where,
+            tags=getattr(args, "tags", None),
+            any_tags=getattr(args, "any_tags", None),
+            ready=getattr(args, "ready", False),
+        )
+        # Options left at their defaults aren't passed (the other engines only
+        # take status).
+        tasks = tm.list_tasks(
+            status=status,
+            **{k: v for k, v in options.items() if v is not None and v is not False},
+        )
     except ValueError as e:
         print(f"Error: {e}")
         return
 
-    if not tasks:
+    if not tasks and fmt == "text":
         if status:
             print(f"No tasks found with status: {status}.")
         else:
             print("No tasks found.")
         return
 
-    print(f"\nListing {len(tasks)} tasks:")
-    print("-" * 40)
-    for t in tasks:
-        print(f"{t['id']} - {t['description']} - {t['status']}")
+    try:
+        write_tasks(tasks, sys.stdout, fmt, fields, header=header)
+        if fmt == "text" and header and limit and len(tasks) == limit:
+            print(f"Next page: --cursor {tm.make_cursor(tasks[-1], sort_by)}")
+    except ValueError as e:
+        print(f"Error: {e}")
+    except BrokenPipeError:
+        silence_broken_pipe()
+
+
+def explain_where(where: str) -> None:
+    """Print the plan chosen for a --where query.
+
+    Args:
+        where: The query text (None if --where was not given).
+
+    Prints:
+        The parsed query, the chosen access path with its estimated cost, and
+        every access path that was considered.
+        If an error occurs, prints an error message.
+    """
+    if not where:
+        print("Error: --explain requires --where.")
+        return
+    try:
+        plan = tm.explain_query(where)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    access = (
+        plan["access"]
+        if plan["condition"] is None
+        else f"{plan['access']} on {plan['condition']}"
+    )
+    print(f"Query: {plan['query']}")
+    print(f"Plan: {access}")
+    print(
+        f"Estimated cost: {plan['candidates']} candidates "
+        f"(full scan: {plan['total']} tasks)"
+    )
+    print("Considered:")
+    for name, condition, estimate in plan["alternatives"]:
+        label = name if condition is None else f"{name} on {condition}"
+        print(f"  {label}: {estimate}")
+
+
+def command_search(args: argparse.Namespace) -> None:
+    """Search task descriptions.
+
+    Args:
+        args: Argument namespace containing:
+            - query: Search terms; "OR" separates alternatives and a trailing
+                    "*" matches a prefix.
+            - status: Optional status filter.
+            - format: Optional output format. Defaults to "text".
+            - fields: Optional comma-separated list of fields to output.
+            - no_header: Optional flag to omit the text banner or CSV/TSV header.
+
+    Prints:
+        The matching tasks in the selected format.
+        If no tasks match or an error occurs, prints an appropriate message.
+    """
+    fmt = getattr(args, "format", "text")
+
+    try:
+        fields = parse_fields(getattr(args, "fields", None))
+        tasks = tm.search(args.query, status=getattr(args, "status", None))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    if not tasks and fmt == "text":
+        print(f"No tasks matched: {args.query}")
+        return
+
+    try:
+        write_tasks(
+            tasks, sys.stdout, fmt, fields, header=not getattr(args, "no_header", False)
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+    except BrokenPipeError:
+        silence_broken_pipe()
+
+
+def command_next(args: argparse.Namespace) -> None:
+    """Show the most important tasks that are not done.
+
+    Args:
+        args: Argument namespace containing:
+            - count: Optional number of tasks to show. Defaults to 1.
+            - format: Optional output format. Defaults to "text".
+            - fields: Optional comma-separated list of fields to output.
+            - no_header: Optional flag to omit the text banner or CSV/TSV header.
+
+    Prints:
+        The tasks by priority, then due date, in the selected format. Text
+        output shows id, description, status, priority and due date.
+        If there are none or an error occurs, prints an appropriate message.
+    """
+    fmt = getattr(args, "format", "text")
+
+    try:
+        fields = parse_fields(getattr(args, "fields", None))
+        tasks = tm.next_tasks(getattr(args, "count", 1))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    if not tasks and fmt == "text":
+        print("No tasks to do.")
+        return
+    if fields is None and fmt == "text":
+        fields = NEXT_TEXT_FIELDS
 
-    print("\n")
+    try:
+        write_tasks(
+            tasks, sys.stdout, fmt, fields, header=not getattr(args, "no_header", False)
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+    except BrokenPipeError:
+        silence_broken_pipe()
 
 
 def command_update(args: argparse.Namespace) -> None:
-    """Update an existing task's description.
+    """Update an existing task's description, priority or due date.
     
     Args:
         args: Argument namespace containing:
             - id: The task id to update (must be a valid integer).
-            - description: The new task description.
+            - description: The new task description, or None to keep it.
+            - priority: Optional new priority (0 clears it).
+            - due: Optional new due date (YYYY-MM-DD; "" clears it).
             
     Prints:
         A confirmation message with the updated task id, description, and status.
@@ -77,13 +311,348 @@ def command_update(args: argparse.Namespace) -> None:
         return
     
     try:
-        t = tm.update_task(task_id, args.description)
+        options = {name: getattr(args, name, None) for name in ("priority", "due")}
+        t = tm.update_task(
+            task_id,
+            getattr(args, "description", None),
+            **{k: v for k, v in options.items() if v is not None},
+        )
         print(f"Task updated: {t['id']} - {t['description']} - {t['status']}")
     except ValueError as e:
         print(f"Error: {e}")
         return
 
 
+def command_tag(args: argparse.Namespace) -> None:
+    """Add tags to a task, or remove them.
+
+    Args:
+        args: Argument namespace containing:
+            - id: The task id (must be a valid integer).
+            - tags: The tags to add or remove.
+            - remove: Optional flag to remove the tags instead (untag).
+
+    Prints:
+        The task id, description and its tags after the change.
+        If an error occurs, prints an error message.
+    """
+    try:
+        task_id = int(args.id)
+    except ValueError:
+        print(f"Error: Invalid task ID: {args.id}")
+        return
+
+    change = tm.untag_task if getattr(args, "remove", False) else tm.tag_task
+    try:
+        t = change(task_id, args.tags)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(
+        f"Task tagged: {t['id']} - {t['description']} - "
+        f"tags: {', '.join(t.get('tags', [])) or '(none)'}"
+    )
+
+
+def command_block(args: argparse.Namespace) -> None:
+    """Make a task depend on other tasks, or remove such links.
+
+    Args:
+        args: Argument namespace containing:
+            - id: The task id (must be a valid integer).
+            - blockers: Ids of the tasks it depends on.
+            - remove: Optional flag to remove the links instead (unblock).
+
+    Prints:
+        The task id, description and the ids it depends on after the change.
+        If an error occurs, prints an error message.
+    """
+    try:
+        task_id = int(args.id)
+        blocker_ids = [int(b) for b in args.blockers]
+    except ValueError:
+        print(f"Error: Invalid task ID in: {' '.join([args.id, *args.blockers])}")
+        return
+
+    change = tm.unblock_task if getattr(args, "remove", False) else tm.block_task
+    try:
+        t = change(task_id, blocker_ids)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    blockers = ", ".join(map(str, t.get("dependsOn", []))) or "(nothing)"
+    print(f"Task {t['id']} - {t['description']} - depends on: {blockers}")
+
+
+def command_move(args: argparse.Namespace) -> None:
+    """Move a task to another named list.
+
+    Args:
+        args: Argument namespace containing:
+            - id: The task id in the current list (must be a valid integer).
+            - to: The name of the list to move it to.
+
+    Prints:
+        The task's old id and its id and description in the other list.
+        If an error occurs, prints an error message.
+    """
+    try:
+        task_id = int(args.id)
+    except ValueError:
+        print(f"Error: Invalid task ID: {args.id}")
+        return
+
+    try:
+        t = tm.move_task(task_id, args.to)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(
+        f"Task moved: {task_id} -> {args.to} {t['id']} - "
+        f"{t['description']} - {t['status']}"
+    )
+
+
+def command_lists(args: argparse.Namespace) -> None:
+    """Show the named task lists of the store.
+
+    Args:
+        args: Argument namespace (no options).
+
+    Prints:
+        One line per list with its name and task counts; the current list is
+        marked with "*".
+    """
+    try:
+        lists = tm.lists()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    for info in lists:
+        counts = info["statusCounts"]
+        mark = "*" if info["name"] == tm.namespace else " "
+        print(
+            f"{mark} {info['name']} - {info['count']} tasks "
+            f"(todo: {counts.get('todo', 0)}, "
+            f"in-progress: {counts.get('in-progress', 0)}, "
+            f"done: {counts.get('done', 0)})"
+        )
+
+
+def _template_line(t: dict) -> str:
+    """Format a recurring template as "id - description - rule - next occurrence"."""
+    rule = f"every {t['every']}" if "every" in t else f"cron {t['cron']}"
+    return f"{t['id']} - {t['description']} - {rule} - next {t['next']}"
+
+
+def command_recur_add(args: argparse.Namespace) -> None:
+    """Add a recurring task template.
+
+    Args:
+        args: Argument namespace containing:
+            - description: Description of the tasks to add.
+            - every: Optional interval such as "1d" or "2w".
+            - cron: Optional cron expression such as "0 9 * * 1-5".
+            - start: Optional ISO timestamp the template starts at.
+            - priority: Optional priority of the tasks.
+            - tags: Optional list of tags of the tasks.
+
+    Prints:
+        The template id, description, rule and next occurrence.
+        If an error occurs, prints an error message.
+    """
+    try:
+        t = tm.add_template(
+            args.description,
+            every=getattr(args, "every", None),
+            cron=getattr(args, "cron", None),
+            start=getattr(args, "start", None),
+            priority=getattr(args, "priority", None),
+            tags=getattr(args, "tags", None),
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Template added: {_template_line(t)}")
+
+
+def command_recur_list(args: argparse.Namespace) -> None:
+    """Show the recurring task templates.
+
+    Args:
+        args: Argument namespace (no options).
+
+    Prints:
+        One line per template with its id, description, rule and next
+        occurrence, or a message if there are none.
+    """
+    try:
+        templates = tm.list_templates()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    if not templates:
+        print("No recurring tasks.")
+    for t in templates:
+        print(_template_line(t))
+
+
+def command_recur_delete(args: argparse.Namespace) -> None:
+    """Delete a recurring task template (its tasks are kept).
+
+    Args:
+        args: Argument namespace containing:
+            - id: The template id (must be a valid integer).
+
+    Prints:
+        The deleted template's id and description.
+        If an error occurs, prints an error message.
+    """
+    try:
+        template_id = int(args.id)
+    except ValueError:
+        print(f"Error: Invalid template ID: {args.id}")
+        return
+
+    try:
+        t = tm.delete_template(template_id)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Template deleted: {t['id']} - {t['description']}")
+
+
+def command_tick(args: argparse.Namespace) -> None:
+    """Add the tasks of the recurring templates that are due.
+
+    Running it again adds nothing until a template is due again, so it can
+    be run from cron or by hand as often as wanted.
+
+    Args:
+        args: Argument namespace containing:
+            - now: Optional ISO timestamp to use as the current time.
+
+    Prints:
+        The added tasks with their occurrence, or a message if none was due.
+        If an error occurs, prints an error message.
+    """
+    now = getattr(args, "now", None)
+    try:
+        now = datetime.fromisoformat(now) if now else None
+    except ValueError:
+        print(f"Error: Invalid timestamp: {args.now}")
+        return
+
+    try:
+        generated = tm.tick(now)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    if not generated:
+        print("No recurring tasks due.")
+        return
+    print(f"Added {len(generated)} recurring tasks:")
+    for t in generated:
+        print(f"{t['id']} - {t['description']} - {t['status']} ({t['occurrence']})")
+
+
+def command_view_save(args: argparse.Namespace) -> None:
+    """Save a --where query as a named view.
+
+    Args:
+        args: Argument namespace containing:
+            - name: The view name.
+            - where: The query, e.g. "status = todo and description ~ 'deploy'".
+
+    Prints:
+        The view name, its query and the number of matching tasks.
+        If an error occurs, prints an error message.
+    """
+    try:
+        view = tm.save_view(args.name, args.where)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"View saved: {view['name']} - {view['where']} - {view['count']} tasks")
+
+
+def command_view_show(args: argparse.Namespace) -> None:
+    """Show the tasks of a saved view.
+
+    Args:
+        args: Argument namespace containing:
+            - name: The view name.
+            - format: Optional output format. Defaults to "text".
+            - fields: Optional comma-separated list of fields to output.
+            - no_header: Optional flag to omit the text banner or CSV/TSV header.
+
+    Prints:
+        The view's tasks in the selected format.
+        If there are none or an error occurs, prints an appropriate message.
+    """
+    fmt = getattr(args, "format", "text")
+
+    try:
+        fields = parse_fields(getattr(args, "fields", None))
+        tasks = tm.show_view(args.name)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    if not tasks and fmt == "text":
+        print("No tasks found.")
+        return
+
+    try:
+        write_tasks(
+            tasks, sys.stdout, fmt, fields, header=not getattr(args, "no_header", False)
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+    except BrokenPipeError:
+        silence_broken_pipe()
+
+
+def command_view_list(args: argparse.Namespace) -> None:
+    """Show the saved views.
+
+    Args:
+        args: Argument namespace (no options).
+
+    Prints:
+        One line per view with its name, query and number of tasks, or a
+        message if there are none.
+    """
+    try:
+        views = tm.list_views()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    if not views:
+        print("No saved views.")
+    for view in views:
+        print(f"{view['name']} - {view['where']} - {view['count']} tasks")
+
+
+def command_view_delete(args: argparse.Namespace) -> None:
+    """Delete a saved view.
+
+    Args:
+        args: Argument namespace containing:
+            - name: The view name.
+
+    Prints:
+        The deleted view's name.
+        If an error occurs, prints an error message.
+    """
+    try:
+        view = tm.delete_view(args.name)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"View deleted: {view['name']}")
+
+
 def command_delete(args: argparse.Namespace) -> None:
     """Delete an existing task.
     
@@ -159,24 +728,274 @@ def command_mark_done(args: argparse.Namespace) -> None:
         return
 
 
+def command_purge(args: argparse.Namespace) -> None:
+    """Delete every task matching the given filters in one pass.
+
+    Args:
+        args: Argument namespace containing:
+            - status: Optional status filter.
+            - older_than: Optional age or timestamp; only tasks created before it.
+            - updated_before: Optional age or timestamp; only tasks updated before it.
+            - contains: Optional text the description must contain.
+            - dry_run: If set, only report what would be deleted.
+
+    Prints:
+        The number of deleted (or matching, for a dry run) tasks per status.
+        If an error occurs, prints an error message.
+    """
+    try:
+        deleted = tm.delete_where(
+            status=args.status,
+            older_than=parse_time_arg(args.older_than) if args.older_than else None,
+            updated_before=parse_time_arg(args.updated_before)
+            if args.updated_before
+            else None,
+            description_contains=args.contains,
+            dry_run=args.dry_run,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    if not deleted:
+        print("No tasks matched.")
+        return
+
+    counts = Counter(t["status"] for t in deleted)
+    breakdown = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items()))
+    verb = "Would delete" if args.dry_run else "Purged"
+    print(f"{verb} {len(deleted)} tasks ({breakdown})")
+
+
+def command_count(args: argparse.Namespace) -> None:
+    """Count tasks, optionally filtered by status.
+
+    Reads only the store header, so it runs in constant time.
+
+    Args:
+        args: Argument namespace containing:
+            - status: Optional status filter ("todo", "in-progress", or "done").
+
+    Prints:
+        The number of matching tasks.
+        If an error occurs, prints an error message.
+    """
+    try:
+        print(tm.count_tasks(status=args.status))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+
+def command_summary(args: argparse.Namespace) -> None:
+    """Show a summary of the task store.
+
+    Reads only the store header, so it runs in constant time.
+
+    Args:
+        args: Argument namespace (no arguments are used).
+
+    Prints:
+        The total task count, the count per status, the next id and the
+        store sequence number.
+        If an error occurs, prints an error message.
+    """
+    try:
+        s = tm.summary()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    print(f"Total tasks: {s['count']}")
+    for status, count in s["statusCounts"].items():
+        print(f"  {status}: {count}")
+    print(f"Next id: {s['nextId']}")
+    print(f"Sequence: {s['seq']}")
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration in seconds as minutes, hours or days (e.g. "3.5h")."""
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+def command_report(args: argparse.Namespace) -> None:
+    """Show task throughput and cycle time.
+
+    Computed from the columnar view of the store (see TaskManager.columns),
+    so it stays fast for millions of tasks.
+
+    Args:
+        args: Argument namespace containing:
+            - days: Optional number of days shown in the daily table. Defaults to 14.
+
+    Prints:
+        The count per status, tasks created and done per day, and the mean,
+        median and 90th percentile time from creation to done.
+        If an error occurs, prints an error message.
+    """
+    try:
+        r = tm.report(days=getattr(args, "days", 14))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    breakdown = ", ".join(f"{status}: {n}" for status, n in r["statusCounts"].items())
+    print(f"Total tasks: {r['count']}" + (f" ({breakdown})" if breakdown else ""))
+    print(f"\n{'Day':<12}{'Created':>9}{'Done':>9}")
+    for day, created, done in r["days"]:
+        print(f"{day.isoformat():<12}{created:>9}{done:>9}")
+
+    cycle = r["cycleTime"]
+    if cycle["count"]:
+        print(
+            f"\nCycle time ({cycle['count']} done tasks): "
+            f"mean {format_seconds(cycle['mean'])}, "
+            f"median {format_seconds(cycle['median'])}, "
+            f"p90 {format_seconds(cycle['p90'])}"
+        )
+    else:
+        print("\nCycle time: no done tasks")
+
+
+def command_migrate_timestamps(args: argparse.Namespace) -> None:
+    """Convert the store's timestamps to epoch milliseconds or ISO strings.
+
+    Args:
+        args: Argument namespace containing:
+            - to: "epoch" for integer epoch milliseconds, "iso" for ISO strings.
+
+    Prints:
+        The number of tasks converted.
+        If an error occurs, prints an error message.
+    """
+    try:
+        count = tm.migrate_timestamps(epoch_ms=args.to == "epoch")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    label = "epoch milliseconds" if args.to == "epoch" else "ISO strings"
+    print(f"Converted timestamps of {count} tasks to {label}")
+
+
+def command_convert(args: argparse.Namespace) -> None:
+    """Copy the JSON store into the store of the selected engine.
+
+    Any existing store of that engine is replaced.
+
+    Args:
+        args: Argument namespace containing:
+            - engine: "segments" or "records".
+
+    Prints:
+        The number of tasks converted and the new store's path.
+        If an error occurs, prints an error message.
+    """
+    if args.engine not in ENGINES:
+        print("Error: convert needs --engine segments or --engine records")
+        return
+    path, engine = ENGINES[args.engine]
+    try:
+        store = engine.create(path, tm.list_tasks())
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    count = store.count_tasks()
+    store.close()
+    print(f"Converted {count} tasks to {path}")
+
+
+def command_serve(args: argparse.Namespace) -> None:
+    """Serve the tasks as a JSON API over HTTP until interrupted.
+
+    Args:
+        args: Argument namespace containing:
+            - host: Address to listen on. Defaults to 127.0.0.1.
+            - port: Port to listen on. Defaults to 8765.
+            - tick: Optional seconds between checks for due recurring tasks.
+
+    Prints:
+        The URL the server listens on.
+        If the address can't be used, prints an error message.
+    """
+    # Only serve needs the HTTP server modules, so they aren't imported for
+    # other commands.
+    from task_server import DEFAULT_HOST, DEFAULT_PORT, TaskServer
+
+    host = getattr(args, "host", None) or DEFAULT_HOST
+    port = getattr(args, "port", None)
+    port = DEFAULT_PORT if port is None else port
+    try:
+        server = TaskServer(
+            (host, port),
+            tm,
+            log_requests=True,
+            tick_interval=getattr(args, "tick", None),
+        )
+    except OSError as e:
+        print(f"Error: Cannot listen on {host}:{port}: {e.strerror or e}")
+        return
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Serving tasks on {server.url} (press Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 def command_parser() -> argparse.ArgumentParser:
     """Create and configure the command-line argument parser.
     
     Sets up subcommands for task management operations:
     - add: Add a new task
     - list: List tasks (optionally filtered by status)
-    - update: Update a task's description
+    - search: Search task descriptions
+    - update: Update a task's description, priority or due date
     - delete: Delete a task
     - mark-in-progress: Mark a task as in progress
     - mark-done: Mark a task as done
+    - purge: Delete all tasks matching filters
+    - tag / untag: Add or remove task tags
+    - block / unblock: Add or remove task dependencies
+    - lists / move: Show named task lists and move tasks between them
+    - recur add / list / delete: Manage recurring task templates
+    - tick: Add the tasks of due recurring templates
+    - view save / show / list / delete: Manage saved, materialized queries
+    - next: Show the most important tasks that are not done
+    - count: Count tasks (optionally filtered by status)
+    - summary: Show task counts, next id and sequence number
+    - report: Show tasks created/done per day and cycle time
+    - migrate-timestamps: Store timestamps as epoch milliseconds or ISO strings
+    - convert: Copy the JSON store into the --engine store
+    - serve: Serve the tasks as a JSON API over HTTP
     
     Returns:
         Configured ArgumentParser instance with all subcommands and their
         respective arguments set up.
     """
     parser = argparse.ArgumentParser(
-        description="Task Manager CLI.",
-        usage="%(prog)s <command> [inputs/options]"   
+        description="Task Manager CLI.", usage="%(prog)s <command> [inputs/options]"
+    )
+
+    parser.add_argument(
+        "--list",
+        dest="namespace",
+        metavar="NAME",
+        help="Named task list to work on (default: default)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("json", *ENGINES),
+        default="json",
+        help="Storage engine: json (tasks.json, default), segments (tasks.seg) "
+        "or records (tasks.rec)",
     )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -184,17 +1003,127 @@ def command_parser() -> argparse.ArgumentParser:
     # add 
     p_add = subparsers.add_parser("add", help="Add a new task")
     p_add.add_argument("description", help="Description of the task")
+    p_add.add_argument(
+        "--priority", type=int, help="Priority (higher is more important)"
+    )
+    p_add.add_argument("--due", help="Due date (YYYY-MM-DD)")
+    p_add.add_argument(
+        "--tag", dest="tags", action="append", help="Tag the task (repeatable)"
+    )
     p_add.set_defaults(func=command_add)
 
     # list
     p_list = subparsers.add_parser("list", help="List tasks")
-    p_list.add_argument("status", nargs="?", help="Optional status filter: todo, in-progress, done")
+    p_list.add_argument(
+        "status", nargs="?", help="Optional status filter: todo, in-progress, done"
+    )
+    p_list.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format (default: text)",
+    )
+    p_list.add_argument(
+        "--fields", help="Comma-separated fields to output, e.g. id,status"
+    )
+    p_list.add_argument(
+        "--no-header",
+        action="store_true",
+        help="Omit the text banner or CSV/TSV header row",
+    )
+    p_list.add_argument(
+        "--sort", choices=TaskManager.SORT_FIELDS, help="Sort by this field"
+    )
+    p_list.add_argument(
+        "--reverse", action="store_true", help="Sort in descending order"
+    )
+    p_list.add_argument("--limit", type=int, help="Show at most this many tasks")
+    p_list.add_argument(
+        "--offset", type=int, default=0, help="Skip this many matching tasks"
+    )
+    p_list.add_argument(
+        "--cursor", help="Continue after the cursor printed by a previous page"
+    )
+    p_list.add_argument(
+        "--created-after",
+        type=parse_time_arg,
+        help="Only tasks created at/after this age (e.g. 7d) or timestamp",
+    )
+    p_list.add_argument(
+        "--created-before",
+        type=parse_time_arg,
+        help="Only tasks created before this age or timestamp",
+    )
+    p_list.add_argument(
+        "--updated-after",
+        type=parse_time_arg,
+        help="Only tasks updated at/after this age (e.g. 1h) or timestamp",
+    )
+    p_list.add_argument(
+        "--updated-before",
+        type=parse_time_arg,
+        help="Only tasks updated before this age or timestamp",
+    )
+    p_list.add_argument(
+        "--where",
+        help="Query, e.g. \"status in (todo,in-progress) and description ~ 'deploy'\"",
+    )
+    p_list.add_argument(
+        "--explain",
+        action="store_true",
+        help="Show the plan for --where instead of listing tasks",
+    )
+    p_list.add_argument(
+        "--tag",
+        dest="tags",
+        action="append",
+        help="Only tasks with this tag (repeatable: all must match)",
+    )
+    p_list.add_argument(
+        "--any-tag",
+        dest="any_tags",
+        action="append",
+        help="Only tasks with any of these tags (repeatable)",
+    )
+    p_list.add_argument(
+        "--ready",
+        action="store_true",
+        help="Only tasks that are not done and whose blockers are all done",
+    )
     p_list.set_defaults(func=command_list)
 
+    # search
+    p_search = subparsers.add_parser("search", help="Search task descriptions")
+    p_search.add_argument(
+        "query", help='Search terms, e.g. "deploy api*" or "deploy OR release"'
+    )
+    p_search.add_argument("--status", help="Only tasks with this status")
+    p_search.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format (default: text)",
+    )
+    p_search.add_argument(
+        "--fields", help="Comma-separated fields to output, e.g. id,status"
+    )
+    p_search.add_argument(
+        "--no-header",
+        action="store_true",
+        help="Omit the text banner or CSV/TSV header row",
+    )
+    p_search.set_defaults(func=command_search)
+
     # update
     p_update = subparsers.add_parser("update", help="Update an existing task")
     p_update.add_argument("id", help="ID of the task to update")
-    p_update.add_argument("description", help="New description")
+    p_update.add_argument(
+        "description",
+        nargs="?",
+        help="New description (optional with --priority/--due)",
+    )
+    p_update.add_argument("--priority", type=int, help="New priority (0 clears it)")
+    p_update.add_argument("--due", help='New due date (YYYY-MM-DD; "" clears it)')
     p_update.set_defaults(func=command_update)
 
     # delete
@@ -212,17 +1141,257 @@ def command_parser() -> argparse.ArgumentParser:
     p_md.add_argument("id", help="ID of the task")
     p_md.set_defaults(func=command_mark_done)
 
+    # purge
+    p_purge = subparsers.add_parser("purge", help="Delete all tasks matching filters")
+    p_purge.add_argument("--status", help="Only tasks with this status")
+    p_purge.add_argument(
+        "--older-than",
+        help="Only tasks created before this age (e.g. 30d) or timestamp",
+    )
+    p_purge.add_argument(
+        "--updated-before",
+        help="Only tasks updated before this age (e.g. 12h) or timestamp",
+    )
+    p_purge.add_argument(
+        "--contains", help="Only tasks whose description contains this text"
+    )
+    p_purge.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report matching tasks without deleting them",
+    )
+    p_purge.set_defaults(func=command_purge)
+
+    # tag / untag
+    p_tag = subparsers.add_parser("tag", help="Add tags to a task")
+    p_tag.add_argument("id", help="ID of the task to tag")
+    p_tag.add_argument("tags", nargs="+", help="Tags to add")
+    p_tag.set_defaults(func=command_tag, remove=False)
+
+    p_untag = subparsers.add_parser("untag", help="Remove tags from a task")
+    p_untag.add_argument("id", help="ID of the task to untag")
+    p_untag.add_argument("tags", nargs="+", help="Tags to remove")
+    p_untag.set_defaults(func=command_tag, remove=True)
+
+    # block / unblock
+    p_block = subparsers.add_parser("block", help="Make a task depend on other tasks")
+    p_block.add_argument("id", help="ID of the blocked task")
+    p_block.add_argument("blockers", nargs="+", help="IDs of the tasks it depends on")
+    p_block.set_defaults(func=command_block, remove=False)
+
+    p_unblock = subparsers.add_parser("unblock", help="Remove dependencies of a task")
+    p_unblock.add_argument("id", help="ID of the blocked task")
+    p_unblock.add_argument(
+        "blockers", nargs="+", help="IDs of the tasks it should no longer depend on"
+    )
+    p_unblock.set_defaults(func=command_block, remove=True)
+
+    # lists / move
+    p_lists = subparsers.add_parser("lists", help="Show the named task lists")
+    p_lists.set_defaults(func=command_lists)
+
+    p_move = subparsers.add_parser("move", help="Move a task to another named list")
+    p_move.add_argument("id", help="ID of the task to move")
+    p_move.add_argument("to", help="Name of the list to move it to")
+    p_move.set_defaults(func=command_move)
+
+    # recur / tick
+    p_recur = subparsers.add_parser("recur", help="Manage recurring task templates")
+    recur_actions = p_recur.add_subparsers(dest="action", required=True)
+    p_recur_add = recur_actions.add_parser("add", help="Add a recurring task template")
+    p_recur_add.add_argument("description", help="Description of the tasks to add")
+    rule = p_recur_add.add_mutually_exclusive_group(required=True)
+    rule.add_argument("--every", help="Interval between tasks: 30m, 12h, 1d, 2w")
+    rule.add_argument(
+        "--cron", help='Cron rule: minute hour day month weekday, e.g. "0 9 * * 1-5"'
+    )
+    p_recur_add.add_argument(
+        "--start", help="When the template starts (ISO timestamp, default: now)"
+    )
+    p_recur_add.add_argument("--priority", type=int, help="Priority of the tasks")
+    p_recur_add.add_argument(
+        "--tag", dest="tags", action="append", help="Tag the tasks (repeatable)"
+    )
+    p_recur_add.set_defaults(func=command_recur_add)
+    p_recur_list = recur_actions.add_parser(
+        "list", help="Show the recurring task templates"
+    )
+    p_recur_list.set_defaults(func=command_recur_list)
+    p_recur_delete = recur_actions.add_parser(
+        "delete", help="Delete a recurring task template"
+    )
+    p_recur_delete.add_argument("id", help="ID of the template to delete")
+    p_recur_delete.set_defaults(func=command_recur_delete)
+
+    p_tick = subparsers.add_parser(
+        "tick", help="Add the tasks of due recurring templates"
+    )
+    p_tick.add_argument(
+        "--now", help="Current time to use (ISO timestamp, default: now)"
+    )
+    p_tick.set_defaults(func=command_tick)
+
+    # view
+    p_view = subparsers.add_parser("view", help="Manage saved queries (views)")
+    view_actions = p_view.add_subparsers(dest="action", required=True)
+    p_view_save = view_actions.add_parser("save", help="Save a --where query as a view")
+    p_view_save.add_argument("name", help="Name of the view")
+    p_view_save.add_argument(
+        "--where",
+        required=True,
+        help="Query, e.g. \"status = todo and description ~ 'deploy'\"",
+    )
+    p_view_save.set_defaults(func=command_view_save)
+    p_view_show = view_actions.add_parser("show", help="Show the tasks of a view")
+    p_view_show.add_argument("name", help="Name of the view")
+    p_view_show.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format (default: text)",
+    )
+    p_view_show.add_argument(
+        "--fields", help="Comma-separated fields to output, e.g. id,status"
+    )
+    p_view_show.add_argument(
+        "--no-header",
+        action="store_true",
+        help="Omit the text banner or CSV/TSV header row",
+    )
+    p_view_show.set_defaults(func=command_view_show)
+    p_view_list = view_actions.add_parser("list", help="Show the saved views")
+    p_view_list.set_defaults(func=command_view_list)
+    p_view_delete = view_actions.add_parser("delete", help="Delete a view")
+    p_view_delete.add_argument("name", help="Name of the view")
+    p_view_delete.set_defaults(func=command_view_delete)
+
+    # next
+    p_next = subparsers.add_parser(
+        "next", help="Show the most important tasks that are not done"
+    )
+    p_next.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        default=1,
+        help="Number of tasks to show (default: 1)",
+    )
+    p_next.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format (default: text)",
+    )
+    p_next.add_argument(
+        "--fields", help="Comma-separated fields to output, e.g. id,priority"
+    )
+    p_next.add_argument(
+        "--no-header",
+        action="store_true",
+        help="Omit the text banner or CSV/TSV header row",
+    )
+    p_next.set_defaults(func=command_next)
+
+    # count
+    p_count = subparsers.add_parser("count", help="Count tasks")
+    p_count.add_argument(
+        "status", nargs="?", help="Optional status filter: todo, in-progress, done"
+    )
+    p_count.set_defaults(func=command_count)
+
+    # summary
+    p_summary = subparsers.add_parser(
+        "summary", help="Show a summary of the task store"
+    )
+    p_summary.set_defaults(func=command_summary)
+
+    # report
+    p_report = subparsers.add_parser("report", help="Show throughput and cycle time")
+    p_report.add_argument(
+        "--days",
+        type=int,
+        default=14,
+        help="Days shown in the daily table (default: 14)",
+    )
+    p_report.set_defaults(func=command_report)
+
+    # migrate-timestamps
+    p_migrate = subparsers.add_parser(
+        "migrate-timestamps",
+        help="Store timestamps as epoch milliseconds or ISO strings",
+    )
+    p_migrate.add_argument("to", choices=("epoch", "iso"), help="Target representation")
+    p_migrate.set_defaults(func=command_migrate_timestamps)
+
+    # convert
+    p_convert = subparsers.add_parser(
+        "convert", help="Copy the JSON store into the --engine store"
+    )
+    p_convert.set_defaults(func=command_convert)
+
+    # serve
+    p_serve = subparsers.add_parser(
+        "serve", help="Serve the tasks as a JSON API over HTTP"
+    )
+    p_serve.add_argument("--host", help="Address to listen on (default: 127.0.0.1)")
+    p_serve.add_argument("--port", type=int, help="Port to listen on (default: 8765)")
+    p_serve.add_argument(
+        "--tick",
+        type=float,
+        metavar="SECONDS",
+        help="Add due recurring tasks every SECONDS",
+    )
+    p_serve.set_defaults(func=command_serve)
+
     return parser 
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Main entry point for the CLI application.
     
     Parses command-line arguments and executes the appropriate command function.
     The subparser attaches a 'func' attribute to the args namespace that
-    corresponds to the selected subcommand.
+    corresponds to the selected subcommand. With --list NAME, commands work
+    on that named task list. With --engine segments or records, the basic
+    commands (see ENGINE_COMMANDS) work on that engine's store instead.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
     """
-    args = command_parser().parse_args()
+    global tm
+    args = command_parser().parse_args(argv)
+    if args.engine != "json" and args.command != "convert":
+        unsupported = ENGINE_COMMANDS.get(args.command)
+        if unsupported is None or args.namespace is not None:
+            what = args.command if unsupported is None else "--list"
+            print(f"Error: {what} is not supported by the {args.engine} engine")
+            return
+        for name in unsupported:
+            if getattr(args, name, None) not in (None, False, 0):
+                print(
+                    f"Error: --{name.replace('_', '-')} is not supported "
+                    f"by the {args.engine} engine"
+                )
+                return
+        path, engine = ENGINES[args.engine]
+        json_tm = tm
+        try:
+            tm = engine(path)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        try:
+            args.func(args)
+        finally:
+            tm.close()
+            tm = json_tm
+        return
+    if args.namespace is not None:
+        try:
+            tm = TaskManager(snapshot_cache=True, namespace=args.namespace)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
     # subparsers attach a 'func' attribute 
     args.func(args)
 
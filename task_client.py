@@ -0,0 +1,819 @@
+#!/usr/bin/env python3
+import json
+import socket
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, urlencode, urlsplit
+
+from task_manager import NotFound, TaskManager, TimeValue, VersionConflict
+from task_server import DEFAULT_HOST, DEFAULT_PORT
+
+# A request: (HTTP method, path with query, JSON body or None, result decoder).
+Request = Tuple[str, str, Optional[Dict[str, Any]], Callable[[Any], Any]]
+# A response: (status, lowercase headers, body bytes).
+Response = Tuple[int, Dict[str, str], bytes]
+
+DEFAULT_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+
+# Requests written to a connection before reading their responses; the
+# server saves the writes of each window in one batch.
+PIPELINE_WINDOW = 128
+
+# After a refused connection, calls go to the local TaskManager for this many
+# seconds before the server is tried again.
+RECONNECT_INTERVAL = 1.0
+
+# First delay before retrying a failed read, doubled on each retry.
+RETRY_DELAY = 0.05
+
+# Responses kept for conditional GETs (If-None-Match).
+CACHE_ENTRIES = 64
+
+
+class _Connection:
+    """A persistent HTTP/1.1 connection to the server."""
+
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        """Connect to the server.
+
+        Raises:
+            OSError: If the connection fails (e.g. ConnectionRefusedError).
+        """
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rfile = self.sock.makefile("rb")
+        self.timeout = timeout
+
+    def alive(self) -> bool:
+        """Check that an idle connection wasn't closed by the server."""
+        self.sock.setblocking(False)
+        try:
+            # An idle connection has nothing to read: b"" means closed, and
+            # unexpected data means it can't be reused either.
+            self.sock.recv(1, socket.MSG_PEEK)
+            return False
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            self.sock.settimeout(self.timeout)
+
+    def send(self, data: bytes) -> None:
+        self.sock.sendall(data)
+
+    def read_response(self) -> Response:
+        """Read one response.
+
+        Raises:
+            ConnectionError: If the connection closes before a full response.
+        """
+        line = self.rfile.readline(65537)
+        parts = line.split(None, 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ConnectionError("Connection closed by the server")
+        status = int(parts[1])
+        headers: Dict[str, str] = {}
+        for line in iter(lambda: self.rfile.readline(65537), b""):
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ConnectionError("Connection closed by the server")
+        length = 0 if status in (204, 304) else int(headers.get("content-length", 0))
+        body = self.rfile.read(length)
+        if len(body) < length:
+            raise ConnectionError("Connection closed by the server")
+        return status, headers, body
+
+    def close(self) -> None:
+        self.rfile.close()
+        self.sock.close()
+
+
+class TaskClient:
+    """Client for a TaskServer with the same methods as TaskManager.
+
+    Connections are kept alive and pooled, so consecutive calls (from one
+    thread or several) reuse sockets instead of connecting each time. Reads
+    are retried on a new connection if a connection fails, and list and
+    search results are revalidated with If-None-Match, so an unchanged result
+    isn't sent again. pipeline() sends many calls without waiting for each
+    response.
+
+    If no server is listening, calls go to a local TaskManager for the same
+    store instead (unless fallback is False), so code using the client works
+    whether or not "task_cli.py serve" is running.
+    """
+
+    def __init__(
+        self,
+        url: str = DEFAULT_URL,
+        path: str = "tasks.json",
+        pool_size: int = 4,
+        timeout: float = 10.0,
+        retries: int = 2,
+        fallback: bool = True,
+    ) -> None:
+        """Configure the client. No connection is made until the first call.
+
+        Args:
+            url: Base URL of the server. Defaults to "http://127.0.0.1:8765".
+            path: Store used by the local TaskManager when the server isn't
+                  running; it should be the store the server serves.
+            pool_size: Maximum number of idle connections kept open.
+            timeout: Socket timeout in seconds.
+            retries: How many times a failed read is retried.
+            fallback: If False, raise ConnectionError instead of using the
+                  local TaskManager when the server can't be reached.
+
+        Raises:
+            ValueError: If url is not an http:// URL.
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Invalid server URL: {url}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.local: Optional[TaskManager] = TaskManager(path) if fallback else None
+        self._idle: List[_Connection] = []
+        self._cache: Dict[str, Tuple[str, bytes]] = {}  # path -> (ETag, body)
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def __enter__(self) -> "TaskClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -----------------------------------------
+    #  Internal Methods
+    # -----------------------------------------
+
+    def _acquire(self) -> _Connection:
+        """Take an idle connection from the pool, or open a new one.
+
+        Raises:
+            OSError: If a new connection can't be made.
+        """
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return _Connection(self.host, self.port, self.timeout)
+            if conn.alive():
+                return conn
+            conn.close()
+
+    def _release(self, conn: _Connection) -> None:
+        """Return a connection to the pool, or close it if the pool is full."""
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _connect(self) -> Optional[_Connection]:
+        """Get a connection, or None to use the local TaskManager.
+
+        Raises:
+            ConnectionError: If the server can't be reached and fallback is off.
+        """
+        if self.local is not None and time.monotonic() < self._down_until:
+            return None
+        try:
+            return self._acquire()
+        except OSError as e:
+            if self.local is None:
+                raise ConnectionError(f"Cannot connect to {self.url}: {e}")
+            self._down_until = time.monotonic() + RECONNECT_INTERVAL
+            return None
+
+    def _encode(self, request: Request) -> bytes:
+        """Encode a request, adding If-None-Match for a cached GET."""
+        method, path, body, _ = request
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+        )
+        if data:
+            head += "Content-Type: application/json\r\n"
+        if method == "GET":
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached is not None:
+                head += f"If-None-Match: {cached[0]}\r\n"
+        return head.encode("latin-1") + b"\r\n" + data
+
+    def _decode(self, request: Request, response: Response) -> Any:
+        """Turn a response into the call's result.
+
+        Raises:
+            VersionConflict: For a 409 response to a conditional change.
+            NotFound: For a 404 response, with the server's message.
+            ValueError: For any other error response, with the server's message.
+        """
+        method, path, _, decode = request
+        status, headers, body = response
+        if status == 304:
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached is None:
+                raise ValueError(f"Unexpected 304 response for {path}")
+            body = cached[1]
+        elif status < 400 and method == "GET" and "etag" in headers:
+            with self._lock:
+                self._cache.pop(path, None)
+                self._cache[path] = (headers["etag"], body)
+                if len(self._cache) > CACHE_ENTRIES:
+                    del self._cache[next(iter(self._cache))]
+
+        data = json.loads(body) if body else None
+        if status == 409 and isinstance(data, dict) and "current" in data:
+            raise VersionConflict(data["id"], data["expectedVersion"], data["current"])
+        if status >= 400:
+            message = data.get("error") if isinstance(data, dict) else None
+            error = NotFound if status == 404 else ValueError
+            raise error(message or f"Server error {status} for {method} {path}")
+        return decode(data)
+
+    def _call(self, name: str, *args: Any) -> Any:
+        """Run one call on the server, or locally if it isn't running.
+
+        Reads are retried on a fresh connection if the connection fails;
+        writes are not, since the server may already have applied them.
+
+        Raises:
+            ValueError: If the operation fails.
+            ConnectionError: If the server can't be reached (and fallback is
+                       off) or the connection fails.
+        """
+        request = self._build(name, *args)
+        attempts = 1 + (self.retries if request[0] == "GET" else 0)
+        for attempt in range(attempts):
+            conn = self._connect()
+            if conn is None:
+                return getattr(self.local, name)(*args)
+            try:
+                conn.send(self._encode(request))
+                response = conn.read_response()
+            except OSError as e:
+                conn.close()
+                if attempt + 1 == attempts:
+                    raise ConnectionError(f"Request to {self.url} failed: {e}")
+                time.sleep(RETRY_DELAY * 2**attempt)
+                continue
+            self._release(conn)
+            return self._decode(request, response)
+
+    def _build(self, name: str, *args: Any) -> Request:
+        """Build the request for a call.
+
+        Raises:
+            ValueError: If name is not a method the server supports.
+        """
+        builder = getattr(self, f"_{name}_request", None)
+        if builder is None:
+            raise ValueError(f"Unsupported operation: {name}")
+        return builder(*args)
+
+    @staticmethod
+    def _query(path: str, params: Dict[str, Any]) -> str:
+        """Append the parameters that are set to a path."""
+        params = {k: v for k, v in params.items() if v is not None and v is not False}
+        return f"{path}?{urlencode(params)}" if params else path
+
+    @staticmethod
+    def _time_param(value: Optional[TimeValue]) -> Optional[str]:
+        """Encode a point in time as an ISO string or age for a query parameter."""
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, timedelta):
+            value = datetime.now() - value
+        elif isinstance(value, int):
+            value = datetime.fromtimestamp(value / 1000)
+        return value.isoformat(timespec="seconds")
+
+    @staticmethod
+    def _fields(**fields: Any) -> Dict[str, Any]:
+        """Build a request body from the fields that are set."""
+        return {k: v for k, v in fields.items() if v is not None}
+
+    @staticmethod
+    def _tags_param(tags: Optional[Iterable[str]]) -> Optional[str]:
+        """Encode tags as a comma-separated query parameter."""
+        return (
+            None
+            if tags is None
+            else ",".join([tags] if isinstance(tags, str) else tags)
+        )
+
+    @staticmethod
+    def _tag_list(tags: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """Make tags a JSON list for a request body."""
+        return None if tags is None else [tags] if isinstance(tags, str) else list(tags)
+
+    def _add_task_request(
+        self,
+        description: str,
+        priority: Optional[int] = None,
+        due: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Request:
+        body = self._fields(
+            description=description,
+            priority=priority,
+            due=due,
+            tags=self._tag_list(tags),
+        )
+        return ("POST", "/tasks", body, lambda r: r)
+
+    def _list_tasks_request(
+        self,
+        status: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        created_after: Optional[TimeValue] = None,
+        created_before: Optional[TimeValue] = None,
+        updated_after: Optional[TimeValue] = None,
+        updated_before: Optional[TimeValue] = None,
+        where: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        any_tags: Optional[Iterable[str]] = None,
+        ready: bool = False,
+    ) -> Request:
+        path = self._query(
+            "/tasks",
+            {
+                "status": status,
+                "sort": sort_by,
+                "reverse": "1" if reverse else None,
+                "limit": limit,
+                "offset": offset or None,
+                "cursor": cursor,
+                "created_after": self._time_param(created_after),
+                "created_before": self._time_param(created_before),
+                "updated_after": self._time_param(updated_after),
+                "updated_before": self._time_param(updated_before),
+                "where": where,
+                "tags": self._tags_param(tags),
+                "any_tags": self._tags_param(any_tags),
+                "ready": "1" if ready else None,
+            },
+        )
+        return ("GET", path, None, lambda r: r)
+
+    def _search_request(self, query: str, status: Optional[str] = None) -> Request:
+        return (
+            "GET",
+            self._query("/search", {"q": query, "status": status}),
+            None,
+            lambda r: r,
+        )
+
+    def _update_task_request(
+        self,
+        id: int,
+        updated_description: Optional[str] = None,
+        expected_version: Optional[int] = None,
+        priority: Optional[int] = None,
+        due: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Request:
+        path = self._query(f"/tasks/{int(id)}", {"expected_version": expected_version})
+        body = self._fields(
+            description=updated_description,
+            priority=priority,
+            due=due,
+            tags=self._tag_list(tags),
+        )
+        return ("PATCH", path, body, lambda r: r)
+
+    def _tag_task_request(
+        self, id: int, tags: Iterable[str], expected_version: Optional[int] = None
+    ) -> Request:
+        path = self._query(
+            f"/tasks/{int(id)}/tags", {"expected_version": expected_version}
+        )
+        return ("POST", path, {"tags": self._tag_list(tags)}, lambda r: r)
+
+    def _untag_task_request(
+        self, id: int, tags: Iterable[str], expected_version: Optional[int] = None
+    ) -> Request:
+        path = self._query(
+            f"/tasks/{int(id)}/tags", {"expected_version": expected_version}
+        )
+        return ("DELETE", path, {"tags": self._tag_list(tags)}, lambda r: r)
+
+    def _block_task_request(
+        self,
+        id: int,
+        blocker_ids: Iterable[int],
+        expected_version: Optional[int] = None,
+    ) -> Request:
+        path = self._query(
+            f"/tasks/{int(id)}/blockers", {"expected_version": expected_version}
+        )
+        return ("POST", path, {"ids": list(blocker_ids)}, lambda r: r)
+
+    def _unblock_task_request(
+        self,
+        id: int,
+        blocker_ids: Iterable[int],
+        expected_version: Optional[int] = None,
+    ) -> Request:
+        path = self._query(
+            f"/tasks/{int(id)}/blockers", {"expected_version": expected_version}
+        )
+        return ("DELETE", path, {"ids": list(blocker_ids)}, lambda r: r)
+
+    def _delete_task_request(
+        self, id: int, expected_version: Optional[int] = None
+    ) -> Request:
+        return (
+            "DELETE",
+            self._query(f"/tasks/{int(id)}", {"expected_version": expected_version}),
+            None,
+            lambda r: r,
+        )
+
+    def _mark_in_progress_request(
+        self, id: int, expected_version: Optional[int] = None
+    ) -> Request:
+        path = self._query(
+            f"/tasks/{int(id)}/in-progress", {"expected_version": expected_version}
+        )
+        return ("POST", path, None, lambda r: r)
+
+    def _mark_done_request(
+        self, id: int, expected_version: Optional[int] = None
+    ) -> Request:
+        return (
+            "POST",
+            self._query(
+                f"/tasks/{int(id)}/done", {"expected_version": expected_version}
+            ),
+            None,
+            lambda r: r,
+        )
+
+    def _next_tasks_request(self, k: int = 1) -> Request:
+        return ("GET", self._query("/next", {"k": k}), None, lambda r: r)
+
+    def _add_template_request(
+        self,
+        description: str,
+        every: Optional[str] = None,
+        cron: Optional[str] = None,
+        start: Optional[Union[datetime, str]] = None,
+        priority: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Request:
+        if isinstance(start, datetime):
+            start = start.isoformat(timespec="seconds")
+        body = self._fields(
+            description=description,
+            every=every,
+            cron=cron,
+            start=start,
+            priority=priority,
+            tags=self._tag_list(tags),
+        )
+        return ("POST", "/templates", body, lambda r: r)
+
+    def _list_templates_request(self) -> Request:
+        return ("GET", "/templates", None, lambda r: r)
+
+    def _delete_template_request(self, id: int) -> Request:
+        return ("DELETE", f"/templates/{int(id)}", None, lambda r: r)
+
+    def _tick_request(self, now: Optional[datetime] = None) -> Request:
+        return (
+            "POST",
+            "/tick",
+            self._fields(now=None if now is None else now.isoformat()),
+            lambda r: r,
+        )
+
+    def _save_view_request(self, name: str, where: str) -> Request:
+        return ("PUT", f"/views/{quote(name, safe='')}", {"where": where}, lambda r: r)
+
+    def _show_view_request(self, name: str) -> Request:
+        return ("GET", f"/views/{quote(name, safe='')}", None, lambda r: r)
+
+    def _list_views_request(self) -> Request:
+        return ("GET", "/views", None, lambda r: r)
+
+    def _delete_view_request(self, name: str) -> Request:
+        return ("DELETE", f"/views/{quote(name, safe='')}", None, lambda r: r)
+
+    def _count_tasks_request(self, status: Optional[str] = None) -> Request:
+        return (
+            "GET",
+            self._query("/count", {"status": status}),
+            None,
+            lambda r: r["count"],
+        )
+
+    def _summary_request(self) -> Request:
+        return ("GET", "/summary", None, lambda r: r)
+
+    def _generation_request(self) -> Request:
+        return ("GET", "/summary", None, lambda r: r["seq"])
+
+    def _report_request(self, days: int = 14, today: Optional[date] = None) -> Request:
+        def decode(report: Dict[str, Any]) -> Dict[str, Any]:
+            report["days"] = [
+                (date.fromisoformat(day), created, done)
+                for day, created, done in report["days"]
+            ]
+            return report
+
+        path = self._query(
+            "/report", {"days": days, "today": today.isoformat() if today else None}
+        )
+        return ("GET", path, None, decode)
+
+    # -----------------------------------------
+    #  Public Methods
+    # -----------------------------------------
+
+    def add_task(
+        self,
+        description: str,
+        priority: Optional[int] = None,
+        due: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Add a new task, with an optional priority, due date and tags.
+
+        See TaskManager.add_task.
+        """
+        return self._call("add_task", description, priority, due, tags)
+
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        created_after: Optional[TimeValue] = None,
+        created_before: Optional[TimeValue] = None,
+        updated_after: Optional[TimeValue] = None,
+        updated_before: Optional[TimeValue] = None,
+        where: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        any_tags: Optional[Iterable[str]] = None,
+        ready: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """List tasks, filtered, sorted and paginated (see TaskManager.list_tasks).
+
+        Datetimes, timedeltas and epoch milliseconds are sent as ISO strings.
+        """
+        return self._call(
+            "list_tasks",
+            status,
+            sort_by,
+            reverse,
+            limit,
+            offset,
+            cursor,
+            created_after,
+            created_before,
+            updated_after,
+            updated_before,
+            where,
+            tags,
+            any_tags,
+            ready,
+        )
+
+    def make_cursor(self, task: Dict[str, Any], sort_by: Optional[str] = None) -> str:
+        """Make a pagination cursor pointing just past a task.
+
+        See TaskManager.make_cursor.
+        """
+        return TaskManager.make_cursor(self.local or TaskManager(), task, sort_by)
+
+    def search(self, query: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Find tasks whose description matches a text query.
+
+        See TaskManager.search.
+        """
+        return self._call("search", query, status)
+
+    def update_task(
+        self,
+        id: int,
+        updated_description: Optional[str] = None,
+        expected_version: Optional[int] = None,
+        priority: Optional[int] = None,
+        due: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Update an existing task's description, priority, due date or tags.
+
+        See TaskManager.update_task.
+        """
+        return self._call(
+            "update_task",
+            id,
+            updated_description,
+            expected_version,
+            priority,
+            due,
+            tags,
+        )
+
+    def tag_task(
+        self, id: int, tags: Iterable[str], expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Add tags to a task (see TaskManager.tag_task)."""
+        return self._call("tag_task", id, tags, expected_version)
+
+    def untag_task(
+        self, id: int, tags: Iterable[str], expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Remove tags from a task (see TaskManager.untag_task)."""
+        return self._call("untag_task", id, tags, expected_version)
+
+    def block_task(
+        self,
+        id: int,
+        blocker_ids: Iterable[int],
+        expected_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Make a task depend on other tasks (see TaskManager.block_task)."""
+        return self._call("block_task", id, blocker_ids, expected_version)
+
+    def unblock_task(
+        self,
+        id: int,
+        blocker_ids: Iterable[int],
+        expected_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Remove links from a task to tasks it depends on.
+
+        See TaskManager.unblock_task.
+        """
+        return self._call("unblock_task", id, blocker_ids, expected_version)
+
+    def delete_task(
+        self, id: int, expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Delete an existing task (see TaskManager.delete_task)."""
+        return self._call("delete_task", id, expected_version)
+
+    def mark_in_progress(
+        self, id: int, expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Mark a task as in progress (see TaskManager.mark_in_progress)."""
+        return self._call("mark_in_progress", id, expected_version)
+
+    def mark_done(
+        self, id: int, expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Mark a task as done (see TaskManager.mark_done)."""
+        return self._call("mark_done", id, expected_version)
+
+    def next_tasks(self, k: int = 1) -> List[Dict[str, Any]]:
+        """Get the k most important tasks that are not done.
+
+        See TaskManager.next_tasks.
+        """
+        return self._call("next_tasks", k)
+
+    def add_template(
+        self,
+        description: str,
+        every: Optional[str] = None,
+        cron: Optional[str] = None,
+        start: Optional[Union[datetime, str]] = None,
+        priority: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Add a recurring task template (see TaskManager.add_template)."""
+        return self._call(
+            "add_template", description, every, cron, start, priority, tags
+        )
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """Get the recurring task templates (see TaskManager.list_templates)."""
+        return self._call("list_templates")
+
+    def delete_template(self, id: int) -> Dict[str, Any]:
+        """Delete a recurring task template (see TaskManager.delete_template)."""
+        return self._call("delete_template", id)
+
+    def tick(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Add the tasks of every recurring template that is due.
+
+        See TaskManager.tick.
+        """
+        return self._call("tick", now)
+
+    def save_view(self, name: str, where: str) -> Dict[str, Any]:
+        """Save a where query as a named view (see TaskManager.save_view)."""
+        return self._call("save_view", name, where)
+
+    def show_view(self, name: str) -> List[Dict[str, Any]]:
+        """Get the tasks of a saved view (see TaskManager.show_view)."""
+        return self._call("show_view", name)
+
+    def list_views(self) -> List[Dict[str, Any]]:
+        """Get the saved views with their result counts (see TaskManager.list_views)."""
+        return self._call("list_views")
+
+    def delete_view(self, name: str) -> Dict[str, Any]:
+        """Delete a saved view (see TaskManager.delete_view)."""
+        return self._call("delete_view", name)
+
+    def count_tasks(self, status: Optional[str] = None) -> int:
+        """Count tasks, optionally filtered by status (see TaskManager.count_tasks)."""
+        return self._call("count_tasks", status)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get a summary of the store from its header (see TaskManager.summary)."""
+        return self._call("summary")
+
+    def generation(self) -> int:
+        """Get the store's generation number (see TaskManager.generation)."""
+        return self._call("generation")
+
+    def report(self, days: int = 14, today: Optional[date] = None) -> Dict[str, Any]:
+        """Build a throughput and cycle-time report (see TaskManager.report)."""
+        return self._call("report", days, today)
+
+    def pipeline(self, calls: Iterable[Sequence[Any]]) -> List[Union[Any, Exception]]:
+        """Run many calls with few round trips.
+
+        On the server, requests are written to one connection in windows of
+        PIPELINE_WINDOW without waiting for responses, and the server saves
+        the writes of each window together. Locally, the calls run in one
+        TaskManager.batch(). Pipelined calls are not retried.
+
+        Args:
+            calls: (method name, *args) sequences, e.g. ("add_task", "Buy milk")
+                  or ("mark_done", 3).
+
+        Returns:
+            One entry per call, in order: its result, or the ValueError it
+            raised (a failed call doesn't stop the others; a VersionConflict
+            carries the task's current state, so only conflicting calls need
+            to be retried). If the connection
+            fails, every call without a response gets the ConnectionError.
+
+        Raises:
+            ValueError: If a call names a method the client doesn't support.
+            ConnectionError: If the server can't be reached and fallback is off.
+        """
+        calls = [tuple(call) for call in calls]
+        requests = [self._build(call[0], *call[1:]) for call in calls]
+        results: List[Union[Any, Exception]] = []
+        conn = self._connect()
+        if conn is None:
+            with self.local.batch():
+                for name, *args in calls:
+                    try:
+                        results.append(getattr(self.local, name)(*args))
+                    except ValueError as e:
+                        results.append(e)
+            return results
+
+        for start in range(0, len(requests), PIPELINE_WINDOW):
+            window = requests[start : start + PIPELINE_WINDOW]
+            try:
+                conn.send(b"".join(self._encode(request) for request in window))
+                for request in window:
+                    response = conn.read_response()
+                    try:
+                        results.append(self._decode(request, response))
+                    except ValueError as e:
+                        results.append(e)
+            except OSError as e:
+                conn.close()
+                error = ConnectionError(f"Request to {self.url} failed: {e}")
+                return results + [error] * (len(requests) - len(results))
+        self._release(conn)
+        return results
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+import marshal
+import operator
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional
+
+COLUMNS_VERSION = 1
+
+# Status codes are positions in TaskColumns.statuses, which starts with these;
+# any other status found in the store is appended.
+STATUSES = ("todo", "in-progress", "done")
+
+TIME_FIELDS = ("createdAt", "updatedAt")
+
+EPOCH = date(1970, 1, 1)
+DAY_SECONDS = 86400
+
+# Serialized columns: the length of the numeric part, the numeric part, then
+# the description table (which is only unmarshalled when first used).
+PART_LENGTH = struct.Struct("<Q")
+
+
+def _seconds_parser() -> Any:
+    """Make a converter from stored timestamps to wall-clock epoch seconds.
+
+    ISO timestamps ("YYYY-MM-DDTHH:MM:SS") are naive local times and are
+    counted as if they were UTC, so a day bucket is a calendar day as written
+    in the store. Epoch-millisecond timestamps are shifted by the local UTC
+    offset to match. Results are memoized: a task's updatedAt often equals its
+    createdAt, and tasks added in bulk share timestamps.
+    """
+    seen: Dict[Any, int] = {}
+    days: Dict[str, int] = {}
+    offsets: Dict[int, int] = {}
+
+    def to_seconds(value: Any) -> int:
+        if isinstance(value, int):
+            utc = value // 1000
+            # The local UTC offset only changes on hour boundaries.
+            offset = offsets.get(utc // 3600)
+            if offset is None:
+                offset = offsets[utc // 3600] = time.localtime(utc).tm_gmtoff
+            return utc + offset
+        seconds = seen.get(value)
+        if seconds is None:
+            day = days.get(value[:10])
+            if day is None:
+                day = days[value[:10]] = (
+                    date.fromisoformat(value[:10]) - EPOCH
+                ).days * DAY_SECONDS
+            seconds = day
+            if len(value) >= 19:
+                seconds += (
+                    int(value[11:13]) * 3600
+                    + int(value[14:16]) * 60
+                    + int(value[17:19])
+                )
+            seen[value] = seconds
+        return seconds
+
+    return to_seconds
+
+
+class TaskColumns:
+    """Columnar copy of the tasks for aggregate queries.
+
+    Each field is a parallel array: ids, status codes, and createdAt/updatedAt
+    as epoch seconds. Descriptions are interned, so each distinct description
+    is stored once and every task holds its position in the table.
+
+    Aggregates work on whole columns with C-level operations: status masks
+    come from bytes.translate, and per-day counts bisect into per-status
+    sorted copies of the timestamp columns, so a daily histogram costs
+    O(days * log n) rather than a pass over every task.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self.statuses: List[str] = list(STATUSES)
+        self.ids = array("q")
+        self.status = array("b")
+        self.created = array("q")
+        self.updated = array("q")
+        self.description_ids = array("l")
+        # field -> sorted timestamps per status code
+        self.sorted_times: Dict[str, List[array]] = {field: [] for field in TIME_FIELDS}
+        self._descriptions: Optional[List[str]] = []
+        self._description_data: Any = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def descriptions(self) -> List[str]:
+        """The interned description table, loaded on first use."""
+        if self._descriptions is None:
+            self._descriptions = marshal.loads(self._description_data)
+            self._description_data = None
+        return self._descriptions
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Dict[str, Any]]) -> "TaskColumns":
+        """Build columns from task dictionaries.
+
+        Args:
+            tasks: Tasks with id, description, status, createdAt and updatedAt.
+
+        Returns:
+            The columns, in the order of tasks.
+
+        Raises:
+            ValueError: If a timestamp is neither an ISO format string nor
+                       epoch milliseconds.
+        """
+        tasks = tasks if isinstance(tasks, list) else list(tasks)
+        cols = cls()
+        status_codes = {status: code for code, status in enumerate(cols.statuses)}
+        for status in {t["status"] for t in tasks} - set(status_codes):
+            status_codes[status] = len(cols.statuses)
+            cols.statuses.append(status)
+
+        interned: Dict[str, int] = {}
+        to_seconds = _seconds_parser()
+        cols.ids = array("q", [t["id"] for t in tasks])
+        cols.status = array("b", [status_codes[t["status"]] for t in tasks])
+        cols.description_ids = array(
+            "l", [interned.setdefault(t["description"], len(interned)) for t in tasks]
+        )
+        cols._descriptions = list(interned)
+        try:
+            cols.created = array("q", [to_seconds(t["createdAt"]) for t in tasks])
+            cols.updated = array("q", [to_seconds(t["updatedAt"]) for t in tasks])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid createdAt/updatedAt timestamp in the store")
+
+        for field in TIME_FIELDS:
+            values = cols._column(field)
+            cols.sorted_times[field] = [
+                array("q", sorted(compress(values, cols._status_mask(code))))
+                for code in range(len(cols.statuses))
+            ]
+        return cols
+
+    def to_bytes(self) -> bytes:
+        """Serialize the columns (arrays are written as raw machine bytes)."""
+        numeric = marshal.dumps(
+            (
+                COLUMNS_VERSION,
+                self.statuses,
+                [column.tobytes() for column in self._arrays()],
+                {
+                    field: [a.tobytes() for a in arrays]
+                    for field, arrays in self.sorted_times.items()
+                },
+            )
+        )
+        return (
+            PART_LENGTH.pack(len(numeric)) + numeric + marshal.dumps(self.descriptions)
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional["TaskColumns"]:
+        """Deserialize the output of to_bytes(), or return None if it is unreadable.
+
+        The description table is kept serialized until it is first used.
+        """
+        view = memoryview(data)
+        try:
+            (length,) = PART_LENGTH.unpack_from(view)
+            version, statuses, columns, sorted_times = marshal.loads(
+                view[PART_LENGTH.size : PART_LENGTH.size + length]
+            )
+        except (EOFError, ValueError, TypeError, struct.error):
+            return None
+        if version != COLUMNS_VERSION:
+            return None
+
+        cols = cls()
+        cols.statuses = statuses
+        for column, raw in zip(cols._arrays(), columns):
+            column.frombytes(raw)
+        for field, arrays in sorted_times.items():
+            cols.sorted_times[field] = [array("q", raw) for raw in arrays]
+        cols._descriptions = None
+        cols._description_data = view[PART_LENGTH.size + length :]
+        return cols
+
+    def _arrays(self) -> List[array]:
+        """Get the parallel arrays in serialization order."""
+        return [self.ids, self.status, self.created, self.updated, self.description_ids]
+
+    def _column(self, field: str) -> array:
+        """Get the timestamp column for "createdAt" or "updatedAt"."""
+        if field not in TIME_FIELDS:
+            raise ValueError(f"Invalid time field: {field}")
+        return self.created if field == "createdAt" else self.updated
+
+    def _code(self, status: str) -> Optional[int]:
+        """Get the code of a status, or None if no task has it."""
+        return self.statuses.index(status) if status in self.statuses else None
+
+    def _status_mask(self, code: int) -> bytes:
+        """Get a per-task mask (one byte per task, 1 for a match) for a status code."""
+        table = bytearray(256)
+        table[code] = 1
+        return self.status.tobytes().translate(table)
+
+    def description(self, i: int) -> str:
+        """Get the description of the task at position i."""
+        return self.descriptions[self.description_ids[i]]
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Count tasks per status.
+
+        Returns:
+            Mapping of status to number of tasks, for statuses with any tasks.
+        """
+        raw = self.status.tobytes()
+        counts = {
+            status: raw.count(bytes([code]))
+            for code, status in enumerate(self.statuses)
+        }
+        return {status: n for status, n in counts.items() if n}
+
+    def histogram_by_day(
+        self,
+        field: str = "createdAt",
+        status: Optional[str] = None,
+        since: Optional[date] = None,
+    ) -> Dict[date, int]:
+        """Count tasks per calendar day of a timestamp.
+
+        Args:
+            field: "createdAt" or "updatedAt". Defaults to "createdAt".
+            status: Only count tasks with this status.
+            since: Only count days on or after this date.
+
+        Returns:
+            Mapping of date to number of tasks, in date order. Days without
+            tasks are omitted.
+
+        Raises:
+            ValueError: If field is not a timestamp field.
+        """
+        self._column(field)
+        if status is None:
+            arrays = self.sorted_times[field]
+        else:
+            code = self._code(status)
+            arrays = [] if code is None else [self.sorted_times[field][code]]
+        arrays = [a for a in arrays if a]
+        if not arrays:
+            return {}
+
+        first = min(a[0] for a in arrays) // DAY_SECONDS
+        if since is not None:
+            first = max(first, (since - EPOCH).days)
+        last = max(a[-1] for a in arrays) // DAY_SECONDS
+
+        counts: Dict[date, int] = {}
+        starts = [bisect_left(a, first * DAY_SECONDS) for a in arrays]
+        for day in range(first, last + 1):
+            ends = [
+                bisect_left(a, (day + 1) * DAY_SECONDS, lo)
+                for a, lo in zip(arrays, starts)
+            ]
+            n = sum(ends) - sum(starts)
+            if n:
+                counts[EPOCH + timedelta(days=day)] = n
+            starts = ends
+        return counts
+
+    def cycle_times(self, status: str = "done") -> array:
+        """Get the seconds from createdAt to updatedAt for tasks with a status.
+
+        For done tasks updatedAt is when they were marked done (unless the
+        description was edited afterwards), so this is their cycle time.
+
+        Args:
+            status: The finishing status. Defaults to "done".
+
+        Returns:
+            Array of durations in seconds, in task order.
+        """
+        code = self._code(status)
+        if code is None:
+            return array("q")
+        mask = self._status_mask(code)
+        return array(
+            "q",
+            map(
+                operator.sub, compress(self.updated, mask), compress(self.created, mask)
+            ),
+        )
+
+    def cycle_time_stats(self, status: str = "done") -> Dict[str, Any]:
+        """Summarize cycle times (see cycle_times).
+
+        Returns:
+            A dictionary with count, and mean, median (the lower middle value
+            for an even count) and p90 in seconds; None when there are no
+            tasks with the status.
+        """
+        durations = sorted(self.cycle_times(status))
+        n = len(durations)
+        if n == 0:
+            return {"count": 0, "mean": None, "median": None, "p90": None}
+        return {
+            "count": n,
+            "mean": sum(durations) / n,
+            "median": durations[(n - 1) // 2],
+            "p90": durations[min(n - 1, (n * 9) // 10)],
+        }
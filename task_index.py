@@ -0,0 +1,775 @@
+#!/usr/bin/env python3
+import heapq
+import json
+import re
+from bisect import bisect_left, insort
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"\w+")
+
+INF = float("inf")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens.
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        List of lowercase tokens made of letters, digits and underscores.
+    """
+    return TOKEN_RE.findall(text.lower())
+
+
+class TaskIndex:
+    """Base class for secondary indexes over tasks.
+
+    TaskManager persists each index next to the store and keeps it in step with
+    mutations by calling remove() with the old version of every changed task
+    and add() with the new version. An index that is missing or out of date is
+    rebuilt from the full task list.
+
+    Subclasses implement add, remove, to_data and from_data, and may override
+    dump and load to choose their own file encoding.
+    """
+
+    name = ""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        # Store signature ([size, mtime_ns]) this index was last synced with.
+        self.signature: Optional[List[int]] = None
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """Index every task from scratch.
+
+        Args:
+            tasks: All tasks in the store.
+        """
+        for t in tasks:
+            self.add(t)
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Add a task to the index."""
+        raise NotImplementedError
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Remove a task (as it was when added) from the index."""
+        raise NotImplementedError
+
+    def to_data(self) -> Any:
+        """Get a JSON-serializable representation of the index."""
+        raise NotImplementedError
+
+    @classmethod
+    def from_data(cls, data: Any) -> "TaskIndex":
+        """Create an index from the output of to_data()."""
+        raise NotImplementedError
+
+    def dump(self) -> bytes:
+        """Encode the index for its file: to_data() as one line of JSON."""
+        return json.dumps(self.to_data(), separators=(",", ":")).encode("utf-8") + b"\n"
+
+    @classmethod
+    def load(cls, data: bytes) -> "TaskIndex":
+        """Create an index from the output of dump()."""
+        return cls.from_data(json.loads(data))
+
+
+class TextIndex(TaskIndex):
+    """Inverted index from description tokens to task ids.
+
+    Queries are whitespace-separated terms. Terms are combined with AND by
+    default; the keyword OR separates alternatives ("deploy api OR release"
+    means "(deploy AND api) OR release"). A term ending in "*" matches any
+    token starting with it.
+
+    The file encoding is one "token id,id,..." line per token, sorted by
+    token, so read_terms can find a token by bisecting the file instead of
+    parsing the whole index.
+    """
+
+    name = "text"
+
+    def __init__(self) -> None:
+        """Initialize an empty text index."""
+        super().__init__()
+        self.postings: Dict[str, Set[int]] = {}
+        self._sorted_tokens: Optional[List[str]] = (
+            None  # built lazily for prefix queries
+        )
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Add a task's description tokens to the index."""
+        for token in set(tokenize(task["description"])):
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = ids = set()
+                self._sorted_tokens = None
+            ids.add(task["id"])
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Remove a task's description tokens from the index."""
+        for token in set(tokenize(task["description"])):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(task["id"])
+            if not ids:
+                del self.postings[token]
+                self._sorted_tokens = None
+
+    def to_data(self) -> Dict[str, List[int]]:
+        """Get the postings as token -> sorted list of ids."""
+        return {token: sorted(ids) for token, ids in self.postings.items()}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, List[int]]) -> "TextIndex":
+        """Create a text index from token -> list of ids."""
+        index = cls()
+        index.postings = {token: set(ids) for token, ids in data.items()}
+        return index
+
+    def dump(self) -> bytes:
+        """Encode the postings as "token id,id,..." lines sorted by token."""
+        return b"".join(
+            f"{token} {','.join(map(str, sorted(self.postings[token])))}\n".encode(
+                "utf-8"
+            )
+            for token in sorted(self.postings)
+        )
+
+    @classmethod
+    def load(cls, data: bytes) -> "TextIndex":
+        """Create a text index from the output of dump()."""
+        index = cls()
+        for line in data.decode("utf-8").splitlines():
+            token, ids = line.split(" ")
+            index.postings[token] = {int(i) for i in ids.split(",")}
+        return index
+
+    @classmethod
+    def read_terms(
+        cls, f: BinaryIO, start: int, end: int, terms: Iterable[str]
+    ) -> "TextIndex":
+        """Read the postings of the tokens matching some terms from a file.
+
+        Each term is found by bisecting the sorted lines, so only a few lines
+        per term are read whatever the size of the index.
+
+        Args:
+            f: Binary file holding the output of dump() between start and end.
+            start: Offset of the first line.
+            end: Offset just past the last line.
+            terms: Query terms; "term*" reads every token starting with term.
+
+        Returns:
+            A text index holding only the matching tokens, which answers
+            queries made of these terms like the full index would.
+        """
+        index = cls()
+        for term in set(terms):
+            prefix = term.endswith("*")
+            key = (term[:-1] if prefix else term).encode("utf-8")
+            f.seek(cls._find_line(f, start, end, key))
+            while f.tell() < end:
+                token, ids = f.readline().rstrip(b"\n").split(b" ")
+                if token != key and not (prefix and token.startswith(key)):
+                    break
+                index.postings[token.decode("utf-8")] = {
+                    int(i) for i in ids.split(b",")
+                }
+        return index
+
+    @staticmethod
+    def _find_line(f: BinaryIO, start: int, end: int, key: bytes) -> int:
+        """Get the offset of the first line whose token is >= key (end if none)."""
+
+        def line_at_or_after(pos: int) -> int:
+            f.seek(max(pos - 1, start))
+            if pos > start:
+                f.readline()  # skip to the start of the next line
+            return f.tell()
+
+        lo, hi = start, end
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line = line_at_or_after(mid)
+            if line >= end or f.readline().split(b" ", 1)[0] >= key:
+                hi = mid
+            else:
+                lo = mid + 1
+        return line_at_or_after(lo)
+
+    def _match_term(self, term: str) -> Set[int]:
+        """Get the ids of tasks containing a term (or, for "term*", a prefix)."""
+        if not term.endswith("*"):
+            return self.postings.get(term, set())
+
+        prefix = term[:-1]
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.postings)
+        tokens = self._sorted_tokens
+        ids: Set[int] = set()
+        for i in range(bisect_left(tokens, prefix), len(tokens)):
+            if not tokens[i].startswith(prefix):
+                break
+            ids |= self.postings[tokens[i]]
+        return ids
+
+    @staticmethod
+    def parse(query: str) -> List[List[str]]:
+        """Split a query into groups of terms, one group per OR alternative.
+
+        Args:
+            query: Terms separated by whitespace, with optional OR and AND
+                  keywords and trailing "*" for prefix terms.
+
+        Returns:
+            Groups of tokenized terms; prefix terms keep their trailing "*".
+        """
+        groups: List[List[str]] = [[]]
+        for word in query.split():
+            if word == "OR":
+                groups.append([])
+            elif word != "AND":
+                prefix = word.endswith("*")
+                tokens = tokenize(word)
+                if prefix and tokens:
+                    tokens[-1] += "*"
+                groups[-1].extend(tokens)
+        return groups
+
+    def search(self, query: str) -> Set[int]:
+        """Find the ids of tasks matching a query.
+
+        Args:
+            query: Terms separated by whitespace, with optional OR and AND
+                  keywords and trailing "*" for prefix terms.
+
+        Returns:
+            Set of matching task ids.
+        """
+        result: Set[int] = set()
+        for terms in self.parse(query):
+            if not terms:
+                continue
+            # Intersect starting from the rarest term to keep intermediates small.
+            matches = sorted((self._match_term(term) for term in terms), key=len)
+            ids = matches[0]
+            for other in matches[1:]:
+                if not ids:
+                    break
+                ids = ids & other
+            result |= ids
+        return result
+
+
+class TimeIndex(TaskIndex):
+    """Sorted (timestamp, id) entries for createdAt and updatedAt.
+
+    Range queries bisect into the sorted entries, so they cost
+    O(log n + matches) instead of comparing every task's timestamp.
+    """
+
+    name = "time"
+
+    FIELDS = ("createdAt", "updatedAt")
+
+    def __init__(self) -> None:
+        """Initialize an empty time index."""
+        super().__init__()
+        self.entries: Dict[str, List[Tuple[Any, int]]] = {
+            field: [] for field in self.FIELDS
+        }
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """Index every task from scratch with one sort per field."""
+        tasks = list(tasks)
+        for field in self.FIELDS:
+            self.entries[field] = sorted((t[field], t["id"]) for t in tasks)
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Insert a task's timestamps in sorted position."""
+        for field in self.FIELDS:
+            insort(self.entries[field], (task[field], task["id"]))
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Remove a task's timestamps."""
+        for field in self.FIELDS:
+            entries = self.entries[field]
+            key = (task[field], task["id"])
+            i = bisect_left(entries, key)
+            if i < len(entries) and entries[i] == key:
+                del entries[i]
+
+    def to_data(self) -> Dict[str, List[List[Any]]]:
+        """Get the entries as field -> list of [timestamp, id] pairs."""
+        return {
+            field: [list(e) for e in entries] for field, entries in self.entries.items()
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict[str, List[List[Any]]]) -> "TimeIndex":
+        """Create a time index from field -> list of [timestamp, id] pairs."""
+        index = cls()
+        index.entries = {field: [tuple(e) for e in data[field]] for field in cls.FIELDS}
+        return index
+
+    def _bounds(
+        self,
+        field: str,
+        start: Any,
+        end: Any,
+        include_start: bool,
+        include_end: bool,
+    ) -> Tuple[int, int]:
+        """Get the slice of entries[field] between start and end."""
+        entries = self.entries[field]
+        # (value,) sorts before, and (value, inf) after, every (value, id) entry.
+        lo = (
+            0
+            if start is None
+            else bisect_left(entries, (start,) if include_start else (start, INF))
+        )
+        hi = (
+            len(entries)
+            if end is None
+            else bisect_left(entries, (end, INF) if include_end else (end,))
+        )
+        return lo, max(lo, hi)
+
+    def range(
+        self,
+        field: str,
+        start: Any = None,
+        end: Any = None,
+        include_start: bool = True,
+        include_end: bool = False,
+    ) -> List[int]:
+        """Get the ids of tasks whose timestamp lies between start and end.
+
+        Args:
+            field: "createdAt" or "updatedAt".
+            start: Lower bound, or None for no lower bound.
+            end: Upper bound, or None for no upper bound.
+            include_start: Whether start itself matches. Defaults to True.
+            include_end: Whether end itself matches. Defaults to False.
+
+        Returns:
+            Matching task ids in timestamp order.
+        """
+        lo, hi = self._bounds(field, start, end, include_start, include_end)
+        return [task_id for _, task_id in self.entries[field][lo:hi]]
+
+    def count(
+        self,
+        field: str,
+        start: Any = None,
+        end: Any = None,
+        include_start: bool = True,
+        include_end: bool = False,
+    ) -> int:
+        """Count tasks in a range without building the id list (see range)."""
+        lo, hi = self._bounds(field, start, end, include_start, include_end)
+        return hi - lo
+
+
+class StatusIndex(TaskIndex):
+    """Set of task ids per status."""
+
+    name = "status"
+
+    def __init__(self) -> None:
+        """Initialize an empty status index."""
+        super().__init__()
+        self.ids: Dict[str, Set[int]] = {}
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Add a task under its status."""
+        self.ids.setdefault(task["status"], set()).add(task["id"])
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Remove a task from its status."""
+        self.ids.get(task["status"], set()).discard(task["id"])
+
+    def to_data(self) -> Dict[str, List[int]]:
+        """Get the index as status -> sorted list of ids."""
+        return {status: sorted(ids) for status, ids in self.ids.items()}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, List[int]]) -> "StatusIndex":
+        """Create a status index from status -> list of ids."""
+        index = cls()
+        index.ids = {status: set(ids) for status, ids in data.items()}
+        return index
+
+    def lookup(self, statuses: Iterable[str]) -> Set[int]:
+        """Get the ids of tasks with any of the given statuses."""
+        result: Set[int] = set()
+        for status in statuses:
+            result |= self.ids.get(status, set())
+        return result
+
+
+class NextIndex(TaskIndex):
+    """Priority heap of the tasks that are not done.
+
+    Tasks are ordered by priority (highest first), then due date (earliest
+    first, tasks without one last), then id. The heap uses lazy deletion:
+    remove() only forgets a task's current key, and entries that no longer
+    match are dropped when they reach the top. Picking the top k tasks costs
+    O(k log n) instead of a sort of every task.
+    """
+
+    name = "next"
+
+    NO_DUE = "~"  # sorts after every ISO date
+
+    def __init__(self) -> None:
+        """Initialize an empty heap."""
+        super().__init__()
+        self.heap: List[Tuple[int, str, int]] = []
+        self.keys: Dict[int, Tuple[int, str, int]] = {}  # id -> current heap key
+
+    @classmethod
+    def key(cls, task: Dict[str, Any]) -> Optional[Tuple[int, str, int]]:
+        """Get a task's heap key, or None if the task is done."""
+        if task["status"] == "done":
+            return None
+        return (-task.get("priority", 0), task.get("due") or cls.NO_DUE, task["id"])
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """Index every task from scratch with one heapify."""
+        self.keys = {}
+        for t in tasks:
+            key = self.key(t)
+            if key is not None:
+                self.keys[t["id"]] = key
+        self.heap = list(self.keys.values())
+        heapq.heapify(self.heap)
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Push a task onto the heap unless it is done."""
+        key = self.key(task)
+        if key is None:
+            return
+        self.keys[task["id"]] = key
+        heapq.heappush(self.heap, key)
+        if len(self.heap) > 2 * len(self.keys) + 64:
+            # Mostly stale entries: compact.
+            self.heap = list(self.keys.values())
+            heapq.heapify(self.heap)
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Forget a task's key; its heap entry is dropped lazily."""
+        self.keys.pop(task["id"], None)
+
+    def to_data(self) -> List[List[Any]]:
+        """Get the current keys as [-priority, due, id] lists."""
+        return [list(key) for key in self.keys.values()]
+
+    @classmethod
+    def from_data(cls, data: List[List[Any]]) -> "NextIndex":
+        """Create a heap from [-priority, due, id] lists."""
+        index = cls()
+        index.keys = {key[2]: tuple(key) for key in data}
+        index.heap = list(index.keys.values())
+        heapq.heapify(index.heap)
+        return index
+
+    def top(self, k: int) -> List[int]:
+        """Get the ids of the first k tasks in heap order.
+
+        Args:
+            k: The number of tasks to get.
+
+        Returns:
+            Up to k task ids, most important first.
+        """
+        heap, keys = self.heap, self.keys
+        found: List[Tuple[int, str, int]] = []
+        while heap and len(found) < k:
+            key = heapq.heappop(heap)
+            # Skip stale entries and a second copy of the one just taken.
+            if keys.get(key[2]) == key and (not found or found[-1] != key):
+                found.append(key)
+        for key in found:
+            heapq.heappush(heap, key)
+        return [key[2] for key in found]
+
+
+class TagIndex(TaskIndex):
+    """Set of task ids per tag.
+
+    Each tag maps to the set of ids of the tasks that have it, so a change
+    touches only the task's own tags and costs the same whatever the ids
+    are. All-of lookups intersect the tags' sets smallest first, any-of
+    lookups join them. Sets are persisted as sorted id lists.
+    """
+
+    name = "tag"
+
+    def __init__(self) -> None:
+        """Initialize an empty tag index."""
+        super().__init__()
+        self.tags: Dict[str, Set[int]] = {}
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Add the task's id to each of its tags."""
+        for tag in task.get("tags", ()):
+            self.tags.setdefault(tag, set()).add(task["id"])
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Remove the task's id from each of its tags, dropping empty tags."""
+        for tag in task.get("tags", ()):
+            ids = self.tags.get(tag)
+            if ids is not None:
+                ids.discard(task["id"])
+                if not ids:
+                    del self.tags[tag]
+
+    def to_data(self) -> Dict[str, List[int]]:
+        """Get the index as tag -> sorted task ids."""
+        return {tag: sorted(ids) for tag, ids in self.tags.items()}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, List[int]]) -> "TagIndex":
+        """Create a tag index from tag -> task ids."""
+        index = cls()
+        index.tags = {tag: set(ids) for tag, ids in data.items()}
+        return index
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of tasks per tag."""
+        return {tag: len(ids) for tag, ids in sorted(self.tags.items())}
+
+    def lookup(
+        self, all_tags: Iterable[str] = (), any_tags: Iterable[str] = ()
+    ) -> List[int]:
+        """Get the ids of tasks with every tag in all_tags and any tag in any_tags.
+
+        Args:
+            all_tags: Tags a task must all have. Ignored if empty.
+            any_tags: Tags a task must have at least one of. Ignored if empty.
+
+        Returns:
+            Matching task ids in ascending order (none if both are empty).
+        """
+        groups = sorted((self.tags.get(tag, set()) for tag in set(all_tags)), key=len)
+        any_tags = list(any_tags)
+        if any_tags:
+            groups.append(set().union(*(self.tags.get(tag, ()) for tag in any_tags)))
+            groups.sort(key=len)
+        if not groups:
+            return []
+        ids = groups[0].intersection(*groups[1:])
+        return sorted(ids)
+
+
+class DependencyIndex(TaskIndex):
+    """Dependency graph with per-task counts of unfinished blockers.
+
+    A task lists the ids of its blockers in "dependsOn" and is ready when it
+    is not done and none of its blockers is unfinished. Deleting a task
+    removes it from the "dependsOn" of its dependents. The index keeps, for
+    every task, how many of
+    its blockers are unfinished, and the set of ready tasks. Marking a task
+    done removes its unfinished version and adds its done one, which only
+    decrements the counts of its dependents; the graph is never re-walked.
+    """
+
+    name = "deps"
+
+    def __init__(self) -> None:
+        """Initialize an empty dependency index."""
+        super().__init__()
+        self.ids: Set[int] = set()  # every task
+        self.open: Set[int] = set()  # tasks that are not done
+        self.blockers: Dict[
+            int, List[int]
+        ] = {}  # id -> dependsOn, for tasks with blockers
+        self.dependents: Dict[
+            int, Set[int]
+        ] = {}  # blocker id -> ids of tasks that depend on it
+        self.unfinished: Dict[int, int] = {}  # id -> number of open blockers, if not 0
+        self.ready: Set[int] = set()
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Add a task, counting its open blockers and blocking its dependents."""
+        task_id = task["id"]
+        is_open = task["status"] != "done"
+        self.ids.add(task_id)
+        blockers = task.get("dependsOn")
+        if blockers:
+            self.blockers[task_id] = list(blockers)
+            count = 0
+            for b in blockers:
+                self.dependents.setdefault(b, set()).add(task_id)
+                count += b in self.open
+            if count:
+                self.unfinished[task_id] = count
+        if is_open:
+            self.open.add(task_id)
+            for d in self.dependents.get(task_id, ()):
+                if d in self.ids:
+                    self.unfinished[d] = self.unfinished.get(d, 0) + 1
+                    self.ready.discard(d)
+            if task_id not in self.unfinished:
+                self.ready.add(task_id)
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Remove a task, unblocking its dependents if it was open."""
+        task_id = task["id"]
+        self.ids.discard(task_id)
+        self.ready.discard(task_id)
+        if task_id in self.open:
+            self.open.discard(task_id)
+            for d in self.dependents.get(task_id, ()):
+                count = self.unfinished.get(d, 0) - 1
+                if count > 0:
+                    self.unfinished[d] = count
+                elif d in self.unfinished:
+                    del self.unfinished[d]
+                    if d in self.open:
+                        self.ready.add(d)
+        for b in self.blockers.pop(task_id, ()):
+            dependents = self.dependents.get(b)
+            if dependents is not None:
+                dependents.discard(task_id)
+                if not dependents:
+                    del self.dependents[b]
+        self.unfinished.pop(task_id, None)
+
+    def to_data(self) -> Dict[str, Any]:
+        """Get the task ids, the open ids and id -> dependsOn."""
+        return {
+            "ids": sorted(self.ids),
+            "open": sorted(self.open),
+            "blockers": {
+                str(task_id): blockers for task_id, blockers in self.blockers.items()
+            },
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "DependencyIndex":
+        """Create a dependency index, recounting blockers from the graph."""
+        index = cls()
+        index.ids = set(data["ids"])
+        index.open = set(data["open"])
+        index.blockers = {
+            int(task_id): blockers for task_id, blockers in data["blockers"].items()
+        }
+        for task_id, blockers in index.blockers.items():
+            count = 0
+            for b in blockers:
+                index.dependents.setdefault(b, set()).add(task_id)
+                count += b in index.open
+            if count:
+                index.unfinished[task_id] = count
+        index.ready = {
+            task_id for task_id in index.open if task_id not in index.unfinished
+        }
+        return index
+
+    def find_path(self, start: int, goal: int) -> Optional[List[int]]:
+        """Find a chain of dependencies leading from start to goal.
+
+        Args:
+            start: The task to start from.
+            goal: The task to look for among start's (transitive) blockers.
+
+        Returns:
+            The ids from start to goal, each depending on the next, or None
+            if start doesn't depend on goal.
+        """
+        parents: Dict[int, int] = {start: start}
+        stack = [start]
+        while stack:
+            task_id = stack.pop()
+            if task_id == goal:
+                path = [goal]
+                while path[-1] != start:
+                    path.append(parents[path[-1]])
+                return path[::-1]
+            for b in self.blockers.get(task_id, ()):
+                if b not in parents:
+                    parents[b] = task_id
+                    stack.append(b)
+        return None
+
+
+class ViewIndex(TaskIndex):
+    """Materialized results of saved views (named where queries).
+
+    Keeps, for each view, its query and the set of ids of the tasks that
+    match it. A change is applied by testing only the changed tasks against
+    each view's predicate, so results never need a pass over the store, and
+    reading a view costs O(result size).
+
+    Predicates depend on the store's timestamp format, so they are not
+    persisted: TaskManager compiles them from the queries with bind().
+    """
+
+    name = "views"
+
+    def __init__(self) -> None:
+        """Initialize an index without views."""
+        super().__init__()
+        self.queries: Dict[str, str] = {}
+        self.results: Dict[str, Set[int]] = {}
+        self.predicates: Dict[str, Callable[[Dict[str, Any]], bool]] = {}
+
+    def bind(self, compile: Callable[[str], Callable[[Dict[str, Any]], bool]]) -> None:
+        """Compile the predicate of every view with compile(query)."""
+        self.predicates = {view: compile(query) for view, query in self.queries.items()}
+
+    def set_view(
+        self,
+        view: str,
+        query: str,
+        predicate: Callable[[Dict[str, Any]], bool],
+        ids: Iterable[int] = (),
+    ) -> None:
+        """Add or replace a view with its current results."""
+        self.queries[view] = query
+        self.predicates[view] = predicate
+        self.results[view] = set(ids)
+
+    def drop_view(self, view: str) -> None:
+        """Remove a view."""
+        self.queries.pop(view, None)
+        self.predicates.pop(view, None)
+        self.results.pop(view, None)
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Add the task to every view whose query it matches."""
+        for view, predicate in self.predicates.items():
+            if predicate(task):
+                self.results[view].add(task["id"])
+
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Remove the task from every view."""
+        for ids in self.results.values():
+            ids.discard(task["id"])
+
+    def to_data(self) -> Dict[str, Dict[str, Any]]:
+        """Get the index as view -> {"where": query, "ids": sorted ids}."""
+        return {
+            view: {"where": self.queries[view], "ids": sorted(ids)}
+            for view, ids in self.results.items()
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Dict[str, Any]]) -> "ViewIndex":
+        """Create a view index (without predicates) from view -> {"where", "ids"}."""
+        index = cls()
+        for view, entry in data.items():
+            index.queries[view] = entry["where"]
+            index.results[view] = set(entry["ids"])
+        return index
+
+    def lookup(self, view: str) -> List[int]:
+        """Get the ids of the tasks in a view, in ascending order."""
+        return sorted(self.results.get(view, ()))
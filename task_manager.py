@@ -1,14 +1,279 @@
 #!/usr/bin/env python3
+import atexit
+import base64
+import gc
+import gzip
+import hashlib
+import heapq
+import importlib.util
 import json
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import lzma
+import marshal
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: saves are then not locked against other processes
+    fcntl = None
+
+from task_columns import TaskColumns
+from task_index import (
+    DependencyIndex,
+    NextIndex,
+    StatusIndex,
+    TagIndex,
+    TaskIndex,
+    TextIndex,
+    TimeIndex,
+    ViewIndex,
+)
+from task_query import TIME_FIELDS, Condition, conjuncts, parse_query
+from task_recurring import RecurrenceRule, TemplateScheduler
+from task_snapshot import TaskSnapshot
+
+# A point in time: a datetime, an ISO format string, epoch milliseconds, or a
+# timedelta (or an age string such as "7d") meaning "this long before now".
+TimeValue = Union[datetime, str, int, timedelta]
+
+DURATION_UNITS = {
+    "s": "seconds",
+    "m": "minutes",
+    "h": "hours",
+    "d": "days",
+    "w": "weeks",
+}
+
+
+def parse_duration(value: str) -> Optional[timedelta]:
+    """Parse an age such as "30m", "12h", "7d" or "2w".
+
+    Args:
+        value: The string to parse.
+
+    Returns:
+        The corresponding timedelta, or None if value is not an age.
+    """
+    unit = DURATION_UNITS.get(value[-1:])
+    if unit is not None and value[:-1].isdigit():
+        return timedelta(**{unit: int(value[:-1])})
+    return None
+
+
+def iso_to_epoch_ms(value: str) -> int:
+    """Convert an ISO format local timestamp to epoch milliseconds.
+
+    Args:
+        value: ISO format date or date and time, e.g. "2026-10-01T09:30:00".
+
+    Returns:
+        Milliseconds since the Unix epoch.
+
+    Raises:
+        ValueError: If value is not a valid ISO timestamp.
+    """
+    dt = datetime.fromisoformat(value)
+    return int(dt.timestamp()) * 1000 + dt.microsecond // 1000
+
+
+def format_timestamp(value: Union[str, int]) -> str:
+    """Format a stored timestamp for output.
+
+    Args:
+        value: Epoch milliseconds or an ISO format string.
+
+    Returns:
+        The local time as an ISO format string (YYYY-MM-DDTHH:MM:SS); ISO
+        strings are returned unchanged.
+    """
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value // 1000).isoformat(timespec="seconds")
+    return value
+
+
+# Compressed store suffixes mapped to the valid compression level range.
+COMPRESSED_SUFFIXES = {".gz": (0, 9), ".xz": (0, 9)}
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Sidecar file holding the store header (counts, next id, sequence number).
+HEADER_SUFFIX = ".meta"
+HEADER_VERSION = 3
+
+# Binary snapshot cache of the parsed store, like a .pyc for tasks.json. The
+# header holds a magic, the interpreter's bytecode magic (marshal data is
+# version specific), and the size, mtime_ns and BLAKE2b digest of the source.
+SNAPSHOT_SUFFIX = ".cache"
+SNAPSHOT_MAGIC = b"TTSC"
+SNAPSHOT_HEADER = struct.Struct("<4s4sQq32s")
+
+# Columnar view of the store for reports, tagged with the store signature.
+COLUMNS_SUFFIX = ".columns"
+COLUMNS_HEADER = struct.Struct("<Qq")
+
+# Byte offsets of the tasks in a plain JSON store, tagged with the store
+# signature: the task count, then the ids and the offsets as int64 arrays.
+OFFSETS_SUFFIX = ".offsets"
+OFFSETS_HEADER = struct.Struct("<QqQ")
+
+# In json.dump(tasks, indent=2) output every task starts on a line indented by
+# two spaces. Strings have their newlines escaped, so nothing else matches.
+TASK_START = re.compile("\n  {")
+TASK_ENCODER = json.JSONEncoder(indent=2)
+
+# Lock file held while a change is read, checked and saved.
+LOCK_SUFFIX = ".lock"
+
+# Write-behind defaults: save pending changes at least this often (seconds),
+# or as soon as this many changes are pending.
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_OPS = 1000
+
+# Recurring task templates of a store (or named list) are kept in
+# "<store path>.recurring".
+RECURRING_SUFFIX = ".recurring"
+RECURRING_VERSION = 1
+
+# Saved views (name -> where query) are kept in "<store path>.views"; their
+# materialized results are the "views" index.
+VIEWS_SUFFIX = ".views"
+VIEWS_VERSION = 1
+
+# Named task lists other than the default one are kept in
+# "<store path>.lists/<name>/", each with its own store file and sidecars.
+LISTS_SUFFIX = ".lists"
+DEFAULT_NAMESPACE = "default"
+NAMESPACE_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+# Secondary indexes are persisted as "<store path>.<index name>.idx": a
+# fixed-width meta line, the index data (TaskIndex.dump(), its length in the
+# meta line), then a journal of the changes saved since, one line each.
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 2
+INDEX_META_WIDTH = 127
+# A loaded index with this many journaled changes is rewritten in full; a
+# journal never grows past INDEX_JOURNAL_MAX (the index is dropped instead).
+INDEX_JOURNAL_COMPACT = 64
+INDEX_JOURNAL_MAX = 256
+# Changes of more tasks than this rewrite loaded indexes and drop the others.
+INDEX_JOURNAL_TASKS = 1000
+
+# Chunk size for streaming passes over the store (migrate_timestamps), and
+# the number of tasks encoded per write.
+STREAM_CHUNK_CHARS = 1 << 20
+MIGRATE_BATCH_TASKS = 4096
+
+# Bytes copied per read when an in-place change copies the rest of the store.
+COPY_CHUNK_BYTES = 1 << 20
+
+
+class VersionConflict(ValueError):
+    """Raised when a task changed since the version a writer expected.
+
+    Attributes:
+        task_id: The id of the task.
+        expected: The version the writer expected.
+        current: The task as it is now.
+    """
+
+    def __init__(self, task_id: int, expected: int, current: Dict[str, Any]) -> None:
+        self.task_id = task_id
+        self.expected = expected
+        self.current = current
+        super().__init__(
+            f"Task {task_id} has version {TaskManager._version(current)}, "
+            f"expected {expected}."
+        )
+
+
+class NotFound(ValueError):
+    """Raised when a task, recurring template or saved view doesn't exist."""
+
+
+class TaskNotFound(NotFound):
+    """Raised when there is no task with a given id.
+
+    Attributes:
+        task_id: The id that was looked up.
+    """
+
+    def __init__(self, task_id: Any) -> None:
+        self.task_id = task_id
+        super().__init__(f"Task with id {task_id} not found.")
+
+
+# TaskManagers in write-behind mode, closed (and so flushed) at exit.
+_WRITE_BEHIND: set = set()
+
+
+@atexit.register
+def _close_write_behind() -> None:
+    for tm in list(_WRITE_BEHIND):
+        tm.close()
+
 
 class TaskManager:
     """Core task management logic.
     
     Manages tasks stored in a JSON file with operations for creating, reading,
     updating, and deleting tasks. Each task has an id, description, status,
-    createdAt, and updatedAt timestamp.
+    createdAt, and updatedAt timestamp, and optionally a priority, a due
+    date (see next_tasks), tags and the ids of the tasks it depends on
+    (see block_task).
+
+    Paths ending in ".gz" or ".xz" are stored as compact, compressed JSON
+    (e.g. "tasks.json.gz"); any other path is stored as indented plain JSON.
+
+    Every save also writes a small header next to the store ("tasks.json.meta")
+    with the total and per-status counts, the next id and a sequence number
+    that increases on each save. The header records the size and mtime of the
+    store it describes, so a store edited by hand is detected and the header
+    is rebuilt from the tasks.
+
+    Secondary indexes (see task_index.py) are persisted the same way, e.g. the
+    description search index in "tasks.json.text.idx". Saves update the indexes
+    incrementally with the tasks that changed; an index that is missing or
+    doesn't match the store is rebuilt the next time it is used.
+
+    A plain JSON store also gets "tasks.json.offsets", the byte offset of
+    every task in the file. With it, a change to one task (status,
+    description, delete) decodes and rewrites only that task's JSON object.
+
+    Every task has a version, 1 when added and increased by each change, and
+    changes can be made conditional on it (expected_version). Reads take no
+    lock; a change holds an exclusive lock on "tasks.json.lock" only while it
+    rereads the store, checks the version and saves, so writers that touch
+    different tasks don't wait on each other's reads or think time.
+
+    A store can hold several named task lists (namespace). The default list
+    is the file at path; list "ops" lives in "tasks.json.lists/ops/tasks.json"
+    with its own header, indexes and ids, so working on one list never reads
+    or rewrites another (see lists and move_task).
+
+    With write_behind=True, changes are applied in memory and saved by a
+    background thread every flush_interval seconds or after flush_ops changes,
+    and on flush(), close() or interpreter exit. The store stays locked while
+    changes are pending.
     """
 
     STATUS_TODO = "todo"
@@ -17,13 +282,125 @@ class TaskManager:
 
     VALID_STATUSES = {STATUS_TODO, STATUS_IN_PROGRESS, STATUS_DONE}
 
-    def __init__(self, path: str = "tasks.json") -> None:
+    SORT_FIELDS = ("id", "createdAt", "updatedAt", "description")
+
+    INDEX_TYPES = {
+        StatusIndex.name: StatusIndex,
+        TextIndex.name: TextIndex,
+        TimeIndex.name: TimeIndex,
+        NextIndex.name: NextIndex,
+        TagIndex.name: TagIndex,
+        DependencyIndex.name: DependencyIndex,
+        ViewIndex.name: ViewIndex,
+    }
+
+    def __init__(
+        self,
+        path: str = "tasks.json",
+        compression_level: Optional[int] = None,
+        snapshot_cache: bool = False,
+        epoch_timestamps: bool = False,
+        write_behind: bool = False,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_ops: int = DEFAULT_FLUSH_OPS,
+        namespace: Optional[str] = None,
+    ) -> None:
         """Initialize TaskManager with a file path.
         
         Args:
             path: Path to the JSON file where tasks are stored. Defaults to "tasks.json".
+                  A ".gz" or ".xz" suffix selects gzip or xz compression.
+            compression_level: Compression level (0-9) used when saving a compressed
+                  store. Defaults to 6. Ignored for plain JSON stores.
+            snapshot_cache: If True, keep a binary snapshot of the parsed tasks in
+                  "<path>.cache" and load from it while it matches the store.
+            epoch_timestamps: If True, a new store keeps createdAt/updatedAt as
+                  integer epoch milliseconds instead of ISO strings. An existing
+                  store keeps the representation it already has (see
+                  migrate_timestamps).
+            write_behind: If True, changes are kept in memory and saved by a
+                  background thread (see flush). Call close() when done;
+                  pending changes are also saved at interpreter exit.
+            flush_interval: With write_behind, the longest time in seconds
+                  between background saves. Defaults to 1.0.
+            flush_ops: With write_behind, the number of pending changes that
+                  triggers a save right away. Defaults to 1000.
+            namespace: Name of the task list to work on (letters, digits, "-"
+                  and "_"). Defaults to "default", the list stored at path
+                  itself; see lists().
+
+        Raises:
+            ValueError: If compression_level, flush_interval or flush_ops is
+                       outside the valid range, or namespace is not a valid name.
         """
+        if namespace is None:
+            namespace = DEFAULT_NAMESPACE
+        if not isinstance(namespace, str) or not NAMESPACE_RE.fullmatch(namespace):
+            raise ValueError(f"Invalid list name: {namespace!r}")
+        self.store_path = path
+        self.namespace = namespace
+        if namespace != DEFAULT_NAMESPACE:
+            # The list's files live in their own directory, under the store's file name.
+            path = os.path.join(path + LISTS_SUFFIX, namespace, os.path.basename(path))
         self.path = path
+        self.compression = next(
+            (s for s in COMPRESSED_SUFFIXES if path.endswith(s)), None
+        )
+
+        if compression_level is None:
+            compression_level = DEFAULT_COMPRESSION_LEVEL
+        if self.compression is not None:
+            low, high = COMPRESSED_SUFFIXES[self.compression]
+            if not low <= compression_level <= high:
+                raise ValueError(
+                    f"Invalid compression level: {compression_level} "
+                    f"(expected {low}-{high})"
+                )
+        self.compression_level = compression_level
+        self.header_path = path + HEADER_SUFFIX
+        self.snapshot_cache = snapshot_cache
+        self.snapshot_path = path + SNAPSHOT_SUFFIX
+        self.columns_path = path + COLUMNS_SUFFIX
+        self.offsets_path = path + OFFSETS_SUFFIX
+        self.lock_path = path + LOCK_SUFFIX
+        self.recurring_path = path + RECURRING_SUFFIX
+        self.views_path = path + VIEWS_SUFFIX
+        # (file signature, templates, scheduler) of the last read of the templates.
+        self._recurring: Optional[tuple] = None
+        self.epoch_timestamps = epoch_timestamps
+        self._indexes: Dict[str, TaskIndex] = {}  # indexes loaded in this instance
+        # Pending changes of an open batch(): the task list, the nesting depth
+        # and, per changed id, the task as last saved (None if added since).
+        self._batch: Optional[Dict[str, Any]] = None
+        self._lock_depth = 0  # nesting of _write_lock()
+        # Guards the pending batch against the write-behind flusher thread.
+        self._mutex = threading.RLock()
+        self._view: Optional[TaskSnapshot] = (
+            None  # latest snapshot(), kept current by saves
+        )
+
+        if flush_interval <= 0:
+            raise ValueError(f"Invalid flush interval: {flush_interval}")
+        if flush_ops < 1:
+            raise ValueError(f"Invalid flush ops: {flush_ops}")
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_ops = flush_ops
+        self._pending_ops = 0
+        self._behind_lock: Optional[IO[str]] = (
+            None  # lock file held while changes are pending
+        )
+        self._behind_tasks: Optional[tuple] = (
+            None  # (store signature, tasks) after the last flush
+        )
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if write_behind:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="task-flusher", daemon=True
+            )
+            self._flusher.start()
+            _WRITE_BEHIND.add(self)
 
     # -----------------------------------------
     #  Internal Methods
@@ -41,247 +418,3185 @@ class TaskManager:
         """
         return 1 if not tasks else max(t["id"] for t in tasks) + 1
 
+    def _take_next_id(self, tasks: List[Dict[str, Any]]) -> int:
+        """Get the id for a task being added to tasks.
+
+        Inside a batch() the next id is kept in the batch, so a run of adds
+        scans the task list once instead of once per add.
+        """
+        batch = self._batch
+        if batch is None:
+            return self._next_id(tasks)
+        next_id = batch.get("nextId") or self._next_id(tasks)
+        batch["nextId"] = next_id + 1
+        return next_id
+
+    def _open_store(self, mode: str, path: Optional[str] = None) -> IO[str]:
+        """Open the store file in text mode, compressing or decompressing by suffix.
+
+        Compressed stores are decoded through a streaming decompressor, so the
+        compressed bytes are never held in memory alongside the decoded text.
+
+        Args:
+            mode: "r" to read or "w" to write.
+            path: File to open in the store's format instead of the store
+                  itself (e.g. a temporary file). Defaults to the store path.
+
+        Returns:
+            A text file object for the store.
+        """
+        path = path or self.path
+        if self.compression == ".gz":
+            return gzip.open(
+                path, mode + "t", compresslevel=self.compression_level, encoding="utf-8"
+            )
+        if self.compression == ".xz":
+            preset = self.compression_level if mode == "w" else None
+            return lzma.open(path, mode + "t", preset=preset, encoding="utf-8")
+        return open(path, mode, encoding="utf-8")
+
+    def _iter_store(self) -> Iterator[Dict[str, Any]]:
+        """Stream the tasks of the store one at a time.
+
+        The store is decoded in chunks of STREAM_CHUNK_CHARS characters, so
+        memory use doesn't grow with the number of tasks.
+
+        Yields:
+            Task dictionaries in file order. Nothing is yielded if the store
+            doesn't exist.
+
+        Raises:
+            ValueError: If the store can't be read or is not a JSON list.
+        """
+        decoder = json.JSONDecoder()
+        try:
+            with self._open_store("r") as tf:
+                buf, pos, eof = "", 0, False
+                started = False
+                while True:
+                    while pos < len(buf) and buf[pos] in " \t\r\n,":
+                        pos += 1
+                    if pos == len(buf):
+                        if eof:
+                            break
+                        chunk = tf.read(STREAM_CHUNK_CHARS)
+                        eof = not chunk
+                        buf, pos = buf[pos:] + chunk, 0
+                        continue
+                    if not started:
+                        if buf[pos] != "[":
+                            raise ValueError(
+                                f"Failed to read tasks from {self.path}: "
+                                "not a JSON list"
+                            )
+                        started, pos = True, pos + 1
+                        continue
+                    if buf[pos] == "]":
+                        return
+                    try:
+                        task, pos = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise ValueError(
+                                f"Failed to read tasks from {self.path}: invalid JSON"
+                            )
+                        chunk = tf.read(STREAM_CHUNK_CHARS)
+                        eof = not chunk
+                        buf, pos = buf[pos:] + chunk, 0
+                        continue
+                    yield task
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, lzma.LZMAError) as e:
+            raise ValueError(f"Failed to read tasks from {self.path}: {e}")
+        if started:
+            raise ValueError(f"Failed to read tasks from {self.path}: invalid JSON")
 
     def _get_tasks(self) -> List[Dict[str, Any]]:
         """Get all tasks from file.
         
+        With the snapshot cache enabled, a fresh snapshot is loaded instead of
+        parsing the JSON, and a new snapshot is written after parsing. Inside
+        a batch() the list is read once and shared by every change.
+
         Returns:
             List of task dictionaries. Returns empty list if file doesn't exist
-            or contains invalid JSON.
-            
+            or is empty.
+
         Raises:
-            ValueError: If there's an OS error reading the file.
+            ValueError: If there's an OS error reading the file, it isn't valid
+                       JSON or the compressed data is corrupt.
         """
+        with self._mutex:
+            if self._batch is not None:
+                if self._batch["tasks"] is None:
+                    self._batch["tasks"] = self._read_tasks()
+                return self._batch["tasks"]
+            return self._read_tasks()
+
+    def _read_tasks(self) -> List[Dict[str, Any]]:
+        """Read all tasks from the snapshot cache or the store (see _get_tasks)."""
+        if self.snapshot_cache:
+            tasks = self._load_snapshot()
+            if tasks is not None:
+                return tasks
+
+        signature = self._store_signature()
         try:
-            with open(self.path,"r",encoding="utf-8") as tf:
-                return json.load(tf)
+            with self._open_store("r") as tf:
+                tasks = json.load(tf)
         except FileNotFoundError:
             return [] # File doesn't exist yet
-        except json.JSONDecodeError:
-            return [] # File is empty or invalid JSON
-        except OSError as e:
+        except json.JSONDecodeError as e:
+            if not e.doc.strip():
+                return []  # File is empty
+            raise ValueError(f"Failed to read tasks from {self.path}: invalid JSON")
+        except (OSError, EOFError, lzma.LZMAError) as e:
             raise ValueError(f"Failed to read tasks from {self.path}: {e}")
 
-    def _get_timestamp(self) -> str:
-        """Get the current timestamp.
+        if self.snapshot_cache:
+            self._write_snapshot(tasks, signature)
+        return tasks
+
+    def _store_digest(self) -> bytes:
+        """Get the BLAKE2b digest of the store file's bytes."""
+        digest = hashlib.blake2b(digest_size=32)
+        with open(self.path, "rb") as sf:
+            for chunk in iter(lambda: sf.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.digest()
+
+    def _load_snapshot(self) -> Optional[List[Dict[str, Any]]]:
+        """Load the snapshot cache if it matches the store.
+
+        The snapshot is fresh if the store's size and mtime match. If only the
+        mtime differs (e.g. the file was touched or copied), the content digest
+        decides, like a hash-checked .pyc.
         
         Returns:
-            ISO format timestamp string (YYYY-MM-DDTHH:MM:SS).
+            The cached task list, or None if the snapshot is missing, stale or
+            unreadable.
         """
-        return datetime.now().isoformat(timespec="seconds")
+        signature = self._store_signature()
+        if signature is None:
+            return None
+        try:
+            with open(self.snapshot_path, "rb") as sf:
+                magic, py_magic, size, mtime_ns, digest = SNAPSHOT_HEADER.unpack(
+                    sf.read(SNAPSHOT_HEADER.size)
+                )
+                if magic != SNAPSHOT_MAGIC or py_magic != importlib.util.MAGIC_NUMBER:
+                    return None
+                if size != signature[0]:
+                    return None
+                if mtime_ns != signature[1] and digest != self._store_digest():
+                    return None
+                data = sf.read()  # one read; marshal.load(sf) reads object by object
+        except (OSError, struct.error):
+            return None
 
-    def _find_task(self, tasks: List[Dict[str, Any]], task_id: int) -> Optional[Dict[str, Any]]:
-        """Find a task by id.
+        # Nothing is freed while unmarshalling, so collection passes are pure overhead.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _write_snapshot(
+        self, tasks: List[Dict[str, Any]], signature: Optional[List[int]]
+    ) -> None:
+        """Write the snapshot cache for tasks parsed from (or saved to) the store.
+
+        Nothing is written if the store changed since signature was taken, so
+        a snapshot never describes a file it wasn't made from. Like the header,
+        the snapshot is derived data and write errors are ignored.
         
         Args:
-            tasks: List of tasks to search through.
-            task_id: The id of the task to find.
-            
-        Returns:
-            The task dictionary if found, None otherwise.
+            tasks: The task list matching the store.
+            signature: Store signature taken before the store was read or
+                      right after it was written.
         """
+        if signature is None or signature != self._store_signature():
+            return
+
+        # Share equal status and timestamp strings: marshal then writes a
+        # back-reference instead of a copy, and loading allocates far fewer strings.
+        memo: Dict[Any, Any] = {}
         for t in tasks:
-            if t["id"] == task_id:
-                return t
-        return None
+            for key in ("status", "createdAt", "updatedAt"):
+                if key in t:
+                    t[key] = memo.setdefault(t[key], t[key])
 
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            header = SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC,
+                importlib.util.MAGIC_NUMBER,
+                signature[0],
+                signature[1],
+                self._store_digest(),
+            )
+            with open(tmp_path, "wb") as sf:
+                sf.write(header + marshal.dumps(tasks))
+            os.replace(tmp_path, self.snapshot_path)
+        except (OSError, ValueError):
+            pass
 
-    def _save_tasks(self, tasks: List[Dict[str, Any]]) -> None:
-        """Save tasks to file.
+    def _uses_epoch(self) -> bool:
+        """Check whether the store keeps timestamps as epoch milliseconds.
+
+        The header records the representation of the stored tasks; an empty
+        store follows the epoch_timestamps option. Inside a batch() the
+        pending tasks are checked instead, without building a header.
+        """
+        with self._mutex:
+            if self._batch is not None and self._batch["tasks"]:
+                return isinstance(self._batch["tasks"][0].get("createdAt"), int)
+        stored = self._get_header().get("epochTimestamps")
+        return self.epoch_timestamps if stored is None else stored
+
+    def _get_timestamp(self) -> Union[str, int]:
+        """Get the current timestamp.
+
+        Returns:
+            Epoch milliseconds if the store uses them, otherwise an ISO format
+            timestamp string (YYYY-MM-DDTHH:MM:SS).
+        """
+        if self._uses_epoch():
+            return time.time_ns() // 1_000_000
+        return datetime.now().isoformat(timespec="seconds")
+
+    def _to_timestamp(self, value: TimeValue) -> Union[str, int]:
+        """Normalize a point in time to the stored timestamp format.
         
         Args:
-            tasks: List of task dictionaries to save.
+            value: A datetime, an ISO format string (date or date and time),
+                  epoch milliseconds, or a timedelta or age string ("7d")
+                  interpreted as that long before now.
+
+        Returns:
+            Epoch milliseconds for a store that uses them, otherwise an ISO
+            format timestamp string (YYYY-MM-DDTHH:MM:SS), so that comparisons
+            with stored createdAt/updatedAt values are like for like.
             
         Raises:
-            ValueError: If there's an error writing to the file.
+            ValueError: If value is a string that is not a valid ISO timestamp or age.
         """
-        try:
-            with open(self.path,"w", encoding="utf-8") as tf:
-                json.dump(tasks, tf, indent=2)
-        except (OSError, json.JSONDecodeError):
-            raise ValueError(f"Failed to save tasks to {self.path}")
+        if isinstance(value, str):
+            value = parse_duration(value) or value
+        if isinstance(value, timedelta):
+            value = datetime.now() - value
+        elif isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid timestamp: {value}")
+        elif isinstance(value, int) and not isinstance(value, bool):
+            value = datetime.fromtimestamp(value / 1000)
 
+        if self._uses_epoch():
+            return int(value.timestamp()) * 1000 + value.microsecond // 1000
+        return value.isoformat(timespec="seconds")
+
+    def _filter_time_ranges(self, ranges: Dict[str, tuple]) -> Set[int]:
+        """Get the ids of the tasks whose timestamps fall in the given ranges.
+
+        The ranges are answered by bisecting the time index; no task is read.
 
-    def _update_task_status(self, task_id: int, new_status: str) -> Dict[str, Any]:
-        """Update the status of a task.
-        
         Args:
-            task_id: The id of the task to update.
-            new_status: The new status value (must be a valid status).
-            
+            ranges: Maps "createdAt"/"updatedAt" to an (inclusive start, exclusive
+                   end) pair of TimeValues; None means unbounded.
+
         Returns:
-            The updated task dictionary.
-            
+            The matching ids.
+
         Raises:
-            ValueError: If task with given id is not found or if file save fails.
+            ValueError: If a bound is not a valid point in time.
         """
-        tasks = self._get_tasks()
-        task = self._find_task(tasks, task_id)
-        if task is None:
-            raise ValueError(f"Task with id {task_id} not found.")
-        
-        task["status"] = new_status
-        task["updatedAt"] = self._get_timestamp()
-        self._save_tasks(tasks)
-        return task
+        bounds = {
+            field: tuple(None if b is None else self._to_timestamp(b) for b in pair)
+            for field, pair in ranges.items()
+            if pair != (None, None)
+        }
+        index = self._get_index(TimeIndex.name)
 
-    # -----------------------------------------
-    #  Public Methods
-    # -----------------------------------------
+        ids: Set[int] = set()
+        for n, (field, (start, end)) in enumerate(bounds.items()):
+            matched = set(index.range(field, start, end))
+            ids = matched if not n else ids & matched
+        return ids
 
+    def _parse_where(self, where: str) -> Any:
+        """Parse a where query, normalizing time values like other time filters."""
+        return parse_query(where, self._to_timestamp, self.VALID_STATUSES)
 
-    def add_task(self, description: str) -> Dict[str, Any]:
-        """Add a new task.
+    def _plan_query(
+        self, node: Any, tasks: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Pick the access path for a parsed where query.
         
-        Creates a new task with the given description, assigns it the next
-        available id, sets status to "todo", and adds timestamps.
+        Every top-level AND condition that an index can answer is costed: status
+        conditions from the header counts, time comparisons by bisecting the time
+        index, and description matches from the text index. The path with the
+        fewest candidate tasks wins; a full scan is used if no index beats it.
+
+        Args:
+            node: The parsed query.
+            tasks: The current task list, if already loaded; used if an index
+                  has to be rebuilt.
+
+        Returns:
+            Plan dictionary with access, condition, estimate, total, ids (the
+            candidate ids, or None for a full scan) and options (every path
+            considered).
+        """
+        header = self._get_header()
+        total = header["count"]
+        scan = {
+            "access": "full scan",
+            "condition": None,
+            "estimate": total,
+            "ids": None,
+        }
+        options = [scan]
+
+        for cond in conjuncts(node):
+            if cond.field == "status" and cond.op in ("=", "in"):
+                statuses = [cond.value] if cond.op == "=" else cond.value
+                estimate = sum(header["statusCounts"].get(s, 0) for s in statuses)
+                options.append(
+                    {"access": "status index", "condition": cond, "estimate": estimate}
+                )
+            elif cond.field in TIME_FIELDS and cond.op in ("=", "<", "<=", ">", ">="):
+                time_index = self._get_index(TimeIndex.name, tasks)
+                estimate = time_index.count(cond.field, **self._time_bounds(cond))
+                options.append(
+                    {"access": "time index", "condition": cond, "estimate": estimate}
+                )
+            elif cond.field == "description" and cond.op == "~":
+                ids = self._search_text(cond.value, tasks)
+                options.append(
+                    {
+                        "access": "text index",
+                        "condition": cond,
+                        "estimate": len(ids),
+                        "ids": ids,
+                    }
+                )
+
+        plan = min(
+            options, key=lambda option: option["estimate"]
+        )  # ties keep the earlier option
+        if plan is not scan and plan.get("ids") is None:
+            cond = plan["condition"]
+            if plan["access"] == "status index":
+                statuses = [cond.value] if cond.op == "=" else cond.value
+                plan["ids"] = self._get_index(StatusIndex.name, tasks).lookup(statuses)
+            else:
+                time_index = self._get_index(TimeIndex.name, tasks)
+                plan["ids"] = set(
+                    time_index.range(cond.field, **self._time_bounds(cond))
+                )
+        return dict(plan, total=total, options=options)
+
+    def _time_bounds(self, cond: Condition) -> Dict[str, Any]:
+        """Translate a time comparison into TimeIndex range arguments."""
+        if cond.op == "=":
+            return {"start": cond.value, "end": cond.value, "include_end": True}
+        if cond.op in (">", ">="):
+            return {"start": cond.value, "include_start": cond.op == ">="}
+        return {"end": cond.value, "include_end": cond.op == "<="}
+
+    def _run_plan(
+        self,
+        plan: Dict[str, Any],
+        predicate: Callable[[Dict[str, Any]], bool],
+        tasks: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Apply the compiled predicate to the candidates chosen by the plan.
+
+        Only the candidates are decoded; the whole store is read only for a
+        full scan.
+
+        Args:
+            plan: Plan from _plan_query.
+            predicate: The compiled query.
+            tasks: All tasks in the store, in file order, if already loaded.
+
+        Returns:
+            Matching tasks in file order.
+        """
+        ids = plan["ids"]
+        if ids is None:
+            candidates = tasks if tasks is not None else self._get_tasks()
+        elif tasks is not None:
+            candidates = [t for t in tasks if t["id"] in ids]
+        else:
+            candidates = self._get_tasks_by_id(sorted(ids))
+        return [t for t in candidates if predicate(t)]
+
+    def _decode_cursor(self, cursor: str, field: str) -> tuple:
+        """Decode a cursor made by make_cursor.
         
         Args:
-            description: The task description (must be non-empty after stripping whitespace).
+            cursor: The cursor string.
+            field: The sort field of the current listing.
             
         Returns:
-            A dictionary representing the newly created task with keys:
-            - id: Unique integer identifier
-            - description: Task description
-            - status: "todo"
-            - createdAt: ISO format timestamp
-            - updatedAt: ISO format timestamp
+            The (sort value, id) key of the task the cursor points past.
             
         Raises:
-            ValueError: If description is empty or if file save fails.
+            ValueError: If the cursor is malformed or was made for another sort field.
         """
+        try:
+            cursor_field, value, task_id = json.loads(
+                base64.urlsafe_b64decode(cursor.encode("ascii"))
+            )
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if cursor_field != field:
+            raise ValueError(
+                f"Cursor was made for sort field {cursor_field}, not {field}"
+            )
+        return (value, task_id)
 
-        if not description or not description.strip():
-            raise ValueError("Task Description cannot be empty.")
+    @staticmethod
+    def _copy_task(task: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a task dictionary and its lists (tags, dependsOn)."""
+        return {k: list(v) if isinstance(v, list) else v for k, v in task.items()}
 
-        tasks = self._get_tasks()
-        new_id = self._next_id(tasks)  # get next available id
-        timestamp = self._get_timestamp()
-        
-        task = {
-            "id": new_id,
-            "description": description,
-            "status": self.STATUS_TODO,
-            "createdAt": timestamp,
-            "updatedAt": timestamp,
-        }
+    def _paginate(
+        self,
+        tasks: List[Dict[str, Any]],
+        sort_by: Optional[str],
+        reverse: bool,
+        limit: Optional[int],
+        offset: int,
+        cursor: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Sort and slice tasks for list_tasks.
+
+        Args:
+            tasks: Tasks that passed the filters, in file order.
+            sort_by: Sort field, or None for file (id) order.
+            reverse: Whether to sort in descending order.
+            limit: Maximum number of tasks to return, or None for all.
+            offset: Number of tasks to skip.
+            cursor: Optional cursor; only tasks after it are returned.
 
-        tasks.append(task)
-        self._save_tasks(tasks)
+        Returns:
+            The requested page of tasks.
 
-        return task
+        Raises:
+            ValueError: If sort_by, limit, offset or cursor is invalid.
+        """
+        field = sort_by or "id"
+        if field not in self.SORT_FIELDS:
+            raise ValueError(f"Invalid sort field: {sort_by}")
+        if limit is not None and limit < 0:
+            raise ValueError(f"Invalid limit: {limit}")
+        if offset < 0:
+            raise ValueError(f"Invalid offset: {offset}")
+
+        def key(t: Dict[str, Any]) -> tuple:
+            return (t[field], t["id"])
+
+        if cursor is not None:
+            after = self._decode_cursor(cursor, field)
+            tasks = [
+                t for t in tasks if (key(t) < after if reverse else key(t) > after)
+            ]
+
+        if sort_by is None and not reverse:
+            end = None if limit is None else offset + limit
+            return tasks[offset:end]  # file order is already id order
+        if limit is None:
+            return sorted(tasks, key=key, reverse=reverse)[offset:]
 
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(offset + limit, tasks, key=key)[offset:]
 
-    def list_tasks(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List all tasks, optionally filtered by status.
+    def _find_task(
+        self, tasks: List[Dict[str, Any]], task_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """Find a task by id.
         
         Args:
-            status: Optional status filter. Must be one of: "todo", "in-progress", "done".
-                   If None, returns all tasks.
-                   
-        Returns:
-            List of task dictionaries matching the status filter (or all tasks if
-            status is None). Each task dictionary contains: id, description, status,
-            createdAt, updatedAt.
+            tasks: List of tasks to search through.
+            task_id: The id of the task to find.
             
+        Returns:
+            The task dictionary if found, None otherwise.
+        """
+        for t in tasks:
+            if t["id"] == task_id:
+                return t
+        return None
+
+    @staticmethod
+    def _version(task: Dict[str, Any]) -> int:
+        """Get a task's version (tasks saved before versions existed are version 1)."""
+        return task.get("version", 1)
+
+    def _check_version(
+        self, task: Dict[str, Any], expected_version: Optional[int]
+    ) -> None:
+        """Check a task against the version a writer expects.
+
         Raises:
-            ValueError: If status is provided but is not a valid status value.
+            VersionConflict: If expected_version is given and differs.
         """
+        if expected_version is not None and self._version(task) != expected_version:
+            raise VersionConflict(task["id"], expected_version, task)
+
+    @staticmethod
+    def _set_planning(
+        task: Dict[str, Any], priority: Optional[int], due: Optional[str]
+    ) -> None:
+        """Set a task's priority and due date, leaving out empty values.
         
-        tasks = self._get_tasks()
-        if status is None:
-            return tasks
-        if status not in self.VALID_STATUSES:
-            raise ValueError(f"Invalid status filter: {status}")
+        Args:
+            task: The task to change in place.
+            priority: New priority, 0 to clear it, or None to keep it.
+            due: New due date (YYYY-MM-DD), "" to clear it, or None to keep it.
+
+        Raises:
+            ValueError: If priority is not a non-negative integer or due is not
+                       a valid date.
+        """
+        if priority is not None:
+            if (
+                not isinstance(priority, int)
+                or isinstance(priority, bool)
+                or priority < 0
+            ):
+                raise ValueError(
+                    f"Invalid priority: {priority} (expected a non-negative integer)"
+                )
+            if priority:
+                task["priority"] = priority
+            else:
+                task.pop("priority", None)
+        if due is not None:
+            if due:
+                try:
+                    due = date.fromisoformat(due).isoformat()
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid due date: {due} (expected YYYY-MM-DD)")
+                task["due"] = due
+            else:
+                task.pop("due", None)
+
+    @staticmethod
+    def _check_tags(tags: Iterable[str]) -> List[str]:
+        """Validate tags and return them sorted, without duplicates.
         
-        return [t for t in tasks if t.get("status") == status]  # filter tasks by status
+        Raises:
+            ValueError: If a tag is not a non-empty string without whitespace
+                       or commas.
+        """
+        if isinstance(tags, str):
+            tags = [tags]
+        tags = list(tags)
+        for tag in tags:
+            if (
+                not isinstance(tag, str)
+                or not tag
+                or any(c.isspace() or c == "," for c in tag)
+            ):
+                raise ValueError(f"Invalid tag: {tag!r}")
+        return sorted(set(tags))
+
+    @staticmethod
+    def _set_tags(task: Dict[str, Any], tags: List[str]) -> None:
+        """Set a task's tags, leaving the field out when there are none."""
+        if tags:
+            task["tags"] = tags
+        else:
+            task.pop("tags", None)
 
+    @staticmethod
+    def _template_rule(template: Dict[str, Any]) -> RecurrenceRule:
+        """Get the recurrence rule of a template.
+
+        Raises:
+            ValueError: If the template's interval or cron rule is invalid.
+        """
+        interval = None
+        if template.get("every") is not None:
+            interval = parse_duration(template["every"])
+            if interval is None:
+                raise ValueError(f"Invalid interval: {template['every']}")
+        return RecurrenceRule(
+            interval, template.get("cron"), datetime.fromisoformat(template["start"])
+        )
 
-    def update_task(self, id: int, updated_description: str) -> Dict[str, Any]:
-        """Update an existing task's description.
+    def _load_templates(self) -> tuple:
+        """Get the recurring task templates and their scheduler.
         
-        Updates the description and updatedAt timestamp of a task with the given id.
+        The file is only read again if it changed since the last call, so the
+        scheduler's heap is kept between ticks of a long-running process.
         
-        Args:
-            id: The id of the task to update.
-            updated_description: The new description (must be non-empty after stripping whitespace).
-            
         Returns:
-            The updated task dictionary with the new description and updatedAt timestamp.
+            (data, scheduler): the file's contents ({"version", "nextId",
+            "templates"}) and a TemplateScheduler over the templates.
             
         Raises:
-            ValueError: If description is empty, task with given id is not found,
-                       or if file save fails.
+            ValueError: If the file can't be read.
         """
+        try:
+            st = os.stat(self.recurring_path)
+            signature = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            signature = None
+        if self._recurring is not None and self._recurring[0] == signature:
+            return self._recurring[1], self._recurring[2]
 
-        if not updated_description or not updated_description.strip():
-            raise ValueError("Updated Task Description cannot be empty.")
+        data = {"version": RECURRING_VERSION, "nextId": 1, "templates": []}
+        if signature is not None:
+            try:
+                with open(self.recurring_path, "r", encoding="utf-8") as rf:
+                    data = json.load(rf)
+            except (OSError, ValueError) as e:
+                raise ValueError(
+                    f"Failed to read recurring tasks from {self.recurring_path}: {e}"
+                )
+        scheduler = TemplateScheduler(data["templates"])
+        self._recurring = (signature, data, scheduler)
+        return data, scheduler
 
-        tasks = self._get_tasks()
-        task = self._find_task(tasks, id)
-        if task is None:
-            raise ValueError(f"Task with id {id} not found.")
+    def _save_templates(
+        self, data: Dict[str, Any], scheduler: TemplateScheduler
+    ) -> None:
+        """Write the recurring task templates atomically.
         
-        task["description"] = updated_description
-        task["updatedAt"] = self._get_timestamp()
+        Raises:
+            ValueError: If the file can't be written.
+        """
+        tmp_path = self.recurring_path + ".tmp"
+        try:
+            self._make_store_dir()
+            with open(tmp_path, "w", encoding="utf-8") as rf:
+                json.dump(data, rf, indent=2)
+            os.replace(tmp_path, self.recurring_path)
+            st = os.stat(self.recurring_path)
+        except OSError as e:
+            self._recurring = None
+            raise ValueError(
+                f"Failed to save recurring tasks to {self.recurring_path}: {e}"
+            )
+        self._recurring = ([st.st_size, st.st_mtime_ns], data, scheduler)
 
-        self._save_tasks(tasks)
-        return task
+    def _parse_view(self, where: str) -> Any:
+        """Parse the query of a saved view.
 
+        Raises:
+            ValueError: If the query is invalid or uses a relative time, which
+                       would change the results without any task changing.
+        """
 
-    def delete_task(self, id: int) -> Dict[str, Any]:
-        """Delete an existing task.
-        
-        Removes a task from the task list and saves the updated list to file.
+        def to_timestamp(value: str) -> Union[str, int]:
+            if parse_duration(value) is not None:
+                raise ValueError(
+                    f"Views can't use relative times: {value} (use a date or timestamp)"
+                )
+            return self._to_timestamp(value)
+
+        return parse_query(where, to_timestamp, self.VALID_STATUSES)
+
+    def _compile_view(self, where: str) -> Callable[[Dict[str, Any]], bool]:
+        """Compile the query of a saved view into a predicate."""
+        return self._parse_view(where).compile()
+
+    def _load_views(self) -> Dict[str, str]:
+        """Get the saved views as name -> where query.
         
-        Args:
-            id: The id of the task to delete.
-            
-        Returns:
-            The deleted task dictionary.
-            
         Raises:
-            ValueError: If task with given id is not found or if file save fails.
+            ValueError: If the views file can't be read.
         """
+        try:
+            with open(self.views_path, "r", encoding="utf-8") as vf:
+                return json.load(vf)["views"]
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Failed to read views from {self.views_path}: {e}")
 
-        tasks = self._get_tasks()
-        task = self._find_task(tasks, id)
-        if task is None:
-            raise ValueError(f"Task with id {id} not found.")
+    def _save_views(self, views: Dict[str, str]) -> None:
+        """Write the saved views atomically.
         
-        tasks.remove(task)
-        self._save_tasks(tasks)
-        return task
+        Raises:
+            ValueError: If the file can't be written.
+        """
+        tmp_path = self.views_path + ".tmp"
+        try:
+            self._make_store_dir()
+            with open(tmp_path, "w", encoding="utf-8") as vf:
+                json.dump({"version": VIEWS_VERSION, "views": views}, vf, indent=2)
+            os.replace(tmp_path, self.views_path)
+        except OSError as e:
+            raise ValueError(f"Failed to save views to {self.views_path}: {e}")
 
-    def mark_in_progress(self, id: int) -> Dict[str, Any]:
-        """Mark a task as in progress.
+    def _get_views(self, views: Dict[str, str]) -> ViewIndex:
+        """Get the view index, bringing it in line with the saved views.
         
-        Updates the task status to "in-progress" and updates the updatedAt timestamp.
+        Views that were added or changed since the index was built (e.g. by
+        another process) are evaluated once, with the same query planner as
+        list_tasks(where=...); the rest are already up to date.
         
         Args:
-            id: The id of the task to mark as in progress.
+            views: The saved views, as returned by _load_views().
             
         Returns:
-            The updated task dictionary with status "in-progress" and updated updatedAt.
-            
-        Raises:
-            ValueError: If task with given id is not found or if file save fails.
+            The view index, in sync with the store and the views.
         """
-        return self._update_task_status(id, self.STATUS_IN_PROGRESS)
+        index = self._get_index(ViewIndex.name)
+        if index.queries == views:
+            return index
 
+        tasks = None
+        for view in set(index.queries).difference(views):
+            index.drop_view(view)
+        for view, where in views.items():
+            if index.queries.get(view) != where:
+                node = self._parse_view(where)
+                plan = self._plan_query(node, tasks)
+                if plan["ids"] is None and tasks is None:
+                    tasks = self._get_tasks()  # kept for the other views
+                predicate = node.compile()
+                matched = self._run_plan(plan, predicate, tasks)
+                index.set_view(view, where, predicate, (t["id"] for t in matched))
+        if index.signature is not None:
+            self._write_index(index)
+        return index
 
-    def mark_done(self, id: int) -> Dict[str, Any]:
+    def _list_manager(self, namespace: str) -> "TaskManager":
+        """Get a TaskManager for another named list of the same store."""
+        return TaskManager(
+            self.store_path,
+            self.compression_level,
+            epoch_timestamps=self.epoch_timestamps,
+            namespace=namespace,
+        )
+
+    def _get_tasks_by_id(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Get tasks by id, decoding only those tasks when the offsets are fresh.
+        
+        If more than a quarter of the store is asked for, the whole store is
+        loaded instead.
+        
+        Args:
+            ids: The ids of the tasks to get.
+            
+        Returns:
+            The tasks that exist, in the order of ids.
+            
+        Raises:
+            ValueError: If the store has to be read in full and can't be.
+        """
+        if self._batch is None and self.compression is None:
+            signature = self._store_signature()
+            offsets = self._load_offsets(signature)
+            if offsets is not None and len(ids) * 4 <= len(offsets[0]):
+                task_ids, starts = offsets
+                found = []
+                try:
+                    with open(self.path, "rb") as sf:
+                        for task_id in ids:
+                            # File order is id order, so ids are found by bisection;
+                            # a task out of place fails the id check below.
+                            p = bisect_left(task_ids, task_id)
+                            if p == len(task_ids) or task_ids[p] != task_id:
+                                if task_id in task_ids:
+                                    break
+                                continue  # no such task
+                            start = starts[p]
+                            end = (
+                                starts[p + 1] - 4
+                                if p + 1 < len(starts)
+                                else signature[0] - 2
+                            )
+                            sf.seek(start)
+                            task = json.loads(sf.read(end - start))
+                            if not isinstance(task, dict) or task.get("id") != task_id:
+                                break
+                            found.append(task)
+                        else:
+                            return found
+                except (
+                    OSError,
+                    ValueError,
+                    KeyError,
+                    TypeError,
+                    OverflowError,
+                    IndexError,
+                ):
+                    pass
+
+        by_id = {t["id"]: t for t in self._get_tasks()}
+        return [by_id[i] for i in ids if i in by_id]
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Hold the store's lock file for a read-check-save cycle.
+
+        The lock is an flock() on "<path>.lock", shared by every process using
+        the store. Nested uses (a change inside batch()) take it once. Without
+        fcntl (Windows) no lock is taken.
+
+        In write-behind mode the first change after a flush opens a pending
+        batch that keeps the lock until the flusher saves it.
+        """
+        with self._mutex:
+            if self.write_behind and self._batch is None:
+                self._begin_write_behind()
+            if fcntl is None or self._lock_depth:
+                yield
+            else:
+                lock_file = self._lock_store()
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    self._unlock_store(lock_file)
+            if self._batch is not None and self._batch.get("behind"):
+                self._pending_ops += 1
+                if self._pending_ops >= self.flush_ops:
+                    self._wake.set()
+
+    def _make_store_dir(self) -> None:
+        """Create the directory of a named list's files if it doesn't exist yet."""
+        if self.namespace != DEFAULT_NAMESPACE:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def _lock_store(self) -> IO[str]:
+        """Open the lock file and take the exclusive lock on it."""
+        try:
+            self._make_store_dir()
+            lock_file = open(self.lock_path, "a")
+        except OSError as e:
+            raise ValueError(f"Failed to lock {self.path}: {e}")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    @staticmethod
+    def _unlock_store(lock_file: IO[str]) -> None:
+        """Release the lock taken by _lock_store and close the lock file."""
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+    def _begin_write_behind(self) -> None:
+        """Open the pending batch of write-behind mode and lock the store for it.
+
+        The tasks saved by the last flush are reused if the store hasn't
+        changed since; otherwise they are read again once the lock is held.
+        """
+        if fcntl is not None and not self._lock_depth:
+            self._behind_lock = self._lock_store()
+            self._lock_depth += 1
+        tasks = None
+        if (
+            self._behind_tasks is not None
+            and self._behind_tasks[0] == self._store_signature()
+        ):
+            tasks = self._behind_tasks[1]
+        self._behind_tasks = None
+        self._batch = {"tasks": tasks, "changed": {}, "behind": True}
+
+    def _end_write_behind(self) -> None:
+        """Close a saved write-behind batch and release the store's lock."""
+        batch, self._batch = self._batch, None
+        if batch["tasks"] is not None:
+            self._behind_tasks = (self._store_signature(), batch["tasks"])
+        self._pending_ops = 0
+        if self._behind_lock is not None:
+            lock_file, self._behind_lock = self._behind_lock, None
+            self._lock_depth -= 1
+            self._unlock_store(lock_file)
+
+    def _flush_loop(self) -> None:
+        """Body of the write-behind flusher thread.
+
+        Saves pending changes every flush_interval seconds, or when woken by
+        flush_ops pending changes, until close(). A failed save stays pending
+        and is retried; flush() and close() raise its error.
+        """
+        while self.write_behind:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except ValueError:
+                pass
+
+    def _store_signature(self) -> Optional[List[int]]:
+        """Get the size and mtime of the store file.
+
+        Returns:
+            [size, mtime_ns] of the store file, or None if it doesn't exist.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def _read_header_file(self) -> Optional[Dict[str, Any]]:
+        """Read the header sidecar file without checking that it is fresh.
+
+        Returns:
+            The header dictionary, or None if it is missing or unreadable.
+        """
+        try:
+            with open(self.header_path, "r", encoding="utf-8") as hf:
+                header = json.load(hf)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(header, dict) or header.get("version") != HEADER_VERSION:
+            return None
+        return header
+
+    def _build_header(self, tasks: List[Dict[str, Any]], seq: int) -> Dict[str, Any]:
+        """Build a header describing the given tasks.
+
+        Args:
+            tasks: List of all tasks in the store.
+            seq: Sequence number to record in the header.
+
+        Returns:
+            Header dictionary with version, count, statusCounts, nextId,
+            linked (number of tasks with dependencies), seq, epochTimestamps
+            (whether timestamps are epoch milliseconds; None for an empty
+            store) and the current store signature.
+        """
+        status_counts = {status: 0 for status in sorted(self.VALID_STATUSES)}
+        linked = 0
+        for t in tasks:
+            status = t.get("status")
+            status_counts[status] = status_counts.get(status, 0) + 1
+            linked += bool(t.get("dependsOn"))
+        return {
+            "version": HEADER_VERSION,
+            "count": len(tasks),
+            "statusCounts": status_counts,
+            "nextId": self._next_id(tasks),
+            "linked": linked,
+            "seq": seq,
+            "epochTimestamps": isinstance(tasks[0].get("createdAt"), int)
+            if tasks
+            else None,
+            "store": self._store_signature(),
+        }
+
+    def _write_header(self, header: Dict[str, Any]) -> None:
+        """Write the header sidecar file atomically.
+
+        The header is derived data: if it can't be written, readers see a stale
+        or missing header and rebuild it from the store, so errors are ignored.
+
+        Args:
+            header: Header dictionary to write.
+        """
+        tmp_path = self.header_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as hf:
+                json.dump(header, hf)
+            os.replace(tmp_path, self.header_path)
+        except OSError:
+            pass
+
+    def _get_header(self) -> Dict[str, Any]:
+        """Get the store header, rebuilding it if it is missing or stale.
+
+        A fresh header is read without parsing the store, so this is constant
+        time regardless of the number of tasks.
+
+        Inside a batch with unsaved changes, the header is built from the
+        pending task list instead.
+
+        Returns:
+            Header dictionary (see _build_header).
+
+        Raises:
+            ValueError: If the header must be rebuilt and the store can't be read.
+        """
+        with self._mutex:
+            header = self._read_header_file()
+            if self._batch is not None and self._batch["changed"]:
+                return self._build_header(
+                    self._batch["tasks"], header["seq"] + 1 if header is not None else 1
+                )
+        signature = self._store_signature()
+        if header is not None and header.get("store") == signature:
+            return header
+
+        seq = header["seq"] + 1 if header is not None else 1
+        header = self._build_header(self._get_tasks(), seq)
+        if signature is not None:
+            self._write_header(header)
+        return header
+
+    def _index_path(self, name: str) -> str:
+        """Get the path of the file an index is persisted to."""
+        return f"{self.path}.{name}{INDEX_SUFFIX}"
+
+    @staticmethod
+    def _index_meta(signature: Optional[List[int]], journal: int, data: int) -> bytes:
+        """Encode the fixed-width meta line of an index file."""
+        meta = json.dumps(
+            {
+                "version": INDEX_VERSION,
+                "store": signature,
+                "journal": journal,
+                "data": data,
+            }
+        )
+        return (meta.ljust(INDEX_META_WIDTH) + "\n").encode("ascii")
+
+    def _load_index(
+        self, name: str, signature: Optional[List[int]]
+    ) -> Optional[TaskIndex]:
+        """Load a persisted index if it matches the given store signature.
+
+        The first line of an index file is a small JSON header, so a stale
+        index is rejected without parsing its data. Changes journaled after
+        the data are applied to the loaded index; a long journal is then
+        compacted by rewriting the file.
+
+        Args:
+            name: Index name (a key of INDEX_TYPES).
+            signature: Store signature the index must have been synced with.
+
+        Returns:
+            The loaded index, or None if it is missing, unreadable or stale.
+        """
+        if signature is None:
+            return None
+        try:
+            with open(self._index_path(name), "rb") as xf:
+                meta = json.loads(xf.readline())
+                if (
+                    meta.get("version") != INDEX_VERSION
+                    or meta.get("store") != signature
+                ):
+                    return None
+                data = xf.read(meta["data"])
+                journal = [json.loads(xf.readline()) for _ in range(meta["journal"])]
+                index = self.INDEX_TYPES[name].load(data)
+                if isinstance(index, ViewIndex):
+                    index.bind(self._compile_view)
+                for removed, added in journal:
+                    for t in removed:
+                        index.remove(t)
+                    for t in added:
+                        index.add(t)
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            return None
+        index.signature = signature
+        if len(journal) >= INDEX_JOURNAL_COMPACT:
+            self._write_index(index)
+        return index
+
+    def _write_index(self, index: TaskIndex) -> None:
+        """Persist an index atomically, tagged with its store signature.
+
+        Like the header, indexes are derived data and write errors are ignored.
+
+        Args:
+            index: The index to write.
+        """
+        path = self._index_path(index.name)
+        tmp_path = path + ".tmp"
+        try:
+            data = index.dump()
+            with open(tmp_path, "wb") as xf:
+                xf.write(self._index_meta(index.signature, 0, len(data)))
+                xf.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _journal_index_change(
+        self, name: str, before: List[int], after: List[int], change: bytes
+    ) -> Optional[int]:
+        """Append a saved change to the journal of a persisted index.
+
+        The index itself is not read: the change is written after the file's
+        last line and the meta line is rewritten in place, so the cost is
+        proportional to the change, not to the index.
+
+        Args:
+            name: Index name (a key of INDEX_TYPES).
+            before: Store signature just before the save; the file must be in
+                   sync with it.
+            after: Store signature after the save.
+            change: The encoded [removed, added] journal line.
+
+        Returns:
+            The number of journaled changes, or None if nothing was appended
+            because the file is missing, stale or its journal is full.
+        """
+        try:
+            with open(self._index_path(name), "r+b") as xf:
+                line = xf.readline()
+                meta = json.loads(line)
+                journal = meta.get("journal", 0) + 1
+                if (
+                    meta.get("version") != INDEX_VERSION
+                    or meta.get("store") != before
+                    or journal > INDEX_JOURNAL_MAX
+                ):
+                    return None
+                xf.seek(0, os.SEEK_END)
+                xf.write(change)
+                xf.flush()
+                # The meta line goes last: until it is rewritten, readers see
+                # the old signature and ignore the appended line.
+                xf.seek(0)
+                xf.write(self._index_meta(after, journal, meta["data"]))
+        except (OSError, ValueError, AttributeError, KeyError):
+            return None
+        return journal
+
+    def _get_index(
+        self, name: str, tasks: Optional[List[Dict[str, Any]]] = None
+    ) -> TaskIndex:
+        """Get an up-to-date index, loading or rebuilding it as needed.
+
+        Args:
+            name: Index name (a key of INDEX_TYPES).
+            tasks: The current task list, if already loaded; used for a rebuild.
+
+        Returns:
+            The index, in sync with the store.
+
+        Raises:
+            ValueError: If the index must be rebuilt and the store can't be read.
+        """
+        self._flush_batch()
+        signature = self._store_signature()
+        index = self._indexes.get(name)
+        if index is not None and signature is not None and index.signature == signature:
+            return index
+
+        index = self._load_index(name, signature)
+        if index is None:
+            index = self.INDEX_TYPES[name]()
+            if isinstance(index, ViewIndex):
+                for view, where in self._load_views().items():
+                    index.set_view(view, where, self._compile_view(where))
+            index.rebuild(tasks if tasks is not None else self._get_tasks())
+            index.signature = signature
+            if signature is not None:
+                self._write_index(index)
+        self._indexes[name] = index
+        return index
+
+    def _search_text(
+        self, query: str, tasks: Optional[List[Dict[str, Any]]] = None
+    ) -> Set[int]:
+        """Find the ids of tasks whose description matches a text query.
+
+        Unless the text index is already loaded and in sync, only the
+        postings of the query's terms are read from the index file (see
+        _read_text_terms); the whole index is loaded only if that isn't
+        possible.
+
+        Args:
+            query: The text query (see TextIndex.search).
+            tasks: The current task list, if already loaded; used if the
+                  index has to be rebuilt.
+
+        Returns:
+            Set of matching task ids.
+        """
+        index = self._indexes.get(TextIndex.name)
+        if self._batch is None:
+            signature = self._store_signature()
+            if index is None or signature is None or index.signature != signature:
+                terms = {term for group in TextIndex.parse(query) for term in group}
+                partial = self._read_text_terms(terms, signature)
+                if partial is not None:
+                    return partial.search(query)
+        return self._get_index(TextIndex.name, tasks).search(query)
+
+    def _read_text_terms(
+        self, terms: Iterable[str], signature: Optional[List[int]]
+    ) -> Optional[TextIndex]:
+        """Read the postings of some terms from the persisted text index.
+
+        The terms are looked up by bisecting the sorted postings in the file
+        and the journal is applied to them, so the cost depends on the terms
+        and the journal, not on the size of the index.
+
+        Args:
+            terms: Query terms (see TextIndex.read_terms).
+            signature: Store signature the index must have been synced with.
+
+        Returns:
+            A text index holding the terms' postings, or None if the file is
+            missing, unreadable or stale, or its journal is due for compaction.
+        """
+        if signature is None:
+            return None
+        try:
+            with open(self._index_path(TextIndex.name), "rb") as xf:
+                meta = json.loads(xf.readline())
+                if (
+                    meta.get("version") != INDEX_VERSION
+                    or meta.get("store") != signature
+                    or meta["journal"] >= INDEX_JOURNAL_COMPACT
+                ):
+                    return None
+                start = xf.tell()
+                end = start + meta["data"]
+                index = TextIndex.read_terms(xf, start, end, terms)
+                xf.seek(end)
+                for _ in range(meta["journal"]):
+                    removed, added = json.loads(xf.readline())
+                    for t in removed:
+                        index.remove(t)
+                    for t in added:
+                        index.add(t)
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            return None
+        index.signature = signature
+        return index
+
+    def _load_columns(self, signature: Optional[List[int]]) -> Optional[TaskColumns]:
+        """Load the persisted columnar view if it matches the given store signature.
+
+        Returns:
+            The columns, or None if they are missing, unreadable or stale.
+        """
+        if signature is None:
+            return None
+        try:
+            with open(self.columns_path, "rb") as cf:
+                if (
+                    list(COLUMNS_HEADER.unpack(cf.read(COLUMNS_HEADER.size)))
+                    != signature
+                ):
+                    return None
+                # Mapped rather than read: the description table is only paged
+                # in if a caller asks for descriptions.
+                data = mmap.mmap(cf.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error):
+            return None
+        return TaskColumns.from_bytes(memoryview(data)[COLUMNS_HEADER.size :])
+
+    def _write_columns(self, columns: TaskColumns, signature: List[int]) -> None:
+        """Persist the columnar view atomically, tagged with its store signature.
+
+        The signature is written first so a stale file is rejected without
+        reading the columns. Write errors are ignored.
+        """
+        tmp_path = self.columns_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as cf:
+                cf.write(COLUMNS_HEADER.pack(*signature))
+                cf.write(columns.to_bytes())
+            os.replace(tmp_path, self.columns_path)
+        except (OSError, ValueError):
+            pass
+
+    def _update_indexes(
+        self,
+        before: Optional[List[int]],
+        removed: Iterable[Dict[str, Any]],
+        added: Iterable[Dict[str, Any]],
+    ) -> None:
+        """Apply a saved change to the indexes, in time proportional to the change.
+
+        The change is appended to the journal of every persisted index that
+        was in sync before the save, without reading the index. Indexes loaded
+        in this instance are also updated in memory, and rewritten in full
+        only when their journal gets long. Index files that can't take the
+        change (stale, or the change is very large) are removed and rebuilt
+        on next use.
+
+        Args:
+            before: Store signature just before the save.
+            removed: Old versions of changed tasks and deleted tasks.
+            added: New versions of changed tasks and added tasks.
+        """
+        removed, added = list(removed), list(added)
+        after = self._store_signature()
+        change = None
+        if (
+            before is not None
+            and after is not None
+            and len(removed) + len(added) <= INDEX_JOURNAL_TASKS
+        ):
+            change = (
+                json.dumps([removed, added], separators=(",", ":")).encode("utf-8")
+                + b"\n"
+            )
+        for name in self.INDEX_TYPES:
+            index = self._indexes.pop(name, None)
+            journal = (
+                None
+                if change is None
+                else self._journal_index_change(name, before, after, change)
+            )
+            if index is None or before is None or index.signature != before:
+                if journal is None:
+                    try:
+                        os.remove(self._index_path(name))
+                    except OSError:
+                        pass
+                continue
+            for t in removed:
+                index.remove(t)
+            for t in added:
+                index.add(t)
+            index.signature = after
+            self._indexes[name] = index
+            if journal is None or journal >= INDEX_JOURNAL_COMPACT:
+                self._write_index(index)
+
+    def _save_tasks(
+        self,
+        tasks: List[Dict[str, Any]],
+        removed: Iterable[Dict[str, Any]] = (),
+        added: Iterable[Dict[str, Any]] = (),
+    ) -> None:
+        """Save tasks to file.
+
+        Also writes the header and updates the persisted indexes with the
+        change described by removed and added. Inside a batch() the change is
+        only recorded, and saved when the batch ends.
+
+        Args:
+            tasks: List of task dictionaries to save.
+            removed: Old versions of changed tasks and deleted tasks.
+            added: New versions of changed tasks and added tasks.
+
+        Raises:
+            ValueError: If there's an error writing to the file.
+        """
+        if self._batch is not None:
+            self._batch["tasks"] = tasks
+            changed = self._batch["changed"]
+            for t in removed:
+                changed.setdefault(t["id"], t)
+            for t in added:
+                changed.setdefault(t["id"], None)
+            if {t["id"] for t in removed}.difference(t["id"] for t in added):
+                self._batch.pop("nextId", None)  # a delete may lower the next id
+            return
+
+        before = self._store_signature()
+        starts = None
+        # Written to a temporary file and renamed over the store, like the
+        # sidecars, so a reader without the lock never sees a partial store.
+        tmp_path = self.path + ".tmp"
+        try:
+            self._make_store_dir()
+            with self._open_store("w", tmp_path) as tf:
+                if self.compression is None:
+                    text = json.dumps(tasks, indent=2)
+                    tf.write(text)
+                    starts = array(
+                        "q", (m.start() + 3 for m in TASK_START.finditer(text))
+                    )
+                else:
+                    # Compact output, encoded in one call and written as one chunk.
+                    tf.write(json.dumps(tasks, separators=(",", ":")))
+            os.replace(tmp_path, self.path)
+        except (OSError, json.JSONDecodeError, lzma.LZMAError):
+            raise ValueError(f"Failed to save tasks to {self.path}")
+        finally:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+        after = self._store_signature()
+        if self.snapshot_cache:
+            self._write_snapshot(tasks, after)
+        if starts is not None:
+            self._write_offsets([t["id"] for t in tasks], starts, after)
+        previous = self._read_header_file()
+        seq = previous["seq"] + 1 if previous is not None else 1
+        self._finish_save(before, self._build_header(tasks, seq), removed, added)
+
+    def _finish_save(
+        self,
+        before: Optional[List[int]],
+        header: Dict[str, Any],
+        removed: Iterable[Dict[str, Any]],
+        added: Iterable[Dict[str, Any]],
+    ) -> None:
+        """Bring the header, indexes and current snapshot up to date after a save.
+
+        Args:
+            before: Store signature just before the save.
+            header: The new header.
+            removed: Old versions of changed tasks and deleted tasks.
+            added: New versions of changed tasks and added tasks.
+        """
+        self._write_header(header)
+        self._update_indexes(before, removed, added)
+        if self._view is not None:
+            # Copy-on-write: the next snapshot shares every unchanged task.
+            view = self._view
+            self._view = None
+            if view.signature == before:
+                self._view = view.with_changes(
+                    removed, added, header["seq"], header["store"]
+                )
+
+    def _load_offsets(self, signature: Optional[List[int]]) -> Optional[tuple]:
+        """Load the task offsets if they match the given store signature.
+
+        Returns:
+            (ids, starts): the task ids in file order and the byte offset of
+            each task's JSON object, or None if missing, unreadable or stale.
+        """
+        if signature is None:
+            return None
+        try:
+            with open(self.offsets_path, "rb") as of:
+                size, mtime_ns, count = OFFSETS_HEADER.unpack(
+                    of.read(OFFSETS_HEADER.size)
+                )
+                if [size, mtime_ns] != signature:
+                    return None
+                ids, starts = array("q"), array("q")
+                ids.fromfile(of, count)
+                starts.fromfile(of, count)
+        except (OSError, EOFError, struct.error):
+            return None
+        return ids, starts
+
+    def _write_offsets(
+        self, ids: Iterable[int], starts: array, signature: Optional[List[int]]
+    ) -> None:
+        """Persist the task offsets atomically, tagged with the store signature.
+
+        Like the header, the offsets are derived data: nothing is written for
+        a store whose ids are not all integers, and write errors are ignored.
+        """
+        if signature is None:
+            return
+        tmp_path = self.offsets_path + ".tmp"
+        try:
+            ids = array("q", ids)
+            with open(tmp_path, "wb") as of:
+                of.write(OFFSETS_HEADER.pack(signature[0], signature[1], len(ids)))
+                ids.tofile(of)
+                starts.tofile(of)
+            os.replace(tmp_path, self.offsets_path)
+        except (OSError, TypeError, OverflowError):
+            pass
+
+    @staticmethod
+    def _copy_bytes(src: IO[bytes], dst: IO[bytes], length: int = -1) -> None:
+        """Copy length bytes of src to dst, or the rest of src if length is -1."""
+        while length:
+            chunk = src.read(
+                COPY_CHUNK_BYTES if length < 0 else min(length, COPY_CHUNK_BYTES)
+            )
+            if not chunk:
+                return
+            dst.write(chunk)
+            if length > 0:
+                length -= len(chunk)
+
+    def _change_in_place(
+        self,
+        task_id: int,
+        expected_version: Optional[int],
+        apply: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> Optional[Dict[str, Any]]:
+        """Change or delete one task without parsing the rest of the store.
+
+        Uses the task offsets of a plain JSON store: the task is found by
+        bisection and only its own JSON object is read and decoded. The new
+        store is the bytes before the task, the new object and the bytes
+        after it, copied to a temporary file that replaces the store, as a
+        full save does. Every other task, and its description, stays
+        undecoded bytes. The header is updated from its counts and the
+        indexes with the one task.
+
+        Args:
+            task_id: The id of the task.
+            expected_version: If given, only change the task if it is still at
+                  this version.
+            apply: Changes the task dictionary in place; None deletes the task.
+
+        Returns:
+            The changed (or deleted) task, or None if the store's offsets or
+            header are not fresh, or its tasks are not in id order (or the
+            store is compressed, or a batch is open), in which case nothing
+            was done.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If the task is not found or the file can't be written.
+        """
+        if self._batch is not None or self.compression is not None:
+            return None
+        before = self._store_signature()
+        header = self._read_header_file()
+        if before is None or header is None or header.get("store") != before:
+            return None
+        offsets = self._load_offsets(before)
+        if offsets is None:
+            return None
+        ids, starts = offsets
+        try:
+            # File order is id order, so the task is found by bisection.
+            p = bisect_left(ids, task_id)
+            if p == len(ids) or ids[p] != task_id:
+                if task_id not in ids:
+                    raise TaskNotFound(task_id)
+                return None  # stored out of id order: use the full read and save
+        except (TypeError, OverflowError):
+            raise TaskNotFound(task_id)
+        start = starts[p]
+        end = (
+            starts[p + 1] - 4 if p + 1 < len(starts) else before[0] - 2
+        )  # before ",\n  " or "\n]"
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(self.path, "rb") as sf:
+                sf.seek(start)
+                try:
+                    task = json.loads(sf.read(end - start))
+                except json.JSONDecodeError:
+                    return None
+                if not isinstance(task, dict) or task.get("id") != task_id:
+                    return None
+                self._check_version(task, expected_version)
+                old = dict(task)
+                if apply is not None:
+                    apply(task)
+                    cut = (start, end)
+                    data = (
+                        TASK_ENCODER.encode(task).replace("\n", "\n  ").encode("ascii")
+                    )
+                elif len(ids) == 1:
+                    cut, data = (0, before[0]), b"[]"
+                else:
+                    # Remove the task with the separator before it (after it,
+                    # for the first).
+                    cut, data = (
+                        ((start, starts[1]) if p == 0 else (start - 4, end)),
+                        b"",
+                    )
+                delta = len(data) - (cut[1] - cut[0])
+                with open(tmp_path, "wb") as out:
+                    sf.seek(0)
+                    self._copy_bytes(sf, out, cut[0])
+                    out.write(data)
+                    sf.seek(cut[1])
+                    self._copy_bytes(sf, out)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            raise ValueError(f"Failed to save tasks to {self.path}")
+        finally:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+        if apply is None:
+            del ids[p]
+            del starts[p]
+        else:
+            p += 1
+        if delta:
+            starts[p:] = array("q", [s + delta for s in starts[p:]])
+        after = self._store_signature()
+        self._write_offsets(ids, starts, after)
+
+        status_counts = dict(header["statusCounts"])
+        status_counts[old.get("status")] = status_counts.get(old.get("status"), 0) - 1
+        if apply is not None:
+            status_counts[task.get("status")] = (
+                status_counts.get(task.get("status"), 0) + 1
+            )
+        header = dict(
+            header,
+            count=len(ids),
+            statusCounts=status_counts,
+            nextId=header["nextId"]
+            if apply is not None
+            else (max(ids) + 1 if ids else 1),
+            linked=header["linked"]
+            - bool(old.get("dependsOn"))
+            + bool(apply is not None and task.get("dependsOn")),
+            seq=header["seq"] + 1,
+            epochTimestamps=header["epochTimestamps"] if ids else None,
+            store=after,
+        )
+        self._finish_save(before, header, [old], [task] if apply is not None else [])
+        return task
+
+    def _change_task(
+        self,
+        task_id: int,
+        expected_version: Optional[int],
+        apply: Optional[Callable[[Dict[str, Any]], None]],
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Change or delete one task and save, in place when possible.
+
+        Args:
+            task_id: The id of the task.
+            expected_version: If given, only change the task if it is still at
+                  this version.
+            apply: Changes the task dictionary in place; None deletes the task.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The changed (or deleted) task dictionary.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If the task is not found or if file save fails.
+        """
+        with self._write_lock():
+            task = self._change_in_place(task_id, expected_version, apply)
+            if task is not None:
+                return task
+
+            tasks = self._get_tasks()
+            task = self._find_task(tasks, task_id)
+            if task is None:
+                raise TaskNotFound(task_id)
+            self._check_version(task, expected_version)
+
+            if apply is None:
+                tasks.remove(task)
+                self._save_tasks(tasks, removed=[task])
+            else:
+                old = dict(task)
+                apply(task)
+                self._save_tasks(tasks, removed=[old], added=[task])
+        if sync:
+            self.flush()
+        return task
+
+    def _flush_batch(self) -> None:
+        """Save the pending changes of an open batch, if there are any.
+
+        The net change per task is passed on to the indexes: its version
+        before the batch is removed and its current version added.
+
+        Raises:
+            ValueError: If there's an error writing to the file.
+        """
+        with self._mutex:
+            batch = self._batch
+            if batch is None or not batch["changed"]:
+                return
+            changed, batch["changed"] = batch["changed"], {}
+            tasks = batch["tasks"]
+            self._batch = None
+            try:
+                self._save_tasks(
+                    tasks,
+                    removed=[t for t in changed.values() if t is not None],
+                    added=[t for t in tasks if t["id"] in changed],
+                )
+            except ValueError:
+                batch["changed"] = changed  # still pending
+                raise
+            finally:
+                self._batch = batch
+
+    def _update_task_status(
+        self,
+        task_id: int,
+        new_status: str,
+        expected_version: Optional[int] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Update the status of a task.
+
+        Args:
+            task_id: The id of the task to update.
+            new_status: The new status value (must be a valid status).
+            expected_version: If given, only update the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If task with given id is not found or if file save fails.
+        """
+
+        def apply(task: Dict[str, Any]) -> None:
+            task["status"] = new_status
+            task["updatedAt"] = self._get_timestamp()
+            task["version"] = self._version(task) + 1
+
+        return self._change_task(task_id, expected_version, apply, sync)
+
+    # -----------------------------------------
+    #  Public Methods
+    # -----------------------------------------
+
+    @contextmanager
+    def batch(self) -> Iterator["TaskManager"]:
+        """Group several changes into a single save.
+
+        Inside the block the task list is read once and changes are applied to
+        it in memory; the store, header and indexes are written once when the
+        block exits, even if it exits with an error (each change is complete
+        on its own, so changes made before the error are kept). Reads see the
+        pending changes; a read that uses an index or the columnar view saves
+        them first. Nested batches are part of the outermost one. In
+        write-behind mode changes are batched anyway and the block does
+        nothing. The store's lock is held for the whole block, so keep it short.
+
+        Yields:
+            This TaskManager.
+
+        Raises:
+            ValueError: If there's an error writing to the file.
+        """
+        if self._batch is not None or self.write_behind:
+            yield self
+            return
+        with self._write_lock():
+            self._batch = {"tasks": None, "changed": {}}
+            try:
+                yield self
+            finally:
+                try:
+                    self._flush_batch()
+                finally:
+                    self._batch = None
+
+    def flush(self) -> None:
+        """Save pending changes now.
+
+        In write-behind mode this saves the pending changes and releases the
+        store's lock until the next change. Inside a batch() it saves the
+        changes made so far; the batch stays open. Otherwise every change is
+        already saved and nothing happens.
+
+        Raises:
+            ValueError: If there's an error writing to the file. The changes
+                       stay pending.
+        """
+        with self._mutex:
+            self._flush_batch()
+            if self._batch is not None and self._batch.get("behind"):
+                self._end_write_behind()
+
+    def close(self) -> None:
+        """Stop write-behind mode: save pending changes and stop the flusher thread.
+
+        Later changes are saved synchronously. Does nothing for a TaskManager
+        without write_behind.
+
+        Raises:
+            ValueError: If there's an error writing to the file.
+        """
+        flusher, self._flusher = self._flusher, None
+        if flusher is None:
+            return
+        self.write_behind = False
+        self._wake.set()
+        flusher.join()
+        _WRITE_BEHIND.discard(self)
+        self.flush()
+
+    def add_task(
+        self,
+        description: str,
+        priority: Optional[int] = None,
+        due: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Add a new task.
+
+        Creates a new task with the given description, assigns it the next
+        available id, sets status to "todo", and adds timestamps.
+
+        Args:
+            description: The task description (must be non-empty after
+                  stripping whitespace).
+            priority: Optional priority; higher is more important, 0 means none.
+            due: Optional due date as YYYY-MM-DD.
+            tags: Optional tags, e.g. ["team-a", "sev1"].
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            A dictionary representing the newly created task with keys:
+            - id: Unique integer identifier
+            - description: Task description
+            - status: "todo"
+            - createdAt: ISO format timestamp
+            - updatedAt: ISO format timestamp
+            - version: 1
+            - priority, due, tags: Only if given
+
+        Raises:
+            ValueError: If description is empty, priority, due or a tag is
+                       invalid, or if file save fails.
+        """
+
+        if not description or not description.strip():
+            raise ValueError("Task Description cannot be empty.")
+        planning: Dict[str, Any] = {}
+        self._set_planning(planning, priority, due)
+        self._set_tags(planning, self._check_tags(tags or ()))
+
+        with self._write_lock():
+            tasks = self._get_tasks()
+            new_id = self._take_next_id(tasks)  # get next available id
+            timestamp = self._get_timestamp()
+
+            task = {
+                "id": new_id,
+                "description": description,
+                "status": self.STATUS_TODO,
+                "createdAt": timestamp,
+                "updatedAt": timestamp,
+                "version": 1,
+                **planning,
+            }
+
+            tasks.append(task)
+            self._save_tasks(tasks, added=[task])
+
+        if sync:
+            self.flush()
+        return task
+
+    def get_task(self, id: int) -> Optional[Dict[str, Any]]:
+        """Get a task by id.
+
+        While the task offsets are fresh only that task is decoded (see
+        _get_tasks_by_id).
+
+        Args:
+            id: The task id.
+
+        Returns:
+            The task dictionary, or None if there is no task with that id.
+        """
+        found = self._get_tasks_by_id([id])
+        return found[0] if found else None
+
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        created_after: Optional[TimeValue] = None,
+        created_before: Optional[TimeValue] = None,
+        updated_after: Optional[TimeValue] = None,
+        updated_before: Optional[TimeValue] = None,
+        where: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        any_tags: Optional[Iterable[str]] = None,
+        ready: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """List all tasks, optionally filtered, sorted and paginated.
+
+        Tasks can be filtered by status, time, tags, readiness or a query.
+
+        A where query is compiled once into a predicate and planned to start
+        from the most selective index (see explain_query). Time filters are
+        answered from the sorted timestamp index in
+        O(log n + matches). Tag filters are answered by intersecting and
+        joining per-tag id sets (see TagIndex), and ready by the dependency
+        index. When a limit is given together with a sort order,
+        the page is selected with a bounded heap of offset + limit tasks
+        instead of sorting every matching task.
+
+        Args:
+            status: Optional status filter. Must be one of: "todo",
+                   "in-progress", "done".
+                   If None, returns all tasks.
+            sort_by: Optional sort field: "id", "createdAt", "updatedAt" or
+                   "description". Ties are broken by id. If None, tasks are
+                   returned in file order (which is also id order).
+            reverse: If True, sort in descending order.
+            limit: Optional maximum number of tasks to return.
+            offset: Number of matching tasks to skip. Defaults to 0.
+            cursor: Optional cursor from make_cursor(); only tasks after the
+                   cursor's task in this sort order are returned. Unlike offset,
+                   a cursor stays stable when tasks are added or deleted.
+            created_after: Only tasks created at or after this point in time
+                   (datetime, ISO string, or timedelta before now).
+            created_before: Only tasks created before this point in time.
+            updated_after: Only tasks last updated at or after this point in time.
+            updated_before: Only tasks last updated before this point in time.
+            where: Optional query, e.g. "status in (todo, in-progress) and
+                   description ~ 'deploy' and updatedAt > 2026-10-01".
+                   See task_query.parse_query for the syntax.
+            tags: Optional tags; only tasks with all of them are listed.
+            any_tags: Optional tags; only tasks with at least one of them are listed.
+            ready: If True, only tasks that are not done and whose blockers
+                   are all done (see block_task). The ready set is kept by the
+                   dependency index, which mark_done updates incrementally.
+
+        Returns:
+            List of task dictionaries matching the status filter (or all tasks if
+            status is None). Each task dictionary contains: id, description, status,
+            createdAt, updatedAt.
+
+        Raises:
+            ValueError: If status, sort_by, limit, offset, cursor, a time
+                       filter, a tag or the where query is invalid.
+        """
+        if status is not None and status not in self.VALID_STATUSES:
+            raise ValueError(f"Invalid status filter: {status}")
+
+        tags = self._check_tags(tags or ())
+        any_tags = self._check_tags(any_tags or ())
+        ranges = {
+            "createdAt": (created_after, created_before),
+            "updatedAt": (updated_after, updated_before),
+        }
+        timed = any(bound is not None for bounds in ranges.values() for bound in bounds)
+        ids: Optional[List[int]] = None
+        if tags or any_tags:
+            ids = self._get_index(TagIndex.name).lookup(tags, any_tags)
+        if ready:
+            ready_ids = self._get_index(DependencyIndex.name).ready
+            ids = (
+                sorted(ready_ids) if ids is None else [i for i in ids if i in ready_ids]
+            )
+        if timed:
+            in_range = self._filter_time_ranges(ranges)
+            ids = sorted(in_range) if ids is None else [i for i in ids if i in in_range]
+        if where is not None:
+            node = self._parse_where(where)
+            plan = self._plan_query(node)
+            if ids is not None:
+                # The other filters narrow the plan's candidates.
+                plan["ids"] = (
+                    set(ids)
+                    if plan["ids"] is None
+                    else set(plan["ids"]).intersection(ids)
+                )
+            tasks = self._run_plan(plan, node.compile())
+        elif ids is not None:
+            # Only the selected tasks are decoded.
+            tasks = self._get_tasks_by_id(ids)
+        else:
+            tasks = self._get_tasks()
+        paginated = (
+            sort_by is not None
+            or reverse
+            or limit is not None
+            or offset
+            or cursor is not None
+        )
+        if status is not None:
+            tasks = [
+                t for t in tasks if t.get("status") == status
+            ]  # filter tasks by status
+        if paginated:
+            tasks = self._paginate(tasks, sort_by, reverse, limit, offset, cursor)
+        if self._batch is not None:
+            # Inside a batch the tasks are the batch's live state: hand out
+            # copies, so changing them can't change or drop pending changes.
+            tasks = [self._copy_task(t) for t in tasks]
+        return tasks
+
+    def explain_query(self, where: str) -> Dict[str, Any]:
+        """Show how a where query would be executed.
+
+        Args:
+            where: The query, as for list_tasks(where=...).
+
+        Returns:
+            A dictionary with keys:
+            - query: The parsed query
+            - access: "status index", "time index", "text index" or "full scan"
+            - condition: The condition answered by the index (None for a full scan)
+            - candidates: Estimated number of tasks the residual filter is applied to
+            - total: Number of tasks in the store (the cost of a full scan)
+            - alternatives: (access, condition, estimate) of every path considered
+
+        Raises:
+            ValueError: If the query is invalid.
+        """
+        node = self._parse_where(where)
+        plan = self._plan_query(node)
+        return {
+            "query": str(node),
+            "access": plan["access"],
+            "condition": None if plan["condition"] is None else str(plan["condition"]),
+            "candidates": plan["estimate"],
+            "total": plan["total"],
+            "alternatives": [
+                (
+                    option["access"],
+                    None if option["condition"] is None else str(option["condition"]),
+                    option["estimate"],
+                )
+                for option in plan["options"]
+            ],
+        }
+
+    def make_cursor(self, task: Dict[str, Any], sort_by: Optional[str] = None) -> str:
+        """Make a pagination cursor pointing just past a task.
+
+        Pass the last task of a page to get the cursor for the next page.
+
+        Args:
+            task: The last task dictionary returned by list_tasks.
+            sort_by: The sort field used for the listing (None for id order).
+
+        Returns:
+            An opaque cursor string for list_tasks(cursor=...).
+
+        Raises:
+            ValueError: If sort_by is not a valid sort field.
+        """
+        field = sort_by or "id"
+        if field not in self.SORT_FIELDS:
+            raise ValueError(f"Invalid sort field: {sort_by}")
+        raw = json.dumps([field, task[field], task["id"]]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def search(self, query: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Find tasks whose description matches a text query.
+
+        Uses the persisted description index, so the matching itself doesn't
+        scan the descriptions, and only the matching tasks are decoded. If the
+        index isn't loaded yet, only the postings of the query's terms are
+        read from its file.
+
+        Args:
+            query: Whitespace-separated terms, all of which must appear in the
+                  description (case-insensitive). "OR" separates alternative
+                  groups of terms, and a term ending in "*" matches as a prefix,
+                  e.g. "deploy api*" or "deploy OR release".
+            status: Optional status filter. Must be one of: "todo",
+                   "in-progress", "done".
+
+        Returns:
+            List of matching task dictionaries in file order.
+
+        Raises:
+            ValueError: If the query is empty or status is not a valid status value.
+        """
+        if not query or not query.strip():
+            raise ValueError("Search query cannot be empty.")
+        if status is not None and status not in self.VALID_STATUSES:
+            raise ValueError(f"Invalid status filter: {status}")
+
+        ids = self._search_text(query)
+        if not ids:
+            return []
+        # Only the matches are decoded; file order is id order.
+        tasks = self._get_tasks_by_id(sorted(ids))
+        return [t for t in tasks if status is None or t.get("status") == status]
+
+    def update_task(
+        self,
+        id: int,
+        updated_description: Optional[str] = None,
+        expected_version: Optional[int] = None,
+        priority: Optional[int] = None,
+        due: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Update an existing task's description, priority, due date or tags.
+
+        Updates the given fields, the updatedAt timestamp and the version of a
+        task with the given id.
+
+        Args:
+            id: The id of the task to update.
+            updated_description: The new description (must be non-empty after
+                  stripping whitespace), or None to keep it.
+            expected_version: If given, only update the task if it is still at
+                  this version (compare-and-swap).
+            priority: New priority, 0 to clear it, or None to keep it.
+            due: New due date (YYYY-MM-DD), "" to clear it, or None to keep it.
+            tags: Tags replacing the task's tags ([] removes them all), or
+                  None to keep them (see tag_task and untag_task).
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The updated task dictionary with the new description and updatedAt
+            timestamp.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If nothing is given to update, description is empty,
+                       priority, due or a tag is invalid, task with given id
+                       is not found, or if file save fails.
+        """
+
+        if (
+            updated_description is None
+            and priority is None
+            and due is None
+            and tags is None
+        ):
+            raise ValueError("Nothing to update.")
+        if updated_description is not None and not updated_description.strip():
+            raise ValueError("Updated Task Description cannot be empty.")
+        self._set_planning({}, priority, due)  # validate before locking
+        if tags is not None:
+            tags = self._check_tags(tags)
+
+        def apply(task: Dict[str, Any]) -> None:
+            if updated_description is not None:
+                task["description"] = updated_description
+            self._set_planning(task, priority, due)
+            if tags is not None:
+                self._set_tags(task, tags)
+            task["updatedAt"] = self._get_timestamp()
+            task["version"] = self._version(task) + 1
+
+        return self._change_task(id, expected_version, apply, sync)
+
+    def tag_task(
+        self,
+        id: int,
+        tags: Iterable[str],
+        expected_version: Optional[int] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Add tags to a task.
+
+        Args:
+            id: The id of the task.
+            tags: Tags to add; tags the task already has are ignored.
+            expected_version: If given, only tag the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If no tags are given, a tag is invalid, task with given
+                       id is not found, or if file save fails.
+        """
+        tags = self._check_tags(tags)
+        if not tags:
+            raise ValueError("No tags given.")
+
+        def apply(task: Dict[str, Any]) -> None:
+            self._set_tags(task, sorted(set(task.get("tags", ())).union(tags)))
+            task["updatedAt"] = self._get_timestamp()
+            task["version"] = self._version(task) + 1
+
+        return self._change_task(id, expected_version, apply, sync)
+
+    def untag_task(
+        self,
+        id: int,
+        tags: Iterable[str],
+        expected_version: Optional[int] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Remove tags from a task.
+
+        Args:
+            id: The id of the task.
+            tags: Tags to remove; tags the task doesn't have are ignored.
+            expected_version: If given, only untag the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If no tags are given, a tag is invalid, task with given
+                       id is not found, or if file save fails.
+        """
+        tags = self._check_tags(tags)
+        if not tags:
+            raise ValueError("No tags given.")
+
+        def apply(task: Dict[str, Any]) -> None:
+            self._set_tags(task, sorted(set(task.get("tags", ())).difference(tags)))
+            task["updatedAt"] = self._get_timestamp()
+            task["version"] = self._version(task) + 1
+
+        return self._change_task(id, expected_version, apply, sync)
+
+    def block_task(
+        self,
+        id: int,
+        blocker_ids: Iterable[int],
+        expected_version: Optional[int] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Make a task depend on other tasks.
+
+        The task is ready (see list_tasks(ready=True)) only once all its
+        blockers are done. Links that would make a task depend on itself,
+        directly or through other tasks, are refused.
+
+        Args:
+            id: The id of the task.
+            blocker_ids: Ids of the tasks it depends on; existing links are ignored.
+            expected_version: If given, only change the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The updated task dictionary, with the sorted blocker ids in "dependsOn".
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If no blockers are given, a task is not found, a link
+                       would create a cycle, or if file save fails.
+        """
+        blocker_ids = sorted(set(blocker_ids))
+        if not blocker_ids:
+            raise ValueError("No blockers given.")
+
+        def apply(task: Dict[str, Any]) -> None:
+            task["dependsOn"] = sorted(
+                set(task.get("dependsOn", ())).union(blocker_ids)
+            )
+            task["updatedAt"] = self._get_timestamp()
+            task["version"] = self._version(task) + 1
+
+        with self._write_lock():
+            graph = self._get_index(DependencyIndex.name)
+            for b in [id] + blocker_ids:
+                if b not in graph.ids:
+                    raise TaskNotFound(b)
+            for b in blocker_ids:
+                path = graph.find_path(b, id)
+                if path is not None:
+                    cycle = " -> ".join(map(str, [id] + path))
+                    raise ValueError(
+                        f"Task {id} cannot depend on {b}: dependency cycle {cycle}"
+                    )
+            return self._change_task(id, expected_version, apply, sync)
+
+    def unblock_task(
+        self,
+        id: int,
+        blocker_ids: Iterable[int],
+        expected_version: Optional[int] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Remove links from a task to tasks it depends on.
+
+        Args:
+            id: The id of the task.
+            blocker_ids: Ids of the blockers to unlink; ids that aren't linked
+                  are ignored.
+            expected_version: If given, only change the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If no blockers are given, task with given id is not
+                       found, or if file save fails.
+        """
+        blocker_ids = set(blocker_ids)
+        if not blocker_ids:
+            raise ValueError("No blockers given.")
+
+        def apply(task: Dict[str, Any]) -> None:
+            remaining = sorted(set(task.get("dependsOn", ())).difference(blocker_ids))
+            if remaining:
+                task["dependsOn"] = remaining
+            else:
+                task.pop("dependsOn", None)
+            task["updatedAt"] = self._get_timestamp()
+            task["version"] = self._version(task) + 1
+
+        return self._change_task(id, expected_version, apply, sync)
+
+    def delete_task(
+        self, id: int, expected_version: Optional[int] = None, sync: bool = False
+    ) -> Dict[str, Any]:
+        """Delete an existing task.
+
+        Removes a task from the task list and saves the updated list to file.
+
+        Args:
+            id: The id of the task to delete.
+            expected_version: If given, only delete the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The deleted task dictionary.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If task with given id is not found or if file save fails.
+        """
+
+        with self._write_lock():
+            if not self._find_dependents({id}):
+                return self._change_task(id, expected_version, None, sync)
+
+            tasks = self._get_tasks()
+            task = self._find_task(tasks, id)
+            if task is None:
+                raise TaskNotFound(id)
+            self._check_version(task, expected_version)
+            tasks.remove(task)
+            old, new = self._unlink_blockers(tasks, {id})
+            self._save_tasks(tasks, removed=[task] + old, added=new)
+        if sync:
+            self.flush()
+        return task
+
+    def _find_dependents(self, ids: Set[int]) -> Set[int]:
+        """Get the ids of the tasks that depend on any of the given tasks.
+
+        The header counts the tasks with dependencies, so a store without any
+        is answered without the dependency index. Inside a batch (and in
+        write-behind mode) the pending tasks are scanned instead, since using
+        the index would save the batch first.
+        """
+        if self._batch is not None:
+            return {
+                t["id"]
+                for t in self._get_tasks()
+                if not ids.isdisjoint(t.get("dependsOn", ()))
+            }.difference(ids)
+        if not self._get_header()["linked"]:
+            return set()
+        graph = self._get_index(DependencyIndex.name)
+        return set().union(*(graph.dependents.get(i, ()) for i in ids)).difference(ids)
+
+    def _unlink_blockers(
+        self, tasks: List[Dict[str, Any]], deleted_ids: Set[int]
+    ) -> tuple:
+        """Remove deleted tasks from the dependencies of the remaining ones.
+
+        Otherwise a dependent would stay linked to the id, and be blocked by
+        the next task to be given that id.
+
+        Args:
+            tasks: The remaining tasks; changed in place.
+            deleted_ids: Ids of the deleted tasks.
+
+        Returns:
+            (old, new): the old and new versions of the changed tasks.
+        """
+        old, new = [], []
+        timestamp = None
+        for t in tasks:
+            blockers = t.get("dependsOn")
+            if blockers and not deleted_ids.isdisjoint(blockers):
+                old.append(dict(t))
+                kept = [b for b in blockers if b not in deleted_ids]
+                if kept:
+                    t["dependsOn"] = kept
+                else:
+                    del t["dependsOn"]
+                timestamp = timestamp or self._get_timestamp()
+                t["updatedAt"] = timestamp
+                t["version"] = self._version(t) + 1
+                new.append(t)
+        return old, new
+
+    def delete_where(
+        self,
+        status: Optional[str] = None,
+        older_than: Optional[TimeValue] = None,
+        updated_before: Optional[TimeValue] = None,
+        description_contains: Optional[str] = None,
+        dry_run: bool = False,
+        sync: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Delete every task matching all of the given filters.
+
+        Matching tasks are removed in a single pass over the task list and the
+        store is saved once, however many tasks are deleted.
+
+        Args:
+            status: Only delete tasks with this status.
+            older_than: Only delete tasks created before this point in time
+                       (datetime, ISO string, or timedelta before now).
+            updated_before: Only delete tasks last updated before this point in time.
+            description_contains: Only delete tasks whose description contains this
+                       text (case-insensitive).
+            dry_run: If True, return the matching tasks without deleting them.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            List of the deleted (or, for a dry run, matching) task dictionaries.
+
+        Raises:
+            ValueError: If no filter is given, a filter value is invalid, or if
+                       file save fails.
+        """
+        if (
+            status is None
+            and older_than is None
+            and updated_before is None
+            and not description_contains
+        ):
+            raise ValueError("At least one filter is required to delete tasks.")
+        if status is not None and status not in self.VALID_STATUSES:
+            raise ValueError(f"Invalid status filter: {status}")
+
+        created_cutoff = (
+            self._to_timestamp(older_than) if older_than is not None else None
+        )
+        updated_cutoff = (
+            self._to_timestamp(updated_before) if updated_before is not None else None
+        )
+        text = description_contains.casefold() if description_contains else None
+
+        with self._write_lock():
+            tasks = self._get_tasks()
+            kept, deleted = [], []
+            for t in tasks:
+                if (
+                    (status is None or t.get("status") == status)
+                    and (created_cutoff is None or t["createdAt"] < created_cutoff)
+                    and (updated_cutoff is None or t["updatedAt"] < updated_cutoff)
+                    and (text is None or text in t["description"].casefold())
+                ):
+                    deleted.append(t)
+                else:
+                    kept.append(t)
+
+            if deleted and not dry_run:
+                old, new = self._unlink_blockers(kept, {t["id"] for t in deleted})
+                self._save_tasks(kept, removed=deleted + old, added=new)
+        if sync:
+            self.flush()
+        return deleted
+
+    def columns(self) -> TaskColumns:
+        """Get a columnar view of the store for aggregate queries.
+
+        The view is persisted in "<path>.columns" and reused while the store is
+        unchanged, so repeated reports don't parse the store. After a change
+        it is rebuilt from the tasks on first use.
+
+        Returns:
+            TaskColumns with one entry per task, in file order.
+
+        Raises:
+            ValueError: If the columns must be rebuilt and the store can't be read.
+        """
+        self._flush_batch()
+        signature = self._store_signature()
+        columns = self._load_columns(signature)
+        if columns is None:
+            columns = TaskColumns.from_tasks(self._get_tasks())
+            if signature is not None and signature == self._store_signature():
+                self._write_columns(columns, signature)
+        return columns
+
+    def report(self, days: int = 14, today: Optional[date] = None) -> Dict[str, Any]:
+        """Build a throughput and cycle-time report from the columnar view.
+
+        Args:
+            days: Number of days, ending today, covered by the daily counts.
+                  Defaults to 14.
+            today: The last day of the report. Defaults to the current date.
+
+        Returns:
+            A dictionary with keys:
+            - count: Total number of tasks
+            - statusCounts: Number of tasks per status
+            - days: List of (date, created, done) for each day in the window,
+              where done counts tasks whose status is done and whose
+              updatedAt falls on that day
+            - cycleTime: Count, mean, median and p90 seconds from createdAt to
+              updatedAt of done tasks (see TaskColumns.cycle_time_stats)
+
+        Raises:
+            ValueError: If days is not positive or the store can't be read.
+        """
+        if days < 1:
+            raise ValueError(f"Invalid number of days: {days}")
+        today = today or date.today()
+        first = today - timedelta(days=days - 1)
+
+        cols = self.columns()
+        created = cols.histogram_by_day("createdAt", since=first)
+        done = cols.histogram_by_day("updatedAt", status=self.STATUS_DONE, since=first)
+        window = [first + timedelta(days=i) for i in range(days)]
+        return {
+            "count": len(cols),
+            "statusCounts": cols.count_by_status(),
+            "days": [(day, created.get(day, 0), done.get(day, 0)) for day in window],
+            "cycleTime": cols.cycle_time_stats(self.STATUS_DONE),
+        }
+
+    def mark_in_progress(
+        self, id: int, expected_version: Optional[int] = None, sync: bool = False
+    ) -> Dict[str, Any]:
+        """Mark a task as in progress.
+
+        Updates the task status to "in-progress" and updates the updatedAt timestamp.
+
+        Args:
+            id: The id of the task to mark as in progress.
+            expected_version: If given, only update the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The updated task dictionary with status "in-progress" and updated updatedAt.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If task with given id is not found or if file save fails.
+        """
+        return self._update_task_status(
+            id, self.STATUS_IN_PROGRESS, expected_version, sync
+        )
+
+    def mark_done(
+        self, id: int, expected_version: Optional[int] = None, sync: bool = False
+    ) -> Dict[str, Any]:
         """Mark a task as done.
-        
+
         Updates the task status to "done" and updates the updatedAt timestamp.
-        
+
         Args:
             id: The id of the task to mark as done.
-            
+            expected_version: If given, only update the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
         Returns:
             The updated task dictionary with status "done" and updated updatedAt.
-            
+
         Raises:
+            VersionConflict: If the task's version is not expected_version.
             ValueError: If task with given id is not found or if file save fails.
         """
-        return self._update_task_status(id, self.STATUS_DONE)
\ No newline at end of file
+        return self._update_task_status(id, self.STATUS_DONE, expected_version, sync)
+
+    def next_tasks(self, k: int = 1) -> List[Dict[str, Any]]:
+        """Get the k most important tasks that are not done.
+
+        Tasks are ranked by priority (highest first), then due date (earliest
+        first, tasks without one last), then id. The ranking comes from the
+        persisted priority heap (see NextIndex), which saves keep in step, so
+        picking the tasks costs O(k log n) and only they are decoded.
+
+        Args:
+            k: The number of tasks to get. Defaults to 1.
+
+        Returns:
+            Up to k task dictionaries, most important first.
+
+        Raises:
+            ValueError: If k is less than 1.
+        """
+        if not isinstance(k, int) or k < 1:
+            raise ValueError(f"Invalid count: {k}")
+        return self._get_tasks_by_id(self._get_index(NextIndex.name).top(k))
+
+    def count_tasks(self, status: Optional[str] = None) -> int:
+        """Count tasks, optionally filtered by status.
+
+        Reads only the store header, so the cost does not depend on the number
+        of tasks.
+
+        Args:
+            status: Optional status filter. Must be one of: "todo",
+                   "in-progress", "done".
+                   If None, counts all tasks.
+
+        Returns:
+            The number of matching tasks.
+
+        Raises:
+            ValueError: If status is provided but is not a valid status value.
+        """
+        if status is not None and status not in self.VALID_STATUSES:
+            raise ValueError(f"Invalid status filter: {status}")
+
+        header = self._get_header()
+        if status is None:
+            return header["count"]
+        return header["statusCounts"].get(status, 0)
+
+    def migrate_timestamps(self, epoch_ms: bool = True) -> int:
+        """Convert the store's createdAt/updatedAt to epoch milliseconds or back to ISO.
+
+        The store is rewritten in one streaming pass, one task at a time, so
+        the whole task list is never held in memory. The header is rebuilt from
+        the same pass; indexes, the snapshot and the columnar view no longer
+        match the store and are rebuilt on next use.
+
+        Args:
+            epoch_ms: True to convert ISO strings to epoch milliseconds, False
+                     to convert epoch milliseconds to ISO strings.
+
+        Returns:
+            The number of tasks in the store.
+
+        Raises:
+            ValueError: If the store can't be read or written, or holds an
+                       invalid timestamp.
+        """
+        with self._write_lock():
+            self._flush_batch()
+            if self._batch is not None:
+                self._batch["tasks"] = None  # reread after the rewrite
+            if self._store_signature() is None:
+                self.epoch_timestamps = epoch_ms
+                return 0
+
+            convert = iso_to_epoch_ms if epoch_ms else format_timestamp
+            source = str if epoch_ms else int
+            memo: Dict[Any, Any] = {}
+
+            def to_target(value: Any) -> Any:
+                if not isinstance(value, source):
+                    return value
+                converted = memo.get(value)
+                if converted is None:
+                    try:
+                        converted = memo[value] = convert(value)
+                    except (ValueError, OverflowError, OSError):
+                        raise ValueError(f"Invalid timestamp: {value}")
+                    if len(memo) > 100_000:
+                        memo.clear()
+                return converted
+
+            status_counts = {status: 0 for status in sorted(self.VALID_STATUSES)}
+            count, max_id, linked = 0, 0, 0
+            batch: List[Dict[str, Any]] = []
+            dumps_flat = json.JSONEncoder(separators=(",\n    ", ": ")).encode
+            tmp_path = self.path + ".migrate"
+
+            def write_batch(out: IO[str]) -> None:
+                # Encode a batch as a list in the store's format, without the brackets,
+                # so the file is byte-identical to one written by _save_tasks.
+                if self.compression is None:
+                    if {list, dict} & set(
+                        map(type, chain.from_iterable(map(dict.values, batch)))
+                    ):
+                        text = json.dumps(batch, indent=2)[2:-2]
+                    else:
+                        # Flat tasks: the C encoder with indent-shaped separators
+                        # gives the same text as indent=2 (which is pure Python).
+                        text = ",\n".join(
+                            [
+                                "  {\n    " + dumps_flat(t)[1:-1] + "\n  }"
+                                if t
+                                else "  {}"
+                                for t in batch
+                            ]
+                        )
+                    out.write(("\n" if count == len(batch) else ",\n") + text)
+                else:
+                    text = json.dumps(batch, separators=(",", ":"))[1:-1]
+                    out.write(("" if count == len(batch) else ",") + text)
+                batch.clear()
+
+            try:
+                with self._open_store("w", tmp_path) as out:
+                    out.write("[")
+                    for task in self._iter_store():
+                        task["createdAt"] = to_target(task.get("createdAt"))
+                        task["updatedAt"] = to_target(task.get("updatedAt"))
+                        batch.append(task)
+                        count += 1
+                        max_id = max(max_id, task["id"])
+                        status_counts[task.get("status")] = (
+                            status_counts.get(task.get("status"), 0) + 1
+                        )
+                        linked += bool(task.get("dependsOn"))
+                        if len(batch) == MIGRATE_BATCH_TASKS:
+                            write_batch(out)
+                    if batch:
+                        write_batch(out)
+                    out.write("\n]" if count and self.compression is None else "]")
+                os.replace(tmp_path, self.path)
+            except (OSError, lzma.LZMAError) as e:
+                raise ValueError(f"Failed to save tasks to {self.path}: {e}")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+            previous = self._read_header_file()
+            self._write_header(
+                {
+                    "version": HEADER_VERSION,
+                    "count": count,
+                    "statusCounts": status_counts,
+                    "nextId": max_id + 1,
+                    "linked": linked,
+                    "seq": previous["seq"] + 1 if previous is not None else 1,
+                    "epochTimestamps": epoch_ms if count else None,
+                    "store": self._store_signature(),
+                }
+            )
+            if not count:
+                self.epoch_timestamps = epoch_ms
+            self._indexes.clear()
+            return count
+
+    def generation(self) -> int:
+        """Get the store's generation number.
+
+        The generation is the header's sequence number: it increases with
+        every save, by this or any other TaskManager. A writer can note it
+        when it reads and compare it before writing. If it is unchanged, no
+        task changed in between. Otherwise, changes with expected_version
+        show exactly which tasks conflicted. Reads only the header.
+
+        Returns:
+            The current generation.
+        """
+        return self._get_header()["seq"]
+
+    def snapshot(self) -> TaskSnapshot:
+        """Get an immutable snapshot of the tasks.
+
+        The snapshot stays the same while tasks are changed: its tasks are
+        read-only mappings that no writer touches. While the store is
+        unchanged, every call returns the same snapshot without reading the
+        store, so taking one is O(1). A save by this TaskManager builds the
+        next snapshot from the last one, copying only the tasks it changed;
+        a change by anyone else is detected from the store's size and mtime
+        and the tasks are read again. Pending batch() changes are saved first.
+
+        Returns:
+            The snapshot (see task_snapshot.TaskSnapshot).
+
+        Raises:
+            ValueError: If there's an error reading the file.
+        """
+        self._flush_batch()
+        signature = self._store_signature()
+        view = self._view
+        if view is None or view.signature != signature:
+            view = TaskSnapshot.from_tasks(
+                self._read_tasks(), self._get_header()["seq"], signature
+            )
+            self._view = view
+        return view
+
+    def store_tag(self) -> str:
+        """Get a tag that changes whenever the store changes.
+
+        The tag combines the header's sequence number with the size and mtime
+        of the store, so while the header is fresh no tasks are read. It is
+        meant for cache validation, e.g. as an HTTP ETag.
+
+        Returns:
+            An opaque string, equal for two calls only if the store was not
+            saved or edited in between.
+        """
+        self._flush_batch()
+        header = self._get_header()
+        size, mtime_ns = header["store"] or (0, 0)
+        return f"{header['seq']}-{size}-{mtime_ns}"
+
+    def summary(self) -> Dict[str, Any]:
+        """Get a summary of the store from its header.
+
+        Returns:
+            A dictionary with keys:
+            - count: Total number of tasks
+            - statusCounts: Number of tasks per status
+            - nextId: The id the next added task will get
+            - seq: Sequence number, increased on every save
+        """
+        header = self._get_header()
+        return {key: header[key] for key in ("count", "statusCounts", "nextId", "seq")}
+
+    def lists(self) -> List[Dict[str, Any]]:
+        """Get the named task lists of the store, with their summaries.
+
+        Each list has its own store file, header and indexes, so this reads
+        one small header per list and no tasks.
+
+        Returns:
+            One dictionary per list, "default" first and the others by name,
+            with the list's name and the keys of summary().
+
+        Raises:
+            ValueError: If a list's header has to be rebuilt and its store
+                       can't be read.
+        """
+        names = [DEFAULT_NAMESPACE]
+        try:
+            names += sorted(
+                name
+                for name in os.listdir(self.store_path + LISTS_SUFFIX)
+                if name != DEFAULT_NAMESPACE and NAMESPACE_RE.fullmatch(name)
+            )
+        except OSError:
+            pass
+        return [
+            {
+                "name": name,
+                **(
+                    self if name == self.namespace else self._list_manager(name)
+                ).summary(),
+            }
+            for name in names
+        ]
+
+    def move_task(
+        self,
+        id: int,
+        namespace: str,
+        expected_version: Optional[int] = None,
+        sync: bool = False,
+    ) -> Dict[str, Any]:
+        """Move a task to another named list.
+
+        The task is added to the other list with the next id of that list
+        and version 1, then deleted from this one. Only the two lists' stores
+        are read and saved. Its dependencies are dropped, as ids are only
+        meaningful within one list.
+
+        Args:
+            id: The id of the task in this list.
+            namespace: The name of the list to move it to (created if needed).
+            expected_version: If given, only move the task if it is still at
+                  this version.
+            sync: If True, save pending changes (write-behind mode, batch())
+                  before returning.
+
+        Returns:
+            The task as added to the other list.
+
+        Raises:
+            VersionConflict: If the task's version is not expected_version.
+            ValueError: If the list name is invalid or is this list, the task
+                       is not found, or if file save fails.
+        """
+        target = self._list_manager(namespace)
+        if target.path == self.path:
+            raise ValueError(f"Task {id} is already in list {namespace}.")
+
+        # Both lists are locked in the order of their lock files, so moves in
+        # opposite directions can't each hold one lock and wait for the other.
+        with ExitStack() as locks:
+            for manager in sorted((self, target), key=lambda m: m.lock_path):
+                locks.enter_context(manager._write_lock())
+            found = self._get_tasks_by_id([id])
+            if not found:
+                raise TaskNotFound(id)
+            task = found[0]
+            self._check_version(task, expected_version)
+
+            tasks = target._get_tasks()
+            moved = {k: v for k, v in task.items() if k != "dependsOn"}
+            moved.update(
+                id=target._take_next_id(tasks),
+                createdAt=target._to_timestamp(task["createdAt"]),
+                updatedAt=target._get_timestamp(),
+                version=1,
+            )
+            tasks.append(moved)
+            target._save_tasks(tasks, added=[moved])
+            self.delete_task(id)
+        if sync:
+            self.flush()
+        return moved
+
+    def add_template(
+        self,
+        description: str,
+        every: Optional[str] = None,
+        cron: Optional[str] = None,
+        start: Optional[Union[datetime, str]] = None,
+        priority: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Add a recurring task template.
+
+        tick() adds a task from the template each time it is due.
+
+        Args:
+            description: Description of the tasks to add (must be non-empty).
+            every: An interval such as "30m", "12h", "1d" or "2w"; the first
+                  task is due at start.
+            cron: A cron expression (minute hour day month weekday), e.g.
+                  "0 9 * * 1-5" for 9:00 on weekdays. Give every or cron.
+            start: When the template starts (datetime or ISO string). Defaults
+                  to now.
+            priority: Optional priority of the tasks.
+            tags: Optional tags of the tasks.
+
+        Returns:
+            The template, with its id and its next occurrence in "next".
+
+        Raises:
+            ValueError: If the description, rule, start, priority or tags are
+                       invalid, or if the templates can't be saved.
+        """
+        if not description or not description.strip():
+            raise ValueError("Task Description cannot be empty.")
+        if isinstance(start, str):
+            try:
+                start = datetime.fromisoformat(start)
+            except ValueError:
+                raise ValueError(f"Invalid timestamp: {start}")
+        start = (start or datetime.now()).replace(microsecond=0)
+        template: Dict[str, Any] = {"description": description}
+        if every is not None:
+            template["every"] = every
+        if cron is not None:
+            template["cron"] = cron
+        template["start"] = start.isoformat(timespec="seconds")
+        template["next"] = (
+            self._template_rule(template)
+            .first_at_or_after(start)
+            .isoformat(timespec="seconds")
+        )
+        self._set_planning(template, priority, None)
+        self._set_tags(template, self._check_tags(tags or ()))
+
+        with self._write_lock():
+            data, scheduler = self._load_templates()
+            template = {"id": data["nextId"], **template}
+            data = dict(
+                data,
+                nextId=data["nextId"] + 1,
+                templates=data["templates"] + [template],
+            )
+            scheduler.schedule(template["id"], template["next"])
+            self._save_templates(data, scheduler)
+        return template
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """Get the recurring task templates, by id.
+
+        Raises:
+            ValueError: If the templates can't be read.
+        """
+        data, _ = self._load_templates()
+        return [dict(t) for t in data["templates"]]
+
+    def delete_template(self, id: int) -> Dict[str, Any]:
+        """Delete a recurring task template; tasks already added from it are kept.
+
+        Returns:
+            The deleted template.
+
+        Raises:
+            ValueError: If there is no template with this id, or the templates
+                       can't be saved.
+        """
+        with self._write_lock():
+            data, scheduler = self._load_templates()
+            template = next((t for t in data["templates"] if t["id"] == id), None)
+            if template is None:
+                raise NotFound(f"Template with id {id} not found.")
+            data = dict(data, templates=[t for t in data["templates"] if t["id"] != id])
+            scheduler.unschedule(id)
+            self._save_templates(data, scheduler)
+        return template
+
+    def tick(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Add the tasks of every recurring template that is due.
+
+        The templates are kept in a heap by next occurrence (see
+        TemplateScheduler), so a tick with nothing due only looks at the top
+        of the heap and doesn't read the store. Due templates each add one
+        task for their latest occurrence (missed occurrences are not added
+        one by one), all in one save, and are rescheduled after now.
+
+        Generation is idempotent: each task records its template and
+        occurrence ("template", "occurrence"), and an occurrence that already
+        has a task is not added again, even if the templates weren't saved
+        after the tasks were (e.g. after a crash).
+
+        Args:
+            now: The current time. Defaults to datetime.now().
+
+        Returns:
+            The added tasks.
+
+        Raises:
+            ValueError: If the templates or the store can't be read or saved.
+        """
+        now = (now or datetime.now()).replace(microsecond=0)
+        now_iso = now.isoformat(timespec="seconds")
+        _, scheduler = self._load_templates()
+        at = scheduler.peek()
+        if at is None or at > now_iso:
+            return []
+
+        with self._write_lock():
+            data, scheduler = self._load_templates()
+            due = scheduler.pop_due(now_iso)
+            if not due:
+                return []
+            try:
+                templates = {t["id"]: t for t in data["templates"]}
+                generated = []
+                with self.batch():
+                    tasks = self._get_tasks()
+                    seen = {
+                        (t["template"], t["occurrence"])
+                        for t in tasks
+                        if "occurrence" in t
+                    }
+                    timestamp = self._get_timestamp()
+                    for template_id in due:
+                        template = templates[template_id]
+                        rule = self._template_rule(template)
+                        occurrence = rule.last_at_or_before(now).isoformat(
+                            timespec="seconds"
+                        )
+                        if (template_id, occurrence) not in seen:
+                            task = {
+                                "id": self._take_next_id(tasks),
+                                "description": template["description"],
+                                "status": self.STATUS_TODO,
+                                "createdAt": timestamp,
+                                "updatedAt": timestamp,
+                                "version": 1,
+                                **{
+                                    k: template[k]
+                                    for k in ("priority", "tags")
+                                    if k in template
+                                },
+                                "template": template_id,
+                                "occurrence": occurrence,
+                            }
+                            tasks.append(task)
+                            self._save_tasks(tasks, added=[task])
+                            generated.append(task)
+                        template["next"] = rule.next_after(now).isoformat(
+                            timespec="seconds"
+                        )
+                # Write-behind: the tasks are saved before the templates.
+                self._flush_batch()
+                for template_id in due:
+                    scheduler.schedule(template_id, templates[template_id]["next"])
+                self._save_templates(data, scheduler)
+            except BaseException:
+                self._recurring = None  # reread the templates next time
+                raise
+        return generated
+
+    def save_view(self, name: str, where: str) -> Dict[str, Any]:
+        """Save a where query as a named view, replacing any view of that name.
+
+        The view's results are materialized in the "views" index and kept up
+        to date as tasks are added, changed and deleted, so show_view() never
+        evaluates the query again.
+
+        Args:
+            name: The view name (letters, digits, "_" and "-").
+            where: The query, as for list_tasks(where=...). Relative times
+                  such as "7d" are not allowed.
+
+        Returns:
+            A dictionary with the view's name, where and count (number of
+            matching tasks).
+
+        Raises:
+            ValueError: If the name or query is invalid, or the views can't be saved.
+        """
+        if not isinstance(name, str) or not NAMESPACE_RE.fullmatch(name):
+            raise ValueError(f"Invalid view name: {name!r}")
+        if not where or not where.strip():
+            raise ValueError("View query cannot be empty.")
+        self._parse_view(where)
+
+        with self._write_lock():
+            views = self._load_views()
+            views[name] = where
+            self._save_views(views)
+            count = len(self._get_views(views).results[name])
+        return {"name": name, "where": where, "count": count}
+
+    def show_view(self, name: str) -> List[Dict[str, Any]]:
+        """Get the tasks of a saved view, in id order.
+
+        The matching ids are read from the materialized results and only
+        those tasks are decoded, so the cost is O(result size) rather than a
+        pass over the store.
+
+        Args:
+            name: The view name.
+
+        Returns:
+            The matching tasks.
+
+        Raises:
+            ValueError: If there is no view with this name, or the store or
+                       views can't be read.
+        """
+        views = self._load_views()
+        if name not in views:
+            raise NotFound(f"View '{name}' not found.")
+        return self._get_tasks_by_id(self._get_views(views).lookup(name))
+
+    def list_views(self) -> List[Dict[str, Any]]:
+        """Get the saved views, by name, with their queries and result counts.
+
+        Raises:
+            ValueError: If the store or views can't be read.
+        """
+        views = self._load_views()
+        if not views:
+            return []
+        index = self._get_views(views)
+        return [
+            {"name": name, "where": views[name], "count": len(index.results[name])}
+            for name in sorted(views)
+        ]
+
+    def delete_view(self, name: str) -> Dict[str, Any]:
+        """Delete a saved view.
+
+        Returns:
+            The deleted view's name and where.
+
+        Raises:
+            ValueError: If there is no view with this name, or the views can't
+                       be saved.
+        """
+        with self._write_lock():
+            views = self._load_views()
+            if name not in views:
+                raise NotFound(f"View '{name}' not found.")
+            where = views.pop(name)
+            self._save_views(views)
+            index = self._indexes.get(ViewIndex.name)
+            if index is not None:
+                index.drop_view(name)
+                if index.signature is not None:
+                    self._write_index(index)
+        return {"name": name, "where": where}
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+import csv
+import io
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from task_manager import format_timestamp
+
+OUTPUT_FORMATS = ("text", "json", "ndjson", "csv", "tsv")
+
+TASK_FIELDS = (
+    "id",
+    "description",
+    "status",
+    "createdAt",
+    "updatedAt",
+    "version",
+    "priority",
+    "due",
+    "tags",
+    "dependsOn",
+    "template",
+    "occurrence",
+)
+TEXT_FIELDS = ("id", "description", "status")
+TIME_FIELDS = ("createdAt", "updatedAt")
+
+# Rows are joined and written in chunks of this many tasks.
+CHUNK_ROWS = 4096
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated field list.
+
+    Args:
+        fields: Comma-separated field names (e.g. "id,status"), or None.
+
+    Returns:
+        List of field names, or None if no fields were given.
+
+    Raises:
+        ValueError: If a field name is not a task field.
+    """
+    if fields is None:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    for name in names:
+        if name not in TASK_FIELDS:
+            raise ValueError(f"Invalid field: {name}")
+    return names or None
+
+
+@lru_cache(maxsize=65536)
+def _format_second(seconds: int) -> str:
+    """Format epoch seconds as a local ISO timestamp (cached: tasks share seconds)."""
+    return format_timestamp(seconds * 1000)
+
+
+def _format_times(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace epoch-millisecond timestamps with ISO strings.
+
+    Stores with epoch timestamps keep them as integers everywhere else; they
+    are only formatted here, for the tasks actually written.
+    """
+    if not any(isinstance(chunk[0].get(f), int) for f in TIME_FIELDS):
+        return chunk
+    return [
+        dict(
+            t,
+            **{
+                f: _format_second(t[f] // 1000)
+                for f in TIME_FIELDS
+                if isinstance(t.get(f), int)
+            },
+        )
+        for t in chunk
+    ]
+
+
+def _chunks(
+    tasks: List[Dict[str, Any]], fields: Optional[Iterable[str]] = None
+) -> Iterable[List[Dict[str, Any]]]:
+    """Split tasks into lists of at most CHUNK_ROWS tasks.
+
+    Epoch timestamps are formatted if fields (None for all fields) includes
+    createdAt or updatedAt.
+    """
+    timed = fields is None or any(f in TIME_FIELDS for f in fields)
+    for start in range(0, len(tasks), CHUNK_ROWS):
+        chunk = tasks[start : start + CHUNK_ROWS]
+        yield _format_times(chunk) if timed else chunk
+
+
+def _cell(value: Any) -> Any:
+    """Format a field value for text and CSV/TSV output.
+
+    Lists are joined with commas.
+    """
+    return ",".join(map(str, value)) if isinstance(value, (list, tuple)) else value
+
+
+def _write_text(
+    tasks: List[Dict[str, Any]], out: TextIO, fields: List[str], header: bool
+) -> None:
+    """Write tasks as " - " separated lines, preceded by a count banner."""
+    if header:
+        out.write(f"\nListing {len(tasks)} tasks:\n{'-' * 40}\n")
+
+    if fields == list(TEXT_FIELDS):
+        for chunk in _chunks(tasks, fields):
+            out.write(
+                "".join(
+                    [f"{t['id']} - {t['description']} - {t['status']}\n" for t in chunk]
+                )
+            )
+    else:
+        for chunk in _chunks(tasks, fields):
+            out.write(
+                "".join(
+                    [
+                        " - ".join([str(_cell(t.get(f, ""))) for f in fields]) + "\n"
+                        for t in chunk
+                    ]
+                )
+            )
+
+    if header:
+        out.write("\n\n")
+
+
+def _write_json(
+    tasks: List[Dict[str, Any]], out: TextIO, fields: Optional[List[str]], ndjson: bool
+) -> None:
+    """Write tasks as a JSON array or as one JSON object per line."""
+    dumps = json.dumps
+    separator = "\n" if ndjson else ",\n"
+    if not ndjson:
+        out.write("[\n")
+
+    first = True
+    for chunk in _chunks(tasks, fields):
+        if fields is not None:
+            chunk = [{f: t.get(f) for f in fields} for t in chunk]
+        text = separator.join([dumps(t) for t in chunk])
+        out.write(text if first else separator + text)
+        first = False
+
+    if not ndjson:
+        out.write("\n]\n")
+    elif tasks:
+        out.write("\n")
+
+
+def _write_delimited(
+    tasks: List[Dict[str, Any]],
+    out: TextIO,
+    fields: List[str],
+    header: bool,
+    dialect: str,
+) -> None:
+    """Write tasks as CSV or TSV rows through an in-memory chunk buffer."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, dialect=dialect, lineterminator="\n")
+    if header:
+        writer.writerow(fields)
+
+    for chunk in _chunks(tasks, fields):
+        writer.writerows([[_cell(t.get(f, "")) for f in fields] for t in chunk])
+        out.write(buf.getvalue())
+        buf.seek(0)
+        buf.truncate()
+    out.write(buf.getvalue())
+
+
+def write_tasks(
+    tasks: List[Dict[str, Any]],
+    out: TextIO,
+    fmt: str = "text",
+    fields: Optional[List[str]] = None,
+    header: bool = True,
+) -> None:
+    """Write tasks to a stream in the selected format.
+
+    Output is produced in chunks of CHUNK_ROWS tasks, one write per chunk,
+    instead of one write per task. Epoch-millisecond timestamps are written as
+    ISO strings.
+
+    Args:
+        tasks: Tasks to write.
+        out: Text stream to write to (e.g. sys.stdout).
+        fmt: One of "text", "json", "ndjson", "csv", "tsv". Defaults to "text".
+        fields: Optional list of task fields to include, in order. Defaults to
+               id, description, status for text and every field otherwise.
+        header: Whether to write the text banner or the CSV/TSV header row.
+               Ignored for JSON formats.
+
+    Raises:
+        ValueError: If the format or a field name is invalid.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Invalid output format: {fmt}")
+    for name in fields or ():
+        if name not in TASK_FIELDS:
+            raise ValueError(f"Invalid field: {name}")
+
+    if fmt == "text":
+        _write_text(tasks, out, list(fields or TEXT_FIELDS), header)
+    elif fmt in ("json", "ndjson"):
+        _write_json(tasks, out, fields, ndjson=fmt == "ndjson")
+    else:
+        dialect = "excel" if fmt == "csv" else "excel-tab"
+        _write_delimited(tasks, out, list(fields or TASK_FIELDS), header, dialect)
+    out.flush()
+
+
+def silence_broken_pipe() -> None:
+    """Point stdout at devnull after the reader of a pipe has gone away.
+
+    Called after catching BrokenPipeError (e.g. when output is piped to
+    `head`), so that Python's flush of stdout at exit doesn't raise again.
+    """
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except (OSError, ValueError, io.UnsupportedOperation):
+        pass
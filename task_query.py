@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+import operator
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from task_index import tokenize
+
+# A predicate over a single task dictionary.
+Predicate = Callable[[Dict[str, Any]], bool]
+
+QUERY_FIELDS = ("id", "status", "description", "createdAt", "updatedAt")
+TIME_FIELDS = ("createdAt", "updatedAt")
+
+COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Operators each field accepts, in addition to = and !=.
+FIELD_OPERATORS = {
+    "id": {"<", "<=", ">", ">=", "in"},
+    "status": {"in"},
+    "description": {"~", "<", "<=", ">", ">="},
+    "createdAt": {"<", "<=", ">", ">="},
+    "updatedAt": {"<", "<=", ">", ">="},
+}
+
+TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<string>'[^']*'|"[^"]*")
+        |(?P<op><=|>=|!=|=|<|>|~|\(|\)|,)
+        |(?P<word>[^\s()<>=!~,'"]+)
+    )""",
+    re.VERBOSE,
+)
+
+
+class Condition:
+    """A single comparison such as `status in (todo, done)` or `updatedAt > X`."""
+
+    def __init__(self, field: str, op: str, value: Any) -> None:
+        """Initialize a condition.
+
+        Args:
+            field: Task field being compared.
+            op: Comparison operator ("=", "!=", "<", "<=", ">", ">=", "in" or "~").
+            value: Normalized value (a list of values for "in").
+        """
+        self.field = field
+        self.op = op
+        self.value = value
+
+    def __str__(self) -> str:
+        if self.op == "in":
+            return f"{self.field} in ({', '.join(str(v) for v in self.value)})"
+        if self.op == "~":
+            return f"{self.field} ~ '{self.value}'"
+        return f"{self.field} {self.op} {self.value}"
+
+    def compile(self) -> Predicate:
+        """Compile the condition into a predicate."""
+        field, value = self.field, self.value
+        if self.op == "in":
+            allowed = frozenset(value)
+            return lambda t: t.get(field) in allowed
+        if self.op == "~":
+            return _text_predicate(value)
+        compare = COMPARISONS[self.op]
+        return lambda t: t.get(field) is not None and compare(t[field], value)
+
+
+class And:
+    """Conjunction of sub-queries."""
+
+    def __init__(self, parts: List[Any]) -> None:
+        self.parts = parts
+
+    def __str__(self) -> str:
+        return " and ".join(_wrap(p) for p in self.parts)
+
+    def compile(self) -> Predicate:
+        """Compile into a predicate that short-circuits on the first failure."""
+        preds = [p.compile() for p in self.parts]
+        return lambda t: all(pred(t) for pred in preds)
+
+
+class Or:
+    """Disjunction of sub-queries."""
+
+    def __init__(self, parts: List[Any]) -> None:
+        self.parts = parts
+
+    def __str__(self) -> str:
+        return " or ".join(_wrap(p) for p in self.parts)
+
+    def compile(self) -> Predicate:
+        """Compile into a predicate that short-circuits on the first match."""
+        preds = [p.compile() for p in self.parts]
+        return lambda t: any(pred(t) for pred in preds)
+
+
+class Not:
+    """Negation of a sub-query."""
+
+    def __init__(self, part: Any) -> None:
+        self.part = part
+
+    def __str__(self) -> str:
+        return f"not {_wrap(self.part)}"
+
+    def compile(self) -> Predicate:
+        """Compile into the negated predicate."""
+        pred = self.part.compile()
+        return lambda t: not pred(t)
+
+
+def _wrap(node: Any) -> str:
+    """Render a node, adding parentheses around compound sub-queries."""
+    return f"({node})" if isinstance(node, (And, Or)) else str(node)
+
+
+def _text_predicate(text: str) -> Predicate:
+    """Build a predicate matching descriptions containing every word of text.
+
+    Uses the same tokens as the description search index; a word ending in
+    "*" matches as a prefix.
+    """
+    prefix = text.rstrip().endswith("*")
+    terms = tokenize(text)
+    exact = set(terms[:-1] if prefix else terms)
+    start = terms[-1] if prefix and terms else None
+
+    def predicate(t: Dict[str, Any]) -> bool:
+        tokens = set(tokenize(t.get("description", "")))
+        if not exact <= tokens:
+            return False
+        return start is None or any(tok.startswith(start) for tok in tokens)
+
+    return predicate
+
+
+def conjuncts(node: Any) -> List[Any]:
+    """Get the top-level conditions that must all hold for a query to match.
+
+    Args:
+        node: A parsed query.
+
+    Returns:
+        The Condition nodes directly under a top-level And (or the node itself
+        if it is a single Condition); empty for Or/Not at the top level.
+    """
+    if isinstance(node, Condition):
+        return [node]
+    if isinstance(node, And):
+        return [p for p in node.parts if isinstance(p, Condition)]
+    return []
+
+
+class _Parser:
+    """Recursive-descent parser for the --where query language."""
+
+    def __init__(
+        self, text: str, to_timestamp: Callable[[str], Any], statuses: set
+    ) -> None:
+        self.text = text
+        self.to_timestamp = to_timestamp
+        self.statuses = statuses
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+
+    def _tokenize(self, text: str) -> List[tuple]:
+        tokens = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            m = TOKEN_RE.match(text, pos)
+            if m is None or m.end() == pos:
+                raise ValueError(f"Invalid query near: {text[pos:]}")
+            kind = m.lastgroup
+            value = m.group(kind)
+            if kind == "string":
+                value = value[1:-1]
+            tokens.append((kind, value))
+            pos = m.end()
+        return tokens
+
+    def _peek(self) -> Optional[tuple]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> tuple:
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of query: {self.text}")
+        self.pos += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == "word" and token[1].lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def _expect_op(self, op: str) -> None:
+        kind, value = self._next()
+        if kind != "op" or value != op:
+            raise ValueError(f"Expected '{op}' but found: {value}")
+
+    def parse(self) -> Any:
+        if not self.tokens:
+            raise ValueError("Query cannot be empty.")
+        node = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected input in query: {self._peek()[1]}")
+        return node
+
+    def _or(self) -> Any:
+        parts = [self._and()]
+        while self._keyword("or"):
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else Or(parts)
+
+    def _and(self) -> Any:
+        parts = [self._not()]
+        while self._keyword("and"):
+            parts.append(self._not())
+        return parts[0] if len(parts) == 1 else And(parts)
+
+    def _not(self) -> Any:
+        if self._keyword("not"):
+            return Not(self._not())
+        token = self._peek()
+        if token == ("op", "("):
+            self.pos += 1
+            node = self._or()
+            self._expect_op(")")
+            return node
+        return self._condition()
+
+    def _condition(self) -> Condition:
+        kind, field = self._next()
+        if kind != "word" or field not in QUERY_FIELDS:
+            raise ValueError(f"Invalid query field: {field}")
+
+        kind, op = self._next()
+        if kind == "word" and op.lower() == "in":
+            op = "in"
+        elif kind != "op" or op in ("(", ")", ","):
+            raise ValueError(f"Invalid operator after {field}: {op}")
+        if op not in ("=", "!=") and op not in FIELD_OPERATORS[field]:
+            raise ValueError(f"Operator {op} is not supported for {field}")
+
+        if op == "in":
+            self._expect_op("(")
+            values = [self._value(field)]
+            while self._peek() == ("op", ","):
+                self.pos += 1
+                values.append(self._value(field))
+            self._expect_op(")")
+            return Condition(field, op, values)
+        if op == "~":
+            kind, value = self._next()
+            if kind == "op":
+                raise ValueError(f"Expected a value after {field} ~")
+            return Condition(field, op, value)
+        return Condition(field, op, self._value(field))
+
+    def _value(self, field: str) -> Any:
+        kind, raw = self._next()
+        if kind == "op":
+            raise ValueError(f"Expected a value for {field} but found: {raw}")
+        if field == "id":
+            try:
+                return int(raw)
+            except ValueError:
+                raise ValueError(f"Invalid id value: {raw}")
+        if field == "status" and raw not in self.statuses:
+            raise ValueError(f"Invalid status filter: {raw}")
+        if field in TIME_FIELDS:
+            return self.to_timestamp(raw)
+        return raw
+
+
+def parse_query(text: str, to_timestamp: Callable[[str], Any], statuses: set) -> Any:
+    """Parse a --where query into a tree of Condition/And/Or/Not nodes.
+
+    Grammar (keywords are case-insensitive):
+        query     := term ("or" term)*
+        term      := factor ("and" factor)*
+        factor    := "not" factor | "(" query ")" | condition
+        condition := field op value | field "in" "(" value ("," value)* ")"
+
+    Fields are id, status, description, createdAt and updatedAt. Operators
+    are =, !=, <, <=, >, >=, "in" (id, status) and "~" (description contains
+    every word, with a trailing "*" for a prefix). Values may be quoted.
+
+    Args:
+        text: The query text.
+        to_timestamp: Converts time values (e.g. "2026-10-01" or "7d") to the
+                     stored timestamp representation.
+        statuses: Valid status values.
+
+    Returns:
+        The root node; call compile() on it to get a predicate.
+
+    Raises:
+        ValueError: If the query is empty or invalid.
+    """
+    return _Parser(text, to_timestamp, statuses).parse()
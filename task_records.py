@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from task_manager import LOCK_SUFFIX, TaskManager, format_timestamp
+
+try:
+    import fcntl
+except ImportError:  # Windows: changes are not locked against other processes
+    fcntl = None
+
+RECORD_MAGIC = b"TTRS"
+RECORD_VERSION = 1
+
+# File header: magic, version, number of id slots, the task count per status,
+# and the heap generation, which compact() bumps when it replaces the heap.
+FILE_HEADER = struct.Struct("<4sII3II8x")
+
+# One fixed-width record per id (task id N lives in slot N - 1): id, status
+# code (0 = no task), createdAt, updatedAt, and the offset and length of the
+# UTF-8 description in the string heap.
+RECORD = struct.Struct("<IB19s19sQI9x")
+STATUS_OFFSET = 4
+UPDATED_OFFSET = 24
+TIMESTAMP = struct.Struct("19s")
+
+STATUS_CODES = (
+    None,
+    TaskManager.STATUS_TODO,
+    TaskManager.STATUS_IN_PROGRESS,
+    TaskManager.STATUS_DONE,
+)
+STATUS_BY_NAME = {
+    status: code for code, status in enumerate(STATUS_CODES) if status is not None
+}
+
+# The record file grows by at least this many slots at a time, so adding a
+# task rarely has to resize the file and re-map it.
+GROW_SLOTS = 1024
+
+HEAP_SUFFIX = ".heap"
+
+# The task fields a record holds. "version" only guards TaskManager's
+# optimistic updates and is not kept; any other field with a value is
+# rejected rather than dropped.
+RECORD_FIELDS = {"id", "description", "status", "createdAt", "updatedAt"}
+DROPPED_FIELDS = {"version"}
+
+
+class RecordStore:
+    """Task storage engine built on memory-mapped fixed-width records.
+
+    Task metadata lives in fixed-width records in "<path>" and descriptions in
+    a separate string heap, "<path>.heap". Both files are memory-mapped and
+    nothing is parsed up front: a task id maps straight to its record's
+    offset, so get_task() is O(1), and only the pages actually read become
+    resident. Status changes rewrite the status byte and updatedAt in place.
+
+    Descriptions are append-only; updating a description appends the new text
+    and repoints the record. compact() rewrites the heap without the
+    unreferenced text.
+
+    Changes hold an flock() on "<path>.lock", like TaskManager's saves, and
+    every call first re-reads the file header, so a store open in several
+    processes sees the tasks, counts and file growth of the others. Like
+    TaskManager, changes go to the OS page cache and are not fsynced on every
+    call; close() flushes the mappings to disk.
+    """
+
+    def __init__(self, path: str = "tasks.rec") -> None:
+        """Open a record store, creating empty files if they don't exist.
+
+        Args:
+            path: Path to the record file. Descriptions are stored in
+                  "<path>.heap". Defaults to "tasks.rec".
+
+        Raises:
+            ValueError: If the file is not a record store or can't be opened.
+        """
+        self.path = path
+        self.heap_path = path + HEAP_SUFFIX
+        self.lock_path = path + LOCK_SUFFIX
+        try:
+            self._records = self._open(path)
+            self._heap = self._open(self.heap_path)
+            with self._locked(sync=False):
+                size = os.fstat(self._records.fileno()).st_size
+                if size == 0:
+                    self._records.write(
+                        FILE_HEADER.pack(RECORD_MAGIC, RECORD_VERSION, 0, 0, 0, 0, 0)
+                    )
+                elif size < FILE_HEADER.size:
+                    self._records.close()
+                    self._heap.close()
+                    raise ValueError(f"Not a task record store: {path}")
+        except OSError as e:
+            raise ValueError(f"Failed to open record store {path}: {e}")
+
+        self._mm = mmap.mmap(self._records.fileno(), 0)
+        self._heap_mm: Optional[mmap.mmap] = None
+        magic, version, *_, self._heap_generation = FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != RECORD_MAGIC or version != RECORD_VERSION:
+            self.close()
+            raise ValueError(f"Not a task record store: {path}")
+        self._sync()
+
+    @staticmethod
+    def _open(path: str) -> Any:
+        """Open a file for unbuffered reading and writing, creating it if needed."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        return os.fdopen(fd, "r+b", buffering=0)
+
+    @classmethod
+    def create(cls, path: str, tasks: Iterable[Dict[str, Any]]) -> "RecordStore":
+        """Create a record store from task dictionaries (e.g. a JSON store).
+
+        Any existing record store at path is replaced.
+
+        Args:
+            path: Path to the record file.
+            tasks: Tasks with id, description, status, createdAt and updatedAt.
+
+        Returns:
+            The open RecordStore.
+
+        Raises:
+            ValueError: If a task has an invalid id, status or timestamp.
+        """
+        for p in (path, path + HEAP_SUFFIX):
+            if os.path.exists(p):
+                os.remove(p)
+        store = cls(path)
+        try:
+            with store._locked():
+                for task in tasks:
+                    store._insert(task)
+        except ValueError:
+            store.close()
+            raise
+        return store
+
+    # -----------------------------------------
+    #  Internal Methods
+    # -----------------------------------------
+
+    @contextmanager
+    def _locked(self, sync: bool = True) -> Iterator[None]:
+        """Hold the store's lock file for a change.
+
+        The lock is an flock() on "<path>.lock", as TaskManager takes for its
+        saves. Without fcntl (Windows) no lock is taken.
+
+        Args:
+            sync: Re-read the file header once the lock is held.
+        """
+        lock_file = None
+        if fcntl is not None:
+            try:
+                lock_file = open(self.lock_path, "a")
+            except OSError as e:
+                raise ValueError(f"Failed to lock {self.path}: {e}")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if sync:
+                self._sync()
+            yield
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+    def _sync(self) -> None:
+        """Catch up with changes other processes made to the store.
+
+        The slot count and status counts are re-read from the file header.
+        The file is re-mapped if it grew past the mapping, and the heap is
+        reopened if compact() replaced it.
+        """
+        _, _, slots, *counts, generation = FILE_HEADER.unpack_from(self._mm, 0)
+        if FILE_HEADER.size + slots * RECORD.size > len(self._mm):
+            self._mm.close()
+            self._mm = mmap.mmap(self._records.fileno(), 0)
+        self._slots, self._counts = slots, counts
+        if generation != self._heap_generation:
+            self._reopen_heap()
+            self._heap_generation = generation
+
+    def _reopen_heap(self) -> None:
+        """Close the heap file and its mapping and open the current heap file."""
+        if self._heap_mm is not None:
+            self._heap_mm.close()
+            self._heap_mm = None
+        self._heap.close()
+        self._heap = self._open(self.heap_path)
+
+    def _write_file_header(self) -> None:
+        """Write the slot count, status counts and heap generation to the header."""
+        FILE_HEADER.pack_into(
+            self._mm,
+            0,
+            RECORD_MAGIC,
+            RECORD_VERSION,
+            self._slots,
+            *self._counts,
+            self._heap_generation,
+        )
+
+    def _record_offset(self, task_id: int) -> Optional[int]:
+        """Get the file offset of a task id's record, or None if out of range."""
+        if not isinstance(task_id, int) or not 1 <= task_id <= self._slots:
+            return None
+        return FILE_HEADER.size + (task_id - 1) * RECORD.size
+
+    def _ensure_slots(self, slots: int) -> None:
+        """Grow the record file (and its mapping) to hold at least slots records."""
+        needed = FILE_HEADER.size + slots * RECORD.size
+        if needed <= len(self._mm):
+            return
+        self._mm.close()
+        if needed > os.fstat(self._records.fileno()).st_size:
+            # Another process may already have grown the file: never shrink it.
+            capacity = max(slots, self._slots + max(GROW_SLOTS, self._slots // 8))
+            self._records.truncate(FILE_HEADER.size + capacity * RECORD.size)
+        self._mm = mmap.mmap(self._records.fileno(), 0)
+
+    def _read_description(self, offset: int, length: int) -> str:
+        """Read a description from the string heap."""
+        if length == 0:
+            return ""
+        if self._heap_mm is None or offset + length > len(self._heap_mm):
+            # The heap grew since it was mapped (or was empty).
+            if self._heap_mm is not None:
+                self._heap_mm.close()
+            self._heap_mm = mmap.mmap(self._heap.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._heap_mm[offset : offset + length].decode("utf-8")
+
+    def _append_description(self, description: str) -> tuple:
+        """Append a description to the string heap.
+
+        Returns:
+            The (offset, length) of the encoded description.
+        """
+        data = description.encode("utf-8")
+        offset = self._heap.seek(0, os.SEEK_END)
+        self._heap.write(data)
+        return offset, len(data)
+
+    def _unpack(self, offset: int) -> Optional[Dict[str, Any]]:
+        """Decode the record at offset into a task dictionary (None if empty)."""
+        task_id, code, created, updated, desc_offset, desc_length = RECORD.unpack_from(
+            self._mm, offset
+        )
+        if code == 0:
+            return None
+        return {
+            "id": task_id,
+            "description": self._read_description(desc_offset, desc_length),
+            "status": STATUS_CODES[code],
+            "createdAt": created.decode("ascii"),
+            "updatedAt": updated.decode("ascii"),
+        }
+
+    @staticmethod
+    def _encode_timestamp(value: Any) -> bytes:
+        """Encode an ISO timestamp or epoch milliseconds for a record.
+
+        The timestamp is stored as YYYY-MM-DDTHH:MM:SS. Other ISO forms are
+        normalised to that: fractional seconds are dropped, and a time with a
+        UTC offset is converted to local time, as epoch milliseconds are.
+
+        Raises:
+            ValueError: If value is not epoch milliseconds or an ISO timestamp.
+        """
+        if isinstance(value, int) and not isinstance(value, bool):
+            return format_timestamp(value).encode("ascii")
+        try:
+            parsed = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid timestamp: {value}")
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone().replace(tzinfo=None)
+        return parsed.isoformat(timespec="seconds").encode("ascii")
+
+    def _insert(self, task: Dict[str, Any]) -> None:
+        """Write a new task into its id's slot."""
+        task_id = task.get("id")
+        if not isinstance(task_id, int) or not 1 <= task_id < 2**32:
+            raise ValueError(f"Invalid task id: {task_id}")
+        extra = sorted(
+            key
+            for key, value in task.items()
+            if key not in RECORD_FIELDS
+            and key not in DROPPED_FIELDS
+            and value not in (None, [])
+        )
+        if extra:
+            raise ValueError(
+                f"Task {task_id} has fields a record store can't hold: "
+                + ", ".join(extra)
+            )
+        code = STATUS_BY_NAME.get(task.get("status"))
+        if code is None:
+            raise ValueError(f"Invalid status: {task.get('status')}")
+        created = self._encode_timestamp(task.get("createdAt"))
+        updated = self._encode_timestamp(task.get("updatedAt"))
+
+        if task_id > self._slots:
+            self._ensure_slots(task_id)
+            self._slots = task_id
+        offset = self._record_offset(task_id)
+        if self._mm[offset + STATUS_OFFSET] != 0:
+            raise ValueError(f"Duplicate task id: {task_id}")
+
+        desc_offset, desc_length = self._append_description(task.get("description", ""))
+        RECORD.pack_into(
+            self._mm, offset, task_id, code, created, updated, desc_offset, desc_length
+        )
+        self._counts[code - 1] += 1
+        self._write_file_header()
+
+    def _set_status(self, task_id: int, new_status: str) -> Dict[str, Any]:
+        """Change a task's status by rewriting its status byte and updatedAt."""
+        with self._locked():
+            offset = self._record_offset(task_id)
+            old_code = self._mm[offset + STATUS_OFFSET] if offset is not None else 0
+            if old_code == 0:
+                raise ValueError(f"Task with id {task_id} not found.")
+
+            code = STATUS_BY_NAME[new_status]
+            self._mm[offset + STATUS_OFFSET] = code
+            TIMESTAMP.pack_into(
+                self._mm,
+                offset + UPDATED_OFFSET,
+                self._get_timestamp().encode("ascii"),
+            )
+            self._counts[old_code - 1] -= 1
+            self._counts[code - 1] += 1
+            self._write_file_header()
+            return self._unpack(offset)
+
+    def _get_timestamp(self) -> str:
+        """Get the current timestamp (YYYY-MM-DDTHH:MM:SS)."""
+        return datetime.now().isoformat(timespec="seconds")
+
+    # -----------------------------------------
+    #  Public Methods
+    # -----------------------------------------
+
+    def get_task(self, id: int) -> Optional[Dict[str, Any]]:
+        """Get a task by id without reading any other record.
+
+        Args:
+            id: The task id.
+
+        Returns:
+            The task dictionary, or None if there is no task with that id.
+        """
+        self._sync()
+        offset = self._record_offset(id)
+        return None if offset is None else self._unpack(offset)
+
+    def iter_tasks(self, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over tasks in id order, optionally filtered by status.
+
+        Only the descriptions of matching tasks are read from the heap.
+
+        Args:
+            status: Optional status filter.
+
+        Yields:
+            Task dictionaries.
+
+        Raises:
+            ValueError: If status is not a valid status value.
+        """
+        code = None
+        if status is not None:
+            code = STATUS_BY_NAME.get(status)
+            if code is None:
+                raise ValueError(f"Invalid status filter: {status}")
+
+        self._sync()
+        for offset in range(
+            FILE_HEADER.size, FILE_HEADER.size + self._slots * RECORD.size, RECORD.size
+        ):
+            record_code = self._mm[offset + STATUS_OFFSET]
+            if record_code != 0 and (code is None or record_code == code):
+                yield self._unpack(offset)
+
+    def list_tasks(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List tasks in id order, optionally filtered by status.
+
+        Args:
+            status: Optional status filter. Must be one of: "todo",
+                   "in-progress", "done".
+
+        Returns:
+            List of task dictionaries.
+
+        Raises:
+            ValueError: If status is not a valid status value.
+        """
+        return list(self.iter_tasks(status))
+
+    def add_task(self, description: str) -> Dict[str, Any]:
+        """Add a new task with the next id (the highest id + 1).
+
+        Args:
+            description: The task description (must be non-empty after
+                  stripping whitespace).
+
+        Returns:
+            The new task dictionary.
+
+        Raises:
+            ValueError: If description is empty.
+        """
+        if not description or not description.strip():
+            raise ValueError("Task Description cannot be empty.")
+
+        timestamp = self._get_timestamp()
+        with self._locked():
+            task = {
+                "id": self._slots + 1,
+                "description": description,
+                "status": TaskManager.STATUS_TODO,
+                "createdAt": timestamp,
+                "updatedAt": timestamp,
+            }
+            self._insert(task)
+        return task
+
+    def update_task(self, id: int, updated_description: str) -> Dict[str, Any]:
+        """Update a task's description.
+
+        The new text is appended to the heap and the record repointed at it.
+
+        Args:
+            id: The id of the task to update.
+            updated_description: The new description (must be non-empty after
+                  stripping whitespace).
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            ValueError: If description is empty or the task is not found.
+        """
+        if not updated_description or not updated_description.strip():
+            raise ValueError("Updated Task Description cannot be empty.")
+
+        with self._locked():
+            task = self.get_task(id)
+            if task is None:
+                raise ValueError(f"Task with id {id} not found.")
+
+            offset = self._record_offset(id)
+            desc_offset, desc_length = self._append_description(updated_description)
+            task["description"] = updated_description
+            task["updatedAt"] = self._get_timestamp()
+            RECORD.pack_into(
+                self._mm,
+                offset,
+                id,
+                STATUS_BY_NAME[task["status"]],
+                task["createdAt"].encode("ascii"),
+                task["updatedAt"].encode("ascii"),
+                desc_offset,
+                desc_length,
+            )
+        return task
+
+    def delete_task(self, id: int) -> Dict[str, Any]:
+        """Delete a task by clearing its record.
+
+        Trailing empty slots are released, so as with TaskManager the next
+        added task gets the highest remaining id + 1.
+
+        Args:
+            id: The id of the task to delete.
+
+        Returns:
+            The deleted task dictionary.
+
+        Raises:
+            ValueError: If the task is not found.
+        """
+        with self._locked():
+            task = self.get_task(id)
+            if task is None:
+                raise ValueError(f"Task with id {id} not found.")
+
+            offset = self._record_offset(id)
+            self._mm[offset : offset + RECORD.size] = bytes(RECORD.size)
+            self._counts[STATUS_BY_NAME[task["status"]] - 1] -= 1
+            while (
+                self._slots
+                and self._mm[self._record_offset(self._slots) + STATUS_OFFSET] == 0
+            ):
+                self._slots -= 1
+            self._write_file_header()
+        return task
+
+    def mark_in_progress(self, id: int) -> Dict[str, Any]:
+        """Mark a task as in progress, in place.
+
+        Args:
+            id: The id of the task.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            ValueError: If the task is not found.
+        """
+        return self._set_status(id, TaskManager.STATUS_IN_PROGRESS)
+
+    def mark_done(self, id: int) -> Dict[str, Any]:
+        """Mark a task as done, in place.
+
+        Only the record's status byte and updatedAt are rewritten.
+
+        Args:
+            id: The id of the task.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            ValueError: If the task is not found.
+        """
+        return self._set_status(id, TaskManager.STATUS_DONE)
+
+    def count_tasks(self, status: Optional[str] = None) -> int:
+        """Count tasks from the counts kept in the file header.
+
+        Args:
+            status: Optional status filter.
+
+        Returns:
+            The number of matching tasks.
+
+        Raises:
+            ValueError: If status is not a valid status value.
+        """
+        self._sync()
+        if status is None:
+            return sum(self._counts)
+        code = STATUS_BY_NAME.get(status)
+        if code is None:
+            raise ValueError(f"Invalid status filter: {status}")
+        return self._counts[code - 1]
+
+    def compact(self) -> int:
+        """Rewrite the string heap with only the descriptions still referenced.
+
+        Returns:
+            The number of heap bytes reclaimed.
+        """
+        tmp_path = self.heap_path + ".tmp"
+        with self._locked():
+            before = os.fstat(self._heap.fileno()).st_size
+            relocated = []
+            with open(tmp_path, "wb") as out:
+                position = 0
+                for task in self.iter_tasks():
+                    data = task["description"].encode("utf-8")
+                    out.write(data)
+                    relocated.append((self._record_offset(task["id"]), position))
+                    position += len(data)
+
+            os.replace(tmp_path, self.heap_path)
+            self._reopen_heap()
+            for offset, desc_offset in relocated:
+                # The description offset follows id, status and the two timestamps.
+                struct.pack_into(
+                    "<Q",
+                    self._mm,
+                    offset + UPDATED_OFFSET + TIMESTAMP.size,
+                    desc_offset,
+                )
+            # Other processes reopen the heap when they see the new generation.
+            self._heap_generation = (self._heap_generation + 1) % 2**32
+            self._write_file_header()
+        return before - position
+
+    def close(self) -> None:
+        """Flush the mappings to disk and close the files."""
+        if self._heap_mm is not None:
+            self._heap_mm.close()
+            self._heap_mm = None
+        if not self._mm.closed:
+            self._mm.flush()
+            self._mm.close()
+        self._records.close()
+        self._heap.close()
+
+    def __enter__(self) -> "RecordStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Cron fields in order, with their ranges. Weekdays are 0-6 from Sunday (7 is
+# also Sunday).
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+# A cron rule that matches no day within this many days never matches.
+CRON_SEARCH_DAYS = 366 * 8
+
+
+def _parse_cron_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    """Parse one cron field.
+
+    A field is "*", "5", "1-5", "*/15", "0-30/10" or a comma list of these.
+
+    Raises:
+        ValueError: If the field is malformed or out of range.
+    """
+    values = set()
+    for part in text.split(","):
+        base, _, step = part.partition("/")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start, end = (int(v) for v in base.split("-", 1))
+        else:
+            start = end = int(base)
+        stride = int(step) if step else 1
+        if not low <= start <= end <= high or stride < 1:
+            raise ValueError(part)
+        values.update(range(start, end + 1, stride))
+    return frozenset(values)
+
+
+class RecurrenceRule:
+    """When a recurring task is due: a fixed interval or a cron expression.
+
+    Interval rules fire at start, start + interval, start + 2 * interval and
+    so on. Cron rules use the five standard fields (minute, hour, day of
+    month, month, day of week) with "*", numbers, ranges, steps and lists;
+    as in cron, if both day fields are restricted a day matching either one
+    matches. Times are local and to the minute.
+    """
+
+    def __init__(
+        self,
+        interval: Optional[timedelta] = None,
+        cron: Optional[str] = None,
+        start: Optional[datetime] = None,
+    ) -> None:
+        """Parse a rule.
+
+        Args:
+            interval: Time between occurrences.
+            cron: A cron expression such as "0 9 * * 1-5".
+            start: First occurrence of an interval rule (defaults to now).
+                  Cron rules only fire at or after it.
+
+        Raises:
+            ValueError: If not exactly one of interval and cron is given, or
+                       it is invalid.
+        """
+        if (interval is None) == (cron is None):
+            raise ValueError("Give either an interval or a cron rule.")
+        self.interval = interval
+        self.cron = cron
+        self.start = (start or datetime.now()).replace(microsecond=0)
+
+        if interval is not None:
+            if interval <= timedelta(0):
+                raise ValueError(f"Invalid interval: {interval}")
+            return
+
+        fields = cron.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Invalid cron rule: {cron} (expected 5 fields)")
+        parsed = []
+        for text, (name, low, high) in zip(fields, CRON_FIELDS):
+            try:
+                parsed.append(_parse_cron_field(text, low, high))
+            except ValueError:
+                raise ValueError(
+                    f"Invalid cron rule: {cron} (bad {name} field: {text})"
+                )
+        minutes, hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+        self.times = sorted(time(h, m) for h in hours for m in minutes)
+
+    def _day_matches(self, day: date) -> bool:
+        """Check a day against the month and the two day fields."""
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def _search(self, moment: datetime, forward: bool) -> datetime:
+        """Find the first cron time at or after (or at or before) a moment."""
+        day, now = moment.date(), moment.time()
+        step = timedelta(days=1 if forward else -1)
+        for i in range(CRON_SEARCH_DAYS):
+            if self._day_matches(day):
+                times = self.times
+                if i == 0:
+                    # Only times on the moment's side of the first day.
+                    times = (
+                        times[bisect_left(times, now) :]
+                        if forward
+                        else times[: bisect_right(times, now)]
+                    )
+                if times:
+                    return datetime.combine(day, times[0] if forward else times[-1])
+            day += step
+        raise ValueError(f"Cron rule never matches: {self.cron}")
+
+    def first_at_or_after(self, moment: datetime) -> datetime:
+        """Get the first occurrence at or after a moment (and not before start)."""
+        moment = max(moment, self.start)
+        if self.interval is not None:
+            periods = -((self.start - moment) // self.interval)  # ceiling division
+            return self.start + periods * self.interval
+        if moment.second or moment.microsecond:
+            moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        return self._search(moment, forward=True)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Get the first occurrence strictly after a moment."""
+        if self.interval is not None:
+            if moment < self.start:
+                return self.start
+            return (
+                self.start
+                + ((moment - self.start) // self.interval + 1) * self.interval
+            )
+        return self.first_at_or_after(
+            moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        )
+
+    def last_at_or_before(self, moment: datetime) -> Optional[datetime]:
+        """Get the latest occurrence at or before a moment.
+
+        Returns None if there is none yet.
+        """
+        if moment < self.start:
+            return None
+        if self.interval is not None:
+            return self.start + ((moment - self.start) // self.interval) * self.interval
+        try:
+            found = self._search(moment, forward=False)
+        except ValueError:
+            return None
+        return found if found >= self.start else None
+
+
+class TemplateScheduler:
+    """Min-heap of (next occurrence, template id) pairs.
+
+    Checking for due templates looks at the top of the heap only, so a tick
+    with nothing due is O(1) however many templates there are, and taking
+    the k due ones costs O(k log m). Rescheduled or removed templates leave
+    their old entries behind; those are skipped when they reach the top.
+    Occurrences are ISO timestamp strings, which sort like the times.
+    """
+
+    def __init__(self, templates: Iterable[Dict[str, Any]] = ()) -> None:
+        """Schedule templates by their "next" occurrence."""
+        self.next: Dict[int, str] = {t["id"]: t["next"] for t in templates}
+        self.heap: List[Tuple[str, int]] = [
+            (at, template_id) for template_id, at in self.next.items()
+        ]
+        heapq.heapify(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.next)
+
+    def peek(self) -> Optional[str]:
+        """Get the earliest scheduled occurrence, or None if nothing is scheduled."""
+        heap = self.heap
+        while heap and self.next.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: str) -> List[int]:
+        """Unschedule and return the ids of templates due at or before now.
+
+        The ids are returned earliest first.
+        """
+        due = []
+        while True:
+            at = self.peek()
+            if at is None or at > now:
+                return due
+            template_id = heapq.heappop(self.heap)[1]
+            del self.next[template_id]
+            due.append(template_id)
+
+    def schedule(self, template_id: int, at: str) -> None:
+        """Schedule a template's next occurrence, replacing any earlier one."""
+        self.next[template_id] = at
+        heapq.heappush(self.heap, (at, template_id))
+
+    def unschedule(self, template_id: int) -> None:
+        """Remove a template from the schedule."""
+        self.next.pop(template_id, None)
@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+import json
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from task_manager import LOCK_SUFFIX, TaskManager
+
+try:
+    import fcntl
+except ImportError:  # Windows: changes are not locked against other processes
+    fcntl = None
+
+SEGMENT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DEFAULT_SEGMENT_SIZE = 1000
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+
+STATUSES = (
+    TaskManager.STATUS_TODO,
+    TaskManager.STATUS_IN_PROGRESS,
+    TaskManager.STATUS_DONE,
+)
+
+
+class SegmentStore:
+    """Task storage engine that keeps only recently used segments in memory.
+
+    Tasks are stored in id order in fixed-size segments: compact JSON files of
+    at most segment_size tasks in the "<path>" directory. A small manifest,
+    "<path>/manifest.json", is the persistent id -> segment index: per segment
+    its file, its first and last id, its per-status counts and a write
+    generation. A task is found
+    with a binary search over the first ids, so a point operation (get_task,
+    update_task, mark_done, delete_task...) reads and rewrites one segment
+    plus the manifest, and counts never read a segment.
+
+    Parsed segments are kept in an LRU cache whose size, measured as the
+    segments' encoded bytes, stays within cache_bytes (the segment in use is
+    always kept). Full scans (iter_tasks, list_tasks) read segments through
+    the cache without adding to it, so a scan doesn't evict the hot segments.
+    cache_stats() reports hits, misses and evictions.
+
+    Like RecordStore, every change is written through to disk. Changes hold
+    an flock() on "<path>.lock" and re-read the manifest first, so processes
+    sharing a store never hand out the same id or overwrite each other's
+    segments; reads re-read the manifest when it changed on disk, and drop
+    cached segments whose generation another process moved on.
+    """
+
+    def __init__(
+        self,
+        path: str = "tasks.seg",
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ) -> None:
+        """Open a segment store, creating an empty one if it doesn't exist.
+
+        Args:
+            path: Directory for the manifest and segment files. Defaults to "tasks.seg".
+            segment_size: Maximum number of tasks per segment for a new store.
+                  An existing store keeps the size it was created with.
+            cache_bytes: Memory budget of the segment cache, in encoded bytes.
+
+        Raises:
+            ValueError: If segment_size or cache_bytes is invalid, or the
+                       directory is not a segment store or can't be opened.
+        """
+        if segment_size < 1:
+            raise ValueError(f"Invalid segment size: {segment_size}")
+        if cache_bytes < 0:
+            raise ValueError(f"Invalid cache size: {cache_bytes}")
+        self.path = path
+        self.manifest_path = os.path.join(path, MANIFEST_NAME)
+        self.lock_path = path + LOCK_SUFFIX
+        self.cache_bytes = cache_bytes
+        self.segment_size = segment_size
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            raise ValueError(f"Failed to open segment store {path}: {e}")
+
+        # file number -> (tasks by id, encoded size, generation), least
+        # recently used first
+        self._cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._cached_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        # Per segment: file number, first and last id, per-status counts and
+        # generation.
+        self._segments: List[Dict[str, Any]] = []
+        self._firsts: List[int] = []
+        self._next_file = 1
+        self._manifest_signature: Optional[tuple] = None
+        self._refresh(force=True)
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        tasks: Iterable[Dict[str, Any]],
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ) -> "SegmentStore":
+        """Create a segment store from task dictionaries (e.g. a JSON store).
+
+        Tasks are written a segment at a time, so tasks can be a stream.
+        Any existing segment store at path is replaced.
+
+        Args:
+            path: Directory of the segment store.
+            tasks: Tasks in increasing id order.
+            segment_size: Maximum number of tasks per segment.
+            cache_bytes: Memory budget of the segment cache, in encoded bytes.
+
+        Returns:
+            The open SegmentStore.
+
+        Raises:
+            ValueError: If a task has an invalid id or status, or ids are not
+                       increasing.
+        """
+        old = cls(path, segment_size, cache_bytes)
+        with old._locked():
+            for seg in old._segments:
+                os.remove(old._segment_path(seg["file"]))
+            if os.path.exists(old.manifest_path):
+                os.remove(old.manifest_path)
+
+            store = cls(path, segment_size, cache_bytes)
+            chunk: Dict[int, Dict[str, Any]] = {}
+            last = 0
+            for task in tasks:
+                task_id = task.get("id")
+                if not isinstance(task_id, int) or task_id <= last:
+                    raise ValueError(
+                        f"Invalid task id: {task_id} (ids must be increasing)"
+                    )
+                if task.get("status") not in STATUSES:
+                    raise ValueError(f"Invalid status: {task.get('status')}")
+                chunk[task_id] = dict(task)
+                last = task_id
+                if len(chunk) == store.segment_size:
+                    store._new_segment(chunk, write_manifest=False)
+                    chunk = {}
+            if chunk:
+                store._new_segment(chunk, write_manifest=False)
+            store._write_manifest()
+        return store
+
+    # -----------------------------------------
+    #  Internal Methods
+    # -----------------------------------------
+
+    def _segment_path(self, number: int) -> str:
+        """Get the path of a segment file."""
+        return os.path.join(self.path, f"{number:06d}.json")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the store's lock file for a change, with the manifest re-read.
+
+        The lock is an flock() on "<path>.lock", as TaskManager takes for its
+        saves. Without fcntl (Windows) no lock is taken.
+        """
+        lock_file = None
+        if fcntl is not None:
+            try:
+                lock_file = open(self.lock_path, "a")
+            except OSError as e:
+                raise ValueError(f"Failed to lock {self.path}: {e}")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            self._refresh(force=True)
+            yield
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+    def _stat_manifest(self) -> Optional[tuple]:
+        """Get the manifest's inode, mtime and size, or None if there is none."""
+        try:
+            st = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self, force: bool = False) -> None:
+        """Load the manifest if it changed on disk since it was last read.
+
+        Cached segments that are gone, or whose generation differs from the
+        manifest's, are dropped from the cache.
+
+        Args:
+            force: Read the manifest even if its inode, mtime and size are
+                  unchanged (used with the lock held, before a change).
+        """
+        signature = self._stat_manifest()
+        if not force and signature == self._manifest_signature:
+            return
+        manifest = self._read_manifest()
+        if manifest is None:
+            manifest = {
+                "version": SEGMENT_VERSION,
+                "segmentSize": self.segment_size,
+                "nextFile": 1,
+                "segments": [],
+            }
+        self._manifest_signature = signature
+        self.segment_size = manifest["segmentSize"]
+        self._next_file = manifest["nextFile"]
+        self._segments = manifest["segments"]
+        self._firsts = [seg["first"] for seg in self._segments]
+        generations = {seg["file"]: seg.get("gen", 0) for seg in self._segments}
+        for number, (_, size, generation) in list(self._cache.items()):
+            if generations.get(number) != generation:
+                del self._cache[number]
+                self._cached_bytes -= size
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        """Read the manifest, or None if the store is new."""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as mf:
+                manifest = json.load(mf)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Failed to open segment store {self.path}: {e}")
+        if not isinstance(manifest, dict) or manifest.get("version") != SEGMENT_VERSION:
+            raise ValueError(f"Not a task segment store: {self.path}")
+        return manifest
+
+    def _write_file(self, path: str, data: bytes) -> None:
+        """Write a file atomically through a temporary file."""
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            raise ValueError(f"Failed to save tasks to {self.path}: {e}")
+
+    def _write_manifest(self) -> None:
+        """Write the manifest with the current segment list."""
+        manifest = {
+            "version": SEGMENT_VERSION,
+            "segmentSize": self.segment_size,
+            "nextFile": self._next_file,
+            "segments": self._segments,
+        }
+        self._write_file(
+            self.manifest_path,
+            json.dumps(manifest, separators=(",", ":")).encode("utf-8"),
+        )
+        self._manifest_signature = self._stat_manifest()
+
+    def _locate(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Find the manifest entry of the segment that would hold a task id."""
+        if not isinstance(task_id, int):
+            return None
+        i = bisect_right(self._firsts, task_id) - 1
+        if i < 0 or task_id > self._segments[i]["last"]:
+            return None
+        return self._segments[i]
+
+    def _remember(
+        self, seg: Dict[str, Any], tasks: Dict[int, Dict[str, Any]], size: int
+    ) -> None:
+        """Put a segment in the cache as most recently used.
+
+        Least recently used segments are evicted to stay within the budget.
+        """
+        number = seg["file"]
+        old = self._cache.pop(number, None)
+        if old is not None:
+            self._cached_bytes -= old[1]
+        self._cache[number] = (tasks, size, seg.get("gen", 0))
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+            _, (_, evicted, _) = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted
+            self.evictions += 1
+
+    def _load(
+        self, seg: Dict[str, Any], cache: bool = True
+    ) -> Dict[int, Dict[str, Any]]:
+        """Get a segment's tasks by id, from the cache or its file.
+
+        Args:
+            seg: The segment's manifest entry.
+            cache: If False, a segment that isn't cached is read without being
+                  added to the cache (used by scans).
+        """
+        number = seg["file"]
+        entry = self._cache.get(number)
+        if entry is not None:
+            self.hits += 1
+            if cache:
+                self._cache.move_to_end(number)
+            return entry[0]
+
+        self.misses += 1
+        try:
+            with open(self._segment_path(number), "rb") as sf:
+                data = sf.read()
+            tasks = {t["id"]: t for t in json.loads(data)}
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(
+                f"Failed to read tasks from {self._segment_path(number)}: {e}"
+            )
+        if cache:
+            self._remember(seg, tasks, len(data))
+        return tasks
+
+    def _save(self, seg: Dict[str, Any], tasks: Dict[int, Dict[str, Any]]) -> None:
+        """Write one segment and the manifest after a change to the segment.
+
+        tasks is a changed copy of the segment's tasks; it replaces the cached
+        segment only once it is written, so a failed write leaves the cache
+        as it was. The segment's ids, counts and generation are updated; a
+        segment left empty is removed.
+        """
+        number = seg["file"]
+        if not tasks:
+            i = self._segments.index(seg)
+            del self._segments[i]
+            del self._firsts[i]
+            old = self._cache.pop(number, None)
+            if old is not None:
+                self._cached_bytes -= old[1]
+            self._write_manifest()
+            try:
+                os.remove(self._segment_path(number))
+            except OSError:
+                pass
+            return
+
+        data = json.dumps(list(tasks.values()), separators=(",", ":")).encode("utf-8")
+        self._write_file(self._segment_path(number), data)
+        seg["gen"] = seg.get("gen", 0) + 1
+        self._remember(seg, tasks, len(data))
+        seg["first"] = min(tasks)
+        seg["last"] = max(tasks)
+        seg["counts"] = [0] * len(STATUSES)
+        for t in tasks.values():
+            seg["counts"][STATUSES.index(t["status"])] += 1
+        self._firsts[self._segments.index(seg)] = seg["first"]
+        self._write_manifest()
+
+    def _new_segment(
+        self, tasks: Dict[int, Dict[str, Any]], write_manifest: bool = True
+    ) -> None:
+        """Append a new segment holding tasks (ids above every stored id)."""
+        seg = {"file": self._next_file, "first": 0, "last": 0, "counts": []}
+        self._next_file += 1
+        self._segments.append(seg)
+        self._firsts.append(0)
+        if write_manifest:
+            self._save(seg, tasks)
+            return
+        # Bulk creation: only the segment file; the caller writes the manifest.
+        data = json.dumps(list(tasks.values()), separators=(",", ":")).encode("utf-8")
+        self._write_file(self._segment_path(seg["file"]), data)
+        seg["first"], seg["last"] = min(tasks), max(tasks)
+        seg["counts"] = [
+            sum(1 for t in tasks.values() if t["status"] == s) for s in STATUSES
+        ]
+        self._firsts[-1] = seg["first"]
+
+    def _find(self, task_id: int) -> tuple:
+        """Get a task's segment entry, the segment's tasks and the task itself.
+
+        Raises:
+            ValueError: If the task is not found.
+        """
+        seg = self._locate(task_id)
+        tasks = self._load(seg) if seg is not None else {}
+        task = tasks.get(task_id)
+        if task is None:
+            raise ValueError(f"Task with id {task_id} not found.")
+        return seg, tasks, task
+
+    def _set_status(self, task_id: int, new_status: str) -> Dict[str, Any]:
+        """Change a task's status, rewriting only its segment."""
+        with self._locked():
+            seg, tasks, task = self._find(task_id)
+            task = dict(
+                task,
+                status=new_status,
+                updatedAt=self._get_timestamp(),
+                version=task.get("version", 1) + 1,
+            )
+            self._save(seg, {**tasks, task_id: task})
+        return dict(task)
+
+    def _get_timestamp(self) -> str:
+        """Get the current timestamp (YYYY-MM-DDTHH:MM:SS)."""
+        return datetime.now().isoformat(timespec="seconds")
+
+    # -----------------------------------------
+    #  Public Methods
+    # -----------------------------------------
+
+    def get_task(self, id: int) -> Optional[Dict[str, Any]]:
+        """Get a task by id, reading at most one segment.
+
+        Args:
+            id: The task id.
+
+        Returns:
+            The task dictionary, or None if there is no task with that id.
+        """
+        self._refresh()
+        seg = self._locate(id)
+        if seg is None:
+            return None
+        task = self._load(seg).get(id)
+        return None if task is None else dict(task)
+
+    def iter_tasks(self, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over tasks in id order, optionally filtered by status.
+
+        Segments without a task of the requested status are skipped, and
+        segments read here are not added to the cache.
+
+        Args:
+            status: Optional status filter.
+
+        Yields:
+            Task dictionaries.
+
+        Raises:
+            ValueError: If status is not a valid status value.
+        """
+        if status is not None and status not in STATUSES:
+            raise ValueError(f"Invalid status filter: {status}")
+        code = None if status is None else STATUSES.index(status)
+        self._refresh()
+        for seg in list(self._segments):
+            if code is not None and not seg["counts"][code]:
+                continue
+            for task in list(self._load(seg, cache=False).values()):
+                if status is None or task["status"] == status:
+                    yield dict(task)
+
+    def list_tasks(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List tasks in id order, optionally filtered by status.
+
+        Args:
+            status: Optional status filter. Must be one of: "todo",
+                   "in-progress", "done".
+
+        Returns:
+            List of task dictionaries.
+
+        Raises:
+            ValueError: If status is not a valid status value.
+        """
+        return list(self.iter_tasks(status))
+
+    def add_task(self, description: str) -> Dict[str, Any]:
+        """Add a new task with the next id (the highest id + 1) to the last segment.
+
+        A new segment is started when the last one is full.
+
+        Args:
+            description: The task description (must be non-empty after
+                  stripping whitespace).
+
+        Returns:
+            The new task dictionary.
+
+        Raises:
+            ValueError: If description is empty.
+        """
+        if not description or not description.strip():
+            raise ValueError("Task Description cannot be empty.")
+
+        timestamp = self._get_timestamp()
+        with self._locked():
+            last = self._segments[-1] if self._segments else None
+            task = {
+                "id": last["last"] + 1 if last is not None else 1,
+                "description": description,
+                "status": TaskManager.STATUS_TODO,
+                "createdAt": timestamp,
+                "updatedAt": timestamp,
+                "version": 1,
+            }
+            if last is not None and sum(last["counts"]) < self.segment_size:
+                self._save(last, {**self._load(last), task["id"]: task})
+            else:
+                self._new_segment({task["id"]: task})
+        return dict(task)
+
+    def update_task(self, id: int, updated_description: str) -> Dict[str, Any]:
+        """Update a task's description, rewriting only its segment.
+
+        Args:
+            id: The id of the task to update.
+            updated_description: The new description (must be non-empty after
+                  stripping whitespace).
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            ValueError: If description is empty or the task is not found.
+        """
+        if not updated_description or not updated_description.strip():
+            raise ValueError("Updated Task Description cannot be empty.")
+
+        with self._locked():
+            seg, tasks, task = self._find(id)
+            task = dict(
+                task,
+                description=updated_description,
+                updatedAt=self._get_timestamp(),
+                version=task.get("version", 1) + 1,
+            )
+            self._save(seg, {**tasks, id: task})
+        return dict(task)
+
+    def delete_task(self, id: int) -> Dict[str, Any]:
+        """Delete a task, rewriting only its segment.
+
+        As with TaskManager, the next added task gets the highest remaining id + 1.
+
+        Args:
+            id: The id of the task to delete.
+
+        Returns:
+            The deleted task dictionary.
+
+        Raises:
+            ValueError: If the task is not found.
+        """
+        with self._locked():
+            seg, tasks, task = self._find(id)
+            tasks = dict(tasks)
+            del tasks[id]
+            self._save(seg, tasks)
+        return dict(task)
+
+    def mark_in_progress(self, id: int) -> Dict[str, Any]:
+        """Mark a task as in progress, rewriting only its segment.
+
+        Args:
+            id: The id of the task.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            ValueError: If the task is not found.
+        """
+        return self._set_status(id, TaskManager.STATUS_IN_PROGRESS)
+
+    def mark_done(self, id: int) -> Dict[str, Any]:
+        """Mark a task as done, rewriting only its segment.
+
+        Args:
+            id: The id of the task.
+
+        Returns:
+            The updated task dictionary.
+
+        Raises:
+            ValueError: If the task is not found.
+        """
+        return self._set_status(id, TaskManager.STATUS_DONE)
+
+    def count_tasks(self, status: Optional[str] = None) -> int:
+        """Count tasks from the per-segment counts in the manifest.
+
+        Args:
+            status: Optional status filter.
+
+        Returns:
+            The number of matching tasks.
+
+        Raises:
+            ValueError: If status is not a valid status value.
+        """
+        self._refresh()
+        if status is None:
+            return sum(sum(seg["counts"]) for seg in self._segments)
+        if status not in STATUSES:
+            raise ValueError(f"Invalid status filter: {status}")
+        code = STATUSES.index(status)
+        return sum(seg["counts"][code] for seg in self._segments)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Get segment cache statistics.
+
+        Returns:
+            A dictionary with keys:
+            - hits: Segment lookups answered from the cache
+            - misses: Segment lookups that read a segment file
+            - evictions: Segments dropped to stay within the budget
+            - segments: Number of cached segments
+            - bytes: Encoded size of the cached segments
+            - budget: The cache budget (cache_bytes)
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "segments": len(self._cache),
+            "bytes": self._cached_bytes,
+            "budget": self.cache_bytes,
+        }
+
+    def close(self) -> None:
+        """Drop the segment cache. Changes are already on disk."""
+        self._cache.clear()
+        self._cached_bytes = 0
+
+    def __enter__(self) -> "SegmentStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,786 @@
+#!/usr/bin/env python3
+import io
+import json
+import re
+import socket
+import sys
+import threading
+import time
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from task_manager import NotFound, TaskManager, TaskNotFound, VersionConflict
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# An idle keep-alive connection is closed after this many seconds.
+KEEPALIVE_TIMEOUT = 60
+
+# Pipelined writes saved together at most; bounds how long one connection
+# holds the store lock.
+MAX_BATCH_REQUESTS = 256
+
+# Content-Length header of a pipelined request still in the read buffer.
+CONTENT_LENGTH = re.compile(rb"(?im)^content-length:[ \t]*(\d+)[ \t]*\r?$")
+
+# Query parameters of GET /tasks, mapped to list_tasks() arguments.
+LIST_PARAMS = {
+    "status": "status",
+    "sort": "sort_by",
+    "reverse": "reverse",
+    "limit": "limit",
+    "offset": "offset",
+    "cursor": "cursor",
+    "where": "where",
+    "created_after": "created_after",
+    "created_before": "created_before",
+    "updated_after": "updated_after",
+    "updated_before": "updated_before",
+    "tags": "tags",
+    "any_tags": "any_tags",
+    "ready": "ready",
+}
+INT_PARAMS = {"limit", "offset", "days", "expected_version", "k"}
+BOOL_PARAMS = {"reverse", "ready"}
+DATE_PARAMS = {"today"}
+LIST_VALUE_PARAMS = {"tags", "any_tags"}  # comma-separated
+
+METRICS = (
+    "requests",
+    "errors",
+    "notModified",
+    "saves",
+    "batches",
+    "batchedRequests",
+    "connections",
+    "recurring",
+)
+
+
+class TaskServer(ThreadingHTTPServer):
+    """HTTP server exposing a TaskManager as a JSON API.
+
+    Each connection is served by its own thread and kept alive between
+    requests (HTTP/1.1). All access to the TaskManager is serialized by one
+    lock, so the server should be the only writer of its store.
+
+    Endpoints (bodies and responses are JSON; tasks are returned as stored):
+    - GET /tasks: list_tasks(), with query parameters status, sort, reverse,
+      limit, offset, cursor, where, created/updated_after/before, tags and
+      any_tags (comma-separated), and ready
+    - GET /tasks/<id>: one task
+    - GET /search?q=...&status=...: search()
+    - GET /count?status=..., GET /summary, GET /report?days=...&today=YYYY-MM-DD
+    - GET /next?k=...: next_tasks()
+    - GET /health: status, uptime, task count and request metrics
+    - POST /tasks {"description": ..., "priority": ..., "due": ..., "tags": [...]}:
+      add_task(), answered with 201; priority, due and tags are optional
+    - PATCH /tasks/<id> {"description", "priority", "due", "tags"}:
+      update_task(), changing the fields that are given
+    - POST /tasks/<id>/tags, DELETE /tasks/<id>/tags {"tags": [...]}:
+      tag_task(), untag_task()
+    - POST /tasks/<id>/blockers, DELETE /tasks/<id>/blockers {"ids": [...]}:
+      block_task(), unblock_task()
+    - DELETE /tasks/<id>: delete_task()
+    - POST /tasks/<id>/in-progress, POST /tasks/<id>/done
+    - GET /templates: list_templates()
+    - POST /templates {"description", "every" or "cron", "start", "priority",
+      "tags"}: add_template(), answered with 201
+    - DELETE /templates/<id>: delete_template()
+    - POST /tick {"now": ...}: tick(); now is optional
+    - GET /views: list_views(); GET /views/<name>: show_view()
+    - PUT /views/<name> {"where": ...}: save_view()
+    - DELETE /views/<name>: delete_view()
+
+    Changes to a task accept ?expected_version=N and fail with 409 Conflict,
+    with the task's current state, if the task is at another version.
+
+    Responses to GET /tasks, /tasks/<id>, /search and /next carry an ETag derived
+    from the store (see TaskManager.store_tag), and a request whose
+    If-None-Match matches it is answered with 304 and no body.
+
+    Writes that a client pipelines (sends before reading the previous
+    response) are applied in one TaskManager.batch(), so the store is saved
+    once for the whole run; see TaskRequestHandler.
+
+    With a tick interval, a background thread calls TaskManager.tick() that
+    often (under the same lock) to add the tasks of due recurring templates.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        tm: Optional[TaskManager] = None,
+        log_requests: bool = False,
+        tick_interval: Optional[float] = None,
+    ) -> None:
+        """Bind the server to an address.
+
+        Args:
+            address: (host, port) to listen on. Port 0 picks a free port.
+                    Defaults to 127.0.0.1:8765.
+            tm: The TaskManager to serve. Defaults to one for "tasks.json".
+            log_requests: If True, log each request to stderr.
+            tick_interval: If given, seconds between checks for due recurring
+                          templates (see TaskManager.tick).
+
+        Raises:
+            OSError: If the address can't be bound.
+        """
+        self.tm = tm if tm is not None else TaskManager()
+        self.lock = threading.RLock()
+        self.log_requests = log_requests
+        self.started = time.monotonic()
+        self.metrics = {name: 0 for name in METRICS}
+        self._metrics_lock = threading.Lock()
+        if tick_interval is not None and tick_interval <= 0:
+            raise ValueError(f"Invalid tick interval: {tick_interval}")
+        self._stop_ticking = threading.Event()
+        self._ticker: Optional[threading.Thread] = None
+        super().__init__(address, TaskRequestHandler)
+        if tick_interval is not None:
+            self._ticker = threading.Thread(
+                target=self._tick_loop, args=(tick_interval,), daemon=True
+            )
+            self._ticker.start()
+
+    def _tick_loop(self, interval: float) -> None:
+        """Add the tasks of due recurring templates every interval seconds.
+
+        Runs until the server is closed.
+        """
+        while not self._stop_ticking.wait(interval):
+            try:
+                with self.lock:
+                    generated = self.tm.tick()
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                continue
+            if generated:
+                self.count("recurring", len(generated))
+                if self.log_requests:
+                    print(f"Added {len(generated)} recurring tasks", file=sys.stderr)
+
+    def server_close(self) -> None:
+        """Stop the recurring-task ticker and close the socket."""
+        self._stop_ticking.set()
+        if self._ticker is not None and self._ticker is not threading.current_thread():
+            self._ticker.join()
+        super().server_close()
+
+    @property
+    def url(self) -> str:
+        """The base URL the server listens on, e.g. "http://127.0.0.1:8765"."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        """Ignore clients that drop their connection; report other errors."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to a request metric."""
+        with self._metrics_lock:
+            self.metrics[name] += n
+
+    def health(self) -> Dict[str, Any]:
+        """Get the server status and metrics.
+
+        Returns:
+            A dictionary with status ("ok"), uptime in seconds, the number of
+            tasks and the store's sequence number, and the counters in METRICS:
+            requests, errors (4xx/5xx responses), notModified (304 responses),
+            saves, batches (saves covering pipelined writes), batchedRequests
+            (writes saved in batches), open connections and recurring (tasks
+            added from recurring templates).
+        """
+        with self.lock:
+            summary = self.tm.summary()
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        return {
+            "status": "ok",
+            "uptime": round(time.monotonic() - self.started, 3),
+            "tasks": summary["count"],
+            "seq": summary["seq"],
+            **metrics,
+        }
+
+
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    """Request handler for TaskServer.
+
+    Pipelined writes: after a write request, if the client has already sent
+    the whole next request on the connection, the handler opens a
+    TaskManager.batch() and keeps it open while further pipelined requests
+    are writes that have fully arrived. The batch holds the store lock, so it
+    is ended before the handler would have to wait on the socket: a client
+    that stalls mid-request never blocks the other connections. Their
+    responses are buffered and sent once the batch is saved, so a client
+    never sees a success for a write that isn't on disk. If the save fails,
+    the buffered responses are replaced by a single 500 error and the
+    connection is closed. A read request ends the batch first, so it sees
+    the saved store.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    server: TaskServer
+
+    def setup(self) -> None:
+        """Set up the connection and count it as open."""
+        super().setup()
+        # Headers and body are separate writes; without this, Nagle's
+        # algorithm holds the body back until the client's delayed ACK.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Open batch of pipelined writes: the batch context, the real wfile,
+        # the buffer holding its responses, and request/change counts.
+        self._pending: Optional[Dict[str, Any]] = None
+        self.server.count("connections")
+
+    def finish(self) -> None:
+        """Save any open batch, then close the connection."""
+        try:
+            self._end_batch()
+        except OSError:
+            pass  # the client went away; the batch is saved regardless
+        finally:
+            self.server.count("connections", -1)
+            super().finish()
+
+    def handle_one_request(self) -> None:
+        """Handle one request, ending an open batch once the pipeline is drained."""
+        super().handle_one_request()
+        pending = self._pending
+        if pending is not None and (
+            self.close_connection
+            or pending["requests"] >= MAX_BATCH_REQUESTS
+            or not self._pipelined()
+        ):
+            self._end_batch()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log a request to stderr if the server was asked to."""
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        """Send a response status line, counting errors and 304 responses."""
+        if code == 304:
+            self.server.count("notModified")
+        elif code >= 400:
+            self.server.count("errors")
+        super().send_response(code, message)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    # -----------------------------------------
+    #  Pipelined batches
+    # -----------------------------------------
+
+    def _pipelined(self) -> bool:
+        """Check whether the client has already sent the whole next request.
+
+        Only data that has already arrived is looked at; the socket is never
+        waited on. A request that doesn't fit in the read buffer counts as not
+        sent, and is read outside any batch.
+        """
+        self.connection.setblocking(False)
+        try:
+            data = self.rfile.peek(1)
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+        end = data.find(b"\r\n\r\n")
+        if end < 0:
+            return False
+        match = CONTENT_LENGTH.search(data, 0, end)
+        return len(data) >= end + 4 + (int(match.group(1)) if match else 0)
+
+    def _begin_batch(self) -> None:
+        """Open a batch: take the store lock and buffer responses."""
+        self.server.lock.acquire()
+        batch = self.server.tm.batch()
+        try:
+            batch.__enter__()
+        except BaseException:
+            self.server.lock.release()
+            raise
+        self._pending = {
+            "batch": batch,
+            "wfile": self.wfile,
+            "requests": 0,
+            "changes": 0,
+        }
+        self.wfile = io.BytesIO()
+
+    def _end_batch(self) -> None:
+        """Save an open batch and send its buffered responses."""
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        buffered, self.wfile = self.wfile, pending["wfile"]
+        try:
+            try:
+                pending["batch"].__exit__(None, None, None)
+            finally:
+                self.server.lock.release()
+        except ValueError as e:
+            self.close_connection = True
+            self._send_json(500, {"error": str(e)})
+            return
+
+        if pending["changes"]:
+            self.server.count("saves")
+            self.server.count("batches")
+            self.server.count("batchedRequests", pending["changes"])
+        self.wfile.write(buffered.getvalue())
+
+    # -----------------------------------------
+    #  Requests and responses
+    # -----------------------------------------
+
+    def _dispatch(self, method: str) -> None:
+        """Parse a request, route it and send the response (or a JSON error).
+
+        ValueErrors become error responses (see _error).
+        """
+        self.server.count("requests")
+        try:
+            body = self._read_body()
+            url = urlsplit(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            params = dict(parse_qsl(url.query, keep_blank_values=True))
+            if method == "GET":
+                self._end_batch()
+            self._route(method, parts, params, body)
+        except ValueError as e:
+            self._send_json(*self._error(e))
+        except Exception as e:
+            self.close_connection = True
+            self.log_error("Internal error: %r", e)
+            self._send_json(500, {"error": "Internal server error"})
+
+    def _route(
+        self,
+        method: str,
+        parts: List[str],
+        params: Dict[str, str],
+        body: Dict[str, Any],
+    ) -> None:
+        """Call the handler for a method and path.
+
+        Raises:
+            ValueError: If the request is invalid or the operation fails.
+        """
+        tm = self.server.tm
+        task_id = (
+            self._task_id(parts[1]) if len(parts) >= 2 and parts[0] == "tasks" else None
+        )
+
+        if parts == ["tasks"]:
+            if method == "GET":
+                kwargs = {
+                    LIST_PARAMS[k]: v
+                    for k, v in self._params(params, LIST_PARAMS).items()
+                }
+                return self._send_cached(lambda: tm.list_tasks(**kwargs))
+            if method == "POST":
+                self._params(params, ())
+                args = (
+                    self._description(body),
+                    *self._planning(body),
+                    self._tags(body, required=False),
+                )
+                return self._write(tm.add_task, *args, status=201)
+        elif len(parts) == 2 and task_id is not None:
+            if method == "GET":
+                return self._send_cached(lambda: self._get_task(task_id))
+            expected = self._params(params, {"expected_version"}).get(
+                "expected_version"
+            )
+            if method == "PATCH":
+                description = self._description(body, required=False)
+                args = (
+                    task_id,
+                    description,
+                    expected,
+                    *self._planning(body),
+                    self._tags(body, required=False),
+                )
+                return self._write(tm.update_task, *args)
+            if method == "DELETE":
+                return self._write(tm.delete_task, task_id, expected)
+        elif (
+            len(parts) == 3
+            and task_id is not None
+            and parts[2] in ("in-progress", "done")
+        ):
+            if method == "POST":
+                expected = self._params(params, {"expected_version"}).get(
+                    "expected_version"
+                )
+                mark = tm.mark_done if parts[2] == "done" else tm.mark_in_progress
+                return self._write(mark, task_id, expected)
+        elif len(parts) == 3 and task_id is not None and parts[2] == "tags":
+            if method in ("POST", "DELETE"):
+                expected = self._params(params, {"expected_version"}).get(
+                    "expected_version"
+                )
+                change = tm.tag_task if method == "POST" else tm.untag_task
+                return self._write(change, task_id, self._tags(body), expected)
+        elif len(parts) == 3 and task_id is not None and parts[2] == "blockers":
+            if method in ("POST", "DELETE"):
+                expected = self._params(params, {"expected_version"}).get(
+                    "expected_version"
+                )
+                change = tm.block_task if method == "POST" else tm.unblock_task
+                return self._write(change, task_id, self._blocker_ids(body), expected)
+        elif parts[:1] == ["templates"] and (
+            len(parts) == 1 or self._task_id(parts[1]) is not None
+        ):
+            if len(parts) == 1 and method == "GET":
+                self._params(params, ())
+                return self._read_locked(tm.list_templates)
+            if len(parts) == 1 and method == "POST":
+                self._params(params, ())
+                every, cron, start = self._strings(body, ("every", "cron", "start"))
+                args = (
+                    self._description(body),
+                    every,
+                    cron,
+                    start,
+                    body.get("priority"),
+                    self._tags(body, required=False),
+                )
+                return self._write(tm.add_template, *args, status=201)
+            if len(parts) == 2 and method == "DELETE":
+                self._params(params, ())
+                return self._write(tm.delete_template, self._task_id(parts[1]))
+        elif parts[:1] == ["views"] and len(parts) <= 2:
+            self._params(params, ())
+            name = unquote(parts[1]) if len(parts) == 2 else None
+            if name is None:
+                if method == "GET":
+                    return self._read_locked(tm.list_views)
+            elif method == "GET":
+                return self._read_locked(tm.show_view, name)
+            elif method == "PUT":
+                (where,) = self._strings(body, ("where",))
+                return self._write(tm.save_view, name, where)
+            elif method == "DELETE":
+                return self._write(tm.delete_view, name)
+        elif parts == ["tick"]:
+            if method == "POST":
+                self._params(params, ())
+                (now,) = self._strings(body, ("now",))
+                return self._write(self._tick, self._timestamp(now))
+        elif len(parts) == 1 and parts[0] in (
+            "search",
+            "next",
+            "count",
+            "summary",
+            "report",
+            "health",
+        ):
+            if method == "GET":
+                return self._read(parts[0], params)
+        else:
+            return self._send_json(404, {"error": f"Not found: {self.path}"})
+        self._send_json(405, {"error": f"Method not allowed: {method} {self.path}"})
+
+    def _read(self, name: str, params: Dict[str, str]) -> None:
+        """Answer one of the read-only endpoints other than /tasks."""
+        tm = self.server.tm
+        if name == "search":
+            args = self._params(params, {"q", "status"})
+            return self._send_cached(
+                lambda: tm.search(args.get("q", ""), args.get("status"))
+            )
+        if name == "next":
+            k = self._params(params, {"k"}).get("k", 1)
+            return self._send_cached(lambda: tm.next_tasks(k))
+        if name == "health":
+            return self._send_json(200, self.server.health())
+
+        args = self._params(
+            params,
+            {"count": {"status"}, "summary": set(), "report": {"days", "today"}}[name],
+        )
+        with self.server.lock:
+            if name == "count":
+                result: Any = {"count": tm.count_tasks(args.get("status"))}
+            elif name == "summary":
+                result = tm.summary()
+            else:
+                report = tm.report(**args)
+                report["days"] = [
+                    (day.isoformat(), created, done)
+                    for day, created, done in report["days"]
+                ]
+                result = report
+        self._send_json(200, result)
+
+    def _read_locked(self, operation: Callable[..., Any], *args: Any) -> None:
+        """Send the result of a read that has no ETag, run under the store lock."""
+        with self.server.lock:
+            result = operation(*args)
+        self._send_json(200, result)
+
+    def _tick(self, now: Optional[datetime]) -> List[Dict[str, Any]]:
+        """Add the tasks of due recurring templates, counting them in the metrics."""
+        generated = self.server.tm.tick(now)
+        self.server.count("recurring", len(generated))
+        return generated
+
+    def _get_task(self, task_id: int) -> Dict[str, Any]:
+        """Get one task by id (the caller holds the store lock).
+
+        Only that task is decoded while the store's offsets are fresh.
+        """
+        task = self.server.tm.get_task(task_id)
+        if task is None:
+            raise TaskNotFound(task_id)
+        return task
+
+    def _write(
+        self, operation: Callable[..., Any], *args: Any, status: int = 200
+    ) -> None:
+        """Run a write operation, joining or opening a batch if requests are pipelined.
+
+        Raises:
+            ValueError: If the operation fails outside a batch.
+        """
+        if self._pending is None and self._pipelined():
+            self._begin_batch()
+        pending = self._pending
+        if pending is None:
+            with self.server.lock:
+                result = operation(*args)
+            self.server.count("saves")
+            return self._send_json(status, result)
+
+        pending["requests"] += 1
+        try:
+            result = operation(*args)
+        except ValueError as e:
+            # A failed operation changes nothing; the rest of the batch goes on.
+            return self._send_json(*self._error(e))
+        pending["changes"] += 1
+        self._send_json(status, result)
+
+    @staticmethod
+    def _error(e: ValueError) -> Tuple[int, Dict[str, Any]]:
+        """Get the status and JSON body for an error.
+
+        A version conflict is 409, with the task's current state; a missing
+        task, template or view (NotFound) is 404; anything else is 400.
+        """
+        if isinstance(e, VersionConflict):
+            return 409, {
+                "error": str(e),
+                "id": e.task_id,
+                "expectedVersion": e.expected,
+                "current": e.current,
+            }
+        return 404 if isinstance(e, NotFound) else 400, {"error": str(e)}
+
+    def _send_cached(self, compute: Callable[[], Any]) -> None:
+        """Send a read result tagged with an ETag, or 304 if the client has it."""
+        with self.server.lock:
+            etag = f'"{self.server.tm.store_tag()}"'
+            if self._etag_matches(etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            result = compute()
+        self._send_json(200, result, {"ETag": etag})
+
+    def _etag_matches(self, etag: str) -> bool:
+        """Check whether the request's If-None-Match covers an ETag."""
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        tags = {tag.strip() for tag in header.split(",")}
+        return "*" in tags or etag in tags or "W/" + etag in tags
+
+    def _send_json(
+        self, status: int, body: Any, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Send a JSON response with a Content-Length, keeping the connection open."""
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> Dict[str, Any]:
+        """Read the JSON object in the request body ({} if there is none).
+
+        Raises:
+            ValueError: If the body is not a JSON object.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True  # the next request can't be found
+            raise ValueError("Invalid Content-Length")
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid JSON body")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    @staticmethod
+    def _description(body: Dict[str, Any], required: bool = True) -> Optional[str]:
+        """Get the description from a request body.
+
+        Args:
+            body: The request body.
+            required: If False, a missing description is returned as None.
+
+        Raises:
+            ValueError: If it is missing (and required) or not a string.
+        """
+        description = body.get("description")
+        if description is None and not required:
+            return None
+        if not isinstance(description, str):
+            raise ValueError("Request body must have a string description")
+        return description
+
+    @staticmethod
+    def _planning(body: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+        """Get the priority and due date from a request body (None if absent).
+
+        They are checked by the TaskManager.
+        """
+        return body.get("priority"), body.get("due")
+
+    @staticmethod
+    def _tags(body: Dict[str, Any], required: bool = True) -> Optional[List[str]]:
+        """Get the list of tags from a request body.
+
+        The tags themselves are checked by the TaskManager.
+
+        Args:
+            body: The request body.
+            required: If False, missing tags are returned as None.
+
+        Raises:
+            ValueError: If they are missing (and required) or not a list.
+        """
+        tags = body.get("tags")
+        if tags is None and not required:
+            return None
+        if not isinstance(tags, list):
+            raise ValueError("Request body must have a list of tags")
+        return tags
+
+    @staticmethod
+    def _strings(
+        body: Dict[str, Any], names: Tuple[str, ...]
+    ) -> Tuple[Optional[str], ...]:
+        """Get optional string fields from a request body (None if absent).
+
+        Raises:
+            ValueError: If one of them is not a string.
+        """
+        values = tuple(body.get(name) for name in names)
+        for name, value in zip(names, values):
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"Request body field {name} must be a string")
+        return values
+
+    @staticmethod
+    def _timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse an optional ISO timestamp.
+
+        Raises:
+            ValueError: If it is not a valid ISO timestamp.
+        """
+        if value is None:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {value}")
+
+    @staticmethod
+    def _blocker_ids(body: Dict[str, Any]) -> List[int]:
+        """Get the list of blocker ids from a request body.
+
+        Raises:
+            ValueError: If it is missing or not a list of integers.
+        """
+        ids = body.get("ids")
+        if not isinstance(ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in ids
+        ):
+            raise ValueError("Request body must have a list of integer ids")
+        return ids
+
+    @staticmethod
+    def _task_id(value: str) -> Optional[int]:
+        """Parse a task id from the path, or return None if it isn't one."""
+        return int(value) if value.isdigit() else None
+
+    @staticmethod
+    def _params(params: Dict[str, str], allowed: Any) -> Dict[str, Any]:
+        """Check and convert query parameters.
+
+        Raises:
+            ValueError: If a parameter is unknown or has an invalid value.
+        """
+        args: Dict[str, Any] = {}
+        for name, value in params.items():
+            if name not in allowed:
+                raise ValueError(f"Unknown parameter: {name}")
+            if name in INT_PARAMS:
+                try:
+                    args[name] = int(value)
+                except ValueError:
+                    raise ValueError(f"Invalid {name}: {value}")
+            elif name in BOOL_PARAMS:
+                args[name] = value.lower() in ("", "1", "true", "yes")
+            elif name in LIST_VALUE_PARAMS:
+                args[name] = value.split(",") if value else []
+            elif name in DATE_PARAMS:
+                try:
+                    args[name] = date.fromisoformat(value)
+                except ValueError:
+                    raise ValueError(f"Invalid {name}: {value}")
+            else:
+                args[name] = value
+        return args
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+from collections.abc import Sequence
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+def freeze(task: Dict[str, Any]) -> Mapping[str, Any]:
+    """Make a read-only copy of a task.
+
+    List values are copied to tuples, so nothing reachable from the copy can
+    be changed.
+    """
+    frozen = dict(task)
+    if list in map(type, frozen.values()):
+        frozen = {k: tuple(v) if isinstance(v, list) else v for k, v in frozen.items()}
+    return MappingProxyType(frozen)
+
+
+class TaskSnapshot(Sequence):
+    """Immutable view of the store's tasks at one point in time.
+
+    A snapshot is a tuple of read-only task mappings in file order. Nothing
+    in it can change, so it can be kept, iterated and shared between threads
+    while writers carry on; it never sees their changes. Getting a snapshot
+    of an unchanged store is O(1) (see TaskManager.snapshot).
+
+    Successive snapshots share structure: with_changes() builds the next one
+    from this one, copying only the tasks that changed and reusing every
+    other task mapping as it is.
+
+    Attributes:
+        generation: The store generation (header seq) the snapshot shows.
+        signature: Size and mtime of the store file it was taken from.
+    """
+
+    __slots__ = ("_tasks", "_positions", "generation", "signature")
+
+    def __init__(
+        self,
+        tasks: Tuple[Mapping[str, Any], ...],
+        generation: int,
+        signature: Optional[List[int]],
+    ) -> None:
+        """Wrap read-only tasks; use from_tasks() to build from dictionaries."""
+        self._tasks = tasks
+        self._positions: Optional[Dict[int, int]] = (
+            None  # id -> position, built on first get()
+        )
+        self.generation = generation
+        self.signature = signature
+
+    @classmethod
+    def from_tasks(
+        cls,
+        tasks: Iterable[Dict[str, Any]],
+        generation: int,
+        signature: Optional[List[int]],
+    ) -> "TaskSnapshot":
+        """Build a snapshot from task dictionaries, copying each one.
+
+        Args:
+            tasks: Task dictionaries, in file order.
+            generation: The store generation they belong to.
+            signature: Size and mtime of the store file they were read from.
+
+        Returns:
+            The snapshot.
+        """
+        return cls(tuple(map(freeze, tasks)), generation, signature)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __getitem__(self, i: Any) -> Any:
+        return self._tasks[i]
+
+    def __iter__(self) -> Any:
+        return iter(self._tasks)
+
+    def __repr__(self) -> str:
+        return f"<TaskSnapshot generation={self.generation} tasks={len(self._tasks)}>"
+
+    def get(self, task_id: int) -> Optional[Mapping[str, Any]]:
+        """Get a task by id.
+
+        The first call builds an id -> position map, which later calls (and
+        only this snapshot) reuse.
+
+        Returns:
+            The read-only task, or None if there is no task with this id.
+        """
+        if self._positions is None:
+            self._positions = {t["id"]: i for i, t in enumerate(self._tasks)}
+        i = self._positions.get(task_id)
+        return None if i is None else self._tasks[i]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Copy the tasks into new, mutable dictionaries (O(n))."""
+        return [
+            {k: list(v) if isinstance(v, tuple) else v for k, v in t.items()}
+            for t in self._tasks
+        ]
+
+    def with_changes(
+        self,
+        removed: Iterable[Dict[str, Any]],
+        added: Iterable[Dict[str, Any]],
+        generation: int,
+        signature: Optional[List[int]],
+    ) -> "TaskSnapshot":
+        """Build the snapshot that follows a saved change.
+
+        Changed tasks are replaced in place, deleted tasks dropped and new
+        tasks appended, as in the store file. Only the tasks in added are
+        copied; every other task mapping is shared with this snapshot.
+
+        Args:
+            removed: Old versions of changed tasks and deleted tasks.
+            added: New versions of changed tasks and added tasks.
+            generation: The store generation after the change.
+            signature: The store signature after the change.
+
+        Returns:
+            The new snapshot. This one is unchanged.
+        """
+        new = {t["id"]: freeze(t) for t in added}
+        gone = {t["id"] for t in removed}.difference(new)
+        tasks = []
+        for t in self._tasks:
+            task_id = t["id"]
+            if task_id in new:
+                tasks.append(new.pop(task_id))
+            elif task_id not in gone:
+                tasks.append(t)
+        tasks.extend(new.values())
+        return TaskSnapshot(tuple(tasks), generation, signature)
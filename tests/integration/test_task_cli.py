@@ -1,16 +1,42 @@
 """Integration tests for task_cli.py and task_manager.py interaction."""
 import json
+import os
+import socket
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from task_cli import (
     command_add,
+    command_block,
+    command_count,
     command_delete,
     command_list,
+    command_lists,
     command_mark_done,
     command_mark_in_progress,
+    command_migrate_timestamps,
+    command_move,
+    command_next,
+    command_purge,
+    command_recur_add,
+    command_recur_delete,
+    command_recur_list,
+    command_report,
+    command_search,
+    command_serve,
+    command_summary,
+    command_tag,
+    command_tick,
     command_update,
+    command_view_delete,
+    command_view_list,
+    command_view_save,
+    command_view_show,
+    main,
+    parse_time_arg,
 )
 from task_manager import TaskManager
 
@@ -43,8 +69,8 @@ def test_cli_add_command_integration(tmp_path, capsys):
     tm = make_tm_with_path(tmp_path)
     
     # Patch the global TaskManager instance in task_cli
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'description': 'Buy groceries'})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"description": "Buy groceries"})()
         command_add(args)
         
         captured = capsys.readouterr()
@@ -75,8 +101,8 @@ def test_cli_list_command_integration_all_tasks(tmp_path, capsys):
     tm.add_task("Task 2")
     tm.add_task("Task 3")
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'status': None})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"status": None})()
         command_list(args)
         
         captured = capsys.readouterr()
@@ -106,9 +132,9 @@ def test_cli_list_command_integration_filtered_by_status(tmp_path, capsys):
     tm.mark_in_progress(task1["id"])
     tm.mark_done(task2["id"])
     
-    with patch('task_cli.tm', tm):
+    with patch("task_cli.tm", tm):
         # Test filtering by in-progress
-        args = type('Args', (), {'status': 'in-progress'})()
+        args = type("Args", (), {"status": "in-progress"})()
         command_list(args)
         
         captured = capsys.readouterr()
@@ -129,8 +155,8 @@ def test_cli_list_command_integration_no_tasks(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'status': None})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"status": None})()
         command_list(args)
         
         captured = capsys.readouterr()
@@ -149,8 +175,8 @@ def test_cli_list_command_integration_invalid_status(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'status': 'invalid-status'})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"status": "invalid-status"})()
         command_list(args)
         
         captured = capsys.readouterr()
@@ -172,9 +198,11 @@ def test_cli_update_command_integration(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     task = tm.add_task("Original description")
-    
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': str(task["id"]), 'description': 'Updated description'})()
+
+    with patch("task_cli.tm", tm):
+        args = type(
+            "Args", (), {"id": str(task["id"]), "description": "Updated description"}
+        )()
         command_update(args)
         
         captured = capsys.readouterr()
@@ -198,8 +226,8 @@ def test_cli_update_command_integration_invalid_id(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': 'not-a-number', 'description': 'Test'})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"id": "not-a-number", "description": "Test"})()
         command_update(args)
         
         captured = capsys.readouterr()
@@ -219,8 +247,8 @@ def test_cli_update_command_integration_nonexistent_task(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': '999', 'description': 'Test'})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"id": "999", "description": "Test"})()
         command_update(args)
         
         captured = capsys.readouterr()
@@ -244,8 +272,8 @@ def test_cli_delete_command_integration(tmp_path, capsys):
     task1 = tm.add_task("Task 1")
     task2 = tm.add_task("Task 2")
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': str(task1["id"])})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"id": str(task1["id"])})()
         command_delete(args)
         
         captured = capsys.readouterr()
@@ -270,8 +298,8 @@ def test_cli_delete_command_integration_invalid_id(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': 'invalid'})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"id": "invalid"})()
         command_delete(args)
         
         captured = capsys.readouterr()
@@ -294,8 +322,8 @@ def test_cli_mark_in_progress_command_integration(tmp_path, capsys):
     tm = make_tm_with_path(tmp_path)
     task = tm.add_task("Test task")
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': str(task["id"])})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"id": str(task["id"])})()
         command_mark_in_progress(args)
         
         captured = capsys.readouterr()
@@ -322,8 +350,8 @@ def test_cli_mark_done_command_integration(tmp_path, capsys):
     tm = make_tm_with_path(tmp_path)
     task = tm.add_task("Test task")
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': str(task["id"])})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"id": str(task["id"])})()
         command_mark_done(args)
         
         captured = capsys.readouterr()
@@ -347,9 +375,9 @@ def test_cli_mark_commands_integration_invalid_id(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
+    with patch("task_cli.tm", tm):
         # Test mark-in-progress
-        args = type('Args', (), {'id': 'not-a-number'})()
+        args = type("Args", (), {"id": "not-a-number"})()
         command_mark_in_progress(args)
         
         captured = capsys.readouterr()
@@ -369,8 +397,8 @@ def test_cli_mark_commands_integration_nonexistent_task(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
-        args = type('Args', (), {'id': '999'})()
+    with patch("task_cli.tm", tm):
+        args = type("Args", (), {"id": "999"})()
         command_mark_done(args)
         
         captured = capsys.readouterr()
@@ -391,16 +419,16 @@ def test_cli_full_workflow_integration(tmp_path, capsys):
     """
     tm = make_tm_with_path(tmp_path)
     
-    with patch('task_cli.tm', tm):
+    with patch("task_cli.tm", tm):
         # Add tasks
-        args_add1 = type('Args', (), {'description': 'First task'})()
+        args_add1 = type("Args", (), {"description": "First task"})()
         command_add(args_add1)
         
-        args_add2 = type('Args', (), {'description': 'Second task'})()
+        args_add2 = type("Args", (), {"description": "Second task"})()
         command_add(args_add2)
         
         # List all tasks
-        args_list = type('Args', (), {'status': None})()
+        args_list = type("Args", (), {"status": None})()
         command_list(args_list)
         
         captured = capsys.readouterr()
@@ -412,11 +440,13 @@ def test_cli_full_workflow_integration(tmp_path, capsys):
         # Update a task
         tasks = tm._get_tasks()
         task_id = tasks[0]["id"]
-        args_update = type('Args', (), {'id': str(task_id), 'description': 'Updated first task'})()
+        args_update = type(
+            "Args", (), {"id": str(task_id), "description": "Updated first task"}
+        )()
         command_update(args_update)
         
         # Mark as in progress
-        args_mip = type('Args', (), {'id': str(task_id)})()
+        args_mip = type("Args", (), {"id": str(task_id)})()
         command_mark_in_progress(args_mip)
         
         # Mark as done
@@ -429,3 +459,749 @@ def test_cli_full_workflow_integration(tmp_path, capsys):
         final_tasks = tm._get_tasks()
         assert len(final_tasks) == 1
         assert final_tasks[0]["description"] == "Second task"
+
+
+def test_cli_count_and_summary_commands_integration(tmp_path, capsys):
+    """Test that CLI count and summary commands report header counts.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - count prints the total and per-status counts
+        - summary prints totals, per-status counts and the next id
+        - An invalid status prints an error
+    """
+    tm = make_tm_with_path(tmp_path)
+    task = tm.add_task("Task 1")
+    tm.add_task("Task 2")
+    tm.mark_done(task["id"])
+
+    with patch("task_cli.tm", tm):
+        command_count(type("Args", (), {"status": None})())
+        command_count(type("Args", (), {"status": "done"})())
+        captured = capsys.readouterr()
+        assert captured.out.split() == ["2", "1"]
+
+        command_summary(type("Args", (), {})())
+        captured = capsys.readouterr()
+        assert "Total tasks: 2" in captured.out
+        assert "done: 1" in captured.out
+        assert "todo: 1" in captured.out
+        assert "Next id: 3" in captured.out
+
+        command_count(type("Args", (), {"status": "invalid-status"})())
+        captured = capsys.readouterr()
+        assert "Error:" in captured.out
+
+
+def test_cli_list_command_integration_formats(tmp_path, capsys):
+    """Test that CLI list command writes the selected format and fields.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - JSON output lists every task
+        - CSV output respects --fields and --no-header
+        - An invalid field prints an error
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Task 1")
+    tm.add_task("Task 2")
+
+    with patch("task_cli.tm", tm):
+        args = type(
+            "Args",
+            (),
+            {"status": None, "format": "json", "fields": None, "no_header": False},
+        )()
+        command_list(args)
+        captured = capsys.readouterr()
+        assert [t["description"] for t in json.loads(captured.out)] == [
+            "Task 1",
+            "Task 2",
+        ]
+
+        args = type(
+            "Args",
+            (),
+            {
+                "status": "todo",
+                "format": "csv",
+                "fields": "id,status",
+                "no_header": True,
+            },
+        )()
+        command_list(args)
+        captured = capsys.readouterr()
+        assert captured.out == "1,todo\n2,todo\n"
+
+        args = type(
+            "Args",
+            (),
+            {
+                "status": None,
+                "format": "text",
+                "fields": "id,owner",
+                "no_header": False,
+            },
+        )()
+        command_list(args)
+        captured = capsys.readouterr()
+        assert "Error: Invalid field: owner" in captured.out
+
+
+def test_cli_purge_command_integration(tmp_path, capsys):
+    """Test that CLI purge command reports and deletes matching tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - --dry-run reports counts without deleting
+        - A real purge deletes only matching tasks
+        - Purging with no filters prints an error
+    """
+    tm = make_tm_with_path(tmp_path)
+    task1 = tm.add_task("Task 1")
+    task2 = tm.add_task("Task 2")
+    tm.add_task("Task 3")
+    tm.mark_done(task1["id"])
+    tm.mark_done(task2["id"])
+
+    def purge_args(**kwargs):
+        values = {
+            "status": None,
+            "older_than": None,
+            "updated_before": None,
+            "contains": None,
+            "dry_run": False,
+        }
+        values.update(kwargs)
+        return type("Args", (), values)()
+
+    with patch("task_cli.tm", tm):
+        command_purge(purge_args(status="done", dry_run=True))
+        captured = capsys.readouterr()
+        assert "Would delete 2 tasks (done: 2)" in captured.out
+        assert len(tm.list_tasks()) == 3
+
+        command_purge(purge_args(status="done", updated_before="2999-01-01"))
+        captured = capsys.readouterr()
+        assert "Purged 2 tasks (done: 2)" in captured.out
+        assert [t["description"] for t in tm.list_tasks()] == ["Task 3"]
+
+        command_purge(purge_args())
+        captured = capsys.readouterr()
+        assert "Error:" in captured.out
+
+
+def test_cli_list_command_integration_pagination(tmp_path, capsys):
+    """Test that CLI list command sorts, limits and prints a next-page cursor.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - --sort/--reverse/--limit show the top tasks
+        - The printed cursor continues with the next page
+    """
+    tm = make_tm_with_path(tmp_path)
+    for i in range(1, 6):
+        tm.add_task(f"Task {i}")
+
+    def list_args(**kwargs):
+        values = {
+            "status": None,
+            "format": "text",
+            "fields": "id",
+            "no_header": False,
+            "sort": "id",
+            "reverse": True,
+            "limit": 2,
+            "offset": 0,
+            "cursor": None,
+        }
+        values.update(kwargs)
+        return type("Args", (), values)()
+
+    with patch("task_cli.tm", tm):
+        command_list(list_args())
+        captured = capsys.readouterr()
+        assert "Listing 2 tasks:" in captured.out
+        assert "5\n4\n" in captured.out
+        cursor = captured.out.split("--cursor ")[1].strip()
+
+        command_list(list_args(cursor=cursor, no_header=True))
+        captured = capsys.readouterr()
+        assert captured.out == "3\n2\n"
+
+
+def test_cli_search_command_integration(tmp_path, capsys):
+    """Test that CLI search command prints matching tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - Matching tasks are listed
+        - A query with no matches prints a message
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Deploy API")
+    tm.add_task("Write docs")
+    tm.add_task("Deployment review")
+
+    with patch("task_cli.tm", tm):
+        command_search(type("Args", (), {"query": "deploy*", "status": None})())
+        captured = capsys.readouterr()
+        assert "Listing 2 tasks:" in captured.out
+        assert "Deploy API" in captured.out
+        assert "Deployment review" in captured.out
+
+        command_search(type("Args", (), {"query": "release", "status": None})())
+        captured = capsys.readouterr()
+        assert "No tasks matched: release" in captured.out
+
+
+def test_cli_list_command_integration_time_range(tmp_path, capsys):
+    """Test that CLI list command filters by updatedAt age.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - Only tasks updated within the last hour are listed
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Fresh task")
+    tasks = tm._get_tasks()
+    tasks.append(
+        {
+            "id": 2,
+            "description": "Old task",
+            "status": "todo",
+            "createdAt": "2020-01-01T00:00:00",
+            "updatedAt": "2020-01-01T00:00:00",
+        }
+    )
+    tm._save_tasks(tasks)
+
+    with patch("task_cli.tm", tm):
+        args = type(
+            "Args", (), {"status": None, "updated_after": parse_time_arg("1h")}
+        )()
+        command_list(args)
+        captured = capsys.readouterr()
+        assert "Listing 1 tasks:" in captured.out
+        assert "Fresh task" in captured.out
+        assert "Old task" not in captured.out
+
+
+def test_cli_list_command_integration_where_and_explain(tmp_path, capsys):
+    """Test that CLI list command filters with --where and explains the plan.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - --where lists only matching tasks
+        - --explain prints the chosen plan and estimated cost
+        - Invalid queries print an error
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Deploy API")
+    tm.add_task("Write docs")
+    tm.mark_done(2)
+
+    with patch("task_cli.tm", tm):
+        command_list(
+            type(
+                "Args",
+                (),
+                {"status": None, "where": "status = todo and description ~ deploy"},
+            )()
+        )
+        captured = capsys.readouterr()
+        assert "Listing 1 tasks:" in captured.out
+        assert "Deploy API" in captured.out
+
+        command_list(
+            type(
+                "Args",
+                (),
+                {"status": None, "where": "description ~ docs", "explain": True},
+            )()
+        )
+        captured = capsys.readouterr()
+        assert "Plan: text index on description ~ 'docs'" in captured.out
+        assert "Estimated cost: 1 candidates (full scan: 2 tasks)" in captured.out
+
+        command_list(type("Args", (), {"status": None, "where": "status ~ todo"})())
+        captured = capsys.readouterr()
+        assert "Error:" in captured.out
+
+
+def test_cli_report_command_integration(tmp_path, capsys):
+    """Test that CLI report command prints status counts, daily counts and cycle time.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - The totals line includes the per-status breakdown
+        - One row is printed per day
+        - The cycle time line counts the done tasks
+        - An invalid number of days prints an error
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Deploy API")
+    tm.add_task("Write docs")
+    tm.mark_done(1)
+
+    with patch("task_cli.tm", tm):
+        command_report(type("Args", (), {"days": 2})())
+        captured = capsys.readouterr()
+        assert "Total tasks: 2 (todo: 1, done: 1)" in captured.out
+        assert (
+            len([line for line in captured.out.splitlines() if line[:2] == "20"]) == 2
+        )
+        assert "Cycle time (1 done tasks): mean 0m" in captured.out
+
+        command_report(type("Args", (), {"days": 0})())
+        captured = capsys.readouterr()
+        assert "Error: Invalid number of days: 0" in captured.out
+
+
+def test_cli_migrate_timestamps_command_integration(tmp_path, capsys):
+    """Test that CLI migrate-timestamps converts the store and output stays ISO.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - The command reports how many tasks were converted
+        - The file holds integer timestamps afterwards
+        - list --format json still prints ISO timestamps
+    """
+    tm = make_tm_with_path(tmp_path)
+    task = tm.add_task("Buy milk")
+
+    with patch("task_cli.tm", tm):
+        command_migrate_timestamps(type("Args", (), {"to": "epoch"})())
+        captured = capsys.readouterr()
+        assert "Converted timestamps of 1 tasks to epoch milliseconds" in captured.out
+
+        data = json.loads((tmp_path / "tasks.json").read_text(encoding="utf-8"))
+        assert isinstance(data[0]["createdAt"], int)
+
+        command_list(type("Args", (), {"status": None, "format": "json"})())
+        captured = capsys.readouterr()
+        assert json.loads(captured.out)[0]["createdAt"] == task["createdAt"]
+
+
+def test_cli_serve_command_integration(tmp_path, capsys):
+    """Test that CLI serve starts a server on the given port and reports errors.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - The URL is printed and Ctrl+C stops the server cleanly
+        - A port that is already in use prints an error
+        - Other commands don't import the HTTP server modules
+    """
+    tm = make_tm_with_path(tmp_path)
+
+    with patch("task_cli.tm", tm), socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+
+        with patch(
+            "task_server.TaskServer.serve_forever", side_effect=KeyboardInterrupt
+        ):
+            command_serve(type("Args", (), {"host": "127.0.0.1", "port": 0})())
+        captured = capsys.readouterr()
+        assert "Serving tasks on http://127.0.0.1:" in captured.out
+
+        command_serve(type("Args", (), {"host": "127.0.0.1", "port": port})())
+        captured = capsys.readouterr()
+        assert f"Error: Cannot listen on 127.0.0.1:{port}" in captured.out
+
+    code = (
+        "import sys, task_cli; "
+        "sys.exit('task_server' in sys.modules or 'http.server' in sys.modules)"
+    )
+    assert (
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=tmp_path,
+            env={**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[2])},
+        ).returncode
+        == 0
+    )
+
+
+def test_cli_next_command_integration(tmp_path, capsys):
+    """Test that add/update priority flags feed the next command.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - add and update accept priority and due
+        - next shows the top tasks with their priority and due date
+        - Invalid values and an empty store print messages
+    """
+    tm = make_tm_with_path(tmp_path)
+
+    with patch("task_cli.tm", tm):
+        command_next(type("Args", (), {"count": 1})())
+        assert "No tasks to do." in capsys.readouterr().out
+
+        command_add(
+            type(
+                "Args", (), {"description": "Buy milk", "priority": None, "due": None}
+            )()
+        )
+        command_add(
+            type(
+                "Args",
+                (),
+                {"description": "Ship release", "priority": 2, "due": "2026-10-20"},
+            )()
+        )
+        command_add(
+            type(
+                "Args", (), {"description": "Bad date", "priority": None, "due": "soon"}
+            )()
+        )
+        assert "Error: Invalid due date: soon" in capsys.readouterr().out
+
+        command_update(
+            type(
+                "Args", (), {"id": "1", "description": None, "priority": 5, "due": None}
+            )()
+        )
+        capsys.readouterr()
+        command_next(type("Args", (), {"count": 2, "no_header": True})())
+        assert (
+            capsys.readouterr().out
+            == "1 - Buy milk - todo - 5 - \n2 - Ship release - todo - 2 - 2026-10-20\n"
+        )
+
+        command_next(type("Args", (), {"count": 0})())
+        assert "Error: Invalid count: 0" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "engine, path", [("segments", "tasks.seg"), ("records", "tasks.rec")]
+)
+def test_cli_engine_option_integration(tmp_path, monkeypatch, capsys, engine, path):
+    """Test the basic commands on the segment and record stores via --engine.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture to run in tmp_path.
+        capsys: Pytest fixture to capture stdout/stderr.
+        engine: The --engine value.
+        path: The engine's default store path.
+
+    Asserts:
+        - convert copies the JSON store into the engine's store
+        - add, update, mark-done, delete, list and count work on that store
+          and leave the JSON store untouched
+        - Commands and options the engine doesn't support print an error
+    """
+    monkeypatch.chdir(tmp_path)
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Buy milk")
+    tm.add_task("Walk dog")
+    with patch("task_cli.tm", tm):
+        main(["--engine", engine, "convert"])
+        assert capsys.readouterr().out == f"Converted 2 tasks to {path}\n"
+
+        for argv in (
+            ["add", "Deploy"],
+            ["update", "2", "Walk the dog"],
+            ["mark-done", "1"],
+            ["delete", "3"],
+            ["list", "todo", "--format", "json"],
+            ["count", "done"],
+        ):
+            main(["--engine", engine, *argv])
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[:4] == [
+            "Task added: 3 - Deploy - todo",
+            "Task updated: 2 - Walk the dog - todo",
+            "Task marked as done: 1",
+            "Task deleted: 3",
+        ]
+        assert [t["description"] for t in json.loads("\n".join(lines[4:-1]))] == [
+            "Walk the dog"
+        ]
+        assert lines[-1] == "1"
+        assert [t["status"] for t in tm.list_tasks()] == ["todo", "todo"]
+
+        main(["--engine", engine, "search", "milk"])
+        main(["--engine", engine, "add", "Ship", "--priority", "2"])
+        main(["--engine", engine, "list", "--sort", "id"])
+        assert capsys.readouterr().out.splitlines() == [
+            f"Error: search is not supported by the {engine} engine",
+            f"Error: --priority is not supported by the {engine} engine",
+            f"Error: --sort is not supported by the {engine} engine",
+        ]
+        main(["convert"])
+        assert capsys.readouterr().out.startswith("Error: convert needs --engine")
+def test_cli_tag_commands_and_list_by_tag_integration(tmp_path, capsys):
+    """Test that tag/untag change tags and list --tag/--any-tag filter by them.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - tag and untag print the task's tags after the change
+        - list filters by all tags and by any tag
+        - Invalid ids and tags print error messages
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Fix login")
+    tm.add_task("Restyle page", tags=["web"])
+
+    with patch("task_cli.tm", tm):
+        command_tag(type("Args", (), {"id": "1", "tags": ["api", "sev1"]})())
+        assert "Task tagged: 1 - Fix login - tags: api, sev1" in capsys.readouterr().out
+        command_tag(type("Args", (), {"id": "1", "tags": ["sev1"], "remove": True})())
+        assert "tags: api" in capsys.readouterr().out
+
+        command_list(type("Args", (), {"status": None, "tags": ["api"]})())
+        out = capsys.readouterr().out
+        assert "Fix login" in out and "Restyle page" not in out
+        command_list(
+            type(
+                "Args",
+                (),
+                {
+                    "status": None,
+                    "any_tags": ["api", "web"],
+                    "format": "csv",
+                    "fields": "id,tags",
+                },
+            )()
+        )
+        assert capsys.readouterr().out == "id,tags\n1,api\n2,web\n"
+
+        command_tag(type("Args", (), {"id": "x", "tags": ["api"]})())
+        assert "Error: Invalid task ID: x" in capsys.readouterr().out
+        command_tag(type("Args", (), {"id": "2", "tags": ["a,b"]})())
+        assert "Error: Invalid tag: 'a,b'" in capsys.readouterr().out
+
+
+def test_cli_block_commands_and_list_ready_integration(tmp_path, capsys):
+    """Test that block/unblock link tasks and list --ready shows workable tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - block and unblock print the task's blockers after the change
+        - list --ready leaves out blocked tasks until their blockers are done
+        - Cycles and invalid ids print error messages
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Build")
+    tm.add_task("Release")
+
+    with patch("task_cli.tm", tm):
+        command_block(type("Args", (), {"id": "2", "blockers": ["1"]})())
+        assert "Task 2 - Release - depends on: 1" in capsys.readouterr().out
+
+        command_list(type("Args", (), {"status": None, "ready": True})())
+        out = capsys.readouterr().out
+        assert "Build" in out and "Release" not in out
+        tm.mark_done(1)
+        command_list(type("Args", (), {"status": None, "ready": True})())
+        assert "Release" in capsys.readouterr().out
+
+        command_block(type("Args", (), {"id": "1", "blockers": ["2"]})())
+        assert (
+            "Error: Task 1 cannot depend on 2: dependency cycle 1 -> 2 -> 1"
+            in capsys.readouterr().out
+        )
+        command_block(type("Args", (), {"id": "2", "blockers": ["x"]})())
+        assert "Error: Invalid task ID in: 2 x" in capsys.readouterr().out
+        command_block(
+            type("Args", (), {"id": "2", "blockers": ["1"], "remove": True})()
+        )
+        assert "depends on: (nothing)" in capsys.readouterr().out
+
+
+def test_cli_lists_and_move_commands_integration(tmp_path, capsys):
+    """Test that move sends a task to another list and lists shows every list.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - move prints the task's id in the other list
+        - lists marks the current list and shows counts per list
+        - Invalid list names print an error message
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Buy milk")
+    tm.add_task("Rotate keys")
+
+    with patch("task_cli.tm", tm):
+        command_move(type("Args", (), {"id": "2", "to": "ops"})())
+        assert "Task moved: 2 -> ops 1 - Rotate keys - todo" in capsys.readouterr().out
+
+        command_lists(type("Args", (), {})())
+        assert capsys.readouterr().out.splitlines() == [
+            "* default - 1 tasks (todo: 1, in-progress: 0, done: 0)",
+            "  ops - 1 tasks (todo: 1, in-progress: 0, done: 0)",
+        ]
+
+        command_move(type("Args", (), {"id": "1", "to": "a b"})())
+        assert "Error: Invalid list name: 'a b'" in capsys.readouterr().out
+
+
+def test_cli_recur_and_tick_commands_integration(tmp_path, capsys):
+    """Test adding recurring templates and generating their tasks with tick.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - recur add prints the template and its next occurrence
+        - tick adds the due tasks once and reports when nothing is due
+        - recur list and recur delete show and remove templates
+        - Invalid rules, ids and timestamps print error messages
+    """
+    tm = make_tm_with_path(tmp_path)
+
+    with patch("task_cli.tm", tm):
+        command_recur_add(
+            type(
+                "Args",
+                (),
+                {"description": "Standup", "every": "1d", "start": "2026-10-01T09:00"},
+            )()
+        )
+        assert (
+            "Template added: 1 - Standup - every 1d - next 2026-10-01T09:00:00"
+            in capsys.readouterr().out
+        )
+        command_recur_add(
+            type(
+                "Args",
+                (),
+                {"description": "Report", "cron": "0 9 * * 1", "start": "2026-10-01"},
+            )()
+        )
+        assert (
+            "Template added: 2 - Report - cron 0 9 * * 1 - next 2026-10-05T09:00:00"
+            in capsys.readouterr().out
+        )
+        command_recur_add(
+            type("Args", (), {"description": "Nope", "cron": "0 9 * *"})()
+        )
+        assert (
+            "Error: Invalid cron rule: 0 9 * * (expected 5 fields)"
+            in capsys.readouterr().out
+        )
+
+        command_tick(type("Args", (), {"now": "2026-10-05T09:30"})())
+        assert capsys.readouterr().out.splitlines() == [
+            "Added 2 recurring tasks:",
+            "1 - Standup - todo (2026-10-05T09:00:00)",
+            "2 - Report - todo (2026-10-05T09:00:00)",
+        ]
+        command_tick(type("Args", (), {"now": "2026-10-05T10:00"})())
+        assert "No recurring tasks due." in capsys.readouterr().out
+        command_tick(type("Args", (), {"now": "tomorrow"})())
+        assert "Error: Invalid timestamp: tomorrow" in capsys.readouterr().out
+
+        command_recur_delete(type("Args", (), {"id": "2"})())
+        assert "Template deleted: 2 - Report" in capsys.readouterr().out
+        command_recur_delete(type("Args", (), {"id": "x"})())
+        assert "Error: Invalid template ID: x" in capsys.readouterr().out
+        command_recur_list(type("Args", (), {})())
+        assert capsys.readouterr().out.splitlines() == [
+            "1 - Standup - every 1d - next 2026-10-06T09:00:00"
+        ]
+
+
+def test_cli_view_commands_integration(tmp_path, capsys):
+    """Test saving a view and showing its tasks as they change.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        capsys: Pytest fixture to capture stdout/stderr.
+
+    Asserts:
+        - view save prints the number of matching tasks
+        - view show follows changes made after the view was saved
+        - view list and view delete show and remove views
+        - Invalid queries and unknown views print error messages
+    """
+    tm = make_tm_with_path(tmp_path)
+    tm.add_task("Deploy API")
+    tm.add_task("Write docs")
+
+    with patch("task_cli.tm", tm):
+        command_view_save(
+            type(
+                "Args",
+                (),
+                {"name": "deploys", "where": "status = todo and description ~ deploy"},
+            )()
+        )
+        assert (
+            "View saved: deploys - status = todo and description ~ deploy - 1 tasks"
+            in capsys.readouterr().out
+        )
+
+        tm.add_task("Deploy web")
+        tm.mark_done(1)
+        command_view_show(
+            type(
+                "Args",
+                (),
+                {"name": "deploys", "format": "csv", "fields": "id,description"},
+            )()
+        )
+        assert capsys.readouterr().out.splitlines() == [
+            "id,description",
+            "3,Deploy web",
+        ]
+
+        command_view_list(type("Args", (), {})())
+        assert capsys.readouterr().out.splitlines() == [
+            "deploys - status = todo and description ~ deploy - 1 tasks"
+        ]
+
+        command_view_save(
+            type("Args", (), {"name": "bad", "where": "status = later"})()
+        )
+        assert "Error: Invalid status filter: later" in capsys.readouterr().out
+        command_view_delete(type("Args", (), {"name": "deploys"})())
+        assert "View deleted: deploys" in capsys.readouterr().out
+        command_view_show(type("Args", (), {"name": "deploys"})())
+        assert "Error: View 'deploys' not found." in capsys.readouterr().out
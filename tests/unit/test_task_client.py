@@ -0,0 +1,347 @@
+import socket
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+import task_client
+from task_client import TaskClient
+from task_manager import NotFound, TaskManager, VersionConflict
+from task_server import TaskServer
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[TaskServer]:
+    """Run a TaskServer on a free localhost port for the duration of a test.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Yields:
+        The running server, serving tmp_path/tasks.json.
+    """
+    srv = TaskServer(("127.0.0.1", 0), TaskManager(str(tmp_path / "tasks.json")))
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def free_port() -> int:
+    """Helper to find a localhost port with nothing listening on it.
+
+    Returns:
+        A port number that refuses connections.
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_client_mirrors_task_manager_over_one_connection(server, tmp_path):
+    """Test that TaskClient calls behave like TaskManager calls and reuse a connection.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Results match what TaskManager returns for the same store
+        - Errors are raised as ValueError with TaskManager's message
+        - Report days are dates, as from TaskManager.report
+        - Every call used the same pooled connection
+    """
+    with TaskClient(server.url, path=str(tmp_path / "tasks.json")) as client:
+        assert client.add_task("Buy milk")["id"] == 1
+        conn = client._idle[0]
+        client.add_task("Deploy API")
+        assert client.mark_done(1)["status"] == "done"
+        assert client.update_task(2, "Deploy API v2")["description"] == "Deploy API v2"
+        assert (
+            client.list_tasks()
+            == TaskManager(str(tmp_path / "tasks.json")).list_tasks()
+        )
+        assert [t["id"] for t in client.list_tasks(status="todo")] == [2]
+        assert [
+            t["id"] for t in client.list_tasks(sort_by="id", reverse=True, limit=1)
+        ] == [2]
+        assert [t["id"] for t in client.search("deploy")] == [2]
+        assert client.count_tasks("done") == 1
+        assert client.summary()["count"] == 2
+        report = client.report(days=1, today=date.today())
+        assert report["days"][0][0] == date.today()
+
+        with pytest.raises(NotFound, match="Task with id 9 not found."):
+            client.mark_in_progress(9)
+        assert client.delete_task(2)["id"] == 2
+        assert client._idle == [conn]
+
+
+def test_client_revalidates_cached_lists(server, tmp_path):
+    """Test that repeated list calls are revalidated with If-None-Match.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The second identical list call is answered with 304
+        - The result is the same as the first
+        - A change on the server makes the next call return fresh data
+    """
+    with TaskClient(server.url, path=str(tmp_path / "tasks.json")) as client:
+        client.add_task("Buy milk")
+        first = client.list_tasks()
+        assert client.list_tasks() == first
+        assert server.metrics["notModified"] == 1
+
+        client.mark_done(1)
+        assert client.list_tasks()[0]["status"] == "done"
+        assert server.metrics["notModified"] == 1
+
+
+def test_client_pipeline_batches_writes(server, tmp_path):
+    """Test that pipeline() sends many calls at once and reports each result.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Results come back in call order
+        - A failing call returns its ValueError without stopping the others
+        - The writes are saved in one batch
+    """
+    with TaskClient(server.url, path=str(tmp_path / "tasks.json")) as client:
+        calls = [("add_task", f"Task {i}") for i in range(10)] + [
+            ("mark_done", 99),
+            ("mark_done", 3),
+        ]
+        results = client.pipeline(calls)
+
+    assert [r["id"] for r in results[:10]] == list(range(1, 11))
+    assert isinstance(results[10], ValueError)
+    assert str(results[10]) == "Task with id 99 not found."
+    assert results[11]["status"] == "done"
+    assert server.metrics["batches"] == 1
+    assert server.tm.summary()["seq"] == 1
+
+    with pytest.raises(ValueError, match="Unsupported operation: purge"):
+        TaskClient(server.url).pipeline([("purge",)])
+
+
+def test_client_retries_reads_but_not_writes(server, tmp_path, monkeypatch):
+    """Test that a failed connection is retried for reads only.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture to make one response read fail.
+
+    Asserts:
+        - A read whose connection fails once still succeeds
+        - A write whose connection fails raises ConnectionError
+    """
+    read_response = task_client._Connection.read_response
+    failures = []
+
+    def flaky(conn):
+        if not failures:
+            failures.append(1)
+            raise ConnectionResetError("reset")
+        return read_response(conn)
+
+    with TaskClient(server.url, path=str(tmp_path / "tasks.json")) as client:
+        client.add_task("Buy milk")
+        monkeypatch.setattr(task_client._Connection, "read_response", flaky)
+        assert len(client.list_tasks()) == 1
+
+        failures.clear()
+        with pytest.raises(ConnectionError):
+            client.add_task("Walk dog")
+
+
+def test_client_falls_back_to_local_task_manager(tmp_path):
+    """Test that calls go to the local store when no server is running.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Calls and pipelines work against the local store
+        - With fallback disabled, ConnectionError is raised
+    """
+    path = str(tmp_path / "tasks.json")
+    url = f"http://127.0.0.1:{free_port()}"
+    client = TaskClient(url, path=path)
+    assert client.add_task("Buy milk")["id"] == 1
+    results = client.pipeline([("add_task", "Walk dog"), ("mark_done", 5)])
+    assert results[0]["id"] == 2 and isinstance(results[1], ValueError)
+    assert [t["description"] for t in TaskManager(path).list_tasks()] == [
+        "Buy milk",
+        "Walk dog",
+    ]
+
+    with pytest.raises(ConnectionError, match="Cannot connect"):
+        TaskClient(url, path=path, fallback=False).list_tasks()
+    with pytest.raises(ValueError, match="Invalid server URL"):
+        TaskClient("ftp://example")
+
+
+def test_client_expected_version(server, tmp_path):
+    """Test that conflicts come back as VersionConflict, also in pipelines.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A stale expected_version raises VersionConflict with the current task
+        - In a pipeline only the conflicting call fails
+        - generation() follows the store's saves
+    """
+    with TaskClient(server.url, path=str(tmp_path / "tasks.json")) as client:
+        first = client.add_task("Buy milk")
+        second = client.add_task("Walk dog")
+        generation = client.generation()
+        client.update_task(1, "Buy oat milk")
+        assert client.generation() == generation + 1
+
+        with pytest.raises(VersionConflict) as exc:
+            client.mark_done(1, expected_version=first["version"])
+        assert exc.value.current["description"] == "Buy oat milk"
+
+        results = client.pipeline(
+            [
+                ("mark_done", 1, first["version"]),
+                ("mark_done", 2, second["version"]),
+            ]
+        )
+        assert isinstance(results[0], VersionConflict)
+        assert results[1]["status"] == "done"
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+def test_client_priority_due_and_next(server, tmp_path, fallback):
+    """Test priorities, due dates and next_tasks through the client.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        fallback: Whether to use the local TaskManager instead of the server.
+
+    Asserts:
+        - add_task and update_task set priority and due as TaskManager does
+        - next_tasks ranks the open tasks
+    """
+    url = f"http://127.0.0.1:{free_port()}" if fallback else server.url
+    with TaskClient(url, path=str(tmp_path / "tasks.json")) as client:
+        assert client.add_task("Ship", 2, "2026-11-01")["due"] == "2026-11-01"
+        client.add_task("Plan")
+        assert client.update_task(2, priority=3)["priority"] == 3
+        assert "due" not in client.update_task(1, due="")
+        assert [t["id"] for t in client.next_tasks(2)] == [2, 1]
+        with pytest.raises(ValueError, match="Invalid priority"):
+            client.update_task(1, priority=-1)
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+def test_client_tags(server, tmp_path, fallback):
+    """Test tagging and tag filters through the client.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        fallback: Whether to use the local TaskManager instead of the server.
+
+    Asserts:
+        - add_task, update_task, tag_task and untag_task change tags as TaskManager does
+        - list_tasks filters by tags and any_tags
+    """
+    url = f"http://127.0.0.1:{free_port()}" if fallback else server.url
+    with TaskClient(url, path=str(tmp_path / "tasks.json")) as client:
+        assert client.add_task("Ship", tags=["work"])["tags"] == ["work"]
+        client.add_task("Walk dog")
+        assert client.update_task(2, tags=["home"])["tags"] == ["home"]
+        assert client.tag_task(1, ["urgent"])["tags"] == ["urgent", "work"]
+        assert "tags" not in client.untag_task(2, "home")
+        assert [t["id"] for t in client.list_tasks(tags=["work", "urgent"])] == [1]
+        assert [t["id"] for t in client.list_tasks(any_tags=["home", "urgent"])] == [1]
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+def test_client_dependencies_and_ready(server, tmp_path, fallback):
+    """Test dependencies and ready tasks through the client.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        fallback: Whether to use the local TaskManager instead of the server.
+
+    Asserts:
+        - block_task and unblock_task change dependsOn as TaskManager does
+        - list_tasks(ready=True) follows the blockers
+    """
+    url = f"http://127.0.0.1:{free_port()}" if fallback else server.url
+    with TaskClient(url, path=str(tmp_path / "tasks.json")) as client:
+        client.add_task("Build")
+        client.add_task("Release")
+        assert client.block_task(2, [1])["dependsOn"] == [1]
+        assert [t["id"] for t in client.list_tasks(ready=True)] == [1]
+        assert "dependsOn" not in client.unblock_task(2, [1])
+        assert [t["id"] for t in client.list_tasks(ready=True)] == [1, 2]
+        with pytest.raises(ValueError, match="Task with id 9 not found"):
+            client.block_task(1, [9])
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+def test_client_recurring_templates(server, tmp_path, fallback):
+    """Test recurring templates and ticks through the client.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        fallback: Whether to use the local TaskManager instead of the server.
+
+    Asserts:
+        - add_template, list_templates and delete_template behave as in TaskManager
+        - tick adds the due task at the given time, once
+    """
+    url = f"http://127.0.0.1:{free_port()}" if fallback else server.url
+    with TaskClient(url, path=str(tmp_path / "tasks.json")) as client:
+        template = client.add_template(
+            "Report", cron="0 9 * * 1", start=datetime(2026, 10, 1), priority=2
+        )
+        assert template["next"] == "2026-10-05T09:00:00"
+        assert client.list_templates() == [template]
+        tasks = client.tick(datetime(2026, 10, 6))
+        assert [(t["description"], t["priority"]) for t in tasks] == [("Report", 2)]
+        assert client.tick(datetime(2026, 10, 6)) == []
+        assert client.delete_template(template["id"])["id"] == template["id"]
+        assert client.list_templates() == []
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+def test_client_saved_views(server, tmp_path, fallback):
+    """Test saved views through the client.
+
+    Args:
+        server: Running TaskServer fixture.
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        fallback: Whether to use the local TaskManager instead of the server.
+
+    Asserts:
+        - save_view, show_view, list_views and delete_view behave as in TaskManager
+    """
+    url = f"http://127.0.0.1:{free_port()}" if fallback else server.url
+    with TaskClient(url, path=str(tmp_path / "tasks.json")) as client:
+        client.add_task("Deploy API")
+        client.add_task("Write docs")
+        assert client.save_view("deploys", "description ~ 'deploy'")["count"] == 1
+        assert [t["id"] for t in client.show_view("deploys")] == [1]
+        assert [v["name"] for v in client.list_views()] == ["deploys"]
+        assert client.delete_view("deploys")["where"] == "description ~ 'deploy'"
+        with pytest.raises(ValueError, match="View 'deploys' not found."):
+            client.show_view("deploys")
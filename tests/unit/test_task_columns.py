@@ -0,0 +1,171 @@
+from datetime import date
+
+from task_columns import TaskColumns
+from task_manager import iso_to_epoch_ms
+
+
+def make_columns() -> TaskColumns:
+    """Helper to build columns over a few tasks spread across three days.
+
+    Returns:
+        TaskColumns for tasks 1-5.
+    """
+    return TaskColumns.from_tasks(
+        [
+            {
+                "id": 1,
+                "description": "Deploy",
+                "status": "done",
+                "createdAt": "2026-10-01T09:00:00",
+                "updatedAt": "2026-10-01T10:00:00",
+            },
+            {
+                "id": 2,
+                "description": "Deploy",
+                "status": "done",
+                "createdAt": "2026-10-01T12:00:00",
+                "updatedAt": "2026-10-03T12:00:00",
+            },
+            {
+                "id": 3,
+                "description": "Docs",
+                "status": "todo",
+                "createdAt": "2026-10-02T08:00:00",
+                "updatedAt": "2026-10-02T08:00:00",
+            },
+            {
+                "id": 4,
+                "description": "Review",
+                "status": "in-progress",
+                "createdAt": "2026-10-03T23:59:59",
+                "updatedAt": "2026-10-03T23:59:59",
+            },
+            {
+                "id": 5,
+                "description": "Triage",
+                "status": "done",
+                "createdAt": "2026-10-03T00:00:00",
+                "updatedAt": "2026-10-03T06:00:00",
+            },
+        ]
+    )
+
+
+def test_columns_layout_and_interned_descriptions():
+    """Test that tasks become parallel columns with interned descriptions.
+
+    Asserts:
+        - Ids, status codes and epoch-second timestamps are stored in task order
+        - Equal descriptions share one table entry
+    """
+    cols = make_columns()
+
+    assert list(cols.ids) == [1, 2, 3, 4, 5]
+    assert [cols.statuses[code] for code in cols.status] == [
+        "done",
+        "done",
+        "todo",
+        "in-progress",
+        "done",
+    ]
+    assert cols.updated[0] - cols.created[0] == 3600
+    assert cols.created[0] % 86400 == 9 * 3600
+    assert cols.descriptions == ["Deploy", "Docs", "Review", "Triage"]
+    assert cols.description(1) == "Deploy"
+
+
+def test_columns_aggregates():
+    """Test group-by status, per-day histograms and cycle times.
+
+    Asserts:
+        - count_by_status counts every status
+        - Day histograms bucket by calendar day, with status and since filters
+        - Cycle times are updatedAt - createdAt of done tasks
+    """
+    cols = make_columns()
+
+    assert cols.count_by_status() == {"todo": 1, "in-progress": 1, "done": 3}
+    assert cols.histogram_by_day() == {
+        date(2026, 10, 1): 2,
+        date(2026, 10, 2): 1,
+        date(2026, 10, 3): 2,
+    }
+    assert cols.histogram_by_day("updatedAt", status="done") == {
+        date(2026, 10, 1): 1,
+        date(2026, 10, 3): 2,
+    }
+    assert cols.histogram_by_day(since=date(2026, 10, 2)) == {
+        date(2026, 10, 2): 1,
+        date(2026, 10, 3): 2,
+    }
+    assert cols.histogram_by_day(status="blocked") == {}
+
+    assert list(cols.cycle_times()) == [3600, 2 * 86400, 6 * 3600]
+    assert cols.cycle_time_stats() == {
+        "count": 3,
+        "mean": (3600 + 2 * 86400 + 6 * 3600) / 3,
+        "median": 6 * 3600,
+        "p90": 2 * 86400,
+    }
+    assert cols.cycle_time_stats("blocked")["count"] == 0
+
+
+def test_columns_round_trip_and_unknown_status():
+    """Test serialization and statuses outside the standard three.
+
+    Asserts:
+        - from_bytes(to_bytes()) restores every column and the description table
+        - A status added by hand gets its own code and is counted
+    """
+    cols = make_columns()
+    restored = TaskColumns.from_bytes(cols.to_bytes())
+    assert list(restored.created) == list(cols.created)
+    assert restored.histogram_by_day("updatedAt") == cols.histogram_by_day("updatedAt")
+    assert restored.descriptions == cols.descriptions
+    assert TaskColumns.from_bytes(b"garbage") is None
+
+    custom = TaskColumns.from_tasks(
+        [
+            {
+                "id": 1,
+                "description": "x",
+                "status": "blocked",
+                "createdAt": "2026-10-01T00:00:00",
+                "updatedAt": "2026-10-01T00:00:00",
+            },
+        ]
+    )
+    assert custom.count_by_status() == {"blocked": 1}
+
+
+def test_columns_from_epoch_timestamps_match_iso():
+    """Test that epoch-millisecond timestamps land in the same day buckets as ISO.
+
+    Asserts:
+        - Column values are identical for the same tasks stored either way
+    """
+    iso = make_columns()
+    tasks = [
+        {
+            "id": i,
+            "description": "",
+            "status": iso.statuses[iso.status[n]],
+            "createdAt": iso_to_epoch_ms(t[0]),
+            "updatedAt": iso_to_epoch_ms(t[1]),
+        }
+        for n, (i, t) in enumerate(
+            zip(
+                iso.ids,
+                [
+                    ("2026-10-01T09:00:00", "2026-10-01T10:00:00"),
+                    ("2026-10-01T12:00:00", "2026-10-03T12:00:00"),
+                    ("2026-10-02T08:00:00", "2026-10-02T08:00:00"),
+                    ("2026-10-03T23:59:59", "2026-10-03T23:59:59"),
+                    ("2026-10-03T00:00:00", "2026-10-03T06:00:00"),
+                ],
+            )
+        )
+    ]
+    epoch = TaskColumns.from_tasks(tasks)
+    assert list(epoch.created) == list(iso.created)
+    assert list(epoch.updated) == list(iso.updated)
@@ -0,0 +1,308 @@
+import io
+
+import pytest
+from task_index import (
+    DependencyIndex,
+    NextIndex,
+    StatusIndex,
+    TagIndex,
+    TextIndex,
+    TimeIndex,
+    ViewIndex,
+    tokenize,
+)
+
+
+def make_text_index() -> TextIndex:
+    """Helper to build a text index over a few sample descriptions.
+
+    Returns:
+        A TextIndex containing tasks 1-4.
+    """
+    index = TextIndex()
+    index.rebuild(
+        [
+            {"id": 1, "description": "Deploy API to staging"},
+            {"id": 2, "description": "Deploy web frontend"},
+            {"id": 3, "description": "Write API docs"},
+            {"id": 4, "description": "Release v2.0 (deployment)"},
+        ]
+    )
+    return index
+
+
+def test_tokenize_lowercases_and_splits_punctuation():
+    """Test that descriptions are split into lowercase word tokens.
+
+    Asserts:
+        - Punctuation separates tokens
+        - Tokens are lowercased
+    """
+    assert tokenize("Release v2.0 (Deployment)") == ["release", "v2", "0", "deployment"]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("deploy", {1, 2}),
+        ("DEPLOY api", {1}),
+        ("deploy AND api", {1}),
+        ("deploy OR docs", {1, 2, 3}),
+        ("deploy* ", {1, 2, 4}),
+        ("api OR release v2*", {1, 3, 4}),
+        ("missing", set()),
+        ("deploy missing OR docs", {3}),
+    ],
+)
+def test_text_index_search_and_or_prefix(query, expected):
+    """Test AND, OR and prefix matching.
+
+    Args:
+        query: The search query.
+        expected: The expected set of matching ids.
+
+    Asserts:
+        - The query returns exactly the expected ids
+    """
+    assert make_text_index().search(query) == expected
+
+
+def test_text_index_incremental_updates_and_round_trip():
+    """Test that add/remove keep the index current and it survives serialization.
+
+    Asserts:
+        - Removing a task drops its tokens, including for prefix queries
+        - Adding a task makes it searchable
+        - from_data(to_data()) gives the same results
+    """
+    index = make_text_index()
+    index.search("deploy*")  # build the sorted token list
+
+    index.remove({"id": 4, "description": "Release v2.0 (deployment)"})
+    index.add({"id": 5, "description": "Deployer cleanup"})
+
+    assert index.search("deploy*") == {1, 2, 5}
+    assert "release" not in index.postings
+
+    restored = TextIndex.from_data(index.to_data())
+    assert restored.search("deploy* OR docs") == {1, 2, 3, 5}
+
+
+def test_text_index_reads_query_terms_from_its_file():
+    """Test that the postings a query needs are read by bisecting the dump.
+
+    Asserts:
+        - load(dump()) gives the same results
+        - The terms read from the dump, surrounded by other data, answer
+          exact, prefix, AND and OR queries like the full index
+        - Only the tokens matching the terms are read
+    """
+    index = make_text_index()
+    data = index.dump()
+    assert TextIndex.load(data).search("deploy* OR docs") == {1, 2, 3, 4}
+
+    f = io.BytesIO(b"meta\n" + data + b"journal\n")
+    end = 5 + len(data)
+    for query in ["deploy", "DEPLOY api", "api OR release v2*", "0 OR zzz*", "aaa"]:
+        terms = [term for group in TextIndex.parse(query) for term in group]
+        partial = TextIndex.read_terms(f, 5, end, terms)
+        assert partial.search(query) == index.search(query)
+    partial = TextIndex.read_terms(f, 5, end, ["deploy*", "to"])
+    assert sorted(partial.postings) == ["deploy", "deployment", "to"]
+
+
+def test_time_index_range_bounds_and_updates():
+    """Test half-open range lookups and incremental maintenance of the time index.
+
+    Asserts:
+        - start is inclusive and end is exclusive
+        - Open-ended ranges work on either side
+        - remove/add move a task to its new timestamp
+        - The index survives serialization
+    """
+    index = TimeIndex()
+    index.rebuild(
+        [
+            {
+                "id": 1,
+                "createdAt": "2026-01-01T00:00:00",
+                "updatedAt": "2026-01-05T00:00:00",
+            },
+            {
+                "id": 2,
+                "createdAt": "2026-01-02T00:00:00",
+                "updatedAt": "2026-01-02T00:00:00",
+            },
+            {
+                "id": 3,
+                "createdAt": "2026-01-03T00:00:00",
+                "updatedAt": "2026-01-03T00:00:00",
+            },
+        ]
+    )
+
+    assert index.range("createdAt", "2026-01-02T00:00:00", "2026-01-03T00:00:00") == [2]
+    assert index.range("createdAt", start="2026-01-02") == [2, 3]
+    assert index.range("updatedAt", end="2026-01-04") == [2, 3]
+
+    index.remove(
+        {
+            "id": 2,
+            "createdAt": "2026-01-02T00:00:00",
+            "updatedAt": "2026-01-02T00:00:00",
+        }
+    )
+    index.add(
+        {
+            "id": 2,
+            "createdAt": "2026-01-02T00:00:00",
+            "updatedAt": "2026-01-09T00:00:00",
+        }
+    )
+    assert index.range("updatedAt", start="2026-01-04") == [1, 2]
+
+    restored = TimeIndex.from_data(index.to_data())
+    assert restored.range("createdAt") == [1, 2, 3]
+
+
+def test_status_index_lookup_follows_status_changes():
+    """Test that the status index moves tasks between statuses.
+
+    Asserts:
+        - lookup returns ids for one or several statuses
+        - remove/add of a changed task moves it to the new status
+        - The index survives serialization
+    """
+    index = StatusIndex()
+    index.rebuild(
+        [
+            {"id": 1, "status": "todo"},
+            {"id": 2, "status": "todo"},
+            {"id": 3, "status": "done"},
+        ]
+    )
+    assert index.lookup(["todo"]) == {1, 2}
+
+    index.remove({"id": 2, "status": "todo"})
+    index.add({"id": 2, "status": "in-progress"})
+    assert index.lookup(["todo", "in-progress"]) == {1, 2}
+    assert StatusIndex.from_data(index.to_data()).lookup(["in-progress", "done"]) == {
+        2,
+        3,
+    }
+
+
+def test_next_index_orders_by_priority_then_due():
+    """Test that the priority heap returns the top tasks and follows changes.
+
+    Asserts:
+        - Tasks come by priority, then due date (none last), then id
+        - Done tasks are left out
+        - A removed or changed task's old entry is skipped
+        - top() leaves the heap intact and the index survives serialization
+    """
+    index = NextIndex()
+    index.rebuild(
+        [
+            {"id": 1, "status": "todo"},
+            {"id": 2, "status": "todo", "priority": 2},
+            {"id": 3, "status": "in-progress", "priority": 2, "due": "2026-10-20"},
+            {"id": 4, "status": "done", "priority": 9},
+            {"id": 5, "status": "todo", "due": "2026-10-19"},
+        ]
+    )
+    assert index.top(10) == [3, 2, 5, 1]
+    assert index.top(2) == [3, 2]
+
+    index.remove({"id": 3, "status": "in-progress", "priority": 2, "due": "2026-10-20"})
+    index.add({"id": 3, "status": "done", "priority": 2, "due": "2026-10-20"})
+    index.remove({"id": 1, "status": "todo"})
+    index.add({"id": 1, "status": "todo", "priority": 5})
+    assert index.top(3) == [1, 2, 5]
+    assert NextIndex.from_data(index.to_data()).top(10) == [1, 2, 5]
+
+
+def test_tag_index_intersects_and_joins_id_sets():
+    """Test tag lookups with all-of and any-of tags.
+
+    Asserts:
+        - all_tags intersects and any_tags joins, and both combine with AND
+        - remove/add move a task between tags and drop empty tags
+        - The index survives serialization
+    """
+    index = TagIndex()
+    index.rebuild(
+        [
+            {"id": 1, "tags": ["api", "sev1"]},
+            {"id": 2, "tags": ["api"]},
+            {"id": 3, "tags": ["web", "sev1"]},
+            {"id": 70, "tags": ["api", "sev1"]},
+            {"id": 4},
+        ]
+    )
+    assert index.lookup(["api", "sev1"]) == [1, 70]
+    assert index.lookup(any_tags=["web", "api"]) == [1, 2, 3, 70]
+    assert index.lookup(["sev1"], ["web", "db"]) == [3]
+    assert index.lookup(["nope"]) == [] and index.lookup() == []
+
+    index.remove({"id": 3, "tags": ["web", "sev1"]})
+    index.add({"id": 3, "tags": ["api"]})
+    assert index.counts() == {"api": 4, "sev1": 2}
+    assert TagIndex.from_data(index.to_data()).lookup(["api"], ["sev1"]) == [1, 70]
+
+
+def test_dependency_index_counts_unfinished_blockers():
+    """Test that the ready set follows status changes without re-walking the graph.
+
+    Asserts:
+        - A task is ready only when all its blockers are done or gone
+        - Marking a blocker done (remove + add) decrements its dependents
+        - Order of adds doesn't matter, and serialization recounts the same state
+        - find_path follows dependencies transitively
+    """
+    tasks = [
+        {"id": 3, "status": "todo", "dependsOn": [1, 2]},
+        {"id": 1, "status": "todo"},
+        {"id": 2, "status": "in-progress", "dependsOn": [1]},
+        {"id": 4, "status": "done", "dependsOn": [3]},
+    ]
+    index = DependencyIndex()
+    index.rebuild(tasks)
+    assert index.ready == {1}
+    assert index.unfinished == {2: 1, 3: 2, 4: 1}
+    assert index.find_path(3, 1) == [3, 1] and index.find_path(1, 3) is None
+
+    index.remove({"id": 1, "status": "todo"})
+    index.add({"id": 1, "status": "done"})
+    assert index.ready == {2}
+    index.remove({"id": 2, "status": "in-progress", "dependsOn": [1]})
+    assert index.ready == {3}
+
+    restored = DependencyIndex.from_data(index.to_data())
+    assert restored.ready == {3} and restored.unfinished == index.unfinished
+
+
+def test_view_index_applies_changes_to_each_view():
+    """Test that view results follow task changes through their predicates.
+
+    Asserts:
+        - A changed task moves in or out of each view it (no longer) matches
+        - Dropped views are no longer updated
+        - Serialization keeps queries and results, and bind() restores predicates
+    """
+    index = ViewIndex()
+    index.set_view("todo", "status = todo", lambda t: t["status"] == "todo", [1])
+    index.set_view("done", "status = done", lambda t: t["status"] == "done", [2])
+
+    index.remove({"id": 1, "status": "todo"})
+    index.add({"id": 1, "status": "done"})
+    index.add({"id": 3, "status": "todo"})
+    assert index.lookup("todo") == [3] and index.lookup("done") == [1, 2]
+
+    restored = ViewIndex.from_data(index.to_data())
+    assert restored.queries == index.queries and restored.lookup("done") == [1, 2]
+    restored.bind(lambda query: lambda t: t["status"] == query.split()[-1])
+    restored.drop_view("done")
+    restored.add({"id": 4, "status": "todo"})
+    restored.add({"id": 5, "status": "done"})
+    assert restored.lookup("todo") == [3, 4] and restored.lookup("done") == []
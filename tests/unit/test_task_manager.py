@@ -1,9 +1,17 @@
+import gzip
 import json
+import lzma
+import os
+import subprocess
+import sys
+import threading
+from datetime import timedelta
 from pathlib import Path
 from time import sleep
 
 import pytest
-from task_manager import TaskManager
+from task_manager import TaskManager, TaskNotFound, VersionConflict
+
 
 def make_tm(tmp_path: Path) -> TaskManager:
     """Helper to create a TaskManager with its own isolated tasks.json.
@@ -646,4 +654,1796 @@ def test_persistence_across_instances(tmp_path):
     
     assert len(tasks) == 1
     assert tasks[0]["id"] == task["id"]
-    assert tasks[0]["description"] == "Persistent task"
\ No newline at end of file
+    assert tasks[0]["description"] == "Persistent task"
+
+
+@pytest.mark.parametrize("suffix, opener", [(".gz", gzip.open), (".xz", lzma.open)])
+def test_compressed_store_round_trip(tmp_path, suffix, opener):
+    """Test that compressed stores are detected by extension and round-trip tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        suffix: Compression suffix appended to tasks.json.
+        opener: Matching stdlib opener used to inspect the file directly.
+
+    Asserts:
+        - The file on disk is compressed, compact JSON
+        - A new instance reads the tasks back unchanged
+    """
+    path = str(tmp_path / f"tasks.json{suffix}")
+    tm = TaskManager(path)
+
+    t1 = tm.add_task("Buy milk")
+    tm.add_task("Buy eggs")
+    tm.mark_done(t1["id"])
+
+    with opener(path, "rt", encoding="utf-8") as f:
+        raw = f.read()
+    assert "\n" not in raw
+    assert json.loads(raw)[0]["status"] == "done"
+
+    tasks = TaskManager(path).list_tasks()
+    assert [t["description"] for t in tasks] == ["Buy milk", "Buy eggs"]
+
+
+def test_compression_level_is_configurable(tmp_path):
+    """Test that the compression level changes the compressed output.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Level 0 (stored) output is larger than level 9 output
+        - Both levels load back the same tasks
+    """
+    tasks = [
+        {
+            "id": i,
+            "description": f"Task {i}",
+            "status": "todo",
+            "createdAt": "2026-01-01T00:00:00",
+            "updatedAt": "2026-01-01T00:00:00",
+        }
+        for i in range(1, 200)
+    ]
+    fast = TaskManager(str(tmp_path / "fast.json.gz"), compression_level=0)
+    small = TaskManager(str(tmp_path / "small.json.gz"), compression_level=9)
+    fast._save_tasks(tasks)
+    small._save_tasks(tasks)
+
+    assert (tmp_path / "fast.json.gz").stat().st_size > (
+        tmp_path / "small.json.gz"
+    ).stat().st_size
+    assert fast._get_tasks() == small._get_tasks() == tasks
+
+
+def test_invalid_compression_level_raises_error(tmp_path):
+    """Test that an out-of-range compression level is rejected.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - ValueError is raised for a level above 9
+    """
+    with pytest.raises(ValueError, match="Invalid compression level"):
+        TaskManager(str(tmp_path / "tasks.json.gz"), compression_level=12)
+
+
+def test_corrupt_compressed_store_raises_error(tmp_path):
+    """Test that reading a corrupt compressed store raises ValueError.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - ValueError is raised when the .gz file is not valid gzip data
+    """
+    path = tmp_path / "tasks.json.gz"
+    path.write_bytes(b"not gzip data")
+
+    with pytest.raises(ValueError, match="Failed to read tasks"):
+        TaskManager(str(path)).list_tasks()
+
+
+def test_header_tracks_counts_next_id_and_seq(tmp_path):
+    """Test that every save writes a header with counts, next id and sequence.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The header file is written next to the store
+        - Counts, next id and sequence number reflect the saved tasks
+    """
+    tm = make_tm(tmp_path)
+
+    t1 = tm.add_task("Buy milk")
+    tm.add_task("Buy eggs")
+    tm.mark_done(t1["id"])
+
+    header = json.loads((tmp_path / "tasks.json.meta").read_text(encoding="utf-8"))
+    assert header["count"] == 2
+    assert header["statusCounts"] == {"done": 1, "in-progress": 0, "todo": 1}
+    assert header["nextId"] == 3
+    assert header["seq"] == 3
+
+
+def test_count_tasks_reads_header_without_parsing_store(tmp_path, monkeypatch):
+    """Test that count_tasks and summary use the header only.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to forbid parsing the store.
+
+    Asserts:
+        - Counts are returned without calling _get_tasks
+        - Invalid status filters raise ValueError
+    """
+    tm = make_tm(tmp_path)
+    t1 = tm.add_task("Buy milk")
+    tm.add_task("Buy eggs")
+    tm.mark_in_progress(t1["id"])
+
+    def fail():
+        raise AssertionError("store should not be parsed")
+
+    monkeypatch.setattr(tm, "_get_tasks", fail)
+
+    assert tm.count_tasks() == 2
+    assert tm.count_tasks("in-progress") == 1
+    assert tm.count_tasks("done") == 0
+    assert tm.summary()["nextId"] == 3
+    with pytest.raises(ValueError, match="Invalid status filter"):
+        tm.count_tasks("invalid")
+
+
+def test_stale_header_is_rebuilt(tmp_path):
+    """Test that a header is rebuilt when the store is edited outside TaskManager.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Counts reflect the hand-edited store
+        - The sequence number moves forward
+        - A missing header is rebuilt as well
+    """
+    tm = make_tm(tmp_path)
+    tm.add_task("Buy milk")
+    seq = tm.summary()["seq"]
+
+    tasks_file = tmp_path / "tasks.json"
+    tasks = json.loads(tasks_file.read_text(encoding="utf-8"))
+    tasks.append(
+        {
+            "id": 7,
+            "description": "Manual",
+            "status": "done",
+            "createdAt": "2026-01-01T00:00:00",
+            "updatedAt": "2026-01-01T00:00:00",
+        }
+    )
+    tasks_file.write_text(json.dumps(tasks), encoding="utf-8")
+
+    summary = tm.summary()
+    assert summary["count"] == 2
+    assert summary["statusCounts"]["done"] == 1
+    assert summary["nextId"] == 8
+    assert summary["seq"] == seq + 1
+
+    (tmp_path / "tasks.json.meta").unlink()
+    assert tm.count_tasks() == 2
+
+
+def write_tasks_file(tmp_path: Path, tasks: list) -> TaskManager:
+    """Helper to seed tasks.json with hand-written tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        tasks: Task dictionaries to write.
+
+    Returns:
+        A TaskManager reading the seeded file.
+    """
+    (tmp_path / "tasks.json").write_text(json.dumps(tasks), encoding="utf-8")
+    return make_tm(tmp_path)
+
+
+def seeded_task(
+    id: int, status: str, created: str, updated: str, description: str = ""
+) -> dict:
+    """Helper to build a task dictionary with fixed timestamps.
+
+    Args:
+        id: Task id.
+        status: Task status.
+        created: createdAt timestamp.
+        updated: updatedAt timestamp.
+        description: Task description. Defaults to "Task <id>".
+
+    Returns:
+        The task dictionary.
+    """
+    return {
+        "id": id,
+        "description": description or f"Task {id}",
+        "status": status,
+        "createdAt": created,
+        "updatedAt": updated,
+    }
+
+
+def test_delete_where_combines_filters_in_one_save(tmp_path, monkeypatch):
+    """Test that delete_where removes tasks matching all filters with a single save.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to count saves.
+
+    Asserts:
+        - Only tasks matching every filter are deleted
+        - The store is saved exactly once
+        - The header counts reflect the deletion
+    """
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(1, "done", "2026-01-01T00:00:00", "2026-01-05T00:00:00"),
+            seeded_task(2, "done", "2026-03-01T00:00:00", "2026-03-02T00:00:00"),
+            seeded_task(3, "todo", "2026-01-01T00:00:00", "2026-01-02T00:00:00"),
+            seeded_task(
+                4, "done", "2026-01-02T00:00:00", "2026-06-01T00:00:00", "Deploy API"
+            ),
+        ],
+    )
+    saves = []
+    original_save = tm._save_tasks
+    monkeypatch.setattr(
+        tm, "_save_tasks", lambda *a, **kw: (saves.append(1), original_save(*a, **kw))
+    )
+
+    deleted = tm.delete_where(status="done", older_than="2026-02-01")
+
+    assert [t["id"] for t in deleted] == [1, 4]
+    assert [t["id"] for t in tm.list_tasks()] == [2, 3]
+    assert len(saves) == 1
+    assert tm.count_tasks("done") == 1
+
+
+def test_delete_where_updated_before_and_description(tmp_path):
+    """Test the updated_before and description_contains filters.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - updated_before compares against updatedAt
+        - description_contains is case-insensitive
+        - A timedelta cutoff is relative to now
+    """
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(
+                1, "todo", "2026-01-01T00:00:00", "2026-01-05T00:00:00", "Deploy API"
+            ),
+            seeded_task(
+                2, "todo", "2026-01-01T00:00:00", "2026-03-02T00:00:00", "deploy web"
+            ),
+            seeded_task(
+                3, "todo", "2026-01-01T00:00:00", "2026-01-02T00:00:00", "Write docs"
+            ),
+        ],
+    )
+
+    deleted = tm.delete_where(
+        updated_before="2026-02-01", description_contains="DEPLOY"
+    )
+    assert [t["id"] for t in deleted] == [1]
+
+    deleted = tm.delete_where(older_than=timedelta(days=1))
+    assert [t["id"] for t in deleted] == [2, 3]
+    assert tm.list_tasks() == []
+
+
+def test_delete_where_dry_run_and_validation(tmp_path):
+    """Test dry runs and invalid delete_where arguments.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A dry run returns matches without deleting them
+        - Calling with no filters raises ValueError
+        - Invalid status and timestamp values raise ValueError
+    """
+    tm = make_tm(tmp_path)
+    tm.add_task("Task 1")
+    tm.add_task("Task 2")
+
+    assert len(tm.delete_where(status="todo", dry_run=True)) == 2
+    assert len(tm.list_tasks()) == 2
+
+    with pytest.raises(ValueError, match="At least one filter"):
+        tm.delete_where()
+    with pytest.raises(ValueError, match="Invalid status filter"):
+        tm.delete_where(status="archived")
+    with pytest.raises(ValueError, match="Invalid timestamp"):
+        tm.delete_where(older_than="last tuesday")
+
+
+def test_list_tasks_sort_limit_offset(tmp_path):
+    """Test sorting, reversing, limiting and offsetting list_tasks results.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - sort_by orders by the field with id as tie-breaker
+        - reverse gives descending order
+        - limit/offset select the expected page, with or without a sort field
+        - Invalid arguments raise ValueError
+    """
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(1, "todo", "2026-01-03T00:00:00", "2026-01-03T00:00:00", "b"),
+            seeded_task(2, "done", "2026-01-01T00:00:00", "2026-01-04T00:00:00", "a"),
+            seeded_task(3, "todo", "2026-01-02T00:00:00", "2026-01-02T00:00:00", "c"),
+            seeded_task(4, "todo", "2026-01-02T00:00:00", "2026-01-01T00:00:00", "a"),
+        ],
+    )
+
+    assert [t["id"] for t in tm.list_tasks(sort_by="createdAt")] == [2, 3, 4, 1]
+    assert [t["id"] for t in tm.list_tasks(sort_by="description")] == [2, 4, 1, 3]
+    assert [
+        t["id"] for t in tm.list_tasks(sort_by="updatedAt", reverse=True, limit=2)
+    ] == [2, 1]
+    assert [t["id"] for t in tm.list_tasks(sort_by="createdAt", limit=2, offset=1)] == [
+        3,
+        4,
+    ]
+    assert [t["id"] for t in tm.list_tasks("todo", limit=2, offset=1)] == [3, 4]
+    assert [t["id"] for t in tm.list_tasks(reverse=True)] == [4, 3, 2, 1]
+
+    with pytest.raises(ValueError, match="Invalid sort field"):
+        tm.list_tasks(sort_by="status")
+    with pytest.raises(ValueError, match="Invalid limit"):
+        tm.list_tasks(limit=-1)
+
+
+def test_list_tasks_cursor_is_stable_across_changes(tmp_path):
+    """Test that cursor pagination doesn't skip or repeat tasks when the store changes.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The second page continues right after the first page
+        - Deleting a task from the first page doesn't shift the second page
+        - Cursors made for another sort field are rejected
+    """
+    tm = make_tm(tmp_path)
+    for i in range(1, 7):
+        tm.add_task(f"Task {i}")
+
+    page1 = tm.list_tasks(sort_by="id", reverse=True, limit=2)
+    assert [t["id"] for t in page1] == [6, 5]
+    cursor = tm.make_cursor(page1[-1], "id")
+
+    tm.delete_task(6)
+    tm.add_task("Task 7")
+
+    page2 = tm.list_tasks(sort_by="id", reverse=True, limit=2, cursor=cursor)
+    assert [t["id"] for t in page2] == [4, 3]
+
+    with pytest.raises(ValueError, match="Cursor was made for sort field"):
+        tm.list_tasks(sort_by="createdAt", cursor=cursor)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        tm.list_tasks(cursor="not-a-cursor")
+
+
+def test_search_uses_index_kept_up_to_date(tmp_path):
+    """Test that search results follow add, update and delete operations.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The index file is written next to the store
+        - Added, updated and deleted tasks are reflected in results
+        - A new instance reads the persisted index
+    """
+    tm = make_tm(tmp_path)
+    t1 = tm.add_task("Deploy API")
+    t2 = tm.add_task("Write docs")
+    assert [t["id"] for t in tm.search("deploy")] == [t1["id"]]
+    assert (tmp_path / "tasks.json.text.idx").exists()
+
+    tm.update_task(t2["id"], "Deploy docs site")
+    t3 = tm.add_task("Deploy web")
+    tm.delete_task(t1["id"])
+    tm.mark_done(t3["id"])
+
+    assert [t["id"] for t in tm.search("deploy")] == [t2["id"], t3["id"]]
+    assert [t["id"] for t in tm.search("deploy", status="done")] == [t3["id"]]
+
+    tm2 = make_tm(tmp_path)
+    assert tm2._load_index("text", tm2._store_signature()).search("deploy") == {
+        t2["id"],
+        t3["id"],
+    }
+    assert tm2.search("api") == []
+
+
+def test_search_decodes_only_matches(tmp_path, monkeypatch):
+    """Test that search reads only the matching tasks from the store.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to forbid parsing the whole store.
+
+    Asserts:
+        - Matches are returned in file order without calling _get_tasks
+        - The status filter applies to the decoded matches
+    """
+    tm = make_tm(tmp_path)
+    for i in range(20):
+        tm.add_task(f"Deploy service {i}" if i % 7 == 3 else f"Write note {i}")
+    tm.mark_done(11)
+    tm.search("deploy")
+
+    def fail():
+        raise AssertionError("store should not be parsed")
+
+    tm = make_tm(tmp_path)
+    monkeypatch.setattr(tm, "_get_tasks", fail)
+    assert [t["description"] for t in tm.search("deploy")] == [
+        "Deploy service 3",
+        "Deploy service 10",
+        "Deploy service 17",
+    ]
+    assert [t["id"] for t in tm.search("deploy", status="done")] == [11]
+
+
+def test_search_rebuilds_missing_or_stale_index(tmp_path):
+    """Test that the search index is rebuilt when missing or out of date.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A deleted index file is rebuilt
+        - Tasks added by editing the store directly are found
+        - Empty queries and invalid statuses raise ValueError
+    """
+    tm = make_tm(tmp_path)
+    tm.add_task("Deploy API")
+    tm.search("deploy")
+    (tmp_path / "tasks.json.text.idx").unlink()
+    assert len(make_tm(tmp_path).search("deploy")) == 1
+
+    tasks = json.loads((tmp_path / "tasks.json").read_text(encoding="utf-8"))
+    tasks.append(
+        seeded_task(
+            9, "todo", "2026-01-01T00:00:00", "2026-01-01T00:00:00", "Deploy manually"
+        )
+    )
+    (tmp_path / "tasks.json").write_text(json.dumps(tasks), encoding="utf-8")
+    assert [t["id"] for t in tm.search("deploy")] == [1, 9]
+
+    with pytest.raises(ValueError, match="cannot be empty"):
+        tm.search("  ")
+    with pytest.raises(ValueError, match="Invalid status filter"):
+        tm.search("deploy", status="archived")
+
+
+def test_saves_only_update_indexes_in_use(tmp_path, monkeypatch):
+    """Test that a save doesn't read the persisted indexes it hasn't loaded.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to detect index loads.
+
+    Asserts:
+        - Changes made by an instance that never used an index don't load it
+        - The index still gives correct results afterwards
+    """
+    tm = make_tm(tmp_path)
+    tm.add_task("Deploy API")
+    tm.add_task("Write docs")
+    tm.search("deploy")
+    tm.list_tasks(created_after="2020-01-01")
+
+    writer = make_tm(tmp_path)
+
+    def no_load(name, signature):
+        raise AssertionError(f"index {name} was loaded")
+
+    monkeypatch.setattr(writer, "_load_index", no_load)
+    writer.update_task(2, "Deploy docs")
+    writer.add_task("Deploy web")
+    writer.delete_task(1)
+    monkeypatch.undo()
+
+    assert [t["id"] for t in make_tm(tmp_path).search("deploy")] == [2, 3]
+    assert [t["id"] for t in tm.list_tasks(created_after="2020-01-01")] == [2, 3]
+
+
+def test_search_reads_only_the_query_terms(tmp_path, monkeypatch):
+    """Test that a cold search reads the query's postings, not the whole index.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to forbid loading the whole index.
+
+    Asserts:
+        - Exact, prefix, AND and OR queries match the full index
+        - Journaled changes are applied to the terms read
+        - The index is neither loaded nor kept in memory
+    """
+    tm = make_tm(tmp_path)
+    words = ["deploy", "deployment", "docs", "api", "web", "zeta", "alpha"]
+    for i in range(60):
+        tm.add_task(f"{words[i % 7]} {words[i * 3 % 7]} task{i}")
+    tm.search("deploy")
+    writer = make_tm(tmp_path)
+    writer.update_task(1, "alpha release")
+    writer.delete_task(2)
+    full = make_tm(tmp_path)._get_index("text")
+
+    def no_load(name, signature):
+        raise AssertionError(f"index {name} was loaded")
+
+    cold = make_tm(tmp_path)
+    monkeypatch.setattr(cold, "_load_index", no_load)
+    queries = [
+        "deploy",
+        "deploy*",
+        "api deployment",
+        "docs OR zeta",
+        "task1*",
+        "release",
+    ]
+    for query in queries:
+        found = [t["id"] for t in cold.search(query)]
+        assert found == sorted(full.search(query)) and found
+    assert cold.search("nope") == [] and cold.search("zz*") == []
+    assert [t["id"] for t in cold.search("release")] == [1]
+    assert "text" not in cold._indexes
+
+
+def test_index_changes_are_journaled(tmp_path):
+    """Test that saves append to index journals instead of rewriting indexes.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A change leaves the index data as it was and journals the change
+        - Loading applies the journal, and a long journal is compacted
+        - A journal out of step with the store is ignored and the index rebuilt
+    """
+    from task_manager import INDEX_JOURNAL_COMPACT
+
+    tm = make_tm(tmp_path)
+    tm.add_task("Deploy API")
+    tm.search("deploy")
+    path = tmp_path / "tasks.json.text.idx"
+    data = path.read_bytes().splitlines()[1:]
+
+    writer = make_tm(tmp_path)
+    writer.add_task("Deploy web")
+    writer.update_task(1, "Write docs")
+    lines = path.read_bytes().splitlines()
+    assert lines[1:-2] == data and len(lines) == len(data) + 3
+    assert json.loads(lines[0])["journal"] == 2
+    assert [t["id"] for t in make_tm(tmp_path).search("deploy")] == [2]
+    assert [t["id"] for t in tm.search("deploy")] == [2]
+
+    for i in range(INDEX_JOURNAL_COMPACT):
+        writer.add_task(f"Deploy {i}")
+    assert len(make_tm(tmp_path).search("deploy")) == INDEX_JOURNAL_COMPACT + 1
+    assert json.loads(path.read_bytes().splitlines()[0])["journal"] == 0
+
+    writer.add_task("Deploy again")
+    lines = path.read_bytes().splitlines()
+    path.write_bytes(b"\n".join(lines[:-1]) + b"\n")  # as if the change was lost
+    assert len(make_tm(tmp_path).search("deploy")) == INDEX_JOURNAL_COMPACT + 2
+
+
+def test_list_tasks_time_range_filters(tmp_path):
+    """Test created/updated time-range filters on list_tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Ranges are inclusive at the start and exclusive at the end
+        - createdAt and updatedAt ranges combine with each other and with status
+        - Results follow later updates through the time index
+        - Invalid bounds raise ValueError
+    """
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(1, "todo", "2026-01-01T00:00:00", "2026-01-05T00:00:00"),
+            seeded_task(2, "done", "2026-01-02T00:00:00", "2026-01-02T00:00:00"),
+            seeded_task(3, "todo", "2026-01-03T00:00:00", "2026-01-03T00:00:00"),
+        ],
+    )
+
+    def ids(tasks):
+        return [t["id"] for t in tasks]
+
+    assert ids(
+        tm.list_tasks(created_after="2026-01-02", created_before="2026-01-03")
+    ) == [2]
+    assert ids(tm.list_tasks(updated_after="2026-01-03")) == [1, 3]
+    assert ids(
+        tm.list_tasks(created_before="2026-01-03", updated_after="2026-01-03")
+    ) == [1]
+    assert ids(tm.list_tasks("todo", created_after="2026-01-02")) == [3]
+
+    tm.mark_done(2)
+    assert ids(tm.list_tasks(updated_after=timedelta(minutes=5))) == [2]
+    assert ids(
+        tm.list_tasks(updated_after="2026-01-04", sort_by="updatedAt", reverse=True)
+    ) == [2, 1]
+
+    with pytest.raises(ValueError, match="Invalid timestamp"):
+        tm.list_tasks(created_after="yesterday")
+
+
+def test_list_tasks_time_range_decodes_only_matches(tmp_path, monkeypatch):
+    """Test that a time-range listing reads only the tasks in range.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to forbid parsing the whole store.
+
+    Asserts:
+        - Tasks in range are returned in file order without calling _get_tasks
+        - Ranges combine with tags and the status filter
+    """
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(
+                i, "todo", f"2026-01-{i:02d}T00:00:00", f"2026-01-{i:02d}T00:00:00"
+            )
+            for i in range(1, 21)
+        ],
+    )
+    tm.update_task(5, tags=["ops"])
+    tm.mark_done(6)
+    tm.list_tasks(created_after="2026-01-01", tags=["ops"])
+
+    def fail():
+        raise AssertionError("store should not be parsed")
+
+    tm = make_tm(tmp_path)
+    monkeypatch.setattr(tm, "_get_tasks", fail)
+
+    def ids(tasks):
+        return [t["id"] for t in tasks]
+
+    assert ids(
+        tm.list_tasks(created_after="2026-01-04", created_before="2026-01-07")
+    ) == [4, 5, 6]
+    assert ids(
+        tm.list_tasks("todo", created_after="2026-01-04", created_before="2026-01-07")
+    ) == [4, 5]
+    assert ids(tm.list_tasks(tags=["ops"], created_before="2026-01-07")) == [5]
+
+
+def test_list_tasks_where_query(tmp_path):
+    """Test list_tasks with a where query combined with other filters.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The query filters tasks and keeps file order
+        - where combines with status, sorting and limits
+        - Results follow later mutations through the indexes
+    """
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(
+                1, "todo", "2026-09-01T00:00:00", "2026-10-02T00:00:00", "Deploy API"
+            ),
+            seeded_task(
+                2,
+                "in-progress",
+                "2026-09-02T00:00:00",
+                "2026-09-20T00:00:00",
+                "Deploy web",
+            ),
+            seeded_task(
+                3, "done", "2026-09-03T00:00:00", "2026-10-05T00:00:00", "Deploy docs"
+            ),
+            seeded_task(
+                4, "todo", "2026-09-04T00:00:00", "2026-10-06T00:00:00", "Write docs"
+            ),
+        ],
+    )
+    where = (
+        "status in (todo, in-progress) and description ~ 'deploy' "
+        "and updatedAt > 2026-10-01"
+    )
+
+    def ids(tasks):
+        return [t["id"] for t in tasks]
+
+    assert ids(tm.list_tasks(where=where)) == [1]
+    assert ids(
+        tm.list_tasks(where="description ~ docs or id = 2", sort_by="id", reverse=True)
+    ) == [4, 3, 2]
+    assert ids(tm.list_tasks("done", where="description ~ deploy")) == [3]
+
+    tm.mark_in_progress(2)
+    tm.update_task(4, "Deploy everything")
+    assert ids(tm.list_tasks(where=where)) == [1, 2, 4]
+
+
+def test_list_tasks_where_decodes_only_candidates(tmp_path, monkeypatch):
+    """Test that an indexed where query reads only the plan's candidates.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to forbid parsing the whole store.
+
+    Asserts:
+        - Text, status and time plans return matches without calling _get_tasks
+        - Other filters narrow the candidates
+        - A query no index answers still scans the store
+    """
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(
+                i,
+                "todo",
+                f"2026-01-{i:02d}T00:00:00",
+                f"2026-01-{i:02d}T00:00:00",
+                "Deploy API" if i % 5 == 0 else f"Note {i}",
+            )
+            for i in range(1, 21)
+        ],
+    )
+    tm.mark_done(10)
+    tm.update_task(15, tags=["ops"])
+    for where in ("description ~ 'deploy'", "status = done", "createdAt < 2026-01-02"):
+        tm.list_tasks(where=where, tags=["ops"])
+
+    def fail():
+        raise AssertionError("store should not be parsed")
+
+    tm = make_tm(tmp_path)
+    monkeypatch.setattr(tm, "_get_tasks", fail)
+
+    def ids(tasks):
+        return [t["id"] for t in tasks]
+
+    assert ids(tm.list_tasks(where="description ~ 'deploy'")) == [5, 10, 15, 20]
+    assert ids(tm.list_tasks(where="status = done")) == [10]
+    assert ids(
+        tm.list_tasks(where="createdAt < 2026-01-03 and description ~ 'note'")
+    ) == [1, 2]
+    assert ids(tm.list_tasks(where="description ~ 'deploy'", tags=["ops"])) == [15]
+    with pytest.raises(AssertionError, match="should not be parsed"):
+        tm.list_tasks(where="status != done")
+
+
+def test_explain_query_picks_most_selective_index(tmp_path):
+    """Test that the planner picks the index with the fewest candidates.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A rare description term picks the text index
+        - A narrow time range picks the time index
+        - A rare status picks the status index
+        - Queries with no usable index fall back to a full scan
+    """
+    tasks = [
+        seeded_task(
+            i,
+            "done" if i == 7 else "todo",
+            f"2026-09-{i:02d}T00:00:00",
+            f"2026-10-{i:02d}T00:00:00",
+            "Release" if i == 3 else f"Chore {i}",
+        )
+        for i in range(1, 21)
+    ]
+    tm = write_tasks_file(tmp_path, tasks)
+
+    plan = tm.explain_query("status = todo and description ~ release")
+    assert (plan["access"], plan["candidates"], plan["total"]) == ("text index", 1, 20)
+    assert plan["condition"] == "description ~ 'release'"
+
+    plan = tm.explain_query("status = todo and updatedAt >= 2026-10-19")
+    assert (plan["access"], plan["candidates"]) == ("time index", 2)
+
+    plan = tm.explain_query("status = done and createdAt > 2026-09-01")
+    assert (plan["access"], plan["candidates"]) == ("status index", 1)
+    assert len(plan["alternatives"]) == 3
+
+    plan = tm.explain_query("status = done or id = 3")
+    assert (plan["access"], plan["candidates"]) == ("full scan", 20)
+    assert [t["id"] for t in tm.list_tasks(where="status = done or id = 3")] == [3, 7]
+
+    with pytest.raises(ValueError, match="Invalid query field"):
+        tm.explain_query("owner = me")
+
+
+def test_snapshot_cache_is_used_while_fresh(tmp_path, monkeypatch):
+    """Test that a fresh snapshot is loaded instead of parsing the JSON.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to forbid JSON parsing.
+
+    Asserts:
+        - Saving writes the snapshot next to the store
+        - A new instance loads the tasks without calling json.load
+        - The store itself is still plain JSON
+    """
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path, snapshot_cache=True)
+    tm.add_task("Buy milk")
+    tm.add_task("Buy eggs")
+    assert (tmp_path / "tasks.json.cache").exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("JSON should not be parsed")
+
+    monkeypatch.setattr(json, "load", fail)
+    tasks = TaskManager(path, snapshot_cache=True)._get_tasks()
+    assert [t["description"] for t in tasks] == ["Buy milk", "Buy eggs"]
+    monkeypatch.undo()
+
+    assert len(json.loads((tmp_path / "tasks.json").read_text(encoding="utf-8"))) == 2
+
+
+def test_snapshot_cache_falls_back_when_stale(tmp_path):
+    """Test that stale or corrupt snapshots are ignored and rewritten.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A store edited by hand is parsed from JSON, not the snapshot
+        - The snapshot is rewritten after that load
+        - A touched but unchanged store still uses the snapshot (digest check)
+        - A corrupt snapshot falls back to JSON
+    """
+    path = tmp_path / "tasks.json"
+    tm = TaskManager(str(path), snapshot_cache=True)
+    tm.add_task("Buy milk")
+
+    path.write_text(
+        json.dumps(
+            [seeded_task(5, "done", "2026-01-01T00:00:00", "2026-01-01T00:00:00")]
+        ),
+        encoding="utf-8",
+    )
+    assert [t["id"] for t in tm._get_tasks()] == [5]
+    assert tm._load_snapshot() == tm._get_tasks()
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert tm._load_snapshot() is not None
+
+    (tmp_path / "tasks.json.cache").write_bytes(b"garbage")
+    assert tm._load_snapshot() is None
+    assert [t["id"] for t in tm._get_tasks()] == [5]
+
+
+def test_report_uses_persisted_columns(tmp_path, monkeypatch):
+    """Test that report() reads the persisted columnar view of an unchanged store.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to forbid loading the tasks.
+
+    Asserts:
+        - The report covers the requested days, with created and done counts
+        - The columns are written to tasks.json.columns and reused by a new instance
+        - A change to the store makes the columns rebuild
+        - A non-positive number of days is rejected
+    """
+    from datetime import date
+
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(1, "done", "2026-10-01T09:00:00", "2026-10-02T09:00:00"),
+            seeded_task(2, "todo", "2026-10-02T10:00:00", "2026-10-02T10:00:00"),
+        ],
+    )
+    report = tm.report(days=3, today=date(2026, 10, 3))
+    assert report["count"] == 2
+    assert report["statusCounts"] == {"todo": 1, "done": 1}
+    assert report["days"] == [
+        (date(2026, 10, 1), 1, 0),
+        (date(2026, 10, 2), 1, 1),
+        (date(2026, 10, 3), 0, 0),
+    ]
+    assert report["cycleTime"]["mean"] == 86400
+    assert (tmp_path / "tasks.json.columns").exists()
+
+    monkeypatch.setattr(
+        TaskManager,
+        "_get_tasks",
+        lambda self: pytest.fail("store should not be loaded"),
+    )
+    assert make_tm(tmp_path).report(days=3, today=date(2026, 10, 3)) == report
+    monkeypatch.undo()
+
+    tm.mark_done(2)
+    assert tm.report()["statusCounts"] == {"done": 2}
+    with pytest.raises(ValueError, match="Invalid number of days: 0"):
+        tm.report(days=0)
+
+
+def test_epoch_timestamps_store_and_query(tmp_path):
+    """Test a store created with epoch-millisecond timestamps.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - New tasks get integer createdAt/updatedAt in the file
+        - Time filters, where queries and time sorts compare integers
+        - The header records the representation, so a TaskManager opened
+          without the option keeps writing integers
+    """
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path, epoch_timestamps=True)
+    first = tm.add_task("Buy milk")
+    tm.add_task("Buy eggs")
+    assert isinstance(first["createdAt"], int)
+    assert isinstance(
+        json.loads((tmp_path / "tasks.json").read_text(encoding="utf-8"))[0][
+            "updatedAt"
+        ],
+        int,
+    )
+
+    assert len(tm.list_tasks(created_after="1h")) == 2
+    assert tm.list_tasks(created_before="2000-01-01") == []
+    assert len(tm.list_tasks(where="updatedAt > 2000-01-01 and status = todo")) == 2
+    assert [t["id"] for t in tm.list_tasks(sort_by="createdAt", reverse=True)][-1] == 1
+
+    other = make_tm(tmp_path)
+    assert other.summary()["count"] == 2
+    assert isinstance(other.mark_done(1)["updatedAt"], int)
+
+
+def test_migrate_timestamps_streams_and_round_trips(tmp_path, monkeypatch):
+    """Test converting an ISO store to epoch milliseconds and back.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to shrink the streaming chunk size.
+
+    Asserts:
+        - The store is read in small chunks without loading it whole
+        - Timestamps become integers and filters keep working
+        - Converting back gives a byte-identical file
+        - The header is rebuilt from the same pass
+        - Compressed stores are migrated too
+    """
+    import task_manager
+
+    monkeypatch.setattr(task_manager, "STREAM_CHUNK_CHARS", 37)
+    monkeypatch.setattr(
+        TaskManager, "_get_tasks", lambda self: pytest.fail("store should be streamed")
+    )
+    tm = write_tasks_file(
+        tmp_path,
+        [
+            seeded_task(
+                1, "done", "2026-01-01T09:00:00", "2026-01-02T09:00:00", 'Say "hi"'
+            ),
+            seeded_task(3, "todo", "2026-03-01T10:00:00", "2026-03-01T10:00:00"),
+        ],
+    )
+    original = (tmp_path / "tasks.json").read_text(encoding="utf-8")
+
+    assert tm.migrate_timestamps(epoch_ms=True) == 2
+    assert tm.summary() == {
+        "count": 2,
+        "statusCounts": {"done": 1, "in-progress": 0, "todo": 1},
+        "nextId": 4,
+        "seq": 1,
+    }
+    monkeypatch.undo()
+
+    tasks = tm.list_tasks()
+    assert tasks[0]["createdAt"] == task_manager.iso_to_epoch_ms("2026-01-01T09:00:00")
+    assert [t["id"] for t in tm.list_tasks(created_after="2026-02-01")] == [3]
+
+    tm._save_tasks(tm._get_tasks())  # the indented layout written by a normal save
+    tm.migrate_timestamps(epoch_ms=False)
+    assert json.loads(
+        (tmp_path / "tasks.json").read_text(encoding="utf-8")
+    ) == json.loads(original)
+    tm._save_tasks(tm._get_tasks())
+    saved = (tmp_path / "tasks.json").read_text(encoding="utf-8")
+    tm.migrate_timestamps(epoch_ms=True)
+    tm.migrate_timestamps(epoch_ms=False)
+    assert (tmp_path / "tasks.json").read_text(encoding="utf-8") == saved
+
+    gz = TaskManager(str(tmp_path / "tasks.json.gz"))
+    gz.add_task("Compressed")
+    assert gz.migrate_timestamps() == 1
+    assert isinstance(gz.list_tasks()[0]["createdAt"], int)
+
+
+def test_batch_saves_once_and_keeps_indexes_in_sync(tmp_path):
+    """Test that changes inside batch() are written with a single save.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The store is not written until the batch ends
+        - Reads inside the batch see the pending changes
+        - The sequence number goes up by one for the whole batch
+        - The persisted text index reflects only the final versions of tasks
+    """
+    tm = make_tm(tmp_path)
+    tm.add_task("Draft notes")
+    tm.add_task("Old name")
+    assert tm.search("old") != []
+    seq = tm.summary()["seq"]
+    before = (tmp_path / "tasks.json").read_text(encoding="utf-8")
+
+    with tm.batch():
+        tm.add_task("Temporary")
+        tm.update_task(2, "New name")
+        tm.delete_task(3)
+        tm.mark_done(1)
+        added = tm.add_task("Ship release")
+        assert (tmp_path / "tasks.json").read_text(encoding="utf-8") == before
+        assert tm.count_tasks() == 3
+        assert tm.count_tasks("done") == 1
+
+    assert added["id"] == 3
+    assert tm.summary()["seq"] == seq + 1
+    fresh = make_tm(tmp_path)
+    assert [t["description"] for t in fresh.list_tasks()] == [
+        "Draft notes",
+        "New name",
+        "Ship release",
+    ]
+    assert fresh.search("old") == []
+    assert fresh.search("temporary") == []
+    assert [t["id"] for t in fresh.search("name")] == [2]
+
+
+def test_store_tag_changes_with_the_store(tmp_path):
+    """Test that store_tag() identifies the state of the store.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The tag is stable while the store is unchanged
+        - Saving a change gives a new tag
+    """
+    tm = make_tm(tmp_path)
+    tm.add_task("Buy milk")
+    tag = tm.store_tag()
+    assert make_tm(tmp_path).store_tag() == tag
+    tm.mark_done(1)
+    assert tm.store_tag() != tag
+
+
+def test_get_task_decodes_one_task(tmp_path, monkeypatch):
+    """Test getting one task by id, and the error for a missing task.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture to make full reads fail.
+
+    Asserts:
+        - get_task returns the task without reading the task list
+        - A missing id gives None
+        - Changing a missing task raises TaskNotFound, a ValueError with the id
+    """
+    tm = make_tm(tmp_path)
+    for description in ("Buy milk", "Walk dog", "Water plants", "Call mom"):
+        tm.add_task(description)
+
+    def fail():
+        raise AssertionError("store was parsed")
+
+    fresh = make_tm(tmp_path)
+    monkeypatch.setattr(fresh, "_read_tasks", fail)
+    assert fresh.get_task(2)["description"] == "Walk dog"
+    assert fresh.get_task(9) is None
+    with pytest.raises(TaskNotFound, match="Task with id 9 not found.") as e:
+        fresh.mark_done(9)
+    assert e.value.task_id == 9
+    assert isinstance(e.value, ValueError)
+
+
+def test_versions_and_expected_version(tmp_path):
+    """Test per-task versions and compare-and-swap changes.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - New tasks are version 1 and each change increases the version
+        - A change with the current expected_version succeeds
+        - A stale expected_version raises VersionConflict carrying the current task
+        - Tasks stored without a version count as version 1
+        - The generation increases with every save
+    """
+    tm = make_tm(tmp_path)
+    assert tm.add_task("Buy milk")["version"] == 1
+    generation = tm.generation()
+    assert tm.update_task(1, "Buy oat milk", expected_version=1)["version"] == 2
+    assert tm.generation() == generation + 1
+
+    with pytest.raises(
+        VersionConflict, match="Task 1 has version 2, expected 1."
+    ) as exc:
+        tm.mark_done(1, expected_version=1)
+    assert exc.value.current["description"] == "Buy oat milk"
+    assert tm.list_tasks()[0]["status"] == "todo"
+    with pytest.raises(VersionConflict):
+        tm.delete_task(1, expected_version=5)
+
+    assert tm.mark_done(1, expected_version=2)["version"] == 3
+    assert tm.delete_task(1, expected_version=3)["id"] == 1
+
+    legacy = [
+        {
+            "id": 1,
+            "description": "Old",
+            "status": "todo",
+            "createdAt": "2026-01-01T00:00:00",
+            "updatedAt": "2026-01-01T00:00:00",
+        }
+    ]
+    (tmp_path / "tasks.json").write_text(json.dumps(legacy), encoding="utf-8")
+    assert make_tm(tmp_path).mark_in_progress(1, expected_version=1)["version"] == 2
+
+
+def test_concurrent_writers_keep_every_change(tmp_path):
+    """Test that writers in several threads, each with a TaskManager, lose no changes.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Every add from every writer is in the store, with distinct ids
+        - A reader without the lock never sees a partial or empty store
+        - A stale compare-and-swap fails while a fresh one on another task succeeds
+        - A store that isn't valid JSON raises ValueError; an empty one is empty
+    """
+
+    def writer(n: int) -> None:
+        tm = make_tm(tmp_path)
+        for i in range(20):
+            tm.add_task(f"Writer {n} task {i}")
+
+    seen_counts = []
+
+    def reader() -> None:
+        tm = make_tm(tmp_path)
+        while any(t.is_alive() for t in threads):
+            seen_counts.append(len(tm.list_tasks()))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    watcher = threading.Thread(target=reader)
+    watcher.start()
+    for t in threads:
+        t.join()
+    watcher.join()
+
+    tasks = make_tm(tmp_path).list_tasks()
+    assert len(tasks) == 80
+    assert sorted(t["id"] for t in tasks) == list(range(1, 81))
+    assert seen_counts == sorted(seen_counts)
+
+    a, b = make_tm(tmp_path), make_tm(tmp_path)
+    seen = a.list_tasks()[:2]
+    b.update_task(1, "Changed by b")
+    with pytest.raises(VersionConflict):
+        a.update_task(1, "Changed by a", expected_version=seen[0]["version"])
+    a.mark_done(2, expected_version=seen[1]["version"])
+    assert [t["description"] for t in b.list_tasks()[:1]] == ["Changed by b"]
+    assert b.list_tasks()[1]["status"] == "done"
+
+    (tmp_path / "tasks.json").write_text('[{"id": 1', encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid JSON"):
+        make_tm(tmp_path).list_tasks()
+    (tmp_path / "tasks.json").write_text("  \n", encoding="utf-8")
+    assert make_tm(tmp_path).list_tasks() == []
+
+
+def test_snapshot_is_stable_and_copy_on_write(tmp_path):
+    """Test immutable snapshots of the store.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - While the store is unchanged, the same snapshot is returned
+        - A snapshot doesn't see later changes, made here or by another TaskManager
+        - The next snapshot shares the tasks that didn't change
+        - Mutating the list returned by list_tasks() inside a batch doesn't drop changes
+        - Mutating a task returned inside a batch doesn't change the pending task
+        - An invalid status filter is rejected before the store is read
+    """
+    tm = make_tm(tmp_path)
+    tm.add_task("Buy milk")
+    tm.add_task("Walk dog")
+    snap = tm.snapshot()
+    assert tm.snapshot() is snap
+    assert snap.generation == tm.generation()
+
+    tm.mark_done(1)
+    after = tm.snapshot()
+    assert snap[0]["status"] == "todo"
+    assert after[0]["status"] == "done" and after[0]["version"] == 2
+    assert after[1] is snap[1]
+    assert after.generation == snap.generation + 1
+
+    make_tm(tmp_path).update_task(2, "Walk the dog")
+    latest = tm.snapshot()
+    assert after[1]["description"] == "Walk dog"
+    assert latest.get(2)["description"] == "Walk the dog"
+
+    with tm.batch():
+        tm.add_task("Water plants")
+        tm.list_tasks().clear()
+        tm.list_tasks()[2]["status"] = "done"
+        tm.list_tasks(status="todo")[0]["description"] = "Changed"
+    assert len(tm.list_tasks()) == 3
+    assert tm.list_tasks()[2]["status"] == "todo"
+    assert tm.list_tasks()[2]["description"] == "Water plants"
+
+    (tmp_path / "tasks.json").write_text("not json", encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid status filter: blocked"):
+        tm.list_tasks(status="blocked")
+
+
+def test_point_changes_splice_one_task(tmp_path, monkeypatch):
+    """Test that point changes rewrite one task without parsing the store.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture to make full reads fail.
+
+    Asserts:
+        - mark_done, mark_in_progress, update_task and delete_task don't read the
+          task list
+        - The store is byte-for-byte what a full save would write
+        - The header counts, next id and indexes follow the changes
+        - A change whose write fails leaves the store as it was
+        - Deleting the last task leaves an empty list
+    """
+    tm = make_tm(tmp_path)
+    for description in ("Buy milk", "Walk dog", "Deploy café ☕", "Water plants"):
+        tm.add_task(description)
+    tm.search("milk")
+
+    def fail():
+        raise AssertionError("store was parsed")
+
+    fresh = make_tm(tmp_path)
+    monkeypatch.setattr(fresh, "_read_tasks", fail)
+    assert fresh.mark_done(2)["status"] == "done"
+    assert fresh.mark_in_progress(1)["version"] == 2
+    assert fresh.update_task(3, "Deploy API v2")["description"] == "Deploy API v2"
+    assert fresh.delete_task(4)["id"] == 4
+    assert fresh.delete_task(1)["id"] == 1
+    with pytest.raises(VersionConflict):
+        fresh.mark_done(2, expected_version=1)
+    with pytest.raises(ValueError, match="Task with id 9 not found."):
+        fresh.mark_done(9)
+    assert fresh.summary() == {
+        "count": 2,
+        "statusCounts": {"done": 1, "in-progress": 0, "todo": 1},
+        "nextId": 4,
+        "seq": 9,
+    }
+    monkeypatch.undo()
+
+    tasks = make_tm(tmp_path).list_tasks()
+    assert (tmp_path / "tasks.json").read_text(encoding="utf-8") == json.dumps(
+        tasks, indent=2
+    )
+    assert [t["id"] for t in fresh.search("deploy")] == [3]
+    assert fresh.search("milk") == []
+
+    before = (tmp_path / "tasks.json").read_bytes()
+    (tmp_path / "tasks.json.tmp").mkdir()
+    with pytest.raises(ValueError, match="Failed to save"):
+        fresh.update_task(2, "Walk the dog twice")
+    (tmp_path / "tasks.json.tmp").rmdir()
+    assert (tmp_path / "tasks.json").read_bytes() == before
+
+    fresh.delete_task(2)
+    fresh.delete_task(3)
+    assert (tmp_path / "tasks.json").read_text(encoding="utf-8") == "[]"
+    assert fresh.add_task("Start over")["id"] == 1
+
+
+def test_write_behind_flushes_in_background(tmp_path):
+    """Test write-behind mode: changes in memory, saved later in one go.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Changes are visible to the writer at once but not in the store until flushed
+        - flush() saves every pending change in one save and releases the lock
+        - flush_ops pending changes wake the flusher thread
+        - sync=True saves before returning
+        - After close() changes are saved synchronously
+    """
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path, write_behind=True, flush_interval=60, flush_ops=3)
+    tm.add_task("Buy milk")
+    tm.add_task("Walk dog")
+    assert [t["id"] for t in tm.list_tasks()] == [1, 2]
+    assert tm.count_tasks() == 2
+    assert TaskManager(path).list_tasks() == []
+
+    tm.flush()
+    assert TaskManager(path).summary()["seq"] == 1
+    other = threading.Thread(target=TaskManager(path).mark_done, args=(2,))
+    other.start()
+    other.join(timeout=5)
+    assert not other.is_alive()
+
+    for i in range(3):
+        tm.add_task(f"Task {i}")
+    for _ in range(100):
+        if TaskManager(path).count_tasks() == 5:
+            break
+        sleep(0.02)
+    assert TaskManager(path).count_tasks() == 5
+    assert TaskManager(path).list_tasks()[1]["status"] == "done"
+
+    tm.mark_done(1, sync=True)
+    assert TaskManager(path).list_tasks()[0]["status"] == "done"
+
+    tm.close()
+    tm.add_task("Water plants")
+    assert TaskManager(path).count_tasks() == 6
+    with pytest.raises(ValueError, match="Invalid flush interval"):
+        TaskManager(path, flush_interval=0)
+
+
+def test_write_behind_flushes_at_exit(tmp_path):
+    """Test that pending write-behind changes are saved when the interpreter exits.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A process that never calls flush() or close() still saves its changes
+    """
+    path = str(tmp_path / "tasks.json")
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from task_manager import TaskManager;"
+        "tm = TaskManager(sys.argv[2], write_behind=True, flush_interval=60);"
+        "[tm.add_task(f'Task {i}') for i in range(10)]"
+    )
+    root = str(Path(__file__).resolve().parents[2])
+    subprocess.run([sys.executable, "-c", script, root, path], check=True, timeout=30)
+    assert [t["id"] for t in TaskManager(path).list_tasks()] == list(range(1, 11))
+
+
+def test_priority_due_and_next_tasks(tmp_path):
+    """Test priority and due fields and picking the next tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - priority and due are stored only when set, and can be cleared
+        - Invalid values raise ValueError
+        - next_tasks ranks by priority then due date and skips done tasks
+        - The heap follows later changes, including in-place ones
+    """
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path)
+    assert "priority" not in tm.add_task("Buy milk")
+    tm.add_task("Ship release", priority=3, due="2026-10-20")
+    tm.add_task("Pay rent", due="2026-10-01")
+    tm.add_task("Fix outage", priority=3, due="2026-10-19")
+
+    with pytest.raises(ValueError, match="Invalid priority"):
+        tm.add_task("Bad", priority=-1)
+    with pytest.raises(ValueError, match="Invalid due date"):
+        tm.update_task(1, due="next week")
+    with pytest.raises(ValueError, match="Nothing to update"):
+        tm.update_task(1)
+
+    assert [t["id"] for t in tm.next_tasks(3)] == [4, 2, 3]
+    tm.mark_done(4)
+    updated = tm.update_task(1, priority=5)
+    assert updated["description"] == "Buy milk" and updated["priority"] == 5
+    assert [t["id"] for t in TaskManager(path).next_tasks(10)] == [1, 2, 3]
+
+    cleared = tm.update_task(2, "Ship release v2", priority=0, due="")
+    assert "priority" not in cleared and "due" not in cleared
+    assert [t["id"] for t in tm.next_tasks(10)] == [1, 3, 2]
+    with pytest.raises(ValueError, match="Invalid count"):
+        tm.next_tasks(0)
+
+
+def test_tags_filter_and_stay_indexed(tmp_path):
+    """Test tagging tasks and listing them by tag.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Tags are stored sorted without duplicates, and only when present
+        - list_tasks filters with all-of and any-of tags, alone or with status
+        - tag_task, untag_task, update_task and delete_task keep the index current
+        - Invalid tags raise ValueError
+    """
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path)
+    assert tm.add_task("Fix login", tags=["sev1", "api", "api"])["tags"] == [
+        "api",
+        "sev1",
+    ]
+    tm.add_task("Restyle page", tags=["web"])
+    tm.add_task("Buy milk")
+    assert "tags" not in tm.list_tasks()[2]
+
+    assert [t["id"] for t in tm.list_tasks(tags=["api", "sev1"])] == [1]
+    tm.tag_task(2, ["sev1"])
+    assert [t["id"] for t in tm.list_tasks(any_tags=["api", "web"])] == [1, 2]
+    assert [
+        t["id"] for t in TaskManager(path).list_tasks(tags=["sev1"], status="todo")
+    ] == [1, 2]
+
+    assert "tags" not in tm.untag_task(1, ["api", "sev1"])
+    tm.update_task(3, tags=["api"])
+    tm.delete_task(2)
+    assert [t["id"] for t in tm.list_tasks(any_tags=["api", "sev1"])] == [3]
+    assert tm.list_tasks(tags=["web"]) == []
+
+    with pytest.raises(ValueError, match="Invalid tag"):
+        tm.tag_task(3, ["two words"])
+    with pytest.raises(ValueError, match="No tags given"):
+        tm.untag_task(3, [])
+
+
+def test_dependencies_and_ready_tasks(tmp_path):
+    """Test blocking tasks on others and listing the ready ones.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - block_task stores sorted blocker ids in dependsOn
+        - Links to missing tasks and links that close a cycle are refused
+        - list_tasks(ready=True) follows mark_done, unblock_task and delete_task
+        - ready combines with other filters
+    """
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path)
+    for description in ("Build", "Test", "Release", "Announce"):
+        tm.add_task(description, tags=["release"] if description != "Build" else None)
+    assert tm.block_task(3, [2, 1])["dependsOn"] == [1, 2]
+    tm.block_task(2, [1])
+    tm.block_task(4, [3])
+
+    with pytest.raises(ValueError, match="dependency cycle 1 -> 4 -> 3 -> 1"):
+        tm.block_task(1, [4])
+    with pytest.raises(ValueError, match="Task with id 9 not found"):
+        tm.block_task(1, [9])
+    with pytest.raises(ValueError, match="dependency cycle 2 -> 2"):
+        tm.block_task(2, [2])
+
+    assert [t["id"] for t in tm.list_tasks(ready=True)] == [1]
+    tm.mark_done(1)
+    assert [t["id"] for t in tm.list_tasks(ready=True)] == [2]
+    tm.unblock_task(3, [2])
+    assert [t["id"] for t in TaskManager(path).list_tasks(ready=True)] == [2, 3]
+    assert [
+        t["id"] for t in tm.list_tasks(ready=True, tags=["release"], status="todo")
+    ] == [2, 3]
+
+    tm.delete_task(3)
+    assert [t["id"] for t in tm.list_tasks(ready=True)] == [2, 4]
+    assert "dependsOn" not in tm.unblock_task(4, [3])
+
+
+def test_deleted_blockers_are_unlinked(tmp_path):
+    """Test that deleting a blocker removes it from its dependents.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - delete_task drops the id from dependsOn, so a new task reusing the id
+          blocks nothing
+        - delete_where unlinks every purged task and bumps the dependents' versions
+        - The unlinked tasks are stored, and a reloaded manager agrees
+        - In write-behind mode deletes in a linked store stay pending, and the
+          dependents are still unlinked when they are saved
+    """
+
+    def get(manager, task_id):
+        return next(t for t in manager.list_tasks() if t["id"] == task_id)
+
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path)
+    tm.add_task("Blocked")
+    tm.add_task("Blocker")
+    tm.block_task(1, [2])
+    tm.delete_task(2)
+    assert tm.add_task("New unrelated")["id"] == 2
+    assert [t["id"] for t in tm.list_tasks(ready=True)] == [1, 2]
+    assert "dependsOn" not in get(tm, 1)
+
+    tm.add_task("Old one")
+    tm.add_task("Old two")
+    tm.add_task("Waits")
+    tm.block_task(5, [1, 3, 4])
+    version = get(tm, 5)["version"]
+    assert [t["id"] for t in tm.delete_where(description_contains="Old")] == [3, 4]
+    task = get(tm, 5)
+    assert task["dependsOn"] == [1]
+    assert task["version"] == version + 1
+    assert get(TaskManager(path), 5)["dependsOn"] == [1]
+    assert [t["id"] for t in TaskManager(path).list_tasks(ready=True)] == [1, 2]
+
+    behind = TaskManager(path, write_behind=True, flush_interval=60)
+    behind.delete_task(2)
+    behind.delete_task(1)
+    assert TaskManager(path).count_tasks() == 3
+    assert "dependsOn" not in get(behind, 5)
+    behind.close()
+    assert [t["id"] for t in TaskManager(path).list_tasks(ready=True)] == [5]
+
+
+def test_namespaces_have_own_ids_and_files(tmp_path):
+    """Test named task lists in one store, listing them and moving tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Each list has its own ids and its own store file and header
+        - Changing one list leaves the other lists' files untouched
+        - lists() reports every list with its counts
+        - move_task gives the task the next id of the target list and drops its
+          dependencies
+        - Invalid list names and moves to the same list raise ValueError
+    """
+    path = str(tmp_path / "tasks.json")
+    default = TaskManager(path)
+    ops = TaskManager(path, namespace="ops")
+    default.add_task("Buy milk")
+    default.add_task("Walk dog")
+    assert ops.add_task("Rotate keys")["id"] == 1
+    assert ops.path == str(tmp_path / "tasks.json.lists" / "ops" / "tasks.json")
+
+    stamp = os.stat(path).st_mtime_ns
+    ops.mark_done(1)
+    assert os.stat(path).st_mtime_ns == stamp
+    assert [t["description"] for t in default.list_tasks()] == ["Buy milk", "Walk dog"]
+
+    default.block_task(2, [1])
+    moved = default.move_task(2, "ops")
+    assert moved["id"] == 2 and moved["version"] == 1 and "dependsOn" not in moved
+    assert [t["id"] for t in default.list_tasks()] == [1]
+    assert [
+        t["description"] for t in TaskManager(path, namespace="ops").list_tasks()
+    ] == ["Rotate keys", "Walk dog"]
+
+    default.move_task(1, "home")
+    assert [(info["name"], info["count"]) for info in ops.lists()] == [
+        ("default", 0),
+        ("home", 1),
+        ("ops", 2),
+    ]
+
+    with pytest.raises(ValueError, match="Invalid list name"):
+        TaskManager(path, namespace="../x")
+    with pytest.raises(ValueError, match="already in list ops"):
+        ops.move_task(1, "ops")
+
+
+def test_opposite_moves_do_not_deadlock(tmp_path, monkeypatch):
+    """Test moving tasks between two lists in both directions at once.
+
+    Both moves wait for each other after taking their locks, so a move that
+    locked its source list first would hold it while waiting for the target.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture to make the moves meet after locking.
+
+    Asserts:
+        - Concurrent moves from A to B and from B to A all finish
+        - No task is lost or duplicated
+    """
+    path = str(tmp_path / "tasks.json")
+    for name in ("a", "b"):
+        manager = TaskManager(path, namespace=name)
+        for i in range(5):
+            manager.add_task(f"{name}{i}")
+
+    meet = threading.Barrier(2)
+    get_tasks_by_id = TaskManager._get_tasks_by_id
+
+    def locked_then_meet(self, ids):
+        try:
+            meet.wait(timeout=0.5)
+        except threading.BrokenBarrierError:
+            pass
+        return get_tasks_by_id(self, ids)
+
+    monkeypatch.setattr(TaskManager, "_get_tasks_by_id", locked_then_meet)
+
+    def move(source, target):
+        manager = TaskManager(path, namespace=source)
+        for task_id in range(1, 6):
+            manager.move_task(task_id, target)
+
+    threads = [
+        threading.Thread(target=move, args=pair, daemon=True)
+        for pair in (("a", "b"), ("b", "a"))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    assert not any(thread.is_alive() for thread in threads)
+
+    descriptions = [
+        t["description"]
+        for name in ("a", "b")
+        for t in TaskManager(path, namespace=name).list_tasks()
+    ]
+    assert sorted(descriptions) == sorted(
+        f"{name}{i}" for name in ("a", "b") for i in range(5)
+    )
+
+
+def test_recurring_templates_and_tick(tmp_path):
+    """Test recurring templates generating tasks when ticked.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - A tick before anything is due adds nothing and doesn't save the store
+        - Due templates add one task each in one save, with the template's
+          priority and tags, and are rescheduled after now
+        - Ticking again, or after the templates file is restored to its state
+          before the tick, adds no duplicates
+        - Deleted templates stop generating tasks
+        - Invalid rules raise ValueError
+    """
+    from datetime import datetime
+
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path)
+    standup = tm.add_template(
+        "Standup", every="1d", start="2026-10-01T09:00:00", priority=2, tags=["team"]
+    )
+    report = tm.add_template("Report", cron="0 9 * * 1", start="2026-10-01T00:00:00")
+    assert (
+        standup["next"] == "2026-10-01T09:00:00"
+        and report["next"] == "2026-10-05T09:00:00"
+    )
+
+    tm.add_task("Inbox")
+    stamp = os.stat(path).st_mtime_ns
+    assert tm.tick(datetime(2026, 10, 1, 8)) == []
+    assert os.stat(path).st_mtime_ns == stamp
+
+    with open(tm.recurring_path, encoding="utf-8") as f:
+        before = f.read()
+    seq = tm.summary()["seq"]
+    tasks = tm.tick(datetime(2026, 10, 6, 10))
+    assert [(t["description"], t["occurrence"]) for t in tasks] == [
+        ("Standup", "2026-10-06T09:00:00"),
+        ("Report", "2026-10-05T09:00:00"),
+    ]
+    assert tasks[0]["priority"] == 2 and tasks[0]["tags"] == ["team"]
+    assert tm.summary()["seq"] == seq + 1
+    assert [t["next"] for t in tm.list_templates()] == [
+        "2026-10-07T09:00:00",
+        "2026-10-12T09:00:00",
+    ]
+    assert tm.tick(datetime(2026, 10, 6, 11)) == []
+
+    # As if the process died after saving the tasks but before the templates.
+    with open(tm.recurring_path, "w", encoding="utf-8") as f:
+        f.write(before)
+    assert TaskManager(path).tick(datetime(2026, 10, 6, 12)) == []
+    assert len(tm.list_tasks()) == 3
+
+    tm.delete_template(report["id"])
+    assert [t["description"] for t in tm.tick(datetime(2026, 10, 13, 9))] == ["Standup"]
+    with pytest.raises(ValueError, match="Template with id 2 not found"):
+        tm.delete_template(report["id"])
+    with pytest.raises(ValueError, match="Invalid interval: soon"):
+        tm.add_template("Nope", every="soon")
+    with pytest.raises(ValueError, match="Invalid cron rule"):
+        tm.add_template("Nope", cron="0 9 * * 8")
+
+
+def test_saved_views_stay_materialized(tmp_path, monkeypatch):
+    """Test that saved views are kept up to date without re-running their query.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+        monkeypatch: Pytest fixture used to detect full loads of the store.
+
+    Asserts:
+        - A view lists the same tasks as list_tasks with its query
+        - Adds, changes, deletes and batches update its results
+        - Showing a selective view doesn't load the whole store
+        - A view saved by another TaskManager is picked up
+        - Invalid names, relative times and unknown views raise ValueError
+    """
+    path = str(tmp_path / "tasks.json")
+    tm = TaskManager(path)
+    for i in range(1, 41):
+        tm.add_task(f"Deploy service {i}" if i % 5 == 1 else f"Write docs {i}")
+    query = "status != done and description ~ 'deploy'"
+    assert tm.save_view("deploys", query) == {
+        "name": "deploys",
+        "where": query,
+        "count": 8,
+    }
+
+    tm.mark_done(1)
+    tm.update_task(2, "Deploy docs site")
+    tm.delete_task(3)
+    with tm.batch():
+        tm.add_task("Deploy worker")
+        tm.mark_in_progress(5)
+    expected = tm.list_tasks(where=query)
+
+    def full_load(*args, **kwargs):
+        raise AssertionError("the store was loaded in full")
+
+    monkeypatch.setattr(tm, "_get_tasks", full_load)
+    assert tm.show_view("deploys") == expected
+    monkeypatch.undo()
+
+    other = TaskManager(path)
+    other.save_view("wip", "status = in-progress")
+    tm.mark_in_progress(7)
+    assert [t["id"] for t in tm.show_view("wip")] == [5, 7]
+    assert [(v["name"], v["count"]) for v in TaskManager(path).list_views()] == [
+        ("deploys", 9),
+        ("wip", 2),
+    ]
+
+    assert tm.delete_view("wip") == {"name": "wip", "where": "status = in-progress"}
+    with pytest.raises(ValueError, match="View 'wip' not found"):
+        other.show_view("wip")
+    with pytest.raises(ValueError, match="Invalid view name"):
+        tm.save_view("my view", "status = todo")
+    with pytest.raises(ValueError, match="Views can't use relative times: 7d"):
+        tm.save_view("recent", "updatedAt > 7d")
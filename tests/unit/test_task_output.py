@@ -0,0 +1,178 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from task_manager import iso_to_epoch_ms
+from task_output import parse_fields, write_tasks
+
+TASKS = [
+    {
+        "id": 1,
+        "description": "Buy milk",
+        "status": "todo",
+        "createdAt": "2026-01-01T10:00:00",
+        "updatedAt": "2026-01-01T10:00:00",
+    },
+    {
+        "id": 2,
+        "description": 'Say "hi", then leave',
+        "status": "done",
+        "createdAt": "2026-01-02T10:00:00",
+        "updatedAt": "2026-01-03T10:00:00",
+    },
+]
+
+
+def render(fmt, fields=None, header=True) -> str:
+    """Helper to write TASKS to a string in the given format.
+
+    Args:
+        fmt: Output format passed to write_tasks.
+        fields: Optional field projection.
+        header: Whether to write the banner or header row.
+
+    Returns:
+        The written output.
+    """
+    out = io.StringIO()
+    write_tasks(TASKS, out, fmt, fields, header)
+    return out.getvalue()
+
+
+def test_text_format_matches_list_layout():
+    """Test that text output keeps the banner and "id - description - status" lines.
+
+    Asserts:
+        - The banner shows the task count and separator
+        - Each task is written on its own line
+        - --no-header output contains only task lines
+    """
+    text = render("text")
+    assert "Listing 2 tasks:" in text
+    assert "-" * 40 in text
+    assert "1 - Buy milk - todo\n" in text
+
+    assert (
+        render("text", header=False)
+        == '1 - Buy milk - todo\n2 - Say "hi", then leave - done\n'
+    )
+    assert render("text", ["id", "status"], header=False) == "1 - todo\n2 - done\n"
+
+
+def test_json_and_ndjson_formats_round_trip():
+    """Test that JSON and NDJSON output parse back to the tasks.
+
+    Asserts:
+        - JSON output is a single array of all tasks
+        - NDJSON output has one object per line
+        - Field projection keeps only the requested keys
+    """
+    assert json.loads(render("json")) == TASKS
+    assert json.loads(render("json", ["id"])) == [{"id": 1}, {"id": 2}]
+
+    lines = render("ndjson").splitlines()
+    assert [json.loads(line) for line in lines] == TASKS
+
+    out = io.StringIO()
+    write_tasks([], out, "json")
+    assert json.loads(out.getvalue()) == []
+
+
+@pytest.mark.parametrize("fmt, delimiter", [("csv", ","), ("tsv", "\t")])
+def test_delimited_formats_quote_and_project(fmt, delimiter):
+    """Test that CSV/TSV output has a header row and quotes descriptions safely.
+
+    Args:
+        fmt: "csv" or "tsv".
+        delimiter: Expected column delimiter.
+
+    Asserts:
+        - The header row lists the selected fields
+        - Values round-trip through the csv module
+        - --no-header omits the header row
+    """
+    rows = list(
+        csv.reader(io.StringIO(render(fmt, ["id", "description"])), delimiter=delimiter)
+    )
+    assert rows == [
+        ["id", "description"],
+        ["1", "Buy milk"],
+        ["2", 'Say "hi", then leave'],
+    ]
+
+    rows = list(csv.reader(io.StringIO(render(fmt, header=False)), delimiter=delimiter))
+    assert len(rows) == 2
+    assert rows[1][2] == "done"
+
+
+def test_epoch_timestamps_are_formatted_only_on_output():
+    """Test that epoch-millisecond timestamps are written as ISO strings.
+
+    Asserts:
+        - JSON and CSV output show the same ISO timestamps as an ISO store
+        - The task dictionaries passed in keep their integer timestamps
+    """
+    tasks = [
+        dict(
+            t,
+            createdAt=iso_to_epoch_ms(t["createdAt"]),
+            updatedAt=iso_to_epoch_ms(t["updatedAt"]),
+        )
+        for t in TASKS
+    ]
+
+    out = io.StringIO()
+    write_tasks(tasks, out, "json")
+    assert json.loads(out.getvalue()) == TASKS
+
+    out = io.StringIO()
+    write_tasks(tasks, out, "csv", fields=["id", "updatedAt"], header=False)
+    assert out.getvalue() == "1,2026-01-01T10:00:00\n2,2026-01-03T10:00:00\n"
+    assert isinstance(tasks[0]["createdAt"], int)
+
+
+def test_invalid_format_and_fields_raise_error():
+    """Test that unknown formats and fields are rejected.
+
+    Asserts:
+        - ValueError is raised for an unknown format
+        - ValueError is raised for an unknown field name
+    """
+    with pytest.raises(ValueError, match="Invalid output format"):
+        render("xml")
+    with pytest.raises(ValueError, match="Invalid field"):
+        parse_fields("id,colour")
+    assert parse_fields("id, status") == ["id", "status"]
+
+
+def test_list_piped_to_head_exits_cleanly(tmp_path):
+    """Test that closing the pipe early doesn't print a BrokenPipeError traceback.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The reader gets the first lines
+        - No traceback is written to stderr
+    """
+    tasks = [dict(TASKS[0], id=i) for i in range(1, 50001)]
+    (tmp_path / "tasks.json").write_text(json.dumps(tasks), encoding="utf-8")
+    cli = Path(__file__).resolve().parents[2] / "task_cli.py"
+
+    proc = subprocess.Popen(
+        [sys.executable, str(cli), "list", "--no-header"],
+        cwd=tmp_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    first = proc.stdout.readline()
+    proc.stdout.close()
+    stderr = proc.stderr.read()
+    proc.wait(timeout=30)
+
+    assert first == b"1 - Buy milk - todo\n"
+    assert b"Traceback" not in stderr
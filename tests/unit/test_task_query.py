@@ -0,0 +1,130 @@
+import pytest
+from task_query import And, Condition, Or, conjuncts, parse_query
+
+STATUSES = {"todo", "in-progress", "done"}
+
+TASKS = [
+    {
+        "id": 1,
+        "description": "Deploy API",
+        "status": "todo",
+        "createdAt": "2026-09-01T00:00:00",
+        "updatedAt": "2026-10-02T00:00:00",
+    },
+    {
+        "id": 2,
+        "description": "Deployment checklist",
+        "status": "in-progress",
+        "createdAt": "2026-09-02T00:00:00",
+        "updatedAt": "2026-09-20T00:00:00",
+    },
+    {
+        "id": 3,
+        "description": "Write docs",
+        "status": "done",
+        "createdAt": "2026-09-03T00:00:00",
+        "updatedAt": "2026-10-05T00:00:00",
+    },
+]
+
+
+def parse(text):
+    """Helper to parse a query with ISO dates normalized to full timestamps.
+
+    Args:
+        text: The query text.
+
+    Returns:
+        The parsed query tree.
+    """
+    return parse_query(text, lambda v: v if "T" in v else v + "T00:00:00", STATUSES)
+
+
+def matching_ids(text):
+    """Helper to compile a query and apply it to TASKS.
+
+    Args:
+        text: The query text.
+
+    Returns:
+        Ids of the matching sample tasks.
+    """
+    predicate = parse(text).compile()
+    return [t["id"] for t in TASKS if predicate(t)]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("status = todo", [1]),
+        ("status in (todo, in-progress)", [1, 2]),
+        ("description ~ 'deploy'", [1]),
+        ("description ~ 'deploy*'", [1, 2]),
+        ("updatedAt > 2026-10-01", [1, 3]),
+        ("id >= 2 and not status = done", [2]),
+        ("status = done or description ~ api", [1, 3]),
+        ("(status = todo or status = done) and updatedAt >= 2026-10-05", [3]),
+        ("status = todo OR id IN (3)", [1, 3]),
+        ('description = "Write docs"', [3]),
+    ],
+)
+def test_compiled_predicates(text, expected):
+    """Test that compiled queries select the expected tasks.
+
+    Args:
+        text: The query text.
+        expected: Ids of the tasks the query should match.
+
+    Asserts:
+        - The compiled predicate matches exactly the expected tasks
+    """
+    assert matching_ids(text) == expected
+
+
+def test_parse_tree_and_conjuncts():
+    """Test the shape of parsed queries and the indexable top-level conditions.
+
+    Asserts:
+        - and binds tighter than or
+        - conjuncts returns top-level AND conditions only
+        - Time values go through the normalizer
+    """
+    node = parse("status = todo and updatedAt > 2026-10-01 or id = 3")
+    assert isinstance(node, Or)
+    assert isinstance(node.parts[0], And)
+    assert conjuncts(node) == []
+
+    node = parse("status = todo and updatedAt > 2026-10-01")
+    conds = conjuncts(node)
+    assert [c.field for c in conds] == ["status", "updatedAt"]
+    assert conds[1].value == "2026-10-01T00:00:00"
+    assert str(node) == "status = todo and updatedAt > 2026-10-01T00:00:00"
+    assert isinstance(conjuncts(parse("id = 1"))[0], Condition)
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("", "cannot be empty"),
+        ("owner = me", "Invalid query field"),
+        ("status > todo", "not supported"),
+        ("status = archived", "Invalid status filter"),
+        ("id = abc", "Invalid id value"),
+        ("status = todo and", "Unexpected end"),
+        ("(status = todo", "Unexpected end"),
+        ("id in 1, 2", "Expected '\\('"),
+        ("status = todo done", "Unexpected input"),
+    ],
+)
+def test_invalid_queries_raise_error(text, message):
+    """Test that malformed queries raise ValueError with a helpful message.
+
+    Args:
+        text: The invalid query text.
+        message: Expected part of the error message.
+
+    Asserts:
+        - ValueError is raised with the expected message
+    """
+    with pytest.raises(ValueError, match=message):
+        parse(text)
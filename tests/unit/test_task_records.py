@@ -0,0 +1,218 @@
+from pathlib import Path
+
+import pytest
+from task_records import FILE_HEADER, GROW_SLOTS, RECORD, RecordStore
+
+
+def make_store(tmp_path: Path) -> RecordStore:
+    """Helper to open a RecordStore in its own temporary directory.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Returns:
+        A RecordStore using tmp_path/tasks.rec.
+    """
+    return RecordStore(str(tmp_path / "tasks.rec"))
+
+
+def test_record_store_add_get_and_reopen(tmp_path):
+    """Test that tasks are stored as fixed-width records and survive reopening.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Ids are assigned sequentially
+        - get_task returns the task, including a non-ASCII description
+        - The record file holds one fixed-width record per id
+        - A reopened store sees the same tasks and counts
+    """
+    with make_store(tmp_path) as store:
+        store.add_task("Buy milk")
+        added = store.add_task("Café ☕ run")
+        assert added["id"] == 2
+        assert store.get_task(2) == added
+        assert store.get_task(3) is None
+
+    size = (tmp_path / "tasks.rec").stat().st_size
+    assert size >= FILE_HEADER.size + 2 * RECORD.size
+    assert (size - FILE_HEADER.size) % RECORD.size == 0
+
+    with make_store(tmp_path) as store:
+        assert [t["description"] for t in store.list_tasks()] == [
+            "Buy milk",
+            "Café ☕ run",
+        ]
+        assert store.count_tasks() == 2
+        assert store.count_tasks("todo") == 2
+
+
+def test_record_store_mark_done_rewrites_record_in_place(tmp_path):
+    """Test that a status change only touches the record and the file header.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - mark_done returns the task with status "done"
+        - The string heap is unchanged
+        - Only bytes inside the header and task 1's record change
+        - Status counts and status filters follow the change
+    """
+    with make_store(tmp_path) as store:
+        store.add_task("First")
+        store.add_task("Second")
+    records = (tmp_path / "tasks.rec").read_bytes()
+    heap = (tmp_path / "tasks.rec.heap").read_bytes()
+
+    with make_store(tmp_path) as store:
+        assert store.mark_done(1)["status"] == "done"
+        assert store.count_tasks("done") == 1
+        assert [t["id"] for t in store.list_tasks("todo")] == [2]
+
+    changed = [
+        i
+        for i, (a, b) in enumerate(zip(records, (tmp_path / "tasks.rec").read_bytes()))
+        if a != b
+    ]
+    assert changed
+    assert all(i < FILE_HEADER.size + RECORD.size for i in changed)
+    assert (tmp_path / "tasks.rec.heap").read_bytes() == heap
+
+
+def test_record_store_update_delete_and_compact(tmp_path):
+    """Test description updates, deletes and heap compaction.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - update_task changes the description
+        - Deleting the highest id lets the next task reuse it, like TaskManager
+        - compact() reclaims the old description bytes and keeps every task intact
+        - Missing ids raise ValueError
+    """
+    with make_store(tmp_path) as store:
+        store.add_task("Draft release notes")
+        store.add_task("Old text")
+        store.add_task("Temporary")
+        store.update_task(2, "New text")
+        assert store.delete_task(3)["description"] == "Temporary"
+        assert store.add_task("Replacement")["id"] == 3
+
+        expected = store.list_tasks()
+        assert store.compact() == len("Old text") + len("Temporary")
+        assert store.list_tasks() == expected
+        assert (tmp_path / "tasks.rec.heap").stat().st_size == sum(
+            len(t["description"]) for t in expected
+        )
+
+        with pytest.raises(ValueError, match="Task with id 9 not found."):
+            store.mark_done(9)
+        with pytest.raises(ValueError, match="Task with id 0 not found."):
+            store.delete_task(0)
+
+
+def test_record_store_create_from_tasks(tmp_path):
+    """Test building a record store from existing task dictionaries.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Tasks round-trip exactly, with gaps in the ids left empty
+        - The next added task gets the highest id + 1
+        - Timestamps with fractional seconds or no time are normalised
+        - Fields a record can't hold are rejected, not dropped
+        - Invalid timestamps and duplicate ids are rejected
+    """
+    tasks = [
+        {
+            "id": 1,
+            "description": "a",
+            "status": "done",
+            "createdAt": "2026-01-01T10:00:00",
+            "updatedAt": "2026-01-02T10:00:00",
+        },
+        {
+            "id": 4,
+            "description": "b",
+            "status": "in-progress",
+            "createdAt": "2026-01-03T10:00:00",
+            "updatedAt": "2026-01-03T10:00:00",
+        },
+    ]
+    path = str(tmp_path / "tasks.rec")
+    with RecordStore.create(path, tasks) as store:
+        assert store.list_tasks() == tasks
+        assert store.get_task(2) is None
+        assert store.add_task("c")["id"] == 5
+
+    odd = dict(
+        tasks[0],
+        createdAt="2026-01-01T10:00:00.123456",
+        updatedAt="2026-01-02",
+        version=3,
+    )
+    with RecordStore.create(path, [odd]) as store:
+        assert store.get_task(1) == dict(
+            tasks[0], createdAt="2026-01-01T10:00:00", updatedAt="2026-01-02T00:00:00"
+        )
+
+    tagged = dict(tasks[0], tags=["ops"], priority="high", dependsOn=[])
+    with pytest.raises(ValueError, match="can't hold: priority, tags"):
+        RecordStore.create(path, [tagged])
+    bad = dict(tasks[0], createdAt="yesterday")
+    with pytest.raises(ValueError, match="Invalid timestamp"):
+        RecordStore.create(path, [bad])
+    with pytest.raises(ValueError, match="Duplicate task id: 1"):
+        RecordStore.create(path, [tasks[0], tasks[0]])
+
+
+def test_record_store_rejects_other_files(tmp_path):
+    """Test that opening a file that isn't a record store fails cleanly.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - ValueError is raised for a JSON file
+    """
+    path = tmp_path / "tasks.json"
+    path.write_text("[]" + " " * 64, encoding="utf-8")
+    with pytest.raises(ValueError, match="Not a task record store"):
+        RecordStore(str(path))
+
+
+def test_record_store_sees_changes_from_another_handle(tmp_path):
+    """Test that two handles on one store see each other's changes.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Tasks added through one handle past the mapped size are visible to
+          the other, which re-maps the grown file
+        - Counts and the next id follow changes made through the other handle
+        - Descriptions stay readable after the other handle compacts the heap
+    """
+    first = make_store(tmp_path)
+    second = make_store(tmp_path)
+    try:
+        for i in range(GROW_SLOTS + 10):
+            first.add_task(f"Task {i}")
+        assert second.get_task(GROW_SLOTS + 10)["description"] == (
+            f"Task {GROW_SLOTS + 9}"
+        )
+        assert second.count_tasks("todo") == GROW_SLOTS + 10
+        assert second.add_task("From second")["id"] == GROW_SLOTS + 11
+
+        first.update_task(1, "Renamed")
+        first.compact()
+        assert second.get_task(1)["description"] == "Renamed"
+        assert second.get_task(2)["description"] == "Task 1"
+        assert first.get_task(GROW_SLOTS + 11)["description"] == "From second"
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+
+import pytest
+from task_recurring import RecurrenceRule, TemplateScheduler
+
+
+def test_interval_rule_occurrences():
+    """Test that interval rules fire at start and every interval after it.
+
+    Asserts:
+        - first_at_or_after rounds up to an occurrence and never precedes start
+        - next_after is strictly after the moment
+        - last_at_or_before is None before start
+    """
+    rule = RecurrenceRule(timedelta(hours=6), start=datetime(2026, 10, 1, 9))
+    assert rule.first_at_or_after(datetime(2026, 9, 1)) == datetime(2026, 10, 1, 9)
+    assert rule.first_at_or_after(datetime(2026, 10, 1, 15)) == datetime(
+        2026, 10, 1, 15
+    )
+    assert rule.first_at_or_after(datetime(2026, 10, 1, 15, 1)) == datetime(
+        2026, 10, 1, 21
+    )
+    assert rule.next_after(datetime(2026, 10, 1, 15)) == datetime(2026, 10, 1, 21)
+    assert rule.last_at_or_before(datetime(2026, 10, 2, 8)) == datetime(2026, 10, 2, 3)
+    assert rule.last_at_or_before(datetime(2026, 10, 1, 8)) is None
+
+
+@pytest.mark.parametrize(
+    "cron, moment, expected_next, expected_last",
+    [
+        (
+            "0 9 * * 1-5",
+            datetime(2026, 10, 16, 9),
+            datetime(2026, 10, 19, 9),
+            datetime(2026, 10, 16, 9),
+        ),
+        (
+            "*/15 * * * *",
+            datetime(2026, 10, 1, 10, 7, 30),
+            datetime(2026, 10, 1, 10, 15),
+            datetime(2026, 10, 1, 10, 0),
+        ),
+        (
+            "30 8 1 * *",
+            datetime(2026, 10, 2),
+            datetime(2026, 11, 1, 8, 30),
+            datetime(2026, 10, 1, 8, 30),
+        ),
+        (
+            "0 0 13 * 5",
+            datetime(2026, 10, 10),
+            datetime(2026, 10, 13),
+            datetime(2026, 10, 9),
+        ),
+        (
+            "0 12 29 2 *",
+            datetime(2026, 3, 1),
+            datetime(2028, 2, 29, 12),
+            datetime(2024, 2, 29, 12),
+        ),
+    ],
+)
+def test_cron_rule_occurrences(cron, moment, expected_next, expected_last):
+    """Test cron rules against weekdays, steps, month days and both day fields.
+
+    Args:
+        cron: The cron expression.
+        moment: The moment to search from.
+        expected_next: The first occurrence after the moment.
+        expected_last: The latest occurrence at or before the moment.
+
+    Asserts:
+        - next_after and last_at_or_before find the expected times
+        - With both day fields restricted, either one matching is enough
+    """
+    rule = RecurrenceRule(cron=cron, start=datetime(2020, 1, 1))
+    assert rule.next_after(moment) == expected_next
+    assert rule.last_at_or_before(moment) == expected_last
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({}, "Give either an interval or a cron rule"),
+        (
+            {"interval": timedelta(hours=1), "cron": "* * * * *"},
+            "Give either an interval or a cron rule",
+        ),
+        ({"interval": timedelta(0)}, "Invalid interval"),
+        ({"cron": "0 9 * *"}, "expected 5 fields"),
+        ({"cron": "0 25 * * *"}, "bad hour field: 25"),
+        ({"cron": "*/0 * * * *"}, "bad minute field"),
+        ({"cron": "x * * * *"}, "bad minute field: x"),
+    ],
+)
+def test_invalid_rules_raise(kwargs, message):
+    """Test that malformed rules raise ValueError.
+
+    Args:
+        kwargs: Arguments to RecurrenceRule.
+        message: Expected part of the error message.
+
+    Asserts:
+        - ValueError is raised with a message naming the problem
+    """
+    with pytest.raises(ValueError, match=message):
+        RecurrenceRule(**kwargs)
+
+
+def test_cron_rule_that_never_matches():
+    """Test that a rule for a day that doesn't exist raises when searched.
+
+    Asserts:
+        - Searching forward raises ValueError
+        - There is no last occurrence
+    """
+    rule = RecurrenceRule(cron="0 0 31 2 *", start=datetime(2026, 1, 1))
+    with pytest.raises(ValueError, match="never matches"):
+        rule.next_after(datetime(2026, 1, 1))
+    assert rule.last_at_or_before(datetime(2026, 6, 1)) is None
+
+
+def test_scheduler_pops_due_templates_in_order():
+    """Test the scheduler heap with rescheduled and removed templates.
+
+    Asserts:
+        - peek shows the earliest occurrence
+        - pop_due returns due templates earliest first and unschedules them
+        - Stale entries of rescheduled or removed templates are skipped
+    """
+    scheduler = TemplateScheduler(
+        [
+            {"id": 1, "next": "2026-10-01T09:00:00"},
+            {"id": 2, "next": "2026-10-01T08:00:00"},
+            {"id": 3, "next": "2026-10-02T08:00:00"},
+        ]
+    )
+    assert len(scheduler) == 3
+    assert scheduler.peek() == "2026-10-01T08:00:00"
+
+    scheduler.schedule(2, "2026-10-03T08:00:00")
+    scheduler.unschedule(3)
+    assert scheduler.pop_due("2026-10-01T07:00:00") == []
+    assert scheduler.pop_due("2026-10-02T12:00:00") == [1]
+    assert scheduler.peek() == "2026-10-03T08:00:00"
+    assert scheduler.pop_due("2026-12-31T00:00:00") == [2]
+    assert scheduler.peek() is None and len(scheduler) == 0
@@ -0,0 +1,182 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from task_segments import SegmentStore
+
+
+def make_tasks(n: int) -> list:
+    """Helper to build n todo tasks with ids 1..n.
+
+    Args:
+        n: Number of tasks.
+
+    Returns:
+        List of task dictionaries.
+    """
+    return [
+        {
+            "id": i,
+            "description": f"Task {i}",
+            "status": "todo",
+            "createdAt": "2026-10-01T09:00:00",
+            "updatedAt": "2026-10-01T09:00:00",
+            "version": 1,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def test_segment_store_layout_and_reopen(tmp_path):
+    """Test that tasks are split into fixed-size segments indexed by the manifest.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - create() writes ceil(n / segment_size) segment files
+        - The manifest records each segment's id range and counts
+        - Adding fills the last segment, then starts a new one
+        - A reopened store keeps its segment size and sees the same tasks
+    """
+    path = str(tmp_path / "tasks.seg")
+    with SegmentStore.create(path, make_tasks(25), segment_size=10) as store:
+        assert len(list(Path(path).glob("0*.json"))) == 3
+        manifest = json.loads((Path(path) / "manifest.json").read_text())
+        assert [(s["first"], s["last"]) for s in manifest["segments"]] == [
+            (1, 10),
+            (11, 20),
+            (21, 25),
+        ]
+        for i in range(6):
+            store.add_task(f"New {i}")
+        assert store.count_tasks() == 31
+
+    with SegmentStore(path, segment_size=99) as store:
+        assert store.segment_size == 10
+        assert [t["id"] for t in store.list_tasks()] == list(range(1, 32))
+        assert store.get_task(31)["description"] == "New 5"
+        assert store.get_task(40) is None
+        assert len(list(Path(path).glob("0*.json"))) == 4
+
+
+def test_segment_store_point_ops_touch_one_segment(tmp_path):
+    """Test that point operations read and rewrite only the task's segment.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - mark_done, update_task and delete_task rewrite only one segment file
+        - Counts come from the manifest and follow the changes
+        - Deleting every task of a segment removes the segment
+        - Missing tasks raise "not found" errors
+    """
+    path = tmp_path / "tasks.seg"
+    with SegmentStore.create(str(path), make_tasks(30), segment_size=10) as store:
+        before = {p.name: p.stat().st_mtime_ns for p in path.glob("0*.json")}
+        assert store.mark_done(15)["status"] == "done"
+        assert store.update_task(16, "Renamed")["version"] == 2
+        changed = [
+            p.name
+            for p in path.glob("0*.json")
+            if p.stat().st_mtime_ns != before[p.name]
+        ]
+        assert changed == ["000002.json"]
+        assert store.cache_stats()["misses"] == 1
+
+        assert store.count_tasks("done") == 1
+        assert [t["id"] for t in store.list_tasks("done")] == [15]
+        for task_id in range(21, 31):
+            store.delete_task(task_id)
+        assert not (path / "000003.json").exists()
+        assert store.add_task("Next")["id"] == 21
+
+        with pytest.raises(ValueError, match="Task with id 99 not found."):
+            store.mark_done(99)
+        with pytest.raises(ValueError, match="Invalid status filter"):
+            store.count_tasks("blocked")
+
+
+def test_segment_cache_stays_within_budget(tmp_path):
+    """Test the LRU segment cache.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Cached bytes never exceed the budget, with evictions counted
+        - Repeated lookups in a cached segment are hits
+        - A full scan doesn't add segments to the cache
+        - Invalid options raise ValueError
+    """
+    path = str(tmp_path / "tasks.seg")
+    SegmentStore.create(path, make_tasks(100), segment_size=10).close()
+    segment_bytes = max(
+        p.stat().st_size for p in (tmp_path / "tasks.seg").glob("0*.json")
+    )
+
+    store = SegmentStore(path, cache_bytes=3 * segment_bytes)
+    for task_id in range(1, 101, 10):
+        store.get_task(task_id)
+    stats = store.cache_stats()
+    assert stats["misses"] == 10 and stats["evictions"] == 7
+    assert stats["segments"] == 3 and stats["bytes"] <= stats["budget"]
+
+    store.get_task(95)
+    store.get_task(96)
+    assert store.cache_stats()["hits"] == 2
+
+    assert len(store.list_tasks()) == 100
+    assert store.cache_stats()["segments"] == 3
+
+    with pytest.raises(ValueError, match="Invalid segment size"):
+        SegmentStore(path, segment_size=0)
+    with pytest.raises(ValueError, match="ids must be increasing"):
+        SegmentStore.create(str(tmp_path / "other.seg"), make_tasks(2)[::-1])
+
+
+def test_segment_store_shared_between_processes(tmp_path):
+    """Test that processes and handles sharing a segment store see each other.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - Two processes adding at once never get the same id
+        - A handle sees changes made through another handle, cached or not
+        - A failed segment write leaves the cached task unchanged
+    """
+    path = str(tmp_path / "tasks.seg")
+    SegmentStore.create(path, make_tasks(5), segment_size=10).close()
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from task_segments import SegmentStore;"
+        "store = SegmentStore(sys.argv[2]);"
+        "[store.add_task(f'Task {i}') for i in range(40)]"
+    )
+    root = str(Path(__file__).resolve().parents[2])
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script, root, path]) for _ in range(2)
+    ]
+    for proc in procs:
+        assert proc.wait(timeout=30) == 0
+
+    first = SegmentStore(path)
+    second = SegmentStore(path)
+    assert [t["id"] for t in first.list_tasks()] == list(range(1, 86))
+    assert first.get_task(3)["description"] == "Task 3"
+    second.update_task(3, "Renamed")
+    second.mark_done(4)
+    assert first.get_task(3)["description"] == "Renamed"
+    assert first.count_tasks("done") == 1
+    assert first.add_task("Next")["id"] == 86
+    assert second.get_task(86)["description"] == "Next"
+
+    (tmp_path / "tasks.seg" / "000001.json.tmp").mkdir()
+    with pytest.raises(ValueError, match="Failed to save"):
+        first.mark_done(1)
+    assert first.get_task(1)["status"] == "todo"
+    assert first.count_tasks("done") == 1
@@ -0,0 +1,516 @@
+import http.client
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pytest
+from task_manager import TaskManager, TaskNotFound
+from task_server import TaskRequestHandler, TaskServer
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[TaskServer]:
+    """Run a TaskServer on a free localhost port for the duration of a test.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Yields:
+        The running server, serving tmp_path/tasks.json.
+    """
+    srv = TaskServer(("127.0.0.1", 0), TaskManager(str(tmp_path / "tasks.json")))
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def call(
+    conn: http.client.HTTPConnection,
+    method: str,
+    path: str,
+    body: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[int, Any, Optional[str]]:
+    """Helper to send one request on a keep-alive connection.
+
+    Args:
+        conn: The connection to use.
+        method: HTTP method.
+        path: Request path with query string.
+        body: Optional JSON body.
+        headers: Optional extra request headers.
+
+    Returns:
+        The status, the decoded JSON body (None if empty) and the ETag header.
+    """
+    conn.request(
+        method,
+        path,
+        body=None if body is None else json.dumps(body),
+        headers=headers or {},
+    )
+    response = conn.getresponse()
+    data = response.read()
+    return (
+        response.status,
+        json.loads(data) if data else None,
+        response.getheader("ETag"),
+    )
+
+
+def test_server_crud_on_one_keep_alive_connection(server):
+    """Test the task endpoints over a single persistent connection.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - Adding, reading, listing, updating, marking and deleting work
+        - Every request reuses the same socket
+        - Missing tasks give 404 and invalid input gives 400, with an error message
+        - Unknown routes give 404 and unsupported methods 405
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    status, task, _ = call(conn, "POST", "/tasks", {"description": "Buy milk"})
+    assert status == 201
+    assert task["id"] == 1 and task["status"] == "todo"
+    sock = conn.sock
+
+    call(conn, "POST", "/tasks", {"description": "Walk dog"})
+    assert call(conn, "POST", "/tasks/2/in-progress")[1]["status"] == "in-progress"
+    assert (
+        call(conn, "PATCH", "/tasks/1", {"description": "Buy oat milk"})[1][
+            "description"
+        ]
+        == "Buy oat milk"
+    )
+    assert call(conn, "GET", "/tasks/1")[1]["description"] == "Buy oat milk"
+    assert [t["id"] for t in call(conn, "GET", "/tasks?status=in-progress")[1]] == [2]
+    assert [
+        t["id"] for t in call(conn, "GET", "/tasks?sort=id&reverse=1&limit=1")[1]
+    ] == [2]
+    assert [t["id"] for t in call(conn, "GET", "/search?q=milk")[1]] == [1]
+    assert call(conn, "GET", "/count?status=todo")[1] == {"count": 1}
+    assert call(conn, "DELETE", "/tasks/1")[1]["id"] == 1
+    assert conn.sock is sock
+
+    assert call(conn, "GET", "/tasks/1") == (
+        404,
+        {"error": "Task with id 1 not found."},
+        None,
+    )
+    assert call(conn, "POST", "/tasks", {"description": " "})[0] == 400
+    assert call(conn, "POST", "/tasks", {"title": "x"})[0] == 400
+    assert call(conn, "GET", "/tasks?limit=ten")[1] == {"error": "Invalid limit: ten"}
+    assert call(conn, "GET", "/tasks?colour=red")[1] == {
+        "error": "Unknown parameter: colour"
+    }
+    assert call(conn, "GET", "/nope")[0] == 404
+    assert call(conn, "DELETE", "/tasks")[0] == 405
+    conn.close()
+
+    # The status comes from the error's type, not its message.
+    assert TaskRequestHandler._error(TaskNotFound(3)) == (
+        404,
+        {"error": "Task with id 3 not found."},
+    )
+    assert TaskRequestHandler._error(ValueError("Tag not found."))[0] == 400
+
+
+def test_server_etag_and_if_none_match(server):
+    """Test conditional GETs on the list endpoint.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - GET /tasks returns an ETag
+        - A matching If-None-Match gives 304 with no body
+        - After a change the old ETag no longer matches and a new one is returned
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    call(conn, "POST", "/tasks", {"description": "Buy milk"})
+    status, tasks, etag = call(conn, "GET", "/tasks")
+    assert status == 200 and len(tasks) == 1 and etag
+
+    assert call(conn, "GET", "/tasks", headers={"If-None-Match": etag}) == (
+        304,
+        None,
+        etag,
+    )
+
+    call(conn, "POST", "/tasks/1/done")
+    status, tasks, new_etag = call(
+        conn, "GET", "/tasks", headers={"If-None-Match": etag}
+    )
+    assert status == 200 and tasks[0]["status"] == "done"
+    assert new_etag != etag
+    conn.close()
+
+
+def test_server_pipelined_writes_are_saved_once(server):
+    """Test that writes pipelined on one connection are saved in one batch.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - Every pipelined request gets its own response, in order
+        - A failing request in the pipeline doesn't affect the others
+        - The store is saved once for the whole pipeline (seq goes up by 1)
+        - The health endpoint reports the batch
+    """
+    requests = b"".join(
+        b"POST /tasks HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n%s"
+        % (len(body), body)
+        for body in (
+            json.dumps({"description": f"Task {i}"}).encode() for i in range(5)
+        )
+    )
+    requests += b"POST /tasks/99/done HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+    with socket.create_connection(server.server_address[:2]) as sock:
+        sock.sendall(requests)
+        responses = sock.makefile("rb")
+        statuses, bodies = [], []
+        for _ in range(6):
+            statuses.append(int(responses.readline().split()[1]))
+            headers = {}
+            for line in iter(responses.readline, b"\r\n"):
+                name, value = line.decode().split(":", 1)
+                headers[name.lower()] = value.strip()
+            bodies.append(json.loads(responses.read(int(headers["content-length"]))))
+
+    assert statuses == [201] * 5 + [404]
+    assert [b["id"] for b in bodies[:5]] == [1, 2, 3, 4, 5]
+    assert server.tm.summary() == {
+        "count": 5,
+        "statusCounts": {"done": 0, "in-progress": 0, "todo": 5},
+        "nextId": 6,
+        "seq": 1,
+    }
+
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    health = call(conn, "GET", "/health")[1]
+    assert health["status"] == "ok"
+    assert health["tasks"] == 5
+    assert health["batches"] == 1 and health["batchedRequests"] == 5
+    assert health["requests"] == 7
+    conn.close()
+
+
+def test_server_stalled_pipeline_does_not_block_others(server):
+    """Test that a client stalling mid-request doesn't hold the store lock.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - A write pipelined ahead of an incomplete request is answered
+        - Another connection can write while the incomplete request waits
+        - The incomplete request is handled once the rest of it arrives
+    """
+
+    def response_status(responses):
+        status = int(responses.readline().split()[1])
+        length = 0
+        for line in iter(responses.readline, b"\r\n"):
+            name, value = line.decode().split(":", 1)
+            if name.lower() == "content-length":
+                length = int(value)
+        responses.read(length)
+        return status
+
+    first, stalled = (
+        json.dumps({"description": d}).encode() for d in ("First", "Stalled")
+    )
+    request = b"POST /tasks HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n"
+
+    with socket.create_connection(server.server_address[:2]) as sock:
+        sock.sendall(request % len(first) + first + request % len(stalled))
+        responses = sock.makefile("rb")
+        assert response_status(responses) == 201
+
+        conn = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+        status, task, _ = call(conn, "POST", "/tasks", {"description": "Other"})
+        assert status == 201 and task["id"] == 2
+        conn.close()
+
+        sock.sendall(stalled)
+        assert response_status(responses) == 201
+
+    assert [t["description"] for t in server.tm.list_tasks()] == [
+        "First",
+        "Other",
+        "Stalled",
+    ]
+
+
+def test_server_expected_version_conflict(server):
+    """Test compare-and-swap changes over HTTP.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - A change with the current expected_version succeeds
+        - A stale one gets 409 with the task's current state
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    call(conn, "POST", "/tasks", {"description": "Buy milk"})
+    status, task, _ = call(conn, "POST", "/tasks/1/done?expected_version=1")
+    assert status == 200 and task["version"] == 2
+
+    status, body, _ = call(
+        conn, "PATCH", "/tasks/1?expected_version=1", {"description": "Buy oat milk"}
+    )
+    assert status == 409
+    assert body["current"]["status"] == "done"
+    assert body["error"] == "Task 1 has version 2, expected 1."
+    assert call(conn, "DELETE", "/tasks/1?expected_version=2")[0] == 200
+    conn.close()
+
+
+def test_server_priority_due_and_next(server):
+    """Test setting priority and due dates over HTTP and listing the next tasks.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - POST /tasks stores an optional priority and due date
+        - PATCH changes only the fields given, without needing a description
+        - GET /next returns the most important open tasks, with an ETag
+        - An empty PATCH or an invalid priority gives 400
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    task = call(
+        conn,
+        "POST",
+        "/tasks",
+        {"description": "Ship", "priority": 2, "due": "2026-11-01"},
+    )[1]
+    assert (task["priority"], task["due"]) == (2, "2026-11-01")
+    call(conn, "POST", "/tasks", {"description": "Plan"})
+    task = call(conn, "PATCH", "/tasks/2", {"priority": 3})[1]
+    assert (task["description"], task["priority"]) == ("Plan", 3)
+    assert "due" not in call(conn, "PATCH", "/tasks/1", {"due": ""})[1]
+
+    status, tasks, etag = call(conn, "GET", "/next?k=2")
+    assert status == 200 and etag
+    assert [t["id"] for t in tasks] == [2, 1]
+    assert [t["id"] for t in call(conn, "GET", "/next")[1]] == [2]
+
+    assert call(conn, "PATCH", "/tasks/1", {}) == (
+        400,
+        {"error": "Nothing to update."},
+        None,
+    )
+    assert call(conn, "PATCH", "/tasks/1", {"priority": "high"})[0] == 400
+    assert call(conn, "GET", "/next?k=0")[0] == 400
+    conn.close()
+
+
+def test_server_tags(server):
+    """Test tagging tasks and filtering by tags over HTTP.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - POST /tasks and PATCH take a list of tags
+        - POST and DELETE /tasks/<id>/tags add and remove tags
+        - GET /tasks filters by all of tags and any of any_tags
+        - Tags that aren't a list, or are invalid, give 400
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    assert call(
+        conn, "POST", "/tasks", {"description": "Ship", "tags": ["work", "urgent"]}
+    )[1]["tags"] == ["urgent", "work"]
+    call(conn, "POST", "/tasks", {"description": "Walk dog"})
+    call(conn, "POST", "/tasks", {"description": "Plan", "tags": ["work"]})
+    assert call(conn, "PATCH", "/tasks/2", {"tags": ["home"]})[1]["tags"] == ["home"]
+    assert call(conn, "POST", "/tasks/3/tags", {"tags": ["urgent"]})[1]["tags"] == [
+        "urgent",
+        "work",
+    ]
+    assert (
+        "tags"
+        not in call(
+            conn, "DELETE", "/tasks/2/tags?expected_version=2", {"tags": ["home"]}
+        )[1]
+    )
+
+    assert [t["id"] for t in call(conn, "GET", "/tasks?tags=work,urgent")[1]] == [1, 3]
+    assert [
+        t["id"] for t in call(conn, "GET", "/tasks?any_tags=home,work&limit=1")[1]
+    ] == [1]
+    assert call(conn, "POST", "/tasks/1/tags", {"tags": "work"})[0] == 400
+    assert call(conn, "POST", "/tasks/1/tags", {"tags": ["two words"]})[0] == 400
+    assert call(conn, "GET", "/tasks/1/tags")[0] == 405
+    conn.close()
+
+
+def test_server_dependencies_and_ready(server):
+    """Test blocking tasks and listing the ready ones over HTTP.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - POST and DELETE /tasks/<id>/blockers link and unlink tasks
+        - GET /tasks?ready=1 lists the tasks whose blockers are done
+        - Cycles and ids that aren't integers give 400
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    for description in ("Build", "Test", "Release"):
+        call(conn, "POST", "/tasks", {"description": description})
+    assert call(conn, "POST", "/tasks/3/blockers", {"ids": [2, 1]})[1]["dependsOn"] == [
+        1,
+        2,
+    ]
+    call(conn, "POST", "/tasks/2/blockers?expected_version=1", {"ids": [1]})
+    assert [t["id"] for t in call(conn, "GET", "/tasks?ready=1")[1]] == [1]
+
+    call(conn, "POST", "/tasks/1/done")
+    assert [t["id"] for t in call(conn, "GET", "/tasks?ready=true")[1]] == [2]
+    assert call(conn, "DELETE", "/tasks/3/blockers", {"ids": [2]})[1]["dependsOn"] == [
+        1
+    ]
+    assert [t["id"] for t in call(conn, "GET", "/tasks?ready=1&status=todo")[1]] == [
+        2,
+        3,
+    ]
+
+    status, body, _ = call(conn, "POST", "/tasks/1/blockers", {"ids": [3]})
+    assert status == 400 and "dependency cycle" in body["error"]
+    assert call(conn, "POST", "/tasks/1/blockers", {"ids": ["2"]})[0] == 400
+    conn.close()
+
+
+def test_server_recurring_template_endpoints(server):
+    """Test managing recurring templates and ticking over HTTP.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - POST /templates adds a template (201) and GET /templates lists it
+        - POST /tick adds the due tasks once, counted in the health metrics
+        - DELETE /templates/<id> removes it, and a missing one gives 404
+        - Invalid rules and field types give 400
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    status, template = call(
+        conn,
+        "POST",
+        "/templates",
+        {
+            "description": "Standup",
+            "every": "1d",
+            "start": "2026-01-01T09:00:00",
+            "tags": ["team"],
+        },
+    )[:2]
+    assert status == 201 and template["next"] == "2026-01-01T09:00:00"
+    assert [t["id"] for t in call(conn, "GET", "/templates")[1]] == [template["id"]]
+
+    tasks = call(conn, "POST", "/tick", {"now": "2026-01-03T10:00:00"})[1]
+    assert [(t["description"], t["occurrence"], t["tags"]) for t in tasks] == [
+        ("Standup", "2026-01-03T09:00:00", ["team"])
+    ]
+    assert call(conn, "POST", "/tick", {"now": "2026-01-03T11:00:00"})[1] == []
+    assert call(conn, "GET", "/health")[1]["recurring"] == 1
+
+    assert (
+        call(conn, "DELETE", f"/templates/{template['id']}")[1]["description"]
+        == "Standup"
+    )
+    assert call(conn, "DELETE", f"/templates/{template['id']}")[0] == 404
+    assert (
+        call(conn, "POST", "/templates", {"description": "x", "every": "often"})[0]
+        == 400
+    )
+    assert call(conn, "POST", "/templates", {"description": "x", "every": 5})[0] == 400
+    assert call(conn, "POST", "/tick", {"now": "soon"})[0] == 400
+    conn.close()
+
+
+def test_server_saved_view_endpoints(server):
+    """Test saving, showing, listing and deleting views over HTTP.
+
+    Args:
+        server: Running TaskServer fixture.
+
+    Asserts:
+        - PUT /views/<name> saves a view and reports its count
+        - GET /views/<name> follows later changes to the tasks
+        - GET /views lists the views, DELETE removes one, and a missing one gives 404
+        - An invalid query gives 400
+    """
+    conn = http.client.HTTPConnection(*server.server_address[:2])
+    for description in ("Deploy API", "Write docs", "Deploy web"):
+        call(conn, "POST", "/tasks", {"description": description})
+    saved = call(
+        conn,
+        "PUT",
+        "/views/deploys",
+        {"where": "description ~ 'deploy' and status != done"},
+    )[1]
+    assert saved["count"] == 2
+    call(conn, "POST", "/tasks/1/done")
+    assert [t["id"] for t in call(conn, "GET", "/views/deploys")[1]] == [3]
+    assert call(conn, "GET", "/views")[1] == [
+        {
+            "name": "deploys",
+            "where": "description ~ 'deploy' and status != done",
+            "count": 1,
+        },
+    ]
+
+    assert call(conn, "DELETE", "/views/deploys")[1]["name"] == "deploys"
+    assert call(conn, "GET", "/views/deploys") == (
+        404,
+        {"error": "View 'deploys' not found."},
+        None,
+    )
+    assert call(conn, "PUT", "/views/bad", {"where": "colour = red"})[0] == 400
+    assert call(conn, "POST", "/views/bad", {"where": "id = 1"})[0] == 405
+    conn.close()
+
+
+def test_server_ticks_recurring_templates(tmp_path):
+    """Test that a server with a tick interval adds due recurring tasks.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture for isolated test data.
+
+    Asserts:
+        - The due template's task is added without any request
+        - The health endpoint counts recurring tasks
+        - Closing the server stops the ticker thread
+    """
+    tm = TaskManager(str(tmp_path / "tasks.json"))
+    tm.add_template("Standup", every="1d", start="2020-01-01T00:00:00")
+    srv = TaskServer(("127.0.0.1", 0), tm, tick_interval=0.01)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        for _ in range(500):
+            if srv.metrics["recurring"]:
+                break
+            time.sleep(0.01)
+        conn = http.client.HTTPConnection(*srv.server_address[:2])
+        health = call(conn, "GET", "/health")[1]
+        assert health["recurring"] == 1 and health["tasks"] == 1
+        conn.close()
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    assert not srv._ticker.is_alive()
+    assert [t["description"] for t in tm.list_tasks()] == ["Standup"]
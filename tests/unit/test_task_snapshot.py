@@ -0,0 +1,72 @@
+import pytest
+from task_snapshot import TaskSnapshot
+
+
+def make_snapshot() -> TaskSnapshot:
+    """Helper to build a snapshot of three tasks at generation 1.
+
+    Returns:
+        TaskSnapshot for tasks 1-3.
+    """
+    return TaskSnapshot.from_tasks(
+        [
+            {"id": 1, "description": "Deploy", "status": "todo", "version": 1},
+            {"id": 2, "description": "Docs", "status": "done", "version": 1},
+            {"id": 3, "description": "Review", "status": "todo", "version": 1},
+        ],
+        1,
+        [100, 1],
+    )
+
+
+def test_snapshot_is_read_only_copy():
+    """Test that a snapshot copies its input and cannot be changed.
+
+    Asserts:
+        - Tasks are reachable by position and by id
+        - Changing the source dictionaries doesn't change the snapshot
+        - Assigning to a task raises TypeError
+        - to_list() returns mutable copies
+    """
+    tasks = [{"id": 1, "description": "Deploy", "status": "todo"}]
+    snap = TaskSnapshot.from_tasks(tasks, 1, None)
+    tasks[0]["status"] = "done"
+
+    assert len(snap) == 1
+    assert snap[0]["status"] == "todo"
+    assert snap.get(1) is snap[0]
+    assert snap.get(9) is None
+    with pytest.raises(TypeError):
+        snap[0]["status"] = "done"
+
+    copy = snap.to_list()
+    copy[0]["status"] = "done"
+    assert snap[0]["status"] == "todo"
+
+
+def test_with_changes_shares_unchanged_tasks():
+    """Test that the next snapshot copies only the changed tasks.
+
+    Asserts:
+        - Changed tasks are replaced in place, deleted ones dropped and new ones
+          appended
+        - Unchanged task mappings are the same objects in both snapshots
+        - The old snapshot is unchanged
+    """
+    snap = make_snapshot()
+    nxt = snap.with_changes(
+        removed=[dict(snap[0]), dict(snap[1])],
+        added=[
+            {"id": 1, "description": "Deploy", "status": "done", "version": 2},
+            {"id": 4, "description": "Triage", "status": "todo", "version": 1},
+        ],
+        generation=2,
+        signature=[120, 2],
+    )
+
+    assert [t["id"] for t in nxt] == [1, 3, 4]
+    assert nxt[0]["status"] == "done"
+    assert nxt[1] is snap[2]
+    assert nxt.generation == 2 and nxt.signature == [120, 2]
+    assert [t["id"] for t in snap] == [1, 2, 3]
+    assert snap[0]["status"] == "todo"